@@ -0,0 +1,598 @@
+"""
+    adbts.buffered
+    ~~~~~~~~~~~~~~
+
+    Contains transports that wrap another :class:`~adbts.transport.Transport` and read ahead from it in large
+    chunks, serving small reads from memory.
+"""
+from . import exceptions, hints, timeouts, transport
+
+__all__ = ['RingBuffer', 'BufferedTransport', 'AsyncBufferedTransport', 'DEFAULT_BUFFER_SIZE']
+
+
+#: Default number of bytes held by the read buffer of a buffered transport.
+DEFAULT_BUFFER_SIZE = 65536
+
+
+class RingBuffer:
+    """
+    Fixed capacity circular buffer of bytes backed by a single preallocated :class:`~bytearray`.
+
+    Free space is exposed as a :class:`~memoryview` a transport can read into directly, and buffered bytes
+    are exposed as a :class:`~memoryview` without copying them.
+    """
+
+    def __init__(self, capacity: hints.Int = DEFAULT_BUFFER_SIZE) -> None:
+        if capacity <= 0:
+            raise ValueError('Buffer capacity must be greater than zero')
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> hints.Int:
+        return self._size
+
+    @property
+    def capacity(self) -> hints.Int:
+        """
+        Maximum number of bytes the buffer can hold.
+
+        :return: Capacity in bytes
+        :rtype: :class:`~int`
+        """
+        return len(self._buffer)
+
+    def writable(self) -> memoryview:
+        """
+        Get the largest contiguous region of free space, directly after the buffered bytes.
+
+        :return: View of free space to read into, empty when the buffer is full
+        :rtype: :class:`~memoryview`
+        """
+        end = self._start + self._size
+        if end < self.capacity:
+            return self._view[end:]
+        return self._view[end - self.capacity:self._start]
+
+    def commit(self, num_bytes: hints.Int) -> None:
+        """
+        Mark the given number of bytes written into the region returned by
+        :meth:`~adbts.buffered.RingBuffer.writable` as buffered.
+
+        :param num_bytes: Number of bytes written
+        :type num_bytes: :class:`~int`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._size += num_bytes
+
+    def peek(self, num_bytes: hints.Int) -> memoryview:
+        """
+        Get up to the given number of buffered bytes without consuming them.
+
+        Bytes that wrap around the end of the buffer are first moved to its start so the view is contiguous.
+
+        :param num_bytes: Maximum number of bytes
+        :type num_bytes: :class:`~int`
+        :return: View of buffered bytes, valid until the buffer is next modified
+        :rtype: :class:`~memoryview`
+        """
+        num_bytes = min(num_bytes, self._size)
+        if self._start + num_bytes > self.capacity:
+            self._linearize()
+        return self._view[self._start:self._start + num_bytes]
+
+    def consume(self, num_bytes: hints.Int) -> None:
+        """
+        Discard the given number of buffered bytes.
+
+        :param num_bytes: Number of bytes to discard
+        :type num_bytes: :class:`~int`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        num_bytes = min(num_bytes, self._size)
+        self._size -= num_bytes
+        # Rewind when empty so the next read gets all of the buffer as one contiguous region.
+        self._start = (self._start + num_bytes) % self.capacity if self._size else 0
+
+    def readinto(self, buffer: hints.WritableBuffer) -> hints.Int:
+        """
+        Copy buffered bytes into the given buffer and consume them.
+
+        :param buffer: Writable buffer to copy bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :return: Number of bytes copied
+        :rtype: :class:`~int`
+        """
+        data = self.peek(len(buffer))
+        num_bytes = len(data)
+        memoryview(buffer)[:num_bytes] = data
+        self.consume(num_bytes)
+        return num_bytes
+
+    def _linearize(self) -> None:
+        """
+        Rotate the buffer so the buffered bytes start at its beginning.
+        """
+        self._buffer[:] = self._buffer[self._start:] + self._buffer[:self._start]
+        self._start = 0
+
+
+class BufferedTransport(transport.Transport):
+    """
+    Wraps a synchronous :class:`~adbts.transport.Transport` and fills a :class:`~adbts.buffered.RingBuffer`
+    with as many bytes as a single read of the wrapped transport returns. Small reads, e.g. message headers,
+    are then served from memory instead of costing a syscall or USB transfer each.
+
+    Reads of at least the buffer size bypass the buffer when it is empty. Writes are passed through.
+    """
+
+    def __init__(self, wrapped: transport.Transport, buffer_size: hints.Int = DEFAULT_BUFFER_SIZE) -> None:
+        self._transport = wrapped
+        self._buffer = RingBuffer(buffer_size)
+
+    def __repr__(self) -> hints.Str:
+        return '<{}({!r}, buffered={})>'.format(self.__class__.__name__, self._transport, len(self._buffer))
+
+    def __str__(self) -> hints.Str:
+        return str(self._transport)
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the wrapped transport is closed.
+
+        :return: Closed state of the transport
+        :rtype: :class:`~bool`
+        """
+        return self._transport.closed
+
+    @property
+    def default_timeout(self) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the wrapped transport wait when they are not given a timeout.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return self._transport.default_timeout
+
+    @property
+    def buffered(self) -> hints.Int:
+        """
+        Number of bytes read from the wrapped transport that have not been consumed yet.
+
+        :return: Number of buffered bytes
+        :rtype: :class:`~int`
+        """
+        return len(self._buffer)
+
+    @transport.ensure_opened
+    def peek(self, num_bytes: hints.Int, timeout: hints.Timeout = timeouts.UNDEFINED) -> memoryview:
+        """
+        Get up to the given number of bytes without consuming them. The wrapped transport is read at most once,
+        only when fewer bytes are buffered.
+
+        :param num_bytes: Maximum number of bytes
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: View of buffered bytes, valid until the next read
+        :rtype: :class:`~memoryview`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if len(self._buffer) < num_bytes:
+            self._fill(timeout)
+        return self._buffer.peek(num_bytes)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    def read(self,
+             num_bytes: hints.Int,
+             timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if not self._buffer:
+            if num_bytes >= self._buffer.capacity:
+                return self._transport.read(num_bytes, timeout)
+            self._fill(timeout)
+        data = bytes(self._buffer.peek(num_bytes))
+        self._buffer.consume(len(data))
+        return data
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    def readinto(self,
+                 buffer: hints.WritableBuffer,
+                 timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if not self._buffer:
+            if len(buffer) >= self._buffer.capacity:
+                return self._transport.readinto(buffer, timeout)
+            self._fill(timeout)
+        return self._buffer.readinto(buffer)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    def read_exactly(self,
+                     num_bytes: hints.Int,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if num_bytes > self._buffer.capacity:
+            # Payloads larger than the buffer are read straight from the wrapped transport after the bytes
+            # already buffered.
+            data = bytearray(num_bytes)
+            offset = self._buffer.readinto(data)
+            data[offset:] = self._transport.read_exactly(num_bytes - offset, timeout)
+            return data
+
+        # Without a timeout the whole call is bounded by the default timeout of the wrapped transport, rather
+        # than each read from it.
+        deadline = timeouts.deadline(timeout, self._transport.default_timeout)
+        while len(self._buffer) < num_bytes:
+            self._fill(timeouts.call_timeout(deadline, timeout))
+        data = bytes(self._buffer.peek(num_bytes))
+        self._buffer.consume(num_bytes)
+        return data
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    def write(self,
+              data: hints.Buffer,
+              timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write bytes to the transport.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes` or :class:`~bytearray`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.write(data, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    def writev(self,
+               buffers: hints.Buffers,
+               timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.writev(buffers, timeout)
+
+    @transport.ensure_opened
+    def write_file(self,
+                   file: hints.FileSource,
+                   offset: hints.Int = 0,
+                   count: hints.OptionalInt = None,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.write_file(file, offset, count, timeout)
+
+    @transport.ensure_opened
+    def close(self) -> None:
+        """
+        Close the wrapped transport, discarding buffered bytes.
+
+        :return: Nothing
+        :rtype: `None`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        """
+        self._buffer.consume(len(self._buffer))
+        self._transport.close()
+
+    def _fill(self, timeout: hints.Timeout) -> None:
+        """
+        Read once from the wrapped transport into the free space of the buffer.
+        """
+        region = self._buffer.writable()
+        if not region:
+            return
+        num_bytes = self._transport.readinto(region, timeout)
+        if not num_bytes:
+            raise exceptions.TransportEndpointNotFound('Transport returned no bytes, peer may be disconnected')
+        self._buffer.commit(num_bytes)
+
+
+class AsyncBufferedTransport(transport.Transport):
+    """
+    Wraps an asynchronous :class:`~adbts.transport.Transport` and fills a :class:`~adbts.buffered.RingBuffer`
+    with as many bytes as a single read of the wrapped transport returns. Small reads, e.g. message headers,
+    are then served from memory instead of awaiting the wrapped transport each.
+
+    Reads of at least the buffer size bypass the buffer when it is empty. Writes are passed through.
+
+    .. note:: This transport must only be used from the thread running its event loop.
+    """
+
+    def __init__(self, wrapped: transport.Transport, buffer_size: hints.Int = DEFAULT_BUFFER_SIZE) -> None:
+        self._transport = wrapped
+        self._buffer = RingBuffer(buffer_size)
+
+    def __repr__(self) -> hints.Str:
+        return '<{}({!r}, buffered={})>'.format(self.__class__.__name__, self._transport, len(self._buffer))
+
+    def __str__(self) -> hints.Str:
+        return str(self._transport)
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the wrapped transport is closed.
+
+        :return: Closed state of the transport
+        :rtype: :class:`~bool`
+        """
+        return self._transport.closed
+
+    @property
+    def default_timeout(self) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the wrapped transport wait when they are not given a timeout.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return self._transport.default_timeout
+
+    @property
+    def buffered(self) -> hints.Int:
+        """
+        Number of bytes read from the wrapped transport that have not been consumed yet.
+
+        :return: Number of buffered bytes
+        :rtype: :class:`~int`
+        """
+        return len(self._buffer)
+
+    @transport.ensure_opened
+    async def peek(self, num_bytes: hints.Int, timeout: hints.Timeout = timeouts.UNDEFINED) -> memoryview:
+        """
+        Get up to the given number of bytes without consuming them. The wrapped transport is read at most once,
+        only when fewer bytes are buffered.
+
+        :param num_bytes: Maximum number of bytes
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: View of buffered bytes, valid until the next read
+        :rtype: :class:`~memoryview`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if len(self._buffer) < num_bytes:
+            await self._fill(timeout)
+        return self._buffer.peek(num_bytes)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read(self,
+                   num_bytes: hints.Int,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if not self._buffer:
+            if num_bytes >= self._buffer.capacity:
+                return await self._transport.read(num_bytes, timeout)
+            await self._fill(timeout)
+        data = bytes(self._buffer.peek(num_bytes))
+        self._buffer.consume(len(data))
+        return data
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    async def readinto(self,
+                       buffer: hints.WritableBuffer,
+                       timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if not self._buffer:
+            if len(buffer) >= self._buffer.capacity:
+                return await self._transport.readinto(buffer, timeout)
+            await self._fill(timeout)
+        return self._buffer.readinto(buffer)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read_exactly(self,
+                           num_bytes: hints.Int,
+                           timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if num_bytes > self._buffer.capacity:
+            # Payloads larger than the buffer are read straight from the wrapped transport after the bytes
+            # already buffered.
+            data = bytearray(num_bytes)
+            offset = self._buffer.readinto(data)
+            data[offset:] = await self._transport.read_exactly(num_bytes - offset, timeout)
+            return data
+
+        # Without a timeout the whole call is bounded by the default timeout of the wrapped transport, rather
+        # than each read from it.
+        deadline = timeouts.deadline(timeout, self._transport.default_timeout)
+        while len(self._buffer) < num_bytes:
+            await self._fill(timeouts.call_timeout(deadline, timeout))
+        data = bytes(self._buffer.peek(num_bytes))
+        self._buffer.consume(num_bytes)
+        return data
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    async def write(self,
+                    data: hints.Buffer,
+                    timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write bytes to the transport.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes` or :class:`~bytearray`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        await self._transport.write(data, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    async def writev(self,
+                     buffers: hints.Buffers,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        await self._transport.writev(buffers, timeout)
+
+    @transport.ensure_opened
+    async def write_file(self,
+                         file: hints.FileSource,
+                         offset: hints.Int = 0,
+                         count: hints.OptionalInt = None,
+                         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._transport.write_file(file, offset, count, timeout)
+
+    @transport.ensure_opened
+    def close(self) -> None:
+        """
+        Close the wrapped transport, discarding buffered bytes.
+
+        :return: Nothing
+        :rtype: `None`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        """
+        self._buffer.consume(len(self._buffer))
+        self._transport.close()
+
+    async def _fill(self, timeout: hints.Timeout) -> None:
+        """
+        Read once from the wrapped transport into the free space of the buffer.
+        """
+        region = self._buffer.writable()
+        if not region:
+            return
+        num_bytes = await self._transport.readinto(region, timeout)
+        if not num_bytes:
+            raise exceptions.TransportEndpointNotFound('Transport returned no bytes, peer may be disconnected')
+        self._buffer.commit(num_bytes)
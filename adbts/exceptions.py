@@ -5,6 +5,7 @@
     Contains exception types used across the package.
 """
 import functools
+import inspect
 
 from . import hints
 
@@ -48,10 +49,22 @@ def reraise(exc_to_catch: hints.ExceptionTypes[hints.ExceptionType]) -> hints.De
     Decorator that catches specific exception types and re-raises them as
     :class:`~adbts.exceptions.TransportError`.
 
+    Coroutine functions are wrapped by a coroutine so errors raised while the result is awaited are
+    also re-raised.
+
     :param exc_to_catch: Transport specific timeout exception type(s) to catch
     :type exc_to_catch: :class:`~Exception` or :class:`~tuple`
     """
     def decorator(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def coroutine_wrapper(*args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+                try:
+                    return await func(*args, **kwargs)
+                except exc_to_catch as ex:
+                    raise TransportError('Transport encountered an error') from ex
+            return coroutine_wrapper
+
         @functools.wraps(func)
         def wrapper(*args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
             try:
@@ -66,10 +79,23 @@ def reraise_timeout_errors(exc_to_catch: hints.ExceptionTypes[hints.ExceptionTyp
     """
     Decorator that catches transport specific timeout related exceptions to re-raise another.
 
+    Coroutine functions are wrapped by a coroutine so errors raised while the result is awaited are
+    also re-raised.
+
     :param exc_to_catch: Transport specific timeout exception type(s) to catch
     :type exc_to_catch: :class:`~Exception` or :class:`~tuple`
     """
     def decorator(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def coroutine_wrapper(*args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+                try:
+                    return await func(*args, **kwargs)
+                except exc_to_catch as ex:
+                    raise TransportTimeoutError(
+                        'Exceeded timeout of {} ms'.format(kwargs.get('timeout', 'inf'))) from ex
+            return coroutine_wrapper
+
         @functools.wraps(func)
         def wrapper(*args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
             try:
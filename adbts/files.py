@@ -0,0 +1,97 @@
+"""
+    adbts.files
+    ~~~~~~~~~~~
+
+    Contains functionality for writing regions of files to transports without copying them into Python bytes.
+"""
+import contextlib
+import mmap
+import os
+
+from . import hints
+
+__all__ = ['open_file', 'file_range', 'mapped']
+
+
+#: Default number of bytes of a mapped file written by a single transport call.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+@contextlib.contextmanager
+def open_file(source: hints.FileSource) -> hints.Iterator[hints.Int]:
+    """
+    Context manager that yields a file descriptor for reading the given file.
+
+    Files given by path are opened for the scope of the context manager. File descriptors are yielded as is and
+    left open.
+
+    :param source: Path of the file or open file descriptor
+    :type source: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+    :return: Readable file descriptor
+    :rtype: :class:`~int`
+    :raises :class:`~OSError`: When the file cannot be opened
+    """
+    if isinstance(source, int):
+        yield source
+        return
+    fd = os.open(source, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def file_range(fd: hints.Int, offset: hints.Int, count: hints.OptionalInt) -> hints.Int:
+    """
+    Determine the number of bytes to write from the given file region, clamped to the end of the file.
+
+    :param fd: Readable file descriptor
+    :type fd: :class:`~int`
+    :param offset: Offset of the first byte of the region
+    :type offset: :class:`~int`
+    :param count: Number of bytes in the region, None for all bytes up to the end of the file
+    :type count: :class:`~int` or :class:`~NoneType`
+    :return: Number of bytes in the region
+    :rtype: :class:`~int`
+    :raises :class:`~ValueError`: When the offset or count is negative
+    """
+    if offset < 0:
+        raise ValueError('File offset must not be negative')
+    if count is not None and count < 0:
+        raise ValueError('Number of bytes must not be negative')
+    available = max(0, os.fstat(fd).st_size - offset)
+    return available if count is None else min(count, available)
+
+
+@contextlib.contextmanager
+def mapped(fd: hints.Int, offset: hints.Int, count: hints.Int) -> hints.Iterator[memoryview]:
+    """
+    Context manager that yields a view of the given file region, mapped into memory.
+
+    The mapping is copy-on-write, so the view is writable without modifying the file. Writable views are
+    handed to libusb as is, whereas read-only ones are copied first.
+
+    :param fd: Readable file descriptor
+    :type fd: :class:`~int`
+    :param offset: Offset of the first byte of the region
+    :type offset: :class:`~int`
+    :param count: Number of bytes in the region, see :func:`~adbts.files.file_range`
+    :type count: :class:`~int`
+    :return: View of the file region
+    :rtype: :class:`~memoryview`
+    :raises :class:`~OSError`: When the file cannot be mapped
+    """
+    if not count:
+        yield memoryview(bytearray())
+        return
+
+    # Mappings must start at a multiple of the allocation granularity.
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    region = mmap.mmap(fd, count + offset - start, access=mmap.ACCESS_COPY, offset=start)
+    try:
+        with memoryview(region) as view:
+            yield view[offset - start:]
+    finally:
+        # Views still held elsewhere, e.g. by a transfer, keep the mapping alive until they are collected.
+        with contextlib.suppress(BufferError):
+            region.close()
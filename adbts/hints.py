@@ -23,6 +23,14 @@ Bool = bool
 Buffer = typing.Union[bytes, bytearray]
 
 
+#: Type hint that defines a sequence of buffers written to a transport as one unit.
+Buffers = typing.Sequence[typing.Union[bytes, bytearray, memoryview]]
+
+
+#: Type hint that defines types that can be written into by a transport read.
+WritableBuffer = typing.Union[bytearray, memoryview]
+
+
 #: Type hint that represents a co-routine that yields :class:`~bytes` or :class:`~bytearray`.
 BufferGenerator = typing.Generator[Buffer, None, None]
 
@@ -31,6 +39,14 @@ BufferGenerator = typing.Generator[Buffer, None, None]
 Bytes = bytes
 
 
+#: Type hint that defines a file given by path or by an open file descriptor.
+FileSource = typing.Union[str, bytes, int]
+
+
+#: Type hint that defines the path of a unix domain socket, prefixed with '@' for the Linux abstract namespace.
+SocketPath = typing.Union[str, bytes]
+
+
 #: Type hints for '*args' and '**kwargs'
 Args = typing.Any
 Kwargs = typing.Any
@@ -65,6 +81,10 @@ OptionalEventLoop = typing.Optional[asyncio.AbstractEventLoop]
 Float = float
 
 
+#: Type that is an alias for :class:`~asyncio.Future`.
+Future = asyncio.Future
+
+
 #: Type hint that is an alias for the built-in :class:`~int` type.
 Int = int
 
@@ -73,6 +93,10 @@ Int = int
 Iterator = typing.Iterator
 
 
+#: Type hint that represents a co-routine that yields :class:`~int`.
+IntGenerator = typing.Generator[typing.Any, None, int]
+
+
 #: Type hint that represents a co-routine that yields :class:`~NoneType`.
 NoneGenerator = typing.Generator[None, None, None]
 
@@ -0,0 +1,103 @@
+"""
+    adbts.loops
+    ~~~~~~~~~~~
+
+    Contains functionality for running asynchronous transports on any `asyncio` compatible event loop,
+    e.g. the default one or `uvloop <https://github.com/MagicStack/uvloop>`_ when it is installed.
+
+    Asynchronous transports use the event loop running the calling co-routine, so they do not need to be given
+    one. Passing an explicit loop to them is deprecated, like it is for `asyncio` itself.
+"""
+import asyncio
+import warnings
+
+from . import hints
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+__all__ = ['HAS_UVLOOP', 'LOOP_ASYNCIO', 'LOOP_UVLOOP', 'current_loop', 'install', 'new_event_loop', 'running_loop']
+
+
+#: Flag indicating if `uvloop` is installed.
+HAS_UVLOOP = uvloop is not None
+
+
+#: Name of the default `asyncio` event loop implementation.
+LOOP_ASYNCIO = 'asyncio'
+
+
+#: Name of the `uvloop` event loop implementation.
+LOOP_UVLOOP = 'uvloop'
+
+
+#: Function that returns the loop running the current co-routine, `asyncio.get_event_loop` before Python 3.7.
+get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+def new_event_loop(implementation: hints.Str = LOOP_ASYNCIO) -> hints.EventLoop:
+    """
+    Create a new event loop of the given implementation.
+
+    :param implementation: Name of the event loop implementation, see :data:`~adbts.loops.LOOP_UVLOOP`
+    :type implementation: :class:`~str`
+    :return: New event loop
+    :rtype: :class:`~asyncio.events.AbstractEventLoop`
+    :raises :class:`~ValueError`: When the implementation is unknown
+    :raises :class:`~RuntimeError`: When `uvloop` is requested but not installed
+    """
+    if implementation == LOOP_ASYNCIO:
+        return asyncio.new_event_loop()
+    if implementation != LOOP_UVLOOP:
+        raise ValueError('Unknown event loop implementation {!r}'.format(implementation))
+    if not HAS_UVLOOP:
+        raise RuntimeError('Event loop implementation {!r} is not installed'.format(implementation))
+    return uvloop.new_event_loop()
+
+
+def install() -> hints.Bool:
+    """
+    Make `uvloop` the event loop implementation of new event loops, when it is installed.
+
+    :return: Flag indicating if `uvloop` was installed
+    :rtype: :class:`~bool`
+    """
+    if not HAS_UVLOOP:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def running_loop(loop: hints.OptionalEventLoop = None) -> hints.EventLoop:
+    """
+    Get the event loop running the current co-routine, warning about a deprecated explicit loop.
+
+    :param loop: Deprecated explicit event loop, ignored in favour of the running loop
+    :type loop: :class:`~asyncio.events.AbstractEventLoop` or :class:`~NoneType`
+    :return: Running event loop
+    :rtype: :class:`~asyncio.events.AbstractEventLoop`
+    """
+    if loop is not None:
+        warnings.warn('The loop argument is deprecated, the running event loop is used instead',
+                      DeprecationWarning, stacklevel=3)
+    return get_running_loop()
+
+
+def current_loop() -> hints.OptionalEventLoop:
+    """
+    Get the event loop running in the current thread without raising when there is none, e.g. to check if a
+    callback of another thread can be called right away.
+
+    :return: Running event loop or None when called outside of one
+    :rtype: :class:`~asyncio.events.AbstractEventLoop` or :class:`~NoneType`
+    """
+    if hasattr(asyncio, 'get_running_loop'):
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+    # Before Python 3.7, the running loop is only exposed privately, and not at all before Python 3.5.3.
+    get_running = getattr(asyncio, '_get_running_loop', None)
+    return get_running() if get_running is not None else None
@@ -4,6 +4,7 @@
 
     Package that contains Transmission Control Protocol (TCP) transports.
 """
-from . import asynchronous, synchronous
+from . import asynchronous, deadlines, options, pool, protocol, resolver, selector, synchronous, zerocopy
 
-__all__ = ['asynchronous', 'synchronous']
+__all__ = ['asynchronous', 'deadlines', 'options', 'pool', 'protocol', 'resolver', 'selector', 'synchronous',
+           'zerocopy']
@@ -5,19 +5,94 @@
     Contains functionality for asynchronous Transmission Control Protocol (TCP) transport using `asyncio`.
 """
 import asyncio
+import io
+import socket
+import typing
 
-from .. import exceptions, hints, transport
-from . import timeouts
+from .. import exceptions, files, hints, loops, transport
+from . import deadlines, options, protocol, resolver, timeouts
 
-__all__ = ['Transport']
+__all__ = ['Transport', 'ENGINE_STREAMS', 'ENGINE_PROTOCOL']
 
 
-# Disable incorrect warning on asyncio.wait_for, https://github.com/PyCQA/pylint/issues/996.
-# pylint: disable=not-an-iterable
+#: Engine of transports built on :class:`~asyncio.StreamReader` and :class:`~asyncio.StreamWriter`.
+ENGINE_STREAMS = 'streams'
+
+
+#: Engine of transports built on a buffered protocol, see :mod:`~adbts.tcp.protocol`. Python versions without
+#: buffered protocols fall back to :data:`~adbts.tcp.asynchronous.ENGINE_STREAMS`.
+ENGINE_PROTOCOL = 'protocol'
+
+
+async def _attempt(address: resolver.AddressInfo, loop: hints.EventLoop) -> hints.Socket:
+    """
+    Connect a new non-blocking socket to the given address, closing it when connecting fails or is cancelled.
+    """
+    family, kind, proto, _, sockaddr = address
+    sock = socket.socket(family, kind, proto)
+    try:
+        sock.setblocking(False)
+        await loop.sock_connect(sock, sockaddr)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+async def connect(addresses: typing.Sequence[resolver.AddressInfo],
+                  delay: hints.Int = timeouts.DEFAULT_CONNECT_DELAY,
+                  loop: hints.OptionalEventLoop = None) -> hints.Socket:
+    """
+    Connect to the first of the given addresses that accepts a connection.
+
+    Attempts are started in order, each one after the previous one failed or did not complete within the given
+    delay, while earlier attempts keep going, as described in RFC 8305 (Happy Eyeballs). Attempts still running
+    once one succeeded, or once this co-routine is cancelled, are cancelled.
+
+    :param addresses: Addresses to connect to in order, see :meth:`~adbts.tcp.resolver.Resolver.resolve_async`
+    :type addresses: :class:`~list` of :class:`~tuple`
+    :param delay: Number of milliseconds to wait for an attempt before starting the next one
+    :type delay: :class:`~int`
+    :param loop: Deprecated, the running event loop is used
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :return: Connected non-blocking socket
+    :rtype: :class:`~socket.socket`
+    :raises :class:`~OSError`: When all attempts failed, the error of the last one
+    """
+    loop = loops.running_loop(loop)
+    pending = list(addresses)
+    attempts = set()  # type: typing.Set[asyncio.Future]
+    error = OSError('No addresses to connect to')
+    winner = None  # type: typing.Optional[hints.Socket]
+    try:
+        while winner is None and (pending or attempts):
+            if pending:
+                attempts.add(asyncio.ensure_future(_attempt(pending.pop(0), loop)))
+            done, attempts = await asyncio.wait(attempts, timeout=delay / 1000 if pending else None,
+                                                return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is not None:
+                    error = attempt.exception()
+                elif winner is None:
+                    winner = attempt.result()
+                else:
+                    attempt.result().close()
+        if winner is None:
+            raise error
+        return winner
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+
 
 class Transport(transport.Transport):
     """
     Defines asynchronous (non-blocking) TCP transport using `asyncio`.
+
+    By default every write waits for the stream writer to drain. Given a write high-water mark, writes are
+    batched instead: bytes written within one event loop iteration are handed to the loop transport together,
+    and writes only wait for it to drain once the written bytes not yet sent exceed the high-water mark. Errors
+    of batched writes are then raised by a later write or :meth:`~adbts.tcp.asynchronous.Transport.flush`.
     """
 
     def __init__(self,
@@ -25,13 +100,21 @@ class Transport(transport.Transport):
                  port: hints.Int,
                  reader: hints.StreamReader,
                  writer: hints.StreamWriter,
-                 loop: hints.OptionalEventLoop = None) -> None:
+                 loop: hints.OptionalEventLoop = None,
+                 write_high_water: hints.OptionalInt = None,
+                 write_low_water: hints.OptionalInt = None) -> None:
         self._host = host
         self._port = port
         self._reader = reader
         self._writer = writer
         self._loop = loop
         self._closed = False
+        self._write_high_water = write_high_water
+        self._pending = []  # type: typing.List[hints.Bytes]
+        self._pending_size = 0
+        self._hand_off_handle = None  # type: typing.Optional[asyncio.Handle]
+        if write_high_water is not None:
+            writer.transport.set_write_buffer_limits(high=write_high_water, low=write_low_water)
 
     def __repr__(self) -> hints.Str:
         address = str(self)
@@ -51,14 +134,24 @@ class Transport(transport.Transport):
         """
         return self._closed is True
 
-    @asyncio.coroutine
+    @property
+    def default_timeout(self) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the transport wait when they are not given a timeout, which is
+        the default timeout of new sockets.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return timeouts.default()
+
     @transport.ensure_opened
     @transport.ensure_num_bytes
     @exceptions.reraise(OSError)
     @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
-    def read(self,
-             num_bytes: hints.Int,
-             timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+    async def read(self,
+                   num_bytes: hints.Int,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
         """
         Read bytes from the transport.
 
@@ -71,19 +164,74 @@ class Transport(transport.Transport):
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
-        data = yield from asyncio.wait_for(self._reader.read(num_bytes),
-                                           timeout=timeouts.timeout(timeout),
-                                           loop=self._loop)
+        with self._deadline(timeout):
+            data = await self._reader.read(num_bytes)
+        return data
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    async def readinto(self,
+                       buffer: hints.WritableBuffer,
+                       timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        Bytes are copied out of the stream reader buffer once, directly into the given buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        with self._deadline(timeout):
+            data = await self._reader.read(len(buffer))
+        num_bytes = len(data)
+        memoryview(buffer)[:num_bytes] = data
+        return num_bytes
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    async def read_exactly(self,
+                           num_bytes: hints.Int,
+                           timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport.
+
+        The stream reader assembles the bytes in one buffer with `readexactly`, bounded by a single timeout.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytes`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When the peer closed before all bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        try:
+            with self._deadline(timeout):
+                data = await self._reader.readexactly(num_bytes)
+        except asyncio.IncompleteReadError as ex:
+            raise exceptions.TransportEndpointNotFound(
+                'Connection closed after {} of {} bytes'.format(len(ex.partial), num_bytes)) from ex
         return data
 
-    @asyncio.coroutine
     @transport.ensure_opened
     @transport.ensure_data
     @exceptions.reraise(OSError)
     @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
-    def write(self,
-              data: hints.Buffer,
-              timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+    async def write(self,
+                    data: hints.Buffer,
+                    timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
         """
         Write bytes to the transport.
 
@@ -96,8 +244,113 @@ class Transport(transport.Transport):
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error.
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
+        if self._write_high_water is not None:
+            await self._batch((bytes(data),), timeout)
+            return
         self._writer.write(data)
-        yield from asyncio.wait_for(self._writer.drain(), timeout=timeouts.timeout(timeout), loop=self._loop)
+        with self._deadline(timeout):
+            await self._writer.drain()
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    async def writev(self,
+                     buffers: hints.Buffers,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if self._write_high_water is not None:
+            await self._batch([bytes(buffer) for buffer in buffers], timeout)
+            return
+        self._writer.writelines(buffers)
+        with self._deadline(timeout):
+            await self._writer.drain()
+
+    @transport.ensure_opened
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    async def flush(self, timeout: hints.Timeout = timeouts.UNDEFINED) -> None:
+        """
+        Hand all batched writes to the event loop transport and wait for it to drain below the low-water mark.
+
+        :param timeout: Maximum number of milliseconds to flush before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        self._hand_off()
+        with self._deadline(timeout):
+            await self._writer.drain()
+
+    @transport.ensure_opened
+    async def write_file(self,
+                         file: hints.FileSource,
+                         offset: hints.Int = 0,
+                         count: hints.OptionalInt = None,
+                         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        The event loop copies the file to the socket with :meth:`~asyncio.AbstractEventLoop.sendfile`, which
+        uses :func:`~os.sendfile` where available. On Python versions without it, the file is mapped into
+        memory and written from there.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened or read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        with files.open_file(file) as fd:
+            count = files.file_range(fd, offset, count)
+            if count:
+                self._hand_off()
+                await self._sendfile(fd, offset, count, timeout)
+        return count
+
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    async def _sendfile(self, fd: hints.Int, offset: hints.Int, count: hints.Int,
+                        timeout: hints.Timeout) -> transport.TransportWriteResult:
+        """
+        Send a file region on the event loop, mapping it into memory when the loop cannot send files.
+        """
+        loop = self._loop or loops.get_running_loop()
+        if hasattr(loop, 'sendfile'):
+            try:
+                # The builtin open, as this module defines its own open() co-routine.
+                with io.open(fd, 'rb', closefd=False) as fileobj, self._deadline(timeout):
+                    await loop.sendfile(self._writer.transport, fileobj, offset, count)
+                return
+            except NotImplementedError:
+                # Alternative loops, e.g. uvloop, may not implement sending files.
+                pass
+        # Write in slices so the loop transport buffers at most one slice it could not send at once.
+        with files.mapped(fd, offset, count) as view, self._deadline(timeout):
+            for start in range(0, count, files.DEFAULT_CHUNK_SIZE):
+                self._writer.write(view[start:start + files.DEFAULT_CHUNK_SIZE])
+                await self._writer.drain()
 
     @transport.ensure_opened
     @exceptions.reraise(OSError)
@@ -109,31 +362,113 @@ class Transport(transport.Transport):
         :rtype: `None`
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         """
+        self._hand_off()
         self._writer.close()
         self._closed = True
 
+    async def _batch(self, buffers: typing.Sequence[hints.Bytes], timeout: hints.Timeout) -> None:
+        """
+        Batch the given buffers, waiting for the loop transport to drain once the high-water mark is exceeded.
+        """
+        self._pending.extend(buffers)
+        self._pending_size += sum(len(buffer) for buffer in buffers)
+        if self._pending_size + self._writer.transport.get_write_buffer_size() > self._write_high_water:
+            self._hand_off()
+            with self._deadline(timeout):
+                await self._writer.drain()
+        elif self._hand_off_handle is None:
+            self._hand_off_handle = (self._loop or loops.get_running_loop()).call_soon(self._hand_off)
+
+    def _hand_off(self) -> None:
+        """
+        Hand the batched buffers to the loop transport, which sends them with as few system calls as it can.
+        """
+        if self._hand_off_handle is not None:
+            self._hand_off_handle.cancel()
+            self._hand_off_handle = None
+        if self._pending:
+            self._writer.writelines(self._pending)
+            self._pending = []
+            self._pending_size = 0
+
+    def _deadline(self, timeout: hints.Timeout) -> deadlines.Deadline:
+        """
+        Create the deadline of an operation with the given timeout in milliseconds.
+        """
+        return deadlines.after(timeout, self._loop)
+
 
-@asyncio.coroutine
 @exceptions.reraise(OSError)
-def open(host: hints.Str,  # pylint: disable=redefined-builtin
-         port: hints.Int,
-         timeout: hints.Timeout = timeouts.UNDEFINED,
-         loop: hints.OptionalEventLoop = None) -> transport.TransportOpenResult:
+@exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+async def open(host: hints.Str,  # pylint: disable=redefined-builtin
+               port: hints.Int,
+               timeout: hints.Timeout = timeouts.UNDEFINED,
+               loop: hints.OptionalEventLoop = None,
+               socket_options: options.SocketOptions = options.DEFAULT_OPTIONS,
+               address_resolver: resolver.Resolver = resolver.DEFAULT_RESOLVER,
+               connect_delay: hints.Int = timeouts.DEFAULT_CONNECT_DELAY,
+               engine: hints.Str = ENGINE_STREAMS,
+               write_high_water: hints.OptionalInt = None,
+               write_low_water: hints.OptionalInt = None) -> transport.TransportOpenResult:
     """
     Open a new :class:`~adbts.tcp.async.Transport` transport to the given host/port.
 
+    The host is resolved through the given resolver, which caches its addresses, and connected to with staggered
+    parallel attempts, see :func:`~adbts.tcp.asynchronous.connect`.
+
     :param host: Remote host
     :type host: :class:`~str`
     :param port: Remote port
     :type port: :class:`~int`
     :param timeout: Maximum number of milliseconds to write before raising an exception.
     :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
-    :param loop: Asyncio Event Loop
+    :param loop: Deprecated, the running event loop is used
     :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :param socket_options: Options set on the socket once connected
+    :type socket_options: :class:`~adbts.tcp.options.SocketOptions`
+    :param address_resolver: Resolver of the host addresses
+    :type address_resolver: :class:`~adbts.tcp.resolver.Resolver`
+    :param connect_delay: Number of milliseconds to wait for a connection attempt before trying the next address
+    :type connect_delay: :class:`~int`
+    :param engine: Engine the transport is built on, see :data:`~adbts.tcp.asynchronous.ENGINE_PROTOCOL`
+    :type engine: :class:`~str`
+    :param write_high_water: Unsent bytes above which writes of the streams engine drain, or None to always drain
+    :type write_high_water: :class:`~int` or :class:`~NoneType`
+    :param write_low_water: Number of unsent bytes below which draining writes resume, defaults to a quarter
+    :type write_low_water: :class:`~int` or :class:`~NoneType`
     :return: Asynchronous TCP transport
-    :rtype: :class:`~adbts.tcp.async.Transport`
+    :rtype: :class:`~adbts.tcp.async.Transport` or :class:`~adbts.tcp.protocol.Transport`
+    :raises :class:`~ValueError`: When the engine is unknown
     :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+    :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+    """
+    if engine not in (ENGINE_STREAMS, ENGINE_PROTOCOL):
+        raise ValueError('Unknown transport engine {!r}'.format(engine))
+
+    loop = loops.running_loop(loop)
+    with deadlines.after(timeout, loop):
+        sock = await _connect(host, port, address_resolver, connect_delay)
+    try:
+        options.apply(sock, socket_options)
+    except OSError:
+        sock.close()
+        raise
+
+    if engine == ENGINE_PROTOCOL and protocol.HAS_BUFFERED_PROTOCOL:
+        return await protocol.open_connection(host, port, sock)
+    reader, writer = await asyncio.open_connection(sock=sock)
+    return Transport(host, port, reader, writer, loop, write_high_water, write_low_water)
+
+
+async def _connect(host: hints.Str, port: hints.Int, address_resolver: resolver.Resolver,
+                   connect_delay: hints.Int) -> hints.Socket:
+    """
+    Resolve and connect to the given host/port.
     """
-    reader, writer = yield from asyncio.wait_for(asyncio.open_connection(host, port, loop=loop),
-                                                 timeout=timeouts.timeout(timeout), loop=loop)
-    return Transport(host, port, reader, writer, loop)
+    addresses = await address_resolver.resolve_async(host, port)
+    try:
+        return await connect(addresses, connect_delay)
+    except OSError:
+        # The cached addresses may be stale, e.g. after the device changed networks.
+        address_resolver.invalidate(host, port)
+        raise
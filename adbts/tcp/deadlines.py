@@ -0,0 +1,114 @@
+"""
+    adbts.tcp.deadlines
+    ~~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for enforcing timeouts of asynchronous TCP transport operations with event loop timers.
+
+    Unlike :func:`~asyncio.wait_for`, which runs the awaited operation in a new task, a deadline runs it in the
+    current task and cancels that task with a single timer handle once the deadline passed. Deadlines nest, so
+    one deadline can bound several operations that each have their own timeout. An enclosing deadline raises
+    :class:`~asyncio.TimeoutError` itself when it passes, while the timeout of an operation raises
+    :class:`~adbts.exceptions.TransportTimeoutError`:
+
+        with deadlines.after(5000):
+            header = await transport.read_exactly(24, timeout=None)
+            payload = await transport.read_exactly(length, timeout=None)
+"""
+import asyncio
+import typing
+
+from .. import hints, loops
+from . import timeouts
+
+__all__ = ['Deadline', 'after']
+
+
+#: Function that returns the task running on the given loop, `asyncio.Task.current_task` before Python 3.7.
+current_task = getattr(asyncio, 'current_task', None) or asyncio.Task.current_task
+
+
+class Deadline:
+    """
+    Context manager that cancels the current task at a loop time deadline and raises
+    :class:`~asyncio.TimeoutError` in place of the resulting :class:`~asyncio.CancelledError`.
+
+    A deadline can only be entered once.
+    """
+
+    def __init__(self, when: hints.OptionalFloat, loop: hints.OptionalEventLoop = None) -> None:
+        self._when = when
+        self._loop = loop
+        self._task = None  # type: typing.Optional[asyncio.Task]
+        self._handle = None  # type: typing.Optional[asyncio.TimerHandle]
+        self._expired = False
+
+    @property
+    def when(self) -> hints.OptionalFloat:
+        """
+        Loop time at which the deadline passes.
+
+        :return: Loop time in seconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return self._when
+
+    @property
+    def expired(self) -> hints.Bool:
+        """
+        Checks to see if the deadline passed while it was entered.
+
+        :return: Expired state of the deadline
+        :rtype: :class:`~bool`
+        """
+        return self._expired
+
+    def __enter__(self) -> 'Deadline':
+        if self._when is None:
+            return self
+        if self._task is not None:
+            raise RuntimeError('Deadline cannot be entered more than once')
+        loop = self._loop or loops.get_running_loop()
+        self._task = current_task(loop)
+        if self._task is None:
+            raise RuntimeError('Deadline must be entered within a task')
+        self._handle = loop.call_at(self._when, self._expire)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> hints.Bool:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._expired and exc_type is asyncio.CancelledError:
+            # Undo the cancellation requested by this deadline, Python 3.11+ counts them per task.
+            uncancel = getattr(self._task, 'uncancel', None)
+            if uncancel is not None:
+                uncancel()
+            raise asyncio.TimeoutError('Deadline exceeded') from exc_value
+        return False
+
+    def _expire(self) -> None:
+        """
+        Cancel the task that entered this deadline.
+        """
+        self._handle = None
+        if not self._task.done():
+            self._expired = True
+            self._task.cancel()
+
+
+def after(timeout: hints.Timeout, loop: hints.OptionalEventLoop = None) -> Deadline:
+    """
+    Create a :class:`~adbts.tcp.deadlines.Deadline` that passes once the given timeout elapsed.
+
+    :param timeout: Number of milliseconds until the deadline passes
+    :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+    :param loop: Asyncio Event Loop
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :return: Deadline to enter within a task
+    :rtype: :class:`~adbts.tcp.deadlines.Deadline`
+    """
+    seconds = timeouts.remaining(timeouts.deadline(timeout))
+    if seconds is None:
+        return Deadline(None, loop)
+    loop = loop or loops.get_running_loop()
+    return Deadline(loop.time() + seconds, loop)
@@ -0,0 +1,82 @@
+"""
+    adbts.tcp.options
+    ~~~~~~~~~~~~~~~~~
+
+    Contains socket options applied to TCP transports when they connect.
+"""
+import socket
+import sys
+import typing
+
+from .. import hints
+
+__all__ = ['SocketOptions', 'SYSTEM_DEFAULTS', 'LOW_LATENCY', 'DEFAULT_OPTIONS', 'apply']
+
+
+#: Socket option that sets the number of microseconds to busy poll the device queue on blocking reads.
+#: Not exposed by the :mod:`~socket` module, value taken from the Linux headers.
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46 if sys.platform.startswith('linux') else None)
+
+
+#: Socket option that disables delayed ACKs, only available on Linux.
+TCP_QUICKACK = getattr(socket, 'TCP_QUICKACK', None)
+
+
+#: Options set on a TCP socket at connect time. Fields that are `None` leave the operating system default.
+#:
+#: * nodelay: Disable Nagle's algorithm so small messages are sent immediately (`TCP_NODELAY`)
+#: * quickack: Acknowledge received segments immediately instead of delaying ACKs (`TCP_QUICKACK`, Linux)
+#: * recv_buffer_size: Size of the kernel receive buffer in bytes (`SO_RCVBUF`)
+#: * send_buffer_size: Size of the kernel send buffer in bytes (`SO_SNDBUF`)
+#: * busy_poll: Microseconds to busy poll the device for packets on blocking reads (`SO_BUSY_POLL`, Linux)
+SocketOptions = typing.NamedTuple('SocketOptions', [
+    ('nodelay', typing.Optional[hints.Bool]),
+    ('quickack', typing.Optional[hints.Bool]),
+    ('recv_buffer_size', hints.OptionalInt),
+    ('send_buffer_size', hints.OptionalInt),
+    ('busy_poll', hints.OptionalInt)
+])
+SocketOptions.__new__.__defaults__ = (None,) * len(SocketOptions._fields)
+
+
+#: Options that leave every socket option at the operating system default.
+SYSTEM_DEFAULTS = SocketOptions(nodelay=None, quickack=None, recv_buffer_size=None, send_buffer_size=None,
+                                busy_poll=None)
+
+
+#: Options for small request/response messages, e.g. ADB headers, on local or emulator links. Kernel buffer
+#: sizes are left to autotuning and busy polling is left off since it trades CPU time for latency.
+LOW_LATENCY = SocketOptions(nodelay=True, quickack=True, recv_buffer_size=None, send_buffer_size=None, busy_poll=None)
+
+
+#: Options applied by TCP transports when none are given.
+DEFAULT_OPTIONS = LOW_LATENCY
+
+
+def apply(sock: hints.Socket, options: SocketOptions) -> None:
+    """
+    Set the given options on a socket.
+
+    Options not supported by the platform, e.g. `TCP_QUICKACK` outside of Linux, are skipped.
+
+    .. note:: Linux clears `TCP_QUICKACK` again on its own, so it only covers the first exchanges
+              after connecting.
+
+    :param sock: Socket to set options on
+    :type sock: :class:`~socket.socket`
+    :param options: Options to set
+    :type options: :class:`~adbts.tcp.options.SocketOptions`
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    :raises :class:`~OSError`: When the operating system rejects an option value
+    """
+    if options.nodelay is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(options.nodelay))
+    if options.quickack is not None and TCP_QUICKACK is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, TCP_QUICKACK, int(options.quickack))
+    if options.recv_buffer_size is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, options.recv_buffer_size)
+    if options.send_buffer_size is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, options.send_buffer_size)
+    if options.busy_poll is not None and SO_BUSY_POLL is not None:
+        sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, options.busy_poll)
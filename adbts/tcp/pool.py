@@ -0,0 +1,467 @@
+"""
+    adbts.tcp.pool
+    ~~~~~~~~~~~~~~
+
+    Contains a pool of synchronous TCP transports that are reused across callers connecting to the same
+    host and port.
+"""
+import collections
+import contextlib
+import functools
+import threading
+import time
+import typing
+
+from .. import exceptions, hints, transport
+from . import options, synchronous, timeouts
+
+__all__ = ['ConnectionPool', 'PooledTransport']
+
+
+#: Default maximum number of idle transports kept per host and port.
+DEFAULT_MAX_IDLE = 4
+
+
+#: Default maximum number of transports, idle or checked out, open per host and port.
+DEFAULT_MAX_PER_KEY = 16
+
+
+#: Default number of milliseconds an idle transport is kept before it is closed.
+DEFAULT_IDLE_TIMEOUT = 60000
+
+
+#: Type hint for the key transports are pooled by.
+PoolKey = typing.Tuple[hints.Str, hints.Int]
+
+
+#: Idle transport along with the :func:`~time.monotonic` time it was returned to the pool.
+IdleEntry = typing.NamedTuple('IdleEntry', [
+    ('transport', synchronous.Transport),
+    ('released_at', float)
+])
+
+
+def evict_on_error(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
+    """
+    Decorator that marks a pooled transport as broken when an operation raises, since the connection may be
+    left part way through an exchange. Broken transports are closed instead of returned to the pool.
+    """
+    @functools.wraps(func)
+    def decorator(self: 'PooledTransport', *args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+        try:
+            return func(self, *args, **kwargs)
+        except Exception:
+            self._broken = True  # pylint: disable=protected-access
+            raise
+    return decorator
+
+
+class PooledTransport(transport.Transport):
+    """
+    Synchronous TCP transport checked out of a :class:`~adbts.tcp.pool.ConnectionPool`.
+
+    Closing it returns the underlying connection to the pool instead of tearing it down. A connection that
+    raised during an operation is closed instead, as is one with unread bytes left when returned.
+
+    .. note:: This transport is not thread-safe.
+    """
+
+    def __init__(self, pool: 'ConnectionPool', key: PoolKey, wrapped: synchronous.Transport) -> None:
+        self._pool = pool
+        self._key = key
+        self._transport = wrapped
+        self._broken = False
+        self._closed = False
+
+    def __repr__(self) -> hints.Str:
+        state = 'closed' if self.closed else 'open'
+        return '<{}(address={!r}, state={!r})>'.format(self.__class__.__name__, str(self), state)
+
+    def __str__(self) -> hints.Str:
+        return str(self._transport)
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the transport is closed, i.e. returned to the pool.
+
+        :return: Closed state of the transport
+        :rtype: :class:`~bool`
+        """
+        return self._closed is True
+
+    @property
+    def default_timeout(self) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the wrapped transport wait when they are not given a timeout.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return self._transport.default_timeout
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @evict_on_error
+    def read(self, num_bytes: hints.Int,
+             timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.read(num_bytes, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    @evict_on_error
+    def readinto(self, buffer: hints.WritableBuffer,
+                 timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.readinto(buffer, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @evict_on_error
+    def read_exactly(self, num_bytes: hints.Int,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.read_exactly(num_bytes, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    @evict_on_error
+    def write(self, data: hints.Buffer,
+              timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write bytes to the transport.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes` or :class:`~bytearray`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.write(data, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    @evict_on_error
+    def writev(self, buffers: hints.Buffers,
+               timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.writev(buffers, timeout)
+
+    @transport.ensure_opened
+    @evict_on_error
+    def write_file(self, file: hints.FileSource,
+                   offset: hints.Int = 0,
+                   count: hints.OptionalInt = None,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return self._transport.write_file(file, offset, count, timeout)
+
+    @transport.ensure_opened
+    def close(self) -> None:
+        """
+        Return the connection to the pool.
+
+        :return: Nothing
+        :rtype: `None`
+        """
+        self._closed = True
+        self._pool.release(self._key, self._transport, discard=self._broken)
+
+    @transport.ensure_opened
+    def discard(self) -> None:
+        """
+        Close the connection instead of returning it to the pool, e.g. when the peer was left in an unknown
+        state.
+
+        :return: Nothing
+        :rtype: `None`
+        """
+        self._closed = True
+        self._pool.release(self._key, self._transport, discard=True)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of synchronous TCP transports keyed by host and port.
+
+    Idle transports are checked out most recently used first and checked for liveness on the way out, so
+    connections closed by the peer or holding stray bytes are closed rather than handed out. When the
+    number of open transports for a host and port reaches `max_per_key`, callers wait for one to be returned.
+    """
+
+    def __init__(self,
+                 max_idle: hints.Int = DEFAULT_MAX_IDLE,
+                 max_per_key: hints.Int = DEFAULT_MAX_PER_KEY,
+                 idle_timeout: hints.Timeout = DEFAULT_IDLE_TIMEOUT,
+                 socket_options: options.SocketOptions = options.DEFAULT_OPTIONS) -> None:
+        if max_per_key <= 0:
+            raise ValueError('Maximum transports per key must be greater than zero')
+        self._max_idle = max_idle
+        self._max_per_key = max_per_key
+        self._idle_timeout = None if idle_timeout is None else idle_timeout / 1000
+        self._socket_options = socket_options
+        self._condition = threading.Condition()
+        self._idle = {}  # type: typing.Dict[PoolKey, typing.Deque[IdleEntry]]
+        self._open = collections.Counter()  # type: typing.Counter[PoolKey]
+        self._closed = False
+
+    def __enter__(self) -> 'ConnectionPool':
+        return self
+
+    def __exit__(self, *args: hints.Args) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the pool is closed.
+
+        :return: Closed state of the pool
+        :rtype: :class:`~bool`
+        """
+        return self._closed is True
+
+    def num_idle(self, host: hints.Str, port: hints.Int) -> hints.Int:
+        """
+        Number of idle transports kept for the given host and port.
+
+        :param host: Remote host
+        :type host: :class:`~str`
+        :param port: Remote port
+        :type port: :class:`~int`
+        :return: Number of idle transports
+        :rtype: :class:`~int`
+        """
+        with self._condition:
+            return len(self._idle.get((host, port), ()))
+
+    def num_open(self, host: hints.Str, port: hints.Int) -> hints.Int:
+        """
+        Number of transports, idle or checked out, open for the given host and port.
+
+        :param host: Remote host
+        :type host: :class:`~str`
+        :param port: Remote port
+        :type port: :class:`~int`
+        :return: Number of open transports
+        :rtype: :class:`~int`
+        """
+        with self._condition:
+            return self._open[(host, port)]
+
+    def acquire(self, host: hints.Str, port: hints.Int,
+                timeout: hints.Timeout = timeouts.UNDEFINED) -> PooledTransport:
+        """
+        Check out a transport to the given host and port, reusing an idle one when possible.
+
+        :param host: Remote host
+        :type host: :class:`~str`
+        :param port: Remote port
+        :type port: :class:`~int`
+        :param timeout: Maximum number of milliseconds to wait for a free slot and connect
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Transport that returns to the pool when closed
+        :rtype: :class:`~adbts.tcp.pool.PooledTransport`
+        :raises :class:`~adbts.exceptions.TransportClosedError`: When the pool is closed
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        key = (host, port)
+        deadline = timeouts.deadline(timeout)
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise exceptions.TransportClosedError('Connection pool is closed')
+                idle = self._checkout_idle(key)
+                if idle is not None:
+                    return PooledTransport(self, key, idle)
+                if self._open[key] < self._max_per_key:
+                    self._open[key] += 1
+                    break
+                if not self._condition.wait(timeouts.remaining(deadline)):
+                    raise exceptions.TransportTimeoutError(
+                        'No transport to {}:{} was released within {} ms'.format(host, port, timeout))
+
+        # Connect within what is left of the timeout after waiting for a free slot.
+        connect_timeout = timeout if deadline is None else timeouts.remaining(deadline) * 1000
+        try:
+            connected = synchronous.open(host, port, connect_timeout, self._socket_options)
+        except BaseException:
+            self._forget(key)
+            raise
+        return PooledTransport(self, key, connected)
+
+    def release(self, key: PoolKey, connection: synchronous.Transport, discard: hints.Bool = False) -> None:
+        """
+        Return a checked out transport to the pool, closing it instead when it is not reusable, the pool
+        already keeps `max_idle` transports for its host and port, or the pool is closed.
+
+        This is called by :meth:`~adbts.tcp.pool.PooledTransport.close`.
+
+        :param key: Host and port the transport was checked out for
+        :type key: :class:`~tuple`
+        :param connection: Transport previously checked out of this pool
+        :type connection: :class:`~adbts.tcp.synchronous.Transport`
+        :param discard: Close the transport regardless of its state
+        :type discard: :class:`~bool`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._condition:
+            idle = self._idle.setdefault(key, collections.deque())
+            keep = not (discard or self._closed) and len(idle) < self._max_idle and connection.reusable
+            if keep:
+                idle.append(IdleEntry(connection, time.monotonic()))
+                self._condition.notify()
+                return
+        close_quietly(connection)
+        self._forget(key)
+
+    def clear(self) -> None:
+        """
+        Close all idle transports. Checked out transports are unaffected.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._condition:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            for key, idle in self._idle.items():
+                self._open[key] -= len(idle)
+                if self._open[key] <= 0:
+                    del self._open[key]
+            self._idle.clear()
+            self._condition.notify_all()
+        for entry in entries:
+            close_quietly(entry.transport)
+
+    def close(self) -> None:
+        """
+        Close the pool and all idle transports. Transports checked out are closed when returned.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._condition:
+            self._closed = True
+        self.clear()
+
+    def _checkout_idle(self, key: PoolKey) -> typing.Optional[synchronous.Transport]:
+        """
+        Pop the most recently returned idle transport that is still reusable, closing any that expired or
+        were closed by the peer. Must be called while holding the lock.
+        """
+        idle = self._idle.get(key)
+        if not idle:
+            return None
+        if self._idle_timeout is not None:
+            expired_at = time.monotonic() - self._idle_timeout
+            while idle and idle[0].released_at < expired_at:
+                self._evict(key, idle.popleft().transport)
+        while idle:
+            connection = idle.pop().transport
+            if connection.reusable:
+                return connection
+            self._evict(key, connection)
+        return None
+
+    def _evict(self, key: PoolKey, connection: synchronous.Transport) -> None:
+        """
+        Close a transport owned by the pool. Must be called while holding the lock.
+        """
+        close_quietly(connection)
+        self._open[key] -= 1
+        if self._open[key] <= 0:
+            del self._open[key]
+            self._idle.pop(key, None)
+
+    def _forget(self, key: PoolKey) -> None:
+        """
+        Give up the slot of a transport that was closed or failed to connect and wake up a waiting caller.
+        """
+        with self._condition:
+            self._open[key] -= 1
+            if self._open[key] <= 0:
+                del self._open[key]
+                if not self._idle.get(key):
+                    self._idle.pop(key, None)
+            self._condition.notify()
+
+
+def close_quietly(connection: synchronous.Transport) -> None:
+    """
+    Close a transport, ignoring errors since it is being thrown away.
+
+    :param connection: Transport to close
+    :type connection: :class:`~adbts.tcp.synchronous.Transport`
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    """
+    if connection.closed:
+        return
+    with contextlib.suppress(exceptions.TransportError):
+        connection.close()
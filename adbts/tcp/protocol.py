@@ -0,0 +1,532 @@
+"""
+    adbts.tcp.protocol
+    ~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for asynchronous Transmission Control Protocol (TCP) transport built directly on an
+    `asyncio` buffered protocol rather than on streams.
+
+    The event loop receives bytes straight into a preallocated :class:`~adbts.buffered.RingBuffer`, or into the
+    buffer of a large :meth:`~adbts.tcp.protocol.Transport.readinto` call, instead of appending them to the
+    internal buffer of a :class:`~asyncio.StreamReader` and slicing new objects out of it. Timeouts are timer
+    handles on the loop instead of a :func:`~asyncio.wait_for` task per call.
+"""
+import asyncio
+import typing
+
+from .. import buffered, exceptions, files, hints, loops, transport
+from . import deadlines, timeouts
+
+__all__ = ['Transport', 'StreamProtocol', 'open_connection', 'HAS_BUFFERED_PROTOCOL']
+
+
+#: Flag indicating if the Python version supports :class:`~asyncio.BufferedProtocol` (3.7+).
+HAS_BUFFERED_PROTOCOL = hasattr(asyncio, 'BufferedProtocol')
+
+
+#: Base class of :class:`~adbts.tcp.protocol.StreamProtocol`. It is only usable where buffered protocols exist.
+BaseProtocol = getattr(asyncio, 'BufferedProtocol', asyncio.Protocol)
+
+
+def _expire(waiter: hints.Future) -> None:
+    """
+    Fail the given waiter with a timeout unless it completed already.
+    """
+    if not waiter.done():
+        waiter.set_exception(exceptions.TransportTimeoutError('Transport operation timed out'))
+
+
+class StreamProtocol(BaseProtocol):
+    """
+    Buffered protocol that receives bytes of a connection into a :class:`~adbts.buffered.RingBuffer`, or into a
+    caller owned buffer while a large read waits, and tracks write flow control.
+
+    Reading is paused while the ring buffer is full, so the memory held per connection is bounded.
+    """
+
+    def __init__(self, loop: hints.EventLoop, buffer_size: hints.Int = buffered.DEFAULT_BUFFER_SIZE) -> None:
+        self._loop = loop
+        self._buffer = buffered.RingBuffer(buffer_size)
+        self._transport = None  # type: typing.Optional[asyncio.Transport]
+        self._target = None  # type: typing.Optional[memoryview]
+        self._received = 0
+        self._read_waiter = None  # type: typing.Optional[hints.Future]
+        self._drain_waiter = None  # type: typing.Optional[hints.Future]
+        self._reading_paused = False
+        self._writing_paused = False
+        self._eof = False
+        self._exception = None  # type: typing.Optional[Exception]
+
+    @property
+    def transport(self) -> typing.Optional[asyncio.Transport]:
+        """
+        Event loop transport of the connection.
+
+        :return: Transport once the connection is made
+        :rtype: :class:`~asyncio.Transport` or :class:`~NoneType`
+        """
+        return self._transport
+
+    @property
+    def buffered(self) -> hints.Int:
+        """
+        Number of bytes received but not read yet.
+
+        :return: Number of buffered bytes
+        :rtype: :class:`~int`
+        """
+        return len(self._buffer)
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:  # pylint: disable=redefined-outer-name
+        self._transport = transport
+
+    def connection_lost(self, exc: typing.Optional[Exception]) -> None:
+        self._eof = True
+        if exc is not None:
+            self._exception = exceptions.TransportError('Transport encountered an error')
+            self._exception.__cause__ = exc
+        self._writing_paused = False
+        self._wake(self._read_waiter)
+        self._wake(self._drain_waiter)
+
+    def eof_received(self) -> hints.Bool:
+        self._eof = True
+        self._wake(self._read_waiter)
+        return False
+
+    def pause_writing(self) -> None:
+        self._writing_paused = True
+
+    def resume_writing(self) -> None:
+        self._writing_paused = False
+        self._wake(self._drain_waiter)
+
+    def get_buffer(self, sizehint: hints.Int) -> memoryview:
+        if self._target is not None:
+            return self._target
+        return self._buffer.writable()
+
+    def buffer_updated(self, nbytes: hints.Int) -> None:
+        if self._target is not None:
+            # Detach the caller buffer right away, further bytes go to the ring buffer until the reader resumes.
+            self._received = nbytes
+            self._target = None
+        else:
+            self._buffer.commit(nbytes)
+            if not self._buffer.writable():
+                self._reading_paused = True
+                self._transport.pause_reading()
+        self._wake(self._read_waiter)
+
+    async def read(self, num_bytes: hints.Int, deadline: hints.OptionalFloat) -> hints.Buffer:
+        """
+        Read up to the given number of bytes, waiting until at least one byte is available.
+
+        :param num_bytes: Maximum number of bytes to read
+        :type num_bytes: :class:`~int`
+        :param deadline: Loop time at which to give up or None to wait forever
+        :type deadline: :class:`~float` or :class:`~NoneType`
+        :return: Bytes read, empty once the peer closed the connection
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When the connection failed
+        :raises :class:`~adbts.exceptions.TransportTimeoutError`: When the deadline passed
+        """
+        if not self._buffer and num_bytes >= self._buffer.capacity:
+            data = bytearray(num_bytes)
+            del data[await self.readinto(data, deadline):]
+            return data
+
+        while not self._buffer:
+            if self._ended():
+                return b''
+            await self._wait_readable(deadline)
+        data = bytes(self._buffer.peek(num_bytes))
+        self._consume(len(data))
+        return data
+
+    async def readinto(self, buffer: hints.WritableBuffer, deadline: hints.OptionalFloat) -> hints.Int:
+        """
+        Read bytes into the given buffer, waiting until at least one byte is available.
+
+        Buffers of at least the ring buffer capacity are handed to the event loop to receive into directly when
+        no bytes are buffered.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param deadline: Loop time at which to give up or None to wait forever
+        :type deadline: :class:`~float` or :class:`~NoneType`
+        :return: Number of bytes read, zero once the peer closed the connection
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When the connection failed
+        :raises :class:`~adbts.exceptions.TransportTimeoutError`: When the deadline passed
+        """
+        while not self._buffer:
+            if self._ended():
+                return 0
+            if len(buffer) < self._buffer.capacity:
+                await self._wait_readable(deadline)
+                continue
+
+            self._target = memoryview(buffer).cast('B')
+            self._received = 0
+            try:
+                await self._wait_readable(deadline)
+            finally:
+                self._target = None
+            if self._received:
+                return self._received
+
+        num_bytes = self._buffer.readinto(buffer)
+        self._consume(0)
+        return num_bytes
+
+    async def read_exactly(self, num_bytes: hints.Int, deadline: hints.OptionalFloat) -> bytearray:
+        """
+        Read exactly the given number of bytes.
+
+        :param num_bytes: Number of bytes to read
+        :type num_bytes: :class:`~int`
+        :param deadline: Loop time at which to give up or None to wait forever
+        :type deadline: :class:`~float` or :class:`~NoneType`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When the peer closed before all bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When the connection failed
+        :raises :class:`~adbts.exceptions.TransportTimeoutError`: When the deadline passed
+        """
+        data = bytearray(num_bytes)
+        view = memoryview(data)
+        received = 0
+        while received < num_bytes:
+            count = await self.readinto(view[received:], deadline)
+            if not count:
+                raise exceptions.TransportEndpointNotFound(
+                    'Connection closed after {} of {} bytes'.format(received, num_bytes))
+            received += count
+        return data
+
+    async def drain(self, deadline: hints.OptionalFloat) -> None:
+        """
+        Wait until the event loop transport accepts more bytes to write.
+
+        :param deadline: Loop time at which to give up or None to wait forever
+        :type deadline: :class:`~float` or :class:`~NoneType`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When the connection failed
+        :raises :class:`~adbts.exceptions.TransportTimeoutError`: When the deadline passed
+        """
+        if self._exception is not None:
+            raise self._exception
+        while self._writing_paused:
+            self._drain_waiter = self._loop.create_future()
+            try:
+                await self._wait(self._drain_waiter, deadline)
+            finally:
+                self._drain_waiter = None
+            if self._exception is not None:
+                raise self._exception
+
+    def _ended(self) -> hints.Bool:
+        """
+        Checks to see if no more bytes will arrive, raising the error the connection failed with.
+        """
+        if self._exception is not None:
+            raise self._exception
+        return self._eof
+
+    def _consume(self, num_bytes: hints.Int) -> None:
+        """
+        Discard the given number of buffered bytes and resume reading once there is room for more.
+        """
+        self._buffer.consume(num_bytes)
+        if self._reading_paused and self._buffer.writable():
+            self._reading_paused = False
+            self._transport.resume_reading()
+
+    async def _wait_readable(self, deadline: hints.OptionalFloat) -> None:
+        """
+        Wait until bytes are received, the peer closed the connection or the deadline passed.
+        """
+        self._read_waiter = self._loop.create_future()
+        try:
+            await self._wait(self._read_waiter, deadline)
+        finally:
+            self._read_waiter = None
+
+    async def _wait(self, waiter: hints.Future, deadline: hints.OptionalFloat) -> None:
+        """
+        Wait for the given waiter, failing it with a timeout at the deadline.
+        """
+        handle = None if deadline is None else self._loop.call_at(deadline, _expire, waiter)
+        try:
+            await waiter
+        finally:
+            if handle is not None:
+                handle.cancel()
+
+    @staticmethod
+    def _wake(waiter: typing.Optional[hints.Future]) -> None:
+        """
+        Complete the given waiter unless it is missing or completed already.
+        """
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+
+class Transport(transport.Transport):
+    """
+    Defines asynchronous (non-blocking) TCP transport on a :class:`~adbts.tcp.protocol.StreamProtocol`.
+
+    It has the same interface as :class:`~adbts.tcp.asynchronous.Transport`. Reads return bytes out of a
+    preallocated buffer and large reads receive directly into the caller buffer.
+    """
+
+    def __init__(self,
+                 host: hints.Str,
+                 port: hints.Int,
+                 protocol: StreamProtocol,
+                 loop: hints.OptionalEventLoop = None) -> None:
+        self._host = host
+        self._port = port
+        self._protocol = protocol
+        self._loop = loop or loops.get_running_loop()
+        self._closed = False
+
+    def __repr__(self) -> hints.Str:
+        address = str(self)
+        state = 'closed' if self.closed else 'open'
+        return '<{}(address={!r}, state={!r})>'.format(self.__class__.__name__, address, state)
+
+    def __str__(self) -> hints.Str:
+        return '{}:{}'.format(self._host, self._port)
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the transport is closed.
+
+        :return: Closed state of the transport
+        :rtype: :class:`~bool`
+        """
+        return self._closed is True
+
+    @property
+    def default_timeout(self) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the transport wait when they are not given a timeout, which is
+        the default timeout of new sockets.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return timeouts.default()
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read(self,
+                   num_bytes: hints.Int,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._protocol.read(num_bytes, self._deadline(timeout))
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    async def readinto(self,
+                       buffer: hints.WritableBuffer,
+                       timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._protocol.readinto(buffer, self._deadline(timeout))
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read_exactly(self,
+                           num_bytes: hints.Int,
+                           timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport, bounded by a single timeout.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When the peer closed before all bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._protocol.read_exactly(num_bytes, self._deadline(timeout))
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    async def write(self,
+                    data: hints.Buffer,
+                    timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write bytes to the transport.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes` or :class:`~bytearray`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        self._writable().write(data)
+        await self._protocol.drain(self._deadline(timeout))
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    async def writev(self,
+                     buffers: hints.Buffers,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        self._writable().writelines(buffers)
+        await self._protocol.drain(self._deadline(timeout))
+
+    @transport.ensure_opened
+    async def write_file(self,
+                         file: hints.FileSource,
+                         offset: hints.Int = 0,
+                         count: hints.OptionalInt = None,
+                         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        The event loop copies the file to the socket with :meth:`~asyncio.AbstractEventLoop.sendfile` where
+        available. Elsewhere the file is mapped into memory and written from there.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened or read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = self._deadline(timeout)
+        with files.open_file(file) as fd:
+            count = files.file_range(fd, offset, count)
+            if count:
+                await self._sendfile(fd, offset, count, deadline)
+        return count
+
+    async def _sendfile(self, fd: hints.Int, offset: hints.Int, count: hints.Int,
+                        deadline: hints.OptionalFloat) -> None:
+        """
+        Send a file region on the event loop, mapping it into memory when the loop cannot send files.
+        """
+        try:
+            with open(fd, 'rb', closefd=False) as fileobj, deadlines.Deadline(deadline, self._loop):
+                await self._loop.sendfile(self._writable(), fileobj, offset, count)
+            return
+        except NotImplementedError:
+            # Alternative loops, e.g. uvloop, may not implement sending files.
+            pass
+        except asyncio.TimeoutError as ex:
+            raise exceptions.TransportTimeoutError('Transport operation timed out') from ex
+        except OSError as ex:
+            raise exceptions.TransportError('Transport encountered an error') from ex
+
+        # Write in slices so the loop transport buffers at most one slice it could not send at once.
+        with files.mapped(fd, offset, count) as view:
+            for start in range(0, count, files.DEFAULT_CHUNK_SIZE):
+                self._writable().write(view[start:start + files.DEFAULT_CHUNK_SIZE])
+                await self._protocol.drain(deadline)
+
+    @transport.ensure_opened
+    def close(self) -> None:
+        """
+        Close the transport.
+
+        :return: Nothing
+        :rtype: `None`
+        """
+        self._protocol.transport.close()
+        self._closed = True
+
+    def _writable(self) -> asyncio.Transport:
+        """
+        Get the event loop transport to write to, raising once the connection was closed.
+        """
+        writer = self._protocol.transport
+        if writer.is_closing():
+            raise exceptions.TransportEndpointNotFound('Connection closed')
+        return writer
+
+    def _deadline(self, timeout: hints.Timeout) -> hints.OptionalFloat:
+        """
+        Determine the loop time at which an operation with the given timeout in milliseconds gives up.
+        """
+        seconds = timeouts.remaining(timeouts.deadline(timeout))
+        return None if seconds is None else self._loop.time() + seconds
+
+
+async def open_connection(host: hints.Str,
+                          port: hints.Int,
+                          sock: hints.Socket,
+                          loop: hints.OptionalEventLoop = None,
+                          buffer_size: hints.Int = buffered.DEFAULT_BUFFER_SIZE) -> Transport:
+    """
+    Create a :class:`~adbts.tcp.protocol.Transport` over the given connected socket.
+
+    :param host: Remote host
+    :type host: :class:`~str`
+    :param port: Remote port
+    :type port: :class:`~int`
+    :param sock: Connected stream socket
+    :type sock: :class:`~socket.socket`
+    :param loop: Deprecated, the running event loop is used
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :param buffer_size: Number of bytes received ahead of reads
+    :type buffer_size: :class:`~int`
+    :return: Asynchronous TCP transport
+    :rtype: :class:`~adbts.tcp.protocol.Transport`
+    :raises :class:`~NotImplementedError`: When the Python version does not support buffered protocols
+    """
+    if not HAS_BUFFERED_PROTOCOL:
+        raise NotImplementedError('Buffered protocols require Python 3.7+')
+    loop = loops.running_loop(loop)
+    _, protocol = await loop.create_connection(lambda: StreamProtocol(loop, buffer_size), sock=sock)
+    return Transport(host, port, protocol, loop)
@@ -0,0 +1,165 @@
+"""
+    adbts.tcp.resolver
+    ~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for resolving TCP hosts to the addresses to connect to, caching the results.
+"""
+import socket
+import threading
+import time
+import typing
+
+from .. import hints, loops
+
+__all__ = ['Resolver', 'AddressInfo', 'DEFAULT_RESOLVER', 'DEFAULT_TTL', 'interleave']
+
+
+#: Default number of milliseconds resolved addresses are reused for.
+DEFAULT_TTL = 30000
+
+
+#: Address to connect to, as returned by :func:`~socket.getaddrinfo`, i.e. a tuple of family, type, protocol,
+#: canonical name and socket address.
+AddressInfo = typing.Tuple[int, int, int, str, tuple]
+
+
+#: Addresses resolved for a host/port and the :func:`~time.monotonic` time they expire at.
+CacheEntry = typing.NamedTuple('CacheEntry', [
+    ('addresses', typing.List[AddressInfo]),
+    ('expires', hints.Float)
+])
+
+
+def interleave(addresses: typing.Iterable[AddressInfo]) -> typing.List[AddressInfo]:
+    """
+    Order addresses so that address families alternate, starting with the family of the first address, as
+    described in RFC 8305 (Happy Eyeballs). A broken family then costs a single connection attempt delay
+    instead of one per address.
+
+    :param addresses: Addresses in order of preference
+    :type addresses: :class:`~list` of :class:`~tuple`
+    :return: Interleaved addresses
+    :rtype: :class:`~list` of :class:`~tuple`
+    """
+    by_family = {}  # type: typing.Dict[int, typing.List[AddressInfo]]
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+
+    ordered = []  # type: typing.List[AddressInfo]
+    families = list(by_family.values())
+    while families:
+        ordered.extend(family.pop(0) for family in families)
+        families = [family for family in families if family]
+    return ordered
+
+
+class Resolver:
+    """
+    Resolves TCP hosts to interleaved addresses and caches them for a fixed time, so that reconnecting to the
+    same device does not pay for a name lookup every time.
+
+    Failed lookups are not cached. This resolver is thread-safe.
+    """
+
+    def __init__(self, ttl: hints.Int = DEFAULT_TTL) -> None:
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._cache = {}  # type: typing.Dict[typing.Tuple[hints.Str, hints.Int], CacheEntry]
+
+    def __len__(self) -> hints.Int:
+        with self._lock:
+            return len(self._cache)
+
+    def resolve(self, host: hints.Str, port: hints.Int) -> typing.List[AddressInfo]:
+        """
+        Resolve the given host/port, blocking on a name lookup when it is not cached.
+
+        :param host: Remote host
+        :type host: :class:`~str`
+        :param port: Remote port
+        :type port: :class:`~int`
+        :return: Addresses to connect to in order
+        :rtype: :class:`~list` of :class:`~tuple`
+        :raises :class:`~socket.gaierror`: When the host cannot be resolved
+        """
+        cached = self._lookup(host, port)
+        if cached is not None:
+            return cached
+        return self._store(host, port, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+
+    async def resolve_async(self, host: hints.Str, port: hints.Int,
+                            loop: hints.OptionalEventLoop = None) -> typing.List[AddressInfo]:
+        """
+        Resolve the given host/port, running a name lookup in the executor of the loop when it is not cached.
+
+        :param host: Remote host
+        :type host: :class:`~str`
+        :param port: Remote port
+        :type port: :class:`~int`
+        :param loop: Deprecated, the running event loop is used
+        :type loop: :class:`~asyncio.events.AbstractEventLoop`
+        :return: Addresses to connect to in order
+        :rtype: :class:`~list` of :class:`~tuple`
+        :raises :class:`~socket.gaierror`: When the host cannot be resolved
+        """
+        loop = loops.running_loop(loop)
+        cached = self._lookup(host, port)
+        if cached is not None:
+            return cached
+        addresses = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return self._store(host, port, addresses)
+
+    def invalidate(self, host: hints.Str, port: hints.Int) -> None:
+        """
+        Drop the cached addresses of the given host/port, e.g. after connecting to all of them failed.
+
+        :param host: Remote host
+        :type host: :class:`~str`
+        :param port: Remote port
+        :type port: :class:`~int`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._lock:
+            self._cache.pop((host, port), None)
+
+    def clear(self) -> None:
+        """
+        Drop all cached addresses.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._lock:
+            self._cache.clear()
+
+    def _lookup(self, host: hints.Str, port: hints.Int) -> typing.Optional[typing.List[AddressInfo]]:
+        """
+        Return the cached addresses of the given host/port or None when they are missing or expired.
+        """
+        with self._lock:
+            entry = self._cache.get((host, port))
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                del self._cache[(host, port)]
+                return None
+            return list(entry.addresses)
+
+    def _store(self, host: hints.Str, port: hints.Int,
+               addresses: typing.Iterable[AddressInfo]) -> typing.List[AddressInfo]:
+        """
+        Cache the interleaved addresses of the given host/port, dropping expired entries of other hosts.
+        """
+        ordered = interleave(addresses)
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, entry in self._cache.items() if entry.expires <= now]:
+                del self._cache[key]
+            if self._ttl > 0:
+                self._cache[(host, port)] = CacheEntry(ordered, now + self._ttl / 1000)
+        return list(ordered)
+
+
+#: Resolver shared by TCP transports opened without one of their own.
+DEFAULT_RESOLVER = Resolver()
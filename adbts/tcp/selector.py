@@ -0,0 +1,134 @@
+"""
+    adbts.tcp.selector
+    ~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for servicing many synchronous TCP transports from a single thread.
+"""
+import selectors
+import typing
+
+from .. import exceptions, hints
+from . import synchronous, timeouts
+
+__all__ = ['TransportSelector', 'SelectedTransport', 'EVENT_READ', 'EVENT_WRITE']
+
+
+#: Event mask bit set when a transport has bytes to read or the peer closed the connection.
+EVENT_READ = selectors.EVENT_READ
+
+
+#: Event mask bit set when a transport can accept bytes to write.
+EVENT_WRITE = selectors.EVENT_WRITE
+
+
+#: Transport reported ready by :meth:`~adbts.tcp.selector.TransportSelector.select` along with the
+#: events it is ready for and the data it was registered with.
+SelectedTransport = typing.NamedTuple('SelectedTransport', [
+    ('transport', synchronous.Transport),
+    ('events', hints.Int),
+    ('data', typing.Any)
+])
+
+
+class TransportSelector:
+    """
+    Reports which of many registered :class:`~adbts.tcp.synchronous.Transport` are ready to read or write,
+    using the most efficient selector of the platform, e.g. epoll on Linux.
+
+    Combined with the non-blocking :meth:`~adbts.tcp.synchronous.Transport.read_available` and
+    :meth:`~adbts.tcp.synchronous.Transport.write_some`, one thread can service every connection instead of
+    dedicating a thread blocked in `recv` to each of them.
+
+    .. note:: This selector is not thread-safe.
+    """
+
+    def __init__(self, selector: typing.Optional[selectors.BaseSelector] = None) -> None:
+        self._selector = selector or selectors.DefaultSelector()
+
+    def __enter__(self) -> 'TransportSelector':
+        return self
+
+    def __exit__(self, *args: hints.Args) -> None:
+        self.close()
+
+    def __len__(self) -> hints.Int:
+        return len(self._selector.get_map())
+
+    def register(self, transport: synchronous.Transport, events: hints.Int = EVENT_READ,
+                 data: typing.Any = None) -> None:
+        """
+        Register a transport for the given events.
+
+        Transports closed without being unregistered are dropped once their file descriptor is reused.
+
+        :param transport: Open transport to register
+        :type transport: :class:`~adbts.tcp.synchronous.Transport`
+        :param events: Mask of :data:`~adbts.tcp.selector.EVENT_READ` and :data:`~adbts.tcp.selector.EVENT_WRITE`
+        :type events: :class:`~int`
+        :param data: Opaque data returned along with the transport when it is ready
+        :type data: :class:`~object`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportClosedError`: When the transport is closed
+        :raises :class:`~KeyError`: When the transport is already registered
+        """
+        if transport.closed:
+            raise exceptions.TransportClosedError('Cannot register closed transport')
+        try:
+            self._selector.register(transport, events, data)
+        except KeyError:
+            stale = self._selector.get_map().get(transport.fileno())
+            if stale is None or not stale.fileobj.closed:
+                raise
+            self._selector.unregister(stale.fileobj)
+            self._selector.register(transport, events, data)
+
+    def modify(self, transport: synchronous.Transport, events: hints.Int, data: typing.Any = None) -> None:
+        """
+        Change the events and data of a registered transport, e.g. to wait for it to become writable only
+        while it has bytes queued to write.
+
+        :param transport: Registered transport
+        :type transport: :class:`~adbts.tcp.synchronous.Transport`
+        :param events: Mask of :data:`~adbts.tcp.selector.EVENT_READ` and :data:`~adbts.tcp.selector.EVENT_WRITE`
+        :type events: :class:`~int`
+        :param data: Opaque data returned along with the transport when it is ready
+        :type data: :class:`~object`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~KeyError`: When the transport is not registered
+        """
+        self._selector.modify(transport, events, data)
+
+    def unregister(self, transport: synchronous.Transport) -> None:
+        """
+        Stop reporting readiness of a transport. Transports should be unregistered before they are closed.
+
+        :param transport: Registered transport
+        :type transport: :class:`~adbts.tcp.synchronous.Transport`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~KeyError`: When the transport is not registered
+        """
+        self._selector.unregister(transport)
+
+    def select(self, timeout: hints.Timeout = timeouts.UNDEFINED) -> typing.List[SelectedTransport]:
+        """
+        Wait until at least one registered transport is ready.
+
+        :param timeout: Maximum number of milliseconds to wait, zero to poll without waiting
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Transports that are ready, empty when the timeout elapsed
+        :rtype: :class:`~list` of :class:`~adbts.tcp.selector.SelectedTransport`
+        """
+        ready = self._selector.select(timeouts.remaining(timeouts.deadline(timeout)))
+        return [SelectedTransport(key.fileobj, events, key.data) for key, events in ready if not key.fileobj.closed]
+
+    def close(self) -> None:
+        """
+        Close the selector. Registered transports are left open.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._selector.close()
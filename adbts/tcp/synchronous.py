@@ -5,44 +5,170 @@
     Contains functionality for synchronous Transmission Control Protocol (TCP) transport.
 """
 import contextlib
+import errno
+import functools
+import os
+import selectors
 import socket
+import typing
 
-from .. import exceptions, hints, transport
-from . import timeouts
+from .. import exceptions, files, hints, transport
+from . import options, resolver, timeouts, zerocopy
 
 __all__ = ['Transport']
 
 
-@contextlib.contextmanager
-def socket_timeout_scope(sock: hints.Socket,
-                         timeout: hints.Timeout = timeouts.UNDEFINED) -> hints.Iterator[None]:
+#: Maximum number of buffers passed to a single `sendmsg` call (POSIX IOV_MAX minimum on Linux).
+SENDMSG_MAX_BUFFERS = 1024
+
+
+#: Selector used to wait for socket readiness. Polling needs no file descriptor of its own, unlike
+#: epoll/kqueue, and is available everywhere but Windows.
+Selector = getattr(selectors, 'PollSelector', selectors.SelectSelector)
+
+
+#: Type hint for a function called to wait until a non-blocking socket is ready.
+WaitFunc = typing.Callable[[], None]  # pylint: disable=invalid-name
+
+
+def sendmsg_all(sock: hints.Socket, buffers: hints.Buffers, wait: typing.Optional[WaitFunc] = None) -> None:
     """
-    Patches the socket timeout for the scope of the context manager.
+    Send all given buffers using scatter/gather I/O, continuing after partial sends.
 
-    :param sock: Socket to set the timeout on
+    :param sock: Socket to send buffers on
     :type sock: :class:`~socket.socket`
-    :param timeout: Socket timeout in milliseconds
-    :type timeout: :class:`~int`
+    :param buffers: Sequence of byte collections to send in order
+    :type buffers: :class:`~list` or :class:`~tuple`
+    :param wait: Optional function called when a non-blocking socket cannot accept more bytes yet
+    :type wait: :class:`~function` or :class:`~NoneType`
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    """
+    has_sendmsg = hasattr(sock, 'sendmsg')
+    if not has_sendmsg:
+        buffers = [b''.join(buffers)]
+
+    views = [memoryview(buffer).cast('B') for buffer in buffers if buffer]
+    while views:
+        try:
+            num_bytes = sock.sendmsg(views[:SENDMSG_MAX_BUFFERS]) if has_sendmsg else sock.send(views[0])
+        except BlockingIOError:
+            if wait is None:
+                raise
+            wait()
+            continue
+
+        # Drop the buffers that were sent entirely and trim the one that was only partially sent.
+        while num_bytes and num_bytes >= len(views[0]):
+            num_bytes -= len(views.pop(0))
+        if num_bytes:
+            views[0] = views[0][num_bytes:]
+
+
+#: Error codes of a non-blocking `connect` that is still in progress.
+CONNECT_IN_PROGRESS = frozenset((errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY))
+
+
+def connect(addresses: typing.Sequence[resolver.AddressInfo], deadline: hints.OptionalFloat,
+            delay: hints.Int = timeouts.DEFAULT_CONNECT_DELAY) -> hints.Socket:
+    """
+    Connect to the first of the given addresses that accepts a connection.
+
+    Attempts are started in order, each one after the previous one failed or did not complete within the given
+    delay, while earlier attempts keep going, as described in RFC 8305 (Happy Eyeballs). An unreachable address
+    therefore costs the delay instead of the whole timeout.
+
+    :param addresses: Addresses to connect to in order, see :meth:`~adbts.tcp.resolver.Resolver.resolve`
+    :type addresses: :class:`~list` of :class:`~tuple`
+    :param deadline: Monotonic deadline in seconds or None to wait forever
+    :type deadline: :class:`~float` or :class:`~NoneType`
+    :param delay: Number of milliseconds to wait for an attempt before starting the next one
+    :type delay: :class:`~int`
+    :return: Connected non-blocking socket
+    :rtype: :class:`~socket.socket`
+    :raises :class:`~socket.timeout`: When no attempt succeeded before the deadline
+    :raises :class:`~OSError`: When all attempts failed, the error of the last one
     """
-    current_timeout = sock.gettimeout()
-    sock.settimeout(timeouts.timeout(timeout))
+    pending = list(addresses)
+    attempts = []  # type: typing.List[hints.Socket]
+    error = OSError('No addresses to connect to')
+    winner = None  # type: typing.Optional[hints.Socket]
+    selector = Selector()
     try:
-        yield
+        while winner is None and (pending or attempts):
+            if pending:
+                family, kind, proto, _, address = pending.pop(0)
+                try:
+                    sock = socket.socket(family, kind, proto)
+                except OSError as ex:
+                    error = ex
+                    continue
+                sock.setblocking(False)
+                code = sock.connect_ex(address)
+                if not code:
+                    winner = sock
+                    break
+                if code not in CONNECT_IN_PROGRESS:
+                    sock.close()
+                    error = OSError(code, os.strerror(code))
+                    continue
+                attempts.append(sock)
+                selector.register(sock, selectors.EVENT_WRITE)
+
+            wait = timeouts.remaining(deadline)
+            if pending:
+                wait = delay / 1000 if wait is None else min(wait, delay / 1000)
+            ready = selector.select(wait)
+            if not ready and timeouts.remaining(deadline) == 0:
+                raise socket.timeout('timed out')
+
+            for key, _ in ready:
+                sock = key.fileobj
+                selector.unregister(sock)
+                attempts.remove(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if not code and winner is None:
+                    winner = sock
+                    continue
+                sock.close()
+                if code:
+                    error = OSError(code, os.strerror(code))
+
+        if winner is None:
+            raise error
+        return winner
     finally:
-        sock.settimeout(current_timeout)
+        for sock in attempts:
+            sock.close()
+        selector.close()
 
 
 class Transport(transport.Transport):
     """
     Defines synchronous (blocking) TCP transport.
 
+    The socket is kept in non-blocking mode. Operations are attempted right away and only wait for the socket
+    to become ready, against a monotonic deadline, when they would block.
+
+    When given a zero-copy threshold, writes of at least that many bytes are sent with Linux zero-copy sends,
+    see :mod:`~adbts.tcp.zerocopy`. Other platforms fall back to regular sends.
+
     .. note:: This transport is not thread-safe.
     """
 
-    def __init__(self, host: hints.Str, port: hints.Int, sock: hints.Socket) -> None:
+    def __init__(self, host: hints.Str, port: hints.Int, sock: hints.Socket,
+                 zerocopy_threshold: hints.OptionalInt = None) -> None:
         self._host = host
         self._port = port
         self._socket = sock
+        self._socket.setblocking(False)
+        self._read_selector = Selector()
+        self._read_selector.register(sock, selectors.EVENT_READ)
+        self._write_selector = Selector()
+        self._write_selector.register(sock, selectors.EVENT_WRITE)
+        self._scope_deadline = None  # type: hints.OptionalFloat
+        self._zerocopy = None if zerocopy_threshold is None else zerocopy.sender(sock)
+        self._zerocopy_threshold = zerocopy_threshold
         self._closed = False
 
     def __repr__(self) -> hints.Str:
@@ -63,6 +189,37 @@ class Transport(transport.Transport):
         """
         return self._closed is True
 
+    @property
+    def default_timeout(self) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the transport wait when they are not given a timeout, which is
+        the default timeout of new sockets.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return timeouts.default()
+
+    @property
+    def reusable(self) -> hints.Bool:
+        """
+        Checks to see if the transport is open, the peer has not closed the connection and no unread bytes
+        are pending, so it can carry a new exchange. This does not block.
+
+        :return: Reusable state of the transport
+        :rtype: :class:`~bool`
+        """
+        if self.closed:
+            return False
+        try:
+            self._socket.recv(1, socket.MSG_PEEK)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        # Either end of stream or leftover bytes of a previous exchange.
+        return False
+
     @transport.ensure_opened
     @transport.ensure_num_bytes
     @exceptions.reraise(OSError)
@@ -81,8 +238,72 @@ class Transport(transport.Transport):
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
-        with socket_timeout_scope(self._socket, timeouts.timeout(timeout)):
-            return self._socket.recv(num_bytes)
+        deadline = self._deadline(timeout)
+        while True:
+            try:
+                return self._socket.recv(num_bytes)
+            except BlockingIOError:
+                self._wait(self._read_selector, deadline)
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(socket.timeout)
+    def readinto(self, buffer: hints.WritableBuffer,
+                 timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = self._deadline(timeout)
+        while True:
+            try:
+                return self._socket.recv_into(buffer)
+            except BlockingIOError:
+                self._wait(self._read_selector, deadline)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(socket.timeout)
+    def read_exactly(self, num_bytes: hints.Int,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport into a single preallocated buffer.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When the peer closed before all bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = self._deadline(timeout)
+        buffer = bytearray(num_bytes)
+        with memoryview(buffer) as view:
+            received = 0
+            while received < num_bytes:
+                try:
+                    chunk = self._socket.recv_into(view[received:])
+                except BlockingIOError:
+                    self._wait(self._read_selector, deadline)
+                    continue
+                if not chunk:
+                    raise exceptions.TransportEndpointNotFound(
+                        'Connection closed after {} of {} bytes'.format(received, num_bytes))
+                received += chunk
+        return buffer
 
     @transport.ensure_opened
     @transport.ensure_data
@@ -102,9 +323,145 @@ class Transport(transport.Transport):
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
-        with socket_timeout_scope(self._socket, timeouts.timeout(timeout)):
-            self._socket.sendall(data)
-            return None
+        self._send((data,), self._deadline(timeout))
+        return None
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(socket.timeout)
+    def writev(self, buffers: hints.Buffers,
+               timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        self._send(buffers, self._deadline(timeout))
+        return None
+
+    @transport.ensure_opened
+    def write_file(self, file: hints.FileSource,
+                   offset: hints.Int = 0,
+                   count: hints.OptionalInt = None,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        The kernel copies the file to the socket directly with :func:`~os.sendfile` where available; elsewhere
+        the file is mapped into memory and sent from there.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened or read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = self._deadline(timeout)
+        with files.open_file(file) as fd:
+            count = files.file_range(fd, offset, count)
+            if not count:
+                return 0
+            if not hasattr(os, 'sendfile'):
+                with files.mapped(fd, offset, count) as view:
+                    self._send((view,), deadline)
+                return count
+            self._sendfile(fd, offset, count, deadline)
+        return count
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @exceptions.reraise(OSError)
+    def read_available(self, num_bytes: hints.Int) -> transport.TransportReadResult:
+        """
+        Read up to the given number of bytes already received, without blocking.
+
+        :param num_bytes: Maximum number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :return: Collection of bytes read, empty when none are available
+        :rtype: :class:`~bytes`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When the peer closed the connection
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        """
+        try:
+            data = self._socket.recv(num_bytes)
+        except BlockingIOError:
+            return b''
+        if not data:
+            raise exceptions.TransportEndpointNotFound('Connection closed by {}'.format(self))
+        return data
+
+    @transport.ensure_opened
+    @exceptions.reraise(OSError)
+    def write_some(self, data: hints.Buffer) -> hints.Int:
+        """
+        Write as many of the given bytes as the socket accepts, without blocking.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes`, :class:`~bytearray` or :class:`~memoryview`
+        :return: Number of bytes written, zero when the socket send buffer is full
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        """
+        if not data:
+            return 0
+        try:
+            return self._socket.send(data)
+        except BlockingIOError:
+            return 0
+
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(socket.timeout)
+    def _send(self, buffers: hints.Buffers, deadline: hints.OptionalFloat) -> None:
+        """
+        Send all given buffers, with zero-copy sends when enabled and they are large enough.
+        """
+        wait = functools.partial(self._wait, self._write_selector, deadline)
+        if self._zerocopy is None or sum(memoryview(buffer).nbytes for buffer in buffers) < self._zerocopy_threshold:
+            sendmsg_all(self._socket, buffers, wait)
+        else:
+            self._zerocopy.sendmsg_all(buffers, deadline, wait)
+
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(socket.timeout)
+    def _sendfile(self, fd: hints.Int, offset: hints.Int, count: hints.Int, deadline: hints.OptionalFloat) -> None:
+        """
+        Send a file region with :func:`~os.sendfile`, waiting for the socket to become writable until the deadline.
+        """
+        sent = 0
+        while sent < count:
+            try:
+                num_bytes = os.sendfile(self._socket.fileno(), fd, offset + sent, count - sent)
+            except BlockingIOError:
+                self._wait(self._write_selector, deadline)
+                continue
+            if not num_bytes:
+                raise exceptions.TransportError('File ended after {} of {} bytes'.format(sent, count))
+            sent += num_bytes
+
+    def fileno(self) -> hints.Int:
+        """
+        Get the file descriptor of the socket, e.g. to register the transport with a :mod:`~selectors` selector.
+
+        :return: Socket file descriptor, -1 once the transport is closed
+        :rtype: :class:`~int`
+        """
+        return self._socket.fileno()
 
     @transport.ensure_opened
     @exceptions.reraise(OSError)
@@ -116,27 +473,92 @@ class Transport(transport.Transport):
         :rtype: `None`
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         """
+        if self._zerocopy is not None:
+            self._zerocopy.close()
+        self._read_selector.close()
+        self._write_selector.close()
         self._socket.close()
         self._closed = True
 
+    @contextlib.contextmanager
+    def deadline_scope(self, timeout: hints.Timeout) -> hints.Iterator[None]:
+        """
+        Context manager that gives all operations within its scope a single deadline, e.g. to bound a whole
+        message exchange rather than each read and write.
+
+        Operations that are not given a timeout use the deadline of the scope. Operations given a timeout
+        use the earliest of both deadlines.
+
+        :param timeout: Maximum number of milliseconds for all operations within the scope
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        """
+        previous = self._scope_deadline
+        self._scope_deadline = timeouts.earliest(previous, timeouts.deadline(timeout))
+        try:
+            yield
+        finally:
+            self._scope_deadline = previous
+
+    def _deadline(self, timeout: hints.Timeout) -> hints.OptionalFloat:
+        """
+        Determine the deadline of an operation given its timeout and the deadline of the current scope.
+        """
+        if timeout == timeouts.UNDEFINED and self._scope_deadline is not None:
+            return self._scope_deadline
+        return timeouts.earliest(self._scope_deadline, timeouts.deadline(timeout))
+
+    def _wait(self, selector: selectors.BaseSelector, deadline: hints.OptionalFloat) -> None:
+        """
+        Wait for the socket to become ready or raise a :class:`~socket.timeout` once the deadline passed.
+        """
+        if not selector.select(timeouts.remaining(deadline)):
+            raise socket.timeout('timed out')
+
 
 @exceptions.reraise(OSError)
 @exceptions.reraise_timeout_errors(socket.timeout)
 def open(host: hints.Str, port: hints.Int,  # pylint: disable=redefined-builtin
-         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportOpenResult:
+         timeout: hints.Timeout = timeouts.UNDEFINED,
+         socket_options: options.SocketOptions = options.DEFAULT_OPTIONS,
+         address_resolver: resolver.Resolver = resolver.DEFAULT_RESOLVER,
+         connect_delay: hints.Int = timeouts.DEFAULT_CONNECT_DELAY,
+         zerocopy_threshold: hints.OptionalInt = None) -> transport.TransportOpenResult:
     """
     Open a new :class:`~adbts.tcp.sync.Transport` transport to the given host/port.
 
+    The host is resolved through the given resolver, which caches its addresses, and connected to with staggered
+    parallel attempts, see :func:`~adbts.tcp.synchronous.connect`.
+
     :param host: Remote host
     :type host: :class:`~str`
     :param port: Remote port
     :type port: :class:`~int`
     :param timeout: Maximum number of milliseconds on blocking socket operations before raising an exception
     :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+    :param socket_options: Options set on the socket once connected
+    :type socket_options: :class:`~adbts.tcp.options.SocketOptions`
+    :param address_resolver: Resolver of the host addresses
+    :type address_resolver: :class:`~adbts.tcp.resolver.Resolver`
+    :param connect_delay: Number of milliseconds to wait for a connection attempt before trying the next address
+    :type connect_delay: :class:`~int`
+    :param zerocopy_threshold: Minimum number of bytes of writes sent with zero-copy, None to disable zero-copy
+    :type zerocopy_threshold: :class:`~int` or :class:`~NoneType`
     :return: Synchronous TCP transport
     :rtype: :class:`~adbts.tcp.sync.Transport`
     :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
     :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
     """
-    sock = socket.create_connection((host, port), timeouts.timeout(timeout))
-    return Transport(host, port, sock)
+    deadline = timeouts.deadline(timeout)
+    addresses = address_resolver.resolve(host, port)
+    try:
+        sock = connect(addresses, deadline, connect_delay)
+    except OSError:
+        # The cached addresses may be stale, e.g. after the device changed networks.
+        address_resolver.invalidate(host, port)
+        raise
+    try:
+        options.apply(sock, socket_options)
+    except OSError:
+        sock.close()
+        raise
+    return Transport(host, port, sock, zerocopy_threshold)
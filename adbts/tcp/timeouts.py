@@ -10,6 +10,13 @@ from .. import hints, timeouts
 
 # Exports from wrapped timeouts module so caller doesn't need to import both.
 UNDEFINED = timeouts.UNDEFINED
+earliest = timeouts.earliest
+remaining = timeouts.remaining
+
+
+#: Default number of milliseconds to wait for a connection attempt before starting one to the next address,
+#: the "Connection Attempt Delay" recommended by RFC 8305.
+DEFAULT_CONNECT_DELAY = 250
 
 
 def timeout(value: hints.Timeout) -> hints.OptionalFloat:
@@ -26,3 +33,27 @@ def timeout(value: hints.Timeout) -> hints.OptionalFloat:
     if value == UNDEFINED:
         return socket.getdefaulttimeout()
     return float(value) // 1000
+
+
+def default() -> hints.OptionalFloat:
+    """
+    Determine the timeout value in milliseconds of TCP transport operations that are not given one, which is
+    the default timeout of new sockets.
+
+    :return: Default timeout in milliseconds or None to wait forever
+    :rtype: :class:`~float` or :class:`~NoneType`
+    """
+    seconds = socket.getdefaulttimeout()
+    return None if seconds is None else seconds * 1000
+
+
+def deadline(value: hints.Timeout) -> hints.OptionalFloat:
+    """
+    Determine the :func:`~time.monotonic` time at which a TCP transport operation times out.
+
+    :param value: Timeout value given in milliseconds
+    :type value: :class:`~int`, :class:`~float`, :class:`~NoneType`
+    :return: Monotonic deadline in seconds or None to wait forever
+    :rtype: :class:`~float` or :class:`~NoneType`
+    """
+    return timeouts.deadline(value, default())
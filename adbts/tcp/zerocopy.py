@@ -0,0 +1,255 @@
+"""
+    adbts.tcp.zerocopy
+    ~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for sending large writes with Linux zero-copy sends (`SO_ZEROCOPY` + `MSG_ZEROCOPY`).
+
+    A zero-copy send pins the pages of the buffer and hands them to the network stack instead of copying them
+    into kernel memory. The buffer must then stay unchanged until the kernel reports on the socket error queue
+    that it no longer references it, which it does once the peer acknowledged the bytes. Page pinning and the
+    completions cost more than copying small buffers, so zero-copy sends only pay off for writes of tens of
+    kilobytes and more on real network interfaces. Sends over loopback are always copied by the kernel.
+"""
+import contextlib
+import errno
+import select
+import socket
+import struct
+import sys
+import typing
+
+from .. import hints
+from . import timeouts
+
+__all__ = ['Sender', 'sender', 'DEFAULT_THRESHOLD']
+
+
+#: Default minimum number of bytes of a write to send with zero-copy.
+DEFAULT_THRESHOLD = 64 * 1024
+
+
+#: Socket option that enables zero-copy sends, Linux 4.14+.
+SO_ZEROCOPY = getattr(socket, 'SO_ZEROCOPY', 60)
+
+
+#: Send flag that requests a zero-copy send.
+MSG_ZEROCOPY = getattr(socket, 'MSG_ZEROCOPY', 0x4000000)
+
+
+#: Receive flag that reads from the socket error queue.
+MSG_ERRQUEUE = getattr(socket, 'MSG_ERRQUEUE', 0x2000)
+
+
+#: Control message (level, type) pairs carrying a `sock_extended_err` for IPv4 and IPv6 sockets.
+RECVERR_MESSAGES = frozenset(((getattr(socket, 'SOL_IP', 0), getattr(socket, 'IP_RECVERR', 11)),
+                              (getattr(socket, 'SOL_IPV6', 41), getattr(socket, 'IPV6_RECVERR', 25))))
+
+
+#: Origin of a `sock_extended_err` that reports completed zero-copy sends.
+SO_EE_ORIGIN_ZEROCOPY = 5
+
+
+#: Code bit of a completion set when the kernel copied the buffer after all, e.g. over loopback.
+SO_EE_CODE_ZEROCOPY_COPIED = 1
+
+
+#: Layout of `struct sock_extended_err`: errno, origin, type, code, pad, info and data.
+SOCK_EXTENDED_ERR = struct.Struct('=IBBBBII')
+
+
+#: Number of bytes of ancillary data read per error queue message.
+ANCILLARY_BUFFER_SIZE = socket.CMSG_SPACE(SOCK_EXTENDED_ERR.size + 64) if hasattr(socket, 'CMSG_SPACE') else 0
+
+
+#: Maximum number of buffers passed to a single `sendmsg` call (POSIX IOV_MAX minimum on Linux).
+SENDMSG_MAX_BUFFERS = 1024
+
+
+#: Number of milliseconds closing a transport waits for outstanding completions.
+CLOSE_TIMEOUT = 1000
+
+
+#: Completion counters wrap around at 32 bits.
+COUNTER_MASK = 0xffffffff
+
+
+class Sender:
+    """
+    Sends buffers of a non-blocking socket with zero-copy sends and keeps them referenced until the kernel
+    reports they were sent.
+
+    Read-only buffers, e.g. :class:`~bytes`, are released lazily as completions arrive, so a write returns as soon
+    as the kernel queued it. Writable buffers could be changed by the caller once the write returned, so writes
+    of them wait for their completions first.
+
+    .. note:: This sender is not thread-safe.
+    """
+
+    def __init__(self, sock: hints.Socket) -> None:
+        self._socket = sock
+        self._poller = select.poll()
+        self._poller.register(sock, select.POLLERR)
+        self._next_id = 0
+        self._pending = {}  # type: typing.Dict[hints.Int, typing.List[memoryview]]
+        self._copied = 0
+
+    @property
+    def pending(self) -> hints.Int:
+        """
+        Number of sends whose buffers the kernel may still reference.
+
+        :return: Number of outstanding sends
+        :rtype: :class:`~int`
+        """
+        return len(self._pending)
+
+    @property
+    def copied(self) -> hints.Int:
+        """
+        Number of completed sends the kernel copied after all. When most sends are copied, zero-copy only adds
+        overhead and should be disabled.
+
+        :return: Number of copied sends
+        :rtype: :class:`~int`
+        """
+        return self._copied
+
+    def sendmsg_all(self, buffers: hints.Buffers, deadline: hints.OptionalFloat,
+                    wait: typing.Callable[[], None]) -> None:
+        """
+        Send all given buffers using zero-copy scatter/gather I/O, continuing after partial sends.
+
+        :param buffers: Sequence of byte collections to send in order
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param deadline: Monotonic deadline in seconds or None to wait forever
+        :type deadline: :class:`~float` or :class:`~NoneType`
+        :param wait: Function called when the socket cannot accept more bytes yet
+        :type wait: :class:`~function`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~socket.timeout`: When writable buffers were not released before the deadline
+        """
+        views = [memoryview(buffer).cast('B') for buffer in buffers if buffer]
+        writable = any(not view.readonly for view in views)
+        while views:
+            batch = views[:SENDMSG_MAX_BUFFERS]
+            try:
+                num_bytes = self._socket.sendmsg(batch, (), MSG_ZEROCOPY)
+            except BlockingIOError:
+                self.reap()
+                wait()
+                continue
+            except OSError as ex:
+                # The kernel limits the memory used by outstanding completions per socket.
+                if ex.errno != errno.ENOBUFS or not self._pending:
+                    raise
+                self._wait_completion(deadline)
+                continue
+
+            self._pending[self._next_id] = batch
+            self._next_id = (self._next_id + 1) & COUNTER_MASK
+
+            # Drop the buffers that were sent entirely and trim the one that was only partially sent.
+            while num_bytes and num_bytes >= len(views[0]):
+                num_bytes -= len(views.pop(0))
+            if num_bytes:
+                views[0] = views[0][num_bytes:]
+
+        if writable:
+            self.flush(deadline)
+        else:
+            self.reap()
+
+    def reap(self) -> hints.Int:
+        """
+        Release the buffers of all sends the kernel reported complete so far, without blocking.
+
+        :return: Number of sends released
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the error queue reports an asynchronous socket error
+        """
+        released = 0
+        while self._pending:
+            try:
+                _, ancdata, _, _ = self._socket.recvmsg(0, ANCILLARY_BUFFER_SIZE, MSG_ERRQUEUE)
+            except BlockingIOError:
+                break
+            for level, kind, data in ancdata:
+                if (level, kind) in RECVERR_MESSAGES:
+                    released += self._complete(data)
+        return released
+
+    def flush(self, deadline: hints.OptionalFloat) -> None:
+        """
+        Wait until the kernel released the buffers of all sends.
+
+        :param deadline: Monotonic deadline in seconds or None to wait forever
+        :type deadline: :class:`~float` or :class:`~NoneType`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~socket.timeout`: When sends are still outstanding at the deadline
+        """
+        while self._pending:
+            self._wait_completion(deadline)
+
+    def close(self) -> None:
+        """
+        Wait a bounded time for outstanding sends before the socket is closed and drop the remaining buffers.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with contextlib.suppress(OSError):
+            self.flush(timeouts.deadline(CLOSE_TIMEOUT))
+        self._pending.clear()
+        self._poller.unregister(self._socket)
+
+    def _wait_completion(self, deadline: hints.OptionalFloat) -> None:
+        """
+        Wait until at least one more send completed or raise a :class:`~socket.timeout` once the deadline passed.
+        """
+        while not self.reap():
+            remaining = timeouts.remaining(deadline)
+            if remaining == 0:
+                raise socket.timeout('timed out')
+            self._poller.poll(None if remaining is None else remaining * 1000)
+
+    def _complete(self, data: hints.Bytes) -> hints.Int:
+        """
+        Release the buffers of the range of sends reported by the given `sock_extended_err`.
+        """
+        err, origin, _, code, _, first, last = SOCK_EXTENDED_ERR.unpack_from(data)
+        if origin != SO_EE_ORIGIN_ZEROCOPY:
+            if err:
+                raise OSError(err, 'Asynchronous socket error')
+            return 0
+
+        released = 0
+        send_id = first
+        while True:
+            if self._pending.pop(send_id, None) is not None:
+                released += 1
+            if send_id == last:
+                break
+            send_id = (send_id + 1) & COUNTER_MASK
+        if code & SO_EE_CODE_ZEROCOPY_COPIED:
+            self._copied += released
+        return released
+
+
+def sender(sock: hints.Socket) -> typing.Optional[Sender]:
+    """
+    Enable zero-copy sends on the given socket.
+
+    :param sock: Connected TCP socket
+    :type sock: :class:`~socket.socket`
+    :return: Sender of the socket or None when the platform or socket does not support zero-copy sends
+    :rtype: :class:`~adbts.tcp.zerocopy.Sender` or :class:`~NoneType`
+    """
+    if not sys.platform.startswith('linux') or not hasattr(select, 'poll') or not ANCILLARY_BUFFER_SIZE:
+        return None
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_ZEROCOPY, 1)
+    except OSError:
+        return None
+    return Sender(sock)
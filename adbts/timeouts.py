@@ -4,9 +4,11 @@
 
     Contains functionality for dealing with transport call timeouts.
 """
-from . import hints
+import time
 
-__all__ = ['UNDEFINED', 'timeout']
+from . import exceptions, hints
+
+__all__ = ['UNDEFINED', 'timeout', 'deadline', 'earliest', 'remaining', 'call_timeout']
 
 #: Sentinel object used to indicate when a timeout value was actually passed
 #: since `None` is a valid type.
@@ -35,3 +37,69 @@ def timeout(value: hints.Timeout,
     if seconds and isinstance(value, (int, float)):
         value //= 1000
     return value
+
+
+def deadline(value: hints.Timeout, default: hints.Timeout = None) -> hints.OptionalFloat:
+    """
+    Determine the :func:`~time.monotonic` time at which a transport operation, which may span many transport
+    calls, times out.
+
+    :param value: Timeout value given in milliseconds, None to wait forever
+    :type value: :class:`~int`, :class:`~float`, :class:`~NoneType`, or :class:`~object`
+    :param default: Timeout value in milliseconds used when no timeout was given, None to wait forever
+    :type default: :class:`~int`, :class:`~float`, :class:`~NoneType`
+    :return: Monotonic deadline in seconds or None to wait forever
+    :rtype: :class:`~float` or :class:`~NoneType`
+    """
+    if value is UNDEFINED or value == UNDEFINED:
+        value = default
+    if value is None:
+        return None
+    return time.monotonic() + float(value) / 1000
+
+
+def earliest(*deadlines: hints.OptionalFloat) -> hints.OptionalFloat:
+    """
+    Determine the earliest of the given deadlines, ignoring those that wait forever.
+
+    :param deadlines: Monotonic deadlines in seconds or None
+    :type deadlines: :class:`~float` or :class:`~NoneType`
+    :return: Earliest deadline or None when all of them wait forever
+    :rtype: :class:`~float` or :class:`~NoneType`
+    """
+    return min((value for value in deadlines if value is not None), default=None)
+
+
+def remaining(value: hints.OptionalFloat) -> hints.OptionalFloat:
+    """
+    Determine the number of seconds left until the given deadline.
+
+    :param value: Monotonic deadline in seconds or None to wait forever
+    :type value: :class:`~float` or :class:`~NoneType`
+    :return: Non-negative number of seconds or None to wait forever
+    :rtype: :class:`~float` or :class:`~NoneType`
+    """
+    if value is None:
+        return value
+    return max(0.0, value - time.monotonic())
+
+
+def call_timeout(value: hints.OptionalFloat, original: hints.Timeout) -> hints.OptionalInt:
+    """
+    Determine the timeout value in milliseconds for the next transport call of an operation with the given
+    deadline.
+
+    :param value: Monotonic deadline in seconds or None to wait forever
+    :type value: :class:`~float` or :class:`~NoneType`
+    :param original: Timeout value given to the operation, used in the error message
+    :type original: :class:`~int`, :class:`~float`, :class:`~NoneType`, or :class:`~object`
+    :return: Timeout of the next call in milliseconds or None to wait forever
+    :rtype: :class:`~int` or :class:`~NoneType`
+    :raises :class:`~adbts.exceptions.TransportTimeoutError`: When the deadline passed
+    """
+    if value is None:
+        return None
+    milliseconds = int((value - time.monotonic()) * 1000)
+    if milliseconds <= 0:
+        raise exceptions.TransportTimeoutError('Exceeded timeout of {} ms'.format(original))
+    return milliseconds
@@ -6,6 +6,7 @@
 """
 import abc
 import functools
+import inspect
 import typing
 
 from . import exceptions, hints, timeouts
@@ -19,10 +20,18 @@ TransportDerived = typing.TypeVar('TransportDerived', bound='Transport')
 TransportReadResult = typing.Union[hints.Buffer, hints.BufferGenerator]  # pylint: disable=invalid-name
 
 
+#: Type hint that represents the number of bytes read into a buffer from a synchronous or asynchronous transport.
+TransportReadIntoResult = typing.Union[hints.Int, hints.IntGenerator]  # pylint: disable=invalid-name
+
+
 #: Type hint that represents an empty result from a synchronous or asynchronous transport.
 TransportWriteResult = typing.Union[None, hints.NoneGenerator]  # pylint: disable=invalid-name
 
 
+#: Type hint that represents the number of file bytes written by a synchronous or asynchronous transport.
+TransportWriteFileResult = typing.Union[hints.Int, hints.IntGenerator]  # pylint: disable=invalid-name
+
+
 #: Type hint that represents a new instance created from a synchronous or asynchronous transport.
 # pylint: disable=invalid-name,unsubscriptable-object
 TransportOpenResult = typing.Union['Transport', typing.Generator[typing.Any, None, 'Transport']]
@@ -32,6 +41,19 @@ def ensure_opened(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
     """
     Decorator used to guard :class:`~adbts.transport.Transport` methods that require it not to be closed.
     """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_decorator(self: TransportDerived,
+                                      *args: hints.Args,
+                                      **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+            """
+            Proxies call to decorated coroutine if transport is open, otherwise raises.
+            """
+            if self.closed:
+                raise exceptions.TransportClosedError('Cannot perform this action against closed transport')
+            return await func(self, *args, **kwargs)
+        return coroutine_decorator
+
     @functools.wraps(func)
     def decorator(self: TransportDerived,
                   *args: hints.Args,
@@ -50,6 +72,21 @@ def ensure_num_bytes(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
     Decorator that returns a default value when wrapped function is given a 'num_bytes' argument that
     won't read any data.
     """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_decorator(self: TransportDerived,
+                                      num_bytes: hints.Int,
+                                      *args: hints.Args,
+                                      **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+            """
+            Proxies call to decorated coroutine if num_bytes is greater than zero, otherwise returns
+            an empty bytes value.
+            """
+            if num_bytes <= 0:
+                return b''
+            return await func(self, num_bytes, *args, **kwargs)
+        return coroutine_decorator
+
     @functools.wraps(func)
     def decorator(self: TransportDerived,
                   num_bytes: hints.Int,
@@ -65,11 +102,58 @@ def ensure_num_bytes(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
     return decorator
 
 
+def ensure_buffer(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
+    """
+    Decorator that returns a default value when wrapped function is given a 'buffer' argument that
+    cannot hold any data.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_decorator(self: TransportDerived,
+                                      buffer: hints.WritableBuffer,
+                                      *args: hints.Args,
+                                      **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+            """
+            Proxies call to decorated coroutine if buffer has a non-zero length, otherwise returns zero.
+            """
+            if not buffer:
+                return 0
+            return await func(self, buffer, *args, **kwargs)
+        return coroutine_decorator
+
+    @functools.wraps(func)
+    def decorator(self: TransportDerived,
+                  buffer: hints.WritableBuffer,
+                  *args: hints.Args,
+                  **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+        """
+        Proxies call to decorated function if buffer has a non-zero length, otherwise returns zero.
+        """
+        if not buffer:
+            return 0
+        return func(self, buffer, *args, **kwargs)
+    return decorator
+
+
 def ensure_data(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
     """
     Decorator that returns a default value when wrapped function is given a 'data' argument that
     won't write any data.
     """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_decorator(self: TransportDerived,
+                                      data: hints.Buffer,
+                                      *args: hints.Args,
+                                      **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+            """
+            Proxies call to decorated coroutine if data is provided, otherwise returns None.
+            """
+            if not data:
+                return None
+            return await func(self, data, *args, **kwargs)
+        return coroutine_decorator
+
     @functools.wraps(func)
     def decorator(self: TransportDerived,
                   data: hints.Buffer,
@@ -84,6 +168,39 @@ def ensure_data(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
     return decorator
 
 
+def ensure_buffers(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
+    """
+    Decorator that returns a default value when wrapped function is given a 'buffers' argument that
+    won't write any data.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_decorator(self: TransportDerived,
+                                      buffers: hints.Buffers,
+                                      *args: hints.Args,
+                                      **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+            """
+            Proxies call to decorated coroutine if any buffer has data, otherwise returns None.
+            """
+            if not any(buffers):
+                return None
+            return await func(self, buffers, *args, **kwargs)
+        return coroutine_decorator
+
+    @functools.wraps(func)
+    def decorator(self: TransportDerived,
+                  buffers: hints.Buffers,
+                  *args: hints.Args,
+                  **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+        """
+        Proxies call to decorated function if any buffer has data, otherwise returns None.
+        """
+        if not any(buffers):
+            return None
+        return func(self, buffers, *args, **kwargs)
+    return decorator
+
+
 class Transport(metaclass=abc.ABCMeta):
     """
     Abstract class that defines a communication transport.
@@ -111,6 +228,16 @@ class Transport(metaclass=abc.ABCMeta):
         :rtype: :class:`~bool`
         """
 
+    @property
+    def default_timeout(self: TransportDerived) -> hints.OptionalFloat:
+        """
+        Number of milliseconds operations of the transport wait when they are not given a timeout.
+
+        :return: Default timeout in milliseconds or None to wait forever
+        :rtype: :class:`~float` or :class:`~NoneType`
+        """
+        return None
+
     @abc.abstractmethod
     def read(self: TransportDerived,
              num_bytes: hints.Int,
@@ -128,6 +255,41 @@ class Transport(metaclass=abc.ABCMeta):
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
 
+    @abc.abstractmethod
+    def readinto(self: TransportDerived,
+                 buffer: hints.WritableBuffer,
+                 timeout: hints.Timeout = timeouts.UNDEFINED) -> TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+
+    @abc.abstractmethod
+    def read_exactly(self: TransportDerived,
+                     num_bytes: hints.Int,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport into a single preallocated buffer.
+
+        :param num_bytes: Number of bytes to read
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When the peer closed before all bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+
     @abc.abstractmethod
     def write(self: TransportDerived,
               data: hints.Buffer,
@@ -145,6 +307,47 @@ class Transport(metaclass=abc.ABCMeta):
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
 
+    @abc.abstractmethod
+    def writev(self: TransportDerived,
+               buffers: hints.Buffers,
+               timeout: hints.Timeout = timeouts.UNDEFINED) -> TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+
+    @abc.abstractmethod
+    def write_file(self: TransportDerived,
+                   file: hints.FileSource,
+                   offset: hints.Int = 0,
+                   count: hints.OptionalInt = None,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first, e.g. to push an
+        APK or system image.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+
     @abc.abstractmethod
     def close(self: TransportDerived) -> None:
         """
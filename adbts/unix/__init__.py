@@ -0,0 +1,9 @@
+"""
+    adbts.unix
+    ~~~~~~~~~~
+
+    Package that contains unix domain socket transports, e.g. for local adb servers and emulators.
+"""
+from . import addresses, asynchronous, synchronous
+
+__all__ = ['addresses', 'asynchronous', 'synchronous']
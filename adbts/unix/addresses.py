@@ -0,0 +1,70 @@
+"""
+    adbts.unix.addresses
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for converting unix domain socket paths to socket addresses.
+"""
+import os
+import sys
+
+from .. import hints
+
+__all__ = ['ABSTRACT_PREFIX', 'address', 'is_abstract', 'display']
+
+
+#: Prefix of paths that name a socket in the Linux abstract namespace rather than the filesystem,
+#: e.g. '@jdwp-control', as printed by `ss` and `netstat`.
+ABSTRACT_PREFIX = '@'
+
+
+#: Leading byte of a socket address in the Linux abstract namespace.
+ABSTRACT_NUL = '\0'
+
+
+#: Flag indicating if the platform supports the abstract socket namespace.
+HAS_ABSTRACT_NAMESPACE = sys.platform.startswith('linux')
+
+
+def is_abstract(path: hints.SocketPath) -> hints.Bool:
+    """
+    Checks to see if the given path names a socket in the Linux abstract namespace.
+
+    :param path: Socket path
+    :type path: :class:`~str` or :class:`~bytes`
+    :return: Abstract state of the path
+    :rtype: :class:`~bool`
+    """
+    return os.fsdecode(path)[:1] in (ABSTRACT_PREFIX, ABSTRACT_NUL)
+
+
+def address(path: hints.SocketPath) -> hints.SocketPath:
+    """
+    Determine the socket address to connect to for the given path.
+
+    :param path: Filesystem path of the socket, or its abstract name prefixed with '@' or a NUL byte
+    :type path: :class:`~str` or :class:`~bytes`
+    :return: Address accepted by :meth:`~socket.socket.connect` for `AF_UNIX` sockets
+    :rtype: :class:`~str` or :class:`~bytes`
+    :raises :class:`~ValueError`: When the path is empty or abstract on a platform without abstract namespace
+    """
+    if not path:
+        raise ValueError('Socket path must not be empty')
+    if not is_abstract(path):
+        return path
+    if not HAS_ABSTRACT_NAMESPACE:
+        raise ValueError('Abstract socket namespace is only supported on Linux')
+    nul = ABSTRACT_NUL.encode() if isinstance(path, bytes) else ABSTRACT_NUL
+    return nul + path[1:]
+
+
+def display(path: hints.SocketPath) -> hints.Str:
+    """
+    Determine the printable form of the given path, with abstract names prefixed with '@'.
+
+    :param path: Socket path
+    :type path: :class:`~str` or :class:`~bytes`
+    :return: Printable socket path
+    :rtype: :class:`~str`
+    """
+    path = os.fsdecode(path)
+    return ABSTRACT_PREFIX + path[1:] if is_abstract(path) else path
@@ -0,0 +1,67 @@
+"""
+    adbts.unix.asynchronous
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for asynchronous unix domain socket transport using `asyncio`.
+"""
+import asyncio
+
+from .. import exceptions, hints, loops, transport
+from ..tcp import asynchronous, deadlines, timeouts
+from . import addresses
+
+__all__ = ['Transport']
+
+
+class Transport(asynchronous.Transport):
+    """
+    Defines asynchronous (non-blocking) unix domain socket transport using `asyncio`.
+
+    Streams of unix domain sockets behave like TCP ones, so every operation is that of
+    :class:`~adbts.tcp.asynchronous.Transport`.
+    """
+
+    def __init__(self,
+                 path: hints.SocketPath,
+                 reader: hints.StreamReader,
+                 writer: hints.StreamWriter,
+                 loop: hints.OptionalEventLoop = None,
+                 write_high_water: hints.OptionalInt = None,
+                 write_low_water: hints.OptionalInt = None) -> None:
+        super().__init__(addresses.display(path), 0, reader, writer, loop, write_high_water, write_low_water)
+        self._path = path
+
+    def __str__(self) -> hints.Str:
+        return addresses.display(self._path)
+
+
+@exceptions.reraise(OSError)
+@exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+async def open(path: hints.SocketPath,  # pylint: disable=redefined-builtin
+               timeout: hints.Timeout = timeouts.UNDEFINED,
+               loop: hints.OptionalEventLoop = None,
+               write_high_water: hints.OptionalInt = None,
+               write_low_water: hints.OptionalInt = None) -> transport.TransportOpenResult:
+    """
+    Open a new :class:`~adbts.unix.asynchronous.Transport` transport to the given socket path.
+
+    :param path: Filesystem path of the socket, or its Linux abstract name prefixed with '@'
+    :type path: :class:`~str` or :class:`~bytes`
+    :param timeout: Maximum number of milliseconds to connect before raising an exception.
+    :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+    :param loop: Deprecated, the running event loop is used
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :param write_high_water: Number of unsent bytes above which writes drain, or None to always drain
+    :type write_high_water: :class:`~int` or :class:`~NoneType`
+    :param write_low_water: Number of unsent bytes below which draining writes resume, defaults to a quarter
+    :type write_low_water: :class:`~int` or :class:`~NoneType`
+    :return: Asynchronous unix domain socket transport
+    :rtype: :class:`~adbts.unix.asynchronous.Transport`
+    :raises :class:`~ValueError`: When the path is empty or abstract on a platform without abstract namespace
+    :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+    :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+    """
+    loop = loops.running_loop(loop)
+    with deadlines.after(timeout, loop):
+        reader, writer = await asyncio.open_unix_connection(addresses.address(path))
+    return Transport(path, reader, writer, loop, write_high_water, write_low_water)
@@ -0,0 +1,61 @@
+"""
+    adbts.unix.synchronous
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for synchronous unix domain socket transport.
+"""
+import socket
+
+from .. import exceptions, hints, transport
+from ..tcp import synchronous, timeouts
+from . import addresses
+
+__all__ = ['Transport']
+
+
+class Transport(synchronous.Transport):
+    """
+    Defines synchronous (blocking) unix domain socket transport.
+
+    Unix domain sockets are stream sockets like TCP ones, so every operation, including the non-blocking
+    :meth:`~adbts.tcp.synchronous.Transport.read_available` and :meth:`~adbts.tcp.synchronous.Transport.write_some`
+    used with :class:`~adbts.tcp.selector.TransportSelector`, behaves as it does for
+    :class:`~adbts.tcp.synchronous.Transport`.
+
+    .. note:: This transport is not thread-safe.
+    """
+
+    def __init__(self, path: hints.SocketPath, sock: hints.Socket) -> None:
+        super().__init__(addresses.display(path), 0, sock)
+        self._path = path
+
+    def __str__(self) -> hints.Str:
+        return addresses.display(self._path)
+
+
+@exceptions.reraise(OSError)
+@exceptions.reraise_timeout_errors(socket.timeout)
+def open(path: hints.SocketPath,  # pylint: disable=redefined-builtin
+         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportOpenResult:
+    """
+    Open a new :class:`~adbts.unix.synchronous.Transport` transport to the given socket path.
+
+    :param path: Filesystem path of the socket, or its Linux abstract name prefixed with '@'
+    :type path: :class:`~str` or :class:`~bytes`
+    :param timeout: Maximum number of milliseconds to connect before raising an exception
+    :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+    :return: Synchronous unix domain socket transport
+    :rtype: :class:`~adbts.unix.synchronous.Transport`
+    :raises :class:`~ValueError`: When the path is empty or abstract on a platform without abstract namespace
+    :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+    :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+    """
+    address = addresses.address(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeouts.remaining(timeouts.deadline(timeout)))
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return Transport(path, sock)
@@ -4,6 +4,6 @@
 
     Package that contains Universal Serial Bus (USB) transports.
 """
-from . import asynchronous, synchronous
+from . import asynchronous, synchronous, threaded
 
-__all__ = ['asynchronous', 'synchronous']
+__all__ = ['asynchronous', 'synchronous', 'threaded']
@@ -4,3 +4,668 @@
 
     Contains functionality for asynchronous Universal Serial Bus (USB) transport.
 """
+import asyncio
+import functools
+import select
+import threading
+import typing
+
+import usb1
+
+from .. import ctxlib, exceptions, files, hints, loops, transport
+from . import hotplug, index, libusb, timeouts
+
+__all__ = ['Transport', 'HotplugMonitor']
+
+
+class EventLoopPoller:
+    """
+    Drives libusb event handling for a :class:`~usb1.USBContext` from an `asyncio` event loop.
+
+    The file descriptors libusb uses for its events are registered as readers/writers on the
+    loop so completed transfers are handled without dedicating a thread to the context. Each event loop
+    using the context has its own poller, see :func:`~adbts.usb.asynchronous.acquire_poller`.
+    """
+
+    def __init__(self, context: libusb.Context, loop: hints.EventLoop) -> None:
+        self._context = context
+        self._loop = loop
+        self._fds = set()  # type: typing.Set[hints.Int]
+        self._timer = None  # type: typing.Optional[asyncio.TimerHandle]
+        self.references = 0
+
+    @property
+    def context(self) -> libusb.Context:
+        """
+        USB context whose events are handled by this poller.
+
+        :return: USB context
+        :rtype: :class:`~usb1.USBContext`
+        """
+        return self._context
+
+    @property
+    def loop(self) -> hints.EventLoop:
+        """
+        Event loop that handles the events of the USB context.
+
+        :return: Event loop
+        :rtype: :class:`~asyncio.events.AbstractEventLoop`
+        """
+        return self._loop
+
+    def register(self) -> None:
+        """
+        Start handling events of the USB context on the event loop.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        for fd, events in self._context.getPollFDList():
+            self._add_fd(fd, events)
+
+    def unregister(self) -> None:
+        """
+        Stop handling events of the USB context on the event loop.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        for fd in tuple(self._fds):
+            self._remove_fd(fd)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def handle_events(self) -> None:
+        """
+        Handle all pending USB events without blocking and reschedule the next libusb timeout.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._context.handleEventsTimeout(0)
+        self.schedule_timeout()
+
+    def schedule_timeout(self) -> None:
+        """
+        Schedule event handling for the next internal libusb timeout, e.g. a transfer timeout.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        next_timeout = self._context.getNextTimeout()
+        if next_timeout is not None:
+            self._timer = self._loop.call_later(next_timeout, self.handle_events)
+
+    def _add_fd(self, fd: hints.Int, events: hints.Int) -> None:
+        if events & select.POLLIN:
+            self._loop.add_reader(fd, self.handle_events)
+        if events & select.POLLOUT:
+            self._loop.add_writer(fd, self.handle_events)
+        self._fds.add(fd)
+
+    def _remove_fd(self, fd: hints.Int) -> None:
+        self._loop.remove_reader(fd)
+        self._loop.remove_writer(fd)
+        self._fds.discard(fd)
+
+    def on_fd_added(self, fd: hints.Int, events: hints.Int) -> None:
+        """
+        Start handling events of a file descriptor libusb added, from any thread.
+
+        :param fd: File descriptor
+        :type fd: :class:`~int`
+        :param events: Poll events to handle
+        :type events: :class:`~int`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._call_soon(self._add_fd, fd, events)
+
+    def on_fd_removed(self, fd: hints.Int) -> None:
+        """
+        Stop handling events of a file descriptor libusb removed, from any thread.
+
+        :param fd: File descriptor
+        :type fd: :class:`~int`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._call_soon(self._remove_fd, fd)
+
+    def _call_soon(self, callback: typing.Callable[..., None], *args: hints.Args) -> None:
+        """
+        Call the function on the event loop, right away when called from the thread running it.
+        """
+        if loops.current_loop() is self._loop:
+            callback(*args)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(callback, *args)
+
+
+#: Pollers driving USB contexts shared by asynchronous transports, keyed by context and event loop.
+_POLLERS = {}  # type: typing.Dict[typing.Tuple[libusb.Context, hints.EventLoop], EventLoopPoller]
+
+
+#: Lock that guards access to :data:`_POLLERS`.
+_POLLERS_LOCK = threading.Lock()
+
+
+def acquire_poller(context: libusb.Context, loop: hints.EventLoop) -> EventLoopPoller:
+    """
+    Acquire a reference to the poller that drives the given USB context on the event loop, registering a new
+    one if the context is not driven by the loop yet.
+
+    The shared context may be used by transports of several event loops, e.g. on different threads. Each loop
+    handles the events of the context with its own poller, so timers and readers are only ever added to the
+    loop of the calling transport.
+
+    :param context: USB context to handle events for
+    :type context: :class:`~usb1.USBContext`
+    :param loop: Asyncio Event Loop that handles the events
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :return: Registered poller for the context and loop
+    :rtype: :class:`~adbts.usb.asynchronous.EventLoopPoller`
+    """
+    with _POLLERS_LOCK:
+        poller = _POLLERS.get((context, loop))
+        if poller is None:
+            # Libusb keeps a single pair of poll file descriptor notifiers per context, so they notify every
+            # poller of the context.
+            if not _context_pollers(context):
+                context.setPollFDNotifiers(functools.partial(_on_fd_added, context),
+                                           functools.partial(_on_fd_removed, context))
+            poller = _POLLERS[(context, loop)] = EventLoopPoller(context, loop)
+            poller.register()
+        poller.references += 1
+        return poller
+
+
+def release_poller(poller: EventLoopPoller) -> None:
+    """
+    Release a reference to the given poller, unregistering it from its event loop if it was the last one.
+
+    :param poller: Poller previously acquired by :func:`~adbts.usb.asynchronous.acquire_poller`
+    :type poller: :class:`~adbts.usb.asynchronous.EventLoopPoller`
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    """
+    with _POLLERS_LOCK:
+        poller.references -= 1
+        if poller.references <= 0:
+            _POLLERS.pop((poller.context, poller.loop), None)
+            if not _context_pollers(poller.context):
+                poller.context.setPollFDNotifiers()
+            poller.unregister()
+
+
+def _context_pollers(context: libusb.Context) -> typing.List[EventLoopPoller]:
+    """
+    Get the pollers that drive the given USB context on any event loop. Caller must hold the lock.
+    """
+    return [poller for (ctx, _), poller in _POLLERS.items() if ctx is context]
+
+
+def _on_fd_added(context: libusb.Context, fd: hints.Int, events: hints.Int, _: hints.Args) -> None:
+    """
+    Poll file descriptor notifier of libusb that registers the added file descriptor with all pollers of
+    the context.
+    """
+    with _POLLERS_LOCK:
+        pollers = _context_pollers(context)
+    for poller in pollers:
+        poller.on_fd_added(fd, events)
+
+
+def _on_fd_removed(context: libusb.Context, fd: hints.Int, _: hints.Args) -> None:
+    """
+    Poll file descriptor notifier of libusb that unregisters the removed file descriptor from all pollers of
+    the context.
+    """
+    with _POLLERS_LOCK:
+        pollers = _context_pollers(context)
+    for poller in pollers:
+        poller.on_fd_removed(fd)
+
+
+class HotplugMonitor(hotplug.HotplugMonitor):
+    """
+    Asynchronous iterator of :class:`~adbts.usb.hotplug.HotplugEvent` for ADB interfaces that are attached to
+    or detached from the bus. The hotplug callbacks are driven by the event loop through the
+    :class:`~adbts.usb.asynchronous.EventLoopPoller` of the USB context.
+
+    The monitor is driven by the event loop running the co-routine that creates it; passing `loop` is
+    deprecated.
+
+    .. note:: This monitor must only be used from the thread running its event loop.
+    """
+
+    def __init__(self,
+                 serial: libusb.SerialNumbers = None,
+                 vid: libusb.VendorIds = None,
+                 pid: libusb.ProductIds = None,
+                 context: libusb.OptionalContext = None,
+                 enumerate_attached: hints.Bool = True,
+                 loop: hints.OptionalEventLoop = None) -> None:
+        super().__init__(serial, vid, pid, context, enumerate_attached)
+        self._loop = loops.running_loop(loop)
+        self._poller = None  # type: typing.Optional[EventLoopPoller]
+        self._waiter = None  # type: typing.Optional[hints.Future]
+
+    async def __aenter__(self) -> 'HotplugMonitor':
+        self.open()
+        return self
+
+    async def __aexit__(self, *args: hints.Args) -> None:
+        self.close()
+
+    def __aiter__(self) -> 'HotplugMonitor':
+        return self
+
+    async def __anext__(self) -> hotplug.HotplugEvent:
+        while not self.closed:
+            event = self.pop_event()
+            if event is not None:
+                return event
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        raise StopAsyncIteration
+
+    def open(self) -> None:
+        """
+        Register the hotplug callback with libusb and start handling events of its USB context on the event loop.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When libusb does not support hotplug on this platform
+        """
+        super().open()
+        self._poller = acquire_poller(self._context, self._loop)
+
+    def close(self) -> None:
+        """
+        Deregister the hotplug callback and stop handling events of its USB context if no longer used.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        if self._poller is not None:
+            release_poller(self._poller)
+            self._poller = None
+        super().close()
+        self._wake()
+
+    def _on_event_queued(self) -> None:
+        """
+        Wake the pending :meth:`~adbts.usb.asynchronous.HotplugMonitor.__anext__` call on the event loop.
+        """
+        if loops.current_loop() is self._loop:
+            self._wake()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class Transport(transport.Transport):
+    """
+    Defines asynchronous (non-blocking) USB transport using `asyncio`.
+
+    .. note:: This transport must only be used from the thread running its event loop.
+    """
+
+    def __init__(self,
+                 serial: libusb.SerialNumber,
+                 vid: libusb.VendorId,
+                 pid: libusb.ProductId,
+                 context: libusb.Context,
+                 device: libusb.Device,
+                 handle: libusb.Handle,
+                 interface_settings: libusb.InterfaceSettings,
+                 read_endpoint: libusb.Endpoint,
+                 write_endpoint: libusb.Endpoint,
+                 poller: EventLoopPoller,
+                 loop: hints.EventLoop) -> None:
+        self._serial = serial
+        self._vid = vid
+        self._pid = pid
+        self._context = context
+        self._device = device
+        self._handle = handle
+        self._interface_settings = interface_settings
+        self._read_endpoint = read_endpoint
+        self._write_endpoint = write_endpoint
+        self._poller = poller
+        self._loop = loop
+        self._closed = False
+
+    def __repr__(self) -> hints.Str:
+        return '<{}({}, state={!r})>'.format(self.__class__.__name__, str(self),
+                                             'closed' if self.closed else 'open')
+
+    def __str__(self) -> hints.Str:
+        serial = 'serial={!r}'.format(self._serial or '*')
+        vid = 'vid={!r}'.format(self._vid or '*')
+        pid = 'pid={!r}'.format(self._pid or '*')
+        return ', '.join((serial, vid, pid))
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the transport is closed.
+
+        :return: Closed state of the transport
+        :rtype: :class:`~bool`
+        """
+        return self._closed is True
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @libusb.reraise_libusb_errors
+    async def read(self,
+                   num_bytes: hints.Int,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        transfer = await self._transfer(self._read_endpoint, num_bytes, timeout)
+        return bytes(transfer.getBuffer()[:transfer.getActualLength()])
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    @libusb.reraise_libusb_errors
+    async def readinto(self,
+                       buffer: hints.WritableBuffer,
+                       timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        The bulk transfer is submitted with the given buffer so libusb writes into it directly.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        transfer = await self._transfer(self._read_endpoint, buffer, timeout)
+        return transfer.getActualLength()
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @libusb.reraise_libusb_errors
+    async def read_exactly(self,
+                           num_bytes: hints.Int,
+                           timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport into a single preallocated buffer.
+
+        Bulk transfers are submitted with the remainder of the buffer until it is full, all within the timeout.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When a transfer returned no bytes before all
+            bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = timeouts.deadline(timeout)
+        buffer = bytearray(num_bytes)
+        with memoryview(buffer) as view:
+            received = 0
+            while received < num_bytes:
+                transfer = await self._transfer(self._read_endpoint, view[received:],
+                                                timeouts.remaining(deadline, timeout))
+                chunk = transfer.getActualLength()
+                if not chunk:
+                    raise exceptions.TransportEndpointNotFound(
+                        'Transfer returned no bytes after {} of {} bytes'.format(received, num_bytes))
+                received += chunk
+        return buffer
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    @libusb.reraise_libusb_errors
+    async def write(self,
+                    data: hints.Buffer,
+                    timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write bytes to the transport.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes` or :class:`~bytearray`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        await self._write_transfer(data, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    @libusb.reraise_libusb_errors
+    async def writev(self,
+                     buffers: hints.Buffers,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        The buffers are sent as one bulk OUT transfer, terminated by a zero-length packet when its length
+        is a multiple of the endpoint max packet size.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        data = b''.join(buffers)
+        await self._write_transfer(data, timeout)
+        if libusb.requires_zero_length_packet(self._write_endpoint, len(data)):
+            await self._transfer(self._write_endpoint, b'', timeout)
+
+    @transport.ensure_opened
+    @libusb.reraise_libusb_errors
+    async def write_file(self,
+                         file: hints.FileSource,
+                         offset: hints.Int = 0,
+                         count: hints.OptionalInt = None,
+                         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        The file is mapped into memory and bulk OUT transfers are submitted directly from slices of the mapping,
+        all within the timeout.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened or mapped
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = timeouts.deadline(timeout)
+        with files.open_file(file) as fd:
+            count = files.file_range(fd, offset, count)
+            with files.mapped(fd, offset, count) as view:
+                for start in range(0, count, files.DEFAULT_CHUNK_SIZE):
+                    await self._write_transfer(view[start:start + files.DEFAULT_CHUNK_SIZE],
+                                               timeouts.remaining(deadline, timeout))
+        return count
+
+    @transport.ensure_opened
+    @libusb.reraise_libusb_errors
+    def close(self) -> None:
+        """
+        Close the transport.
+
+        :return: Nothing
+        :rtype: `None`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        """
+        release_poller(self._poller)
+        libusb.close(self._context, self._handle, self._interface_settings)
+        self._closed = True
+
+    async def _transfer(self,
+                        endpoint: libusb.Endpoint,
+                        buffer_or_len: typing.Union[hints.Buffer, hints.WritableBuffer, hints.Int],
+                        timeout: hints.Timeout) -> libusb.Transfer:
+        """
+        Submit a bulk transfer and wait for libusb to complete it on the event loop.
+        """
+        future = self._loop.create_future()
+        transfer = libusb.submit_bulk_transfer(self._handle, endpoint, buffer_or_len,
+                                               functools.partial(_on_transfer_completed, future, timeout),
+                                               timeouts.timeout(timeout))
+        self._poller.schedule_timeout()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if transfer.isSubmitted():
+                transfer.cancel()
+            raise
+
+    async def _write_transfer(self, data: hints.Buffer, timeout: hints.Timeout) -> None:
+        """
+        Submit a bulk OUT transfer and raise if the device did not accept all bytes.
+        """
+        transfer = await self._transfer(self._write_endpoint, data, timeout)
+        num_bytes = transfer.getActualLength()
+        if num_bytes != len(data):
+            raise exceptions.TransportError(
+                'Only wrote {} bytes when expected {} bytes'.format(num_bytes, len(data)))
+
+
+def _on_transfer_completed(future: hints.Future, timeout: hints.Timeout, transfer: libusb.Transfer) -> None:
+    """
+    Resolve the future waiting on the transfer on its event loop.
+
+    The shared USB context may have its events handled by another thread, e.g. a synchronous transport,
+    in which case the future is resolved on its own loop thread.
+    """
+    loop = future.get_loop()
+    status = transfer.getStatus()
+    if loops.current_loop() is loop:
+        _resolve_transfer(future, timeout, transfer, status)
+    else:
+        loop.call_soon_threadsafe(_resolve_transfer, future, timeout, transfer, status)
+
+
+def _resolve_transfer(future: hints.Future, timeout: hints.Timeout,
+                      transfer: libusb.Transfer, status: hints.Int) -> None:
+    """
+    Resolve the future waiting on the transfer with its result or mapped transport exception.
+    """
+    if future.done():
+        return
+    if status == libusb.USB_TRANSFER_COMPLETED:
+        future.set_result(transfer)
+    else:
+        future.set_exception(libusb.transfer_status_to_transport_error(status, timeout))
+
+
+@libusb.reraise_libusb_errors
+async def open(serial: libusb.SerialNumber = None,  # pylint: disable=redefined-builtin
+               vid: libusb.VendorId = None,
+               pid: libusb.ProductId = None,
+               loop: hints.OptionalEventLoop = None) -> transport.TransportOpenResult:
+    """
+    Open a new :class:`~adbts.usb.asynchronous.Transport` transport to a USB device.
+
+    :param serial: Optional serial number filter
+    :type serial: :class:`~str` or :class:`~NoneType`
+    :param vid: Optional vendor id filter
+    :type vid: :class:`~int` or :class:`~NoneType`
+    :param vid: Optional product id filter
+    :type pid: :class:`~int` or :class:`~NoneType`
+    :param loop: Deprecated, the running event loop is used
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :return: Asynchronous USB transport
+    :rtype: :class:`~adbts.usb.asynchronous.Transport`
+    """
+    loop = loops.running_loop(loop)
+
+    # Acquire the process-wide context for accessing a USB device. The context is driven by the event loop,
+    # so transfers across any number of devices are completed on the loop thread.
+    with libusb.release_context_on_error(libusb.acquire_context()) as context:
+        # Open the first device that matches the given serial/vid/pid filter provided. If no filter
+        # was provided, this will yield back the first device that matches the USB class/subclass/protocol
+        # supported by ADB. Enumerating the bus reads serial numbers with control transfers, so the lookup
+        # runs in the executor of the loop. A stale device of the index is looked up again once.
+        find = functools.partial(index.find_indexed_device_or_raise, serial, vid, pid, context)
+        try:
+            device, interface_settings = await loop.run_in_executor(None, find)
+            return _open_device(serial, vid, pid, context, device, interface_settings, loop)
+        except usb1.USBError:
+            index.invalidate_device_index()
+        device, interface_settings = await loop.run_in_executor(None, find)
+        return _open_device(serial, vid, pid, context, device, interface_settings, loop)
+
+
+def _open_device(serial: libusb.SerialNumber,
+                 vid: libusb.VendorId,
+                 pid: libusb.ProductId,
+                 context: libusb.Context,
+                 device: libusb.Device,
+                 interface_settings: libusb.InterfaceSettings,
+                 loop: hints.EventLoop) -> Transport:
+    """
+    Open a handle to the device, claim its interface and create the transport. The caller is responsible
+    for releasing the context on error.
+    """
+    # Grab first device interface endpoint that is used for reading.
+    read_endpoint = libusb.find_read_endpoint(interface_settings)
+    if not read_endpoint:
+        raise exceptions.TransportError('Cannot find read endpoint for USB device interface')
+
+    # Grab first device interface endpoint that is used for writing.
+    write_endpoint = libusb.find_write_endpoint(interface_settings)
+    if not write_endpoint:
+        raise exceptions.TransportError('Cannot find write endpoint for USB device interface')
+
+    # Open this USB device and grab a handle required to perform I/O.
+    with ctxlib.close_on_error(libusb.open_device_handle(device)) as handle:
+        # Claim the device interface. Doing makes this USB device interface unusable to other clients
+        # until it is released.
+        with libusb.claim_interface(handle, interface_settings):
+            poller = acquire_poller(context, loop)
+            return Transport(serial, vid, pid, context, device, handle,
+                             interface_settings, read_endpoint, write_endpoint, poller, loop)
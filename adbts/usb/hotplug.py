@@ -0,0 +1,238 @@
+"""
+    adbts.usb.hotplug
+    ~~~~~~~~~~~~~~~~~
+
+    Contains functionality for monitoring ADB devices that are attached to or detached from the bus.
+"""
+import collections
+import time
+import typing
+
+import usb1
+
+from .. import exceptions, hints
+from . import index, libusb
+
+__all__ = ['HotplugMonitor', 'HotplugEvent', 'HOTPLUG_EVENT_ARRIVED', 'HOTPLUG_EVENT_LEFT']
+
+
+#: Hotplug event type for a device that was attached to the bus.
+HOTPLUG_EVENT_ARRIVED = usb1.HOTPLUG_EVENT_DEVICE_ARRIVED  # pylint: disable=no-member
+
+
+#: Hotplug event type for a device that was detached from the bus.
+HOTPLUG_EVENT_LEFT = usb1.HOTPLUG_EVENT_DEVICE_LEFT  # pylint: disable=no-member
+
+
+#: Event of a :class:`~adbts.usb.hotplug.HotplugMonitor` describing an ADB interface that arrived or left.
+HotplugEvent = typing.NamedTuple('HotplugEvent', [
+    ('event', hints.Int),
+    ('device', libusb.Device),
+    ('settings', libusb.InterfaceSettings),
+    ('serial', libusb.SerialNumber),
+    ('port_path', libusb.PortPath)
+])
+
+
+#: Type hint for a hotplug event received by a callback that has not been filtered yet.
+# pylint: disable=invalid-name
+PendingHotplugEvent = typing.Tuple[hints.Int, libusb.Device, libusb.OptionalInterfaceSettings]
+# pylint: enable=invalid-name
+
+
+#: Type hint for an optional hotplug event.
+OptionalHotplugEvent = typing.Optional[HotplugEvent]  # pylint: disable=invalid-name
+
+
+class HotplugMonitor:
+    """
+    Iterator of :class:`~adbts.usb.hotplug.HotplugEvent` for ADB interfaces that are attached to or detached
+    from the bus, driven by libusb hotplug callbacks rather than rescanning the bus.
+
+    Devices are filtered by a :class:`~adbts.usb.libusb.DeviceFilter`, so serial/vid/pid filters may be a single
+    value or a collection of them. Serial numbers are read when the event is consumed, as libusb forbids
+    synchronous I/O within its callbacks, and at most once per attached device. Every event invalidates
+    :data:`~adbts.usb.index.DEVICE_INDEX`.
+
+    .. note:: Events must be consumed by a single thread.
+    """
+
+    def __init__(self,
+                 serial: libusb.SerialNumbers = None,
+                 vid: libusb.VendorIds = None,
+                 pid: libusb.ProductIds = None,
+                 context: libusb.OptionalContext = None,
+                 enumerate_attached: hints.Bool = True) -> None:
+        self._serial = serial
+        self._vid = vid
+        self._pid = pid
+        self._filter = libusb.DeviceFilter(serial, vid, pid)
+        self._context = context
+        self._owns_context = context is None
+        self._enumerate_attached = enumerate_attached
+        self._handle = None  # type: hints.OptionalInt
+        self._pending = collections.deque()  # type: typing.Deque[PendingHotplugEvent]
+        self._attached = {}  # type: typing.Dict[typing.Tuple[hints.Int, hints.Int], HotplugEvent]
+
+    def __enter__(self) -> 'HotplugMonitor':
+        self.open()
+        return self
+
+    def __exit__(self, *args: hints.Args) -> None:
+        self.close()
+
+    def __iter__(self) -> 'HotplugMonitor':
+        return self
+
+    def __next__(self) -> HotplugEvent:
+        event = None
+        while event is None:
+            event = self.next_event()
+        return event
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the monitor is closed.
+
+        :return: Closed state of the monitor
+        :rtype: :class:`~bool`
+        """
+        return self._handle is None
+
+    def open(self) -> None:
+        """
+        Register the hotplug callback with libusb.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When libusb does not support hotplug on this platform
+        """
+        if not usb1.hasCapability(usb1.CAP_HAS_HOTPLUG):  # pylint: disable=no-member
+            raise exceptions.TransportError('Hotplug is not supported by libusb on this platform')
+        # Start with no cached serial numbers as addresses of devices may have been reused while closed.
+        self._filter = libusb.DeviceFilter(self._serial, self._vid, self._pid)
+        if not self._owns_context:
+            self._handle = self._register(self._context)
+            return
+        with libusb.release_context_on_error(libusb.acquire_context()) as context:
+            self._handle = self._register(context)
+            self._context = context
+
+    def close(self) -> None:
+        """
+        Deregister the hotplug callback and release the USB context if it was acquired by the monitor.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        if self._handle is None:
+            return
+        self._context.hotplugDeregisterCallback(self._handle)
+        self._handle = None
+        self._pending.clear()
+        self._attached.clear()
+        if self._owns_context:
+            libusb.release_context(self._context)
+            self._context = None
+
+    def next_event(self, timeout: hints.OptionalInt = None) -> OptionalHotplugEvent:
+        """
+        Wait for the next hotplug event.
+
+        :param timeout: Maximum number of milliseconds to wait, None to wait forever
+        :type timeout: :class:`~int` or :class:`~NoneType`
+        :return: Next event or None if no event occurred within the timeout
+        :rtype: :class:`~adbts.usb.hotplug.HotplugEvent` or :class:`~NoneType`
+        """
+        deadline = time.monotonic() + timeout / 1000 if timeout is not None else None
+
+        while True:
+            event = self.pop_event()
+            if event is not None:
+                return event
+            if deadline is None:
+                self._context.handleEvents()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._context.handleEventsTimeout(remaining)
+
+    def pop_event(self) -> OptionalHotplugEvent:
+        """
+        Get the next hotplug event that was already received without handling libusb events.
+
+        :return: Next event or None if none are pending
+        :rtype: :class:`~adbts.usb.hotplug.HotplugEvent` or :class:`~NoneType`
+        """
+        while self._pending:
+            event = self._to_event(*self._pending.popleft())
+            if event is not None:
+                return event
+        return None
+
+    def _register(self, context: libusb.Context) -> hints.Int:
+        """
+        Register the hotplug callback on the given context, letting libusb match a single vendor/product id.
+        """
+        # pylint: disable=no-member
+        return context.hotplugRegisterCallback(
+            self._on_hotplug,
+            flags=usb1.HOTPLUG_ENUMERATE if self._enumerate_attached else usb1.HOTPLUG_NO_FLAGS,
+            vendor_id=_hotplug_match(libusb.filter_values(self._vid)),
+            product_id=_hotplug_match(libusb.filter_values(self._pid)))
+
+    def _on_hotplug(self, _: libusb.Context, device: libusb.Device, event: hints.Int) -> hints.Bool:
+        """
+        Queue arrivals of devices with an ADB interface that match the vendor/product id filter and all departures,
+        as descriptors of detached devices are not available.
+        """
+        index.DEVICE_INDEX.invalidate()
+        if event == HOTPLUG_EVENT_ARRIVED:
+            settings = next((s for s in device.iterSettings() if self._filter.matches_descriptors(device, s)), None)
+            if settings is None:
+                return False
+            self._pending.append((event, device, settings))
+        else:
+            self._pending.append((event, device, None))
+        self._on_event_queued()
+        return False
+
+    def _on_event_queued(self) -> None:
+        """
+        Hook invoked from the hotplug callback after an event was queued.
+        """
+
+    def _to_event(self,
+                  event: hints.Int,
+                  device: libusb.Device,
+                  settings: libusb.OptionalInterfaceSettings) -> OptionalHotplugEvent:
+        """
+        Apply the serial number filter to a queued arrival and pair departures with their arrival.
+        """
+        key = (device.getBusNumber(), device.getDeviceAddress())
+        if event != HOTPLUG_EVENT_ARRIVED:
+            # The address of a detached device may be reused by the next one attached.
+            self._filter.forget(device)
+            arrival = self._attached.pop(key, None)
+            return arrival._replace(event=event, device=device) if arrival else None
+
+        try:
+            serial = self._filter.serial_number(device)
+        except usb1.USBError:
+            serial = None
+        if not self._filter.accepts_serial(serial):
+            return None
+
+        arrival = self._attached[key] = HotplugEvent(event, device, settings, serial, libusb.device_port_path(device))
+        return arrival
+
+
+def _hotplug_match(values: typing.Optional[typing.FrozenSet[hints.Int]]) -> hints.Int:
+    """
+    Get the vendor/product id libusb matches for a hotplug callback, any when the filter has several values.
+    """
+    if values is not None and len(values) == 1:
+        return next(iter(values))
+    return usb1.HOTPLUG_MATCH_ANY  # pylint: disable=no-member
@@ -0,0 +1,298 @@
+"""
+    adbts.usb.index
+    ~~~~~~~~~~~~~~~
+
+    Contains functionality for finding USB devices through an index of the ADB interfaces on the bus.
+"""
+import threading
+import time
+import typing
+
+import usb1
+
+from .. import exceptions, hints
+from . import libusb
+
+__all__ = ['DeviceIndex', 'DeviceIndexEntry', 'DEVICE_INDEX', 'DEFAULT_DEVICE_INDEX_TTL', 'find_indexed_device',
+           'find_indexed_device_or_raise', 'invalidate_device_index', 'open_indexed_device']
+
+
+#: Entry of a :class:`~adbts.usb.index.DeviceIndex` describing one ADB interface of a device.
+DeviceIndexEntry = typing.NamedTuple('DeviceIndexEntry', [
+    ('device', libusb.Device),
+    ('settings', libusb.InterfaceSettings),
+    ('serial', libusb.SerialNumber),
+    ('vid', libusb.VendorId),
+    ('pid', libusb.ProductId),
+    ('port_path', libusb.PortPath)
+])
+
+
+#: Type hint for the entries of a :class:`~adbts.usb.index.DeviceIndex` found by one lookup key.
+DeviceIndexEntries = typing.List[DeviceIndexEntry]  # pylint: disable=invalid-name
+
+
+#: Default number of seconds a :class:`~adbts.usb.index.DeviceIndex` is used before enumerating again.
+DEFAULT_DEVICE_INDEX_TTL = 10.0
+
+
+class DeviceIndex:
+    """
+    Index of the ADB interfaces of all devices on the bus, keyed by serial number, vendor/product id and
+    bus/port path.
+
+    Enumerating the bus walks every interface setting of every device and reading a serial number requires
+    a control transfer, so the results are kept for a limited time and looked up with a dictionary.
+    The index is enumerated again when it expires, is invalidated, or a lookup misses.
+    """
+
+    def __init__(self, ttl: hints.Float = DEFAULT_DEVICE_INDEX_TTL) -> None:
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._context = None  # type: libusb.OptionalContext
+        self._expires_at = 0.0
+        self._generation = 0
+        self._entries = []  # type: DeviceIndexEntries
+        self._by_serial = {}  # type: typing.Dict[hints.Str, DeviceIndexEntries]
+        self._by_vid_pid = {}  # type: typing.Dict[typing.Tuple[libusb.VendorId, libusb.ProductId], DeviceIndexEntries]
+        self._by_port_path = {}  # type: typing.Dict[libusb.PortPath, DeviceIndexEntries]
+
+    @property
+    def entries(self) -> DeviceIndexEntries:
+        """
+        ADB interfaces found by the most recent enumeration, in bus order.
+
+        :return: List of index entries
+        :rtype: :class:`~list`
+        """
+        return list(self._entries)
+
+    def invalidate(self) -> None:
+        """
+        Discard the index so the next lookup enumerates the bus again.
+
+        This does not take the index lock as it may be called by a hotplug callback while libusb handles
+        events during an enumeration on the same thread.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._generation += 1
+        self._expires_at = 0.0
+
+    def refresh(self, context: libusb.Context, skip_on_error: hints.Bool = True) -> None:
+        """
+        Enumerate the bus and rebuild the index.
+
+        :param context: USB context to use for querying devices
+        :type context: :class:`~usb1.USBContext`
+        :param skip_on_error: Optional flag indicating if devices that raise errors should be ignored
+        :type skip_on_error: :class:`~bool`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._lock:
+            self._refresh(context, skip_on_error)
+
+    def find(self,
+             context: libusb.Context,
+             serial: libusb.SerialNumber = None,
+             vid: libusb.VendorId = None,
+             pid: libusb.ProductId = None,
+             port_path: libusb.OptionalPortPath = None,
+             skip_on_error: hints.Bool = True) -> libusb.OptionalDeviceAndInterfaceSettings:
+        """
+        Find the first ADB interface that matches the filter.
+
+        :param context: USB context to use for querying devices
+        :type context: :class:`~usb1.USBContext`
+        :param serial: Optional serial number filter
+        :type serial: :class:`~str` or :class:`~NoneType`
+        :param vid: Optional vendor id filter
+        :type vid: :class:`~int` or :class:`~NoneType`
+        :param pid: Optional product id filter
+        :type pid: :class:`~int` or :class:`~NoneType`
+        :param port_path: Optional bus number and port numbers filter
+        :type port_path: :class:`~tuple` or :class:`~NoneType`
+        :param skip_on_error: Optional flag indicating if devices that raise errors should be ignored
+        :type skip_on_error: :class:`~bool`
+        :return: Two item tuple with device and interface settings
+        :rtype: :class:`~tuple` containing :class:`~usb1.USBDevice` and :class:`~usb1.USBInterfaceSetting`
+        """
+        with self._lock:
+            refreshed = False
+            if context is not self._context or time.monotonic() >= self._expires_at:
+                self._refresh(context, skip_on_error)
+                refreshed = True
+
+            entry = self._lookup(serial, vid, pid, port_path)
+
+            # The device may have arrived since the bus was enumerated.
+            if entry is None and not refreshed:
+                self._refresh(context, skip_on_error)
+                entry = self._lookup(serial, vid, pid, port_path)
+
+        if entry is None:
+            return None, None
+        return entry.device, entry.settings
+
+    def _refresh(self, context: libusb.Context, skip_on_error: hints.Bool) -> None:
+        """
+        Enumerate the bus and rebuild all lookup tables. Caller must hold the lock.
+        """
+        generation = self._generation
+        entries = []
+        for device, settings in libusb.find_devices_interfaces_generator(context, skip_on_error):
+            if not libusb.is_adb_interface(settings):
+                continue
+            try:
+                serial = device.getSerialNumber()
+            except usb1.USBError:
+                if not skip_on_error:
+                    raise
+                serial = None
+            entries.append(DeviceIndexEntry(device, settings, serial, device.getVendorID(),
+                                            device.getProductID(), libusb.device_port_path(device)))
+
+        self._by_serial = {}
+        self._by_vid_pid = {}
+        self._by_port_path = {}
+        for entry in entries:
+            self._by_serial.setdefault(entry.serial, []).append(entry)
+            self._by_vid_pid.setdefault((entry.vid, entry.pid), []).append(entry)
+            self._by_port_path.setdefault(entry.port_path, []).append(entry)
+
+        self._entries = entries
+        self._context = context
+
+        # Keep the index expired if it was invalidated while enumerating.
+        if generation == self._generation:
+            self._expires_at = time.monotonic() + self._ttl
+        else:
+            self._expires_at = 0.0
+
+    def _lookup(self,
+                serial: libusb.SerialNumber,
+                vid: libusb.VendorId,
+                pid: libusb.ProductId,
+                port_path: libusb.OptionalPortPath) -> typing.Optional[DeviceIndexEntry]:
+        """
+        Find the first entry that matches the filter using the narrowest lookup table.
+        """
+        if serial:
+            candidates = self._by_serial.get(serial, [])
+        elif port_path:
+            candidates = self._by_port_path.get(tuple(port_path), [])
+        elif vid and pid:
+            candidates = self._by_vid_pid.get((vid, pid), [])
+        else:
+            candidates = self._entries
+
+        return next((entry for entry in candidates
+                     if (not vid or entry.vid == vid) and
+                     (not pid or entry.pid == pid) and
+                     (not port_path or entry.port_path == tuple(port_path))), None)
+
+
+#: Process-wide index of ADB devices on the bus of the shared USB context.
+DEVICE_INDEX = DeviceIndex()
+
+
+def find_indexed_device(serial: libusb.SerialNumber = None,
+                        vid: libusb.VendorId = None,
+                        pid: libusb.ProductId = None,
+                        context: libusb.OptionalContext = None,
+                        port_path: libusb.OptionalPortPath = None,
+                        skip_on_error: hints.Bool = True) -> libusb.OptionalDeviceAndInterfaceSettings:
+    """
+    Find a local USB device using the process-wide :class:`~adbts.usb.index.DeviceIndex`.
+
+    :param serial: Optional serial number filter
+    :type serial: :class:`~str` or :class:`~NoneType`
+    :param vid: Optional vendor id filter
+    :type vid: :class:`~int` or :class:`~NoneType`
+    :param pid: Optional product id filter
+    :type pid: :class:`~int` or :class:`~NoneType`
+    :param context: Optional USB context to use for querying devices
+    :type context: :class:`~usb1.USBContext` or :class:`~NoneType`
+    :param port_path: Optional bus number and port numbers filter
+    :type port_path: :class:`~tuple` or :class:`~NoneType`
+    :param skip_on_error: Optional flag indicating if devices that raise errors should be ignored
+    :type skip_on_error: :class:`~bool`
+    :return: Two item tuple with device and interface settings
+    :rtype: :class:`~tuple` containing :class:`~usb1.USBDevice` and :class:`~usb1.USBInterfaceSetting`
+    """
+    with libusb.optional_usb_context(context) as ctx:
+        return DEVICE_INDEX.find(ctx, serial, vid, pid, port_path, skip_on_error)
+
+
+def invalidate_device_index() -> None:
+    """
+    Discard the process-wide :class:`~adbts.usb.index.DeviceIndex` so the next lookup enumerates the bus.
+
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    """
+    DEVICE_INDEX.invalidate()
+
+
+def open_indexed_device(opener: typing.Callable[[libusb.Device, libusb.InterfaceSettings], typing.Any],
+                        serial: libusb.SerialNumber = None,
+                        vid: libusb.VendorId = None,
+                        pid: libusb.ProductId = None,
+                        context: libusb.OptionalContext = None) -> typing.Any:
+    """
+    Find a local USB device using the process-wide :class:`~adbts.usb.index.DeviceIndex` and open it with
+    the given function.
+
+    The index may still hold a device that re-enumerated since it was indexed, e.g. after adbd restarted or the
+    device rebooted. When opening it raises a :class:`~usb1.USBError`, the index is invalidated and the device
+    is looked up and opened once more.
+
+    :param opener: Function that opens the found device and interface settings
+    :type opener: :class:`~collections.abc.Callable`
+    :param serial: Optional serial number filter
+    :type serial: :class:`~str` or :class:`~NoneType`
+    :param vid: Optional vendor id filter
+    :type vid: :class:`~int` or :class:`~NoneType`
+    :param pid: Optional product id filter
+    :type pid: :class:`~int` or :class:`~NoneType`
+    :param context: Optional USB context to use for querying devices
+    :type context: :class:`~usb1.USBContext` or :class:`~NoneType`
+    :return: Result of the given function
+    :rtype: :class:`~object`
+    :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When no device matches the filter
+    :raises :class:`~usb1.USBError`: When the device found again cannot be opened either
+    """
+    try:
+        return opener(*find_indexed_device_or_raise(serial, vid, pid, context))
+    except usb1.USBError:
+        DEVICE_INDEX.invalidate()
+    return opener(*find_indexed_device_or_raise(serial, vid, pid, context))
+
+
+def find_indexed_device_or_raise(serial: libusb.SerialNumber = None,
+                                 vid: libusb.VendorId = None,
+                                 pid: libusb.ProductId = None,
+                                 context: libusb.OptionalContext = None) -> libusb.DeviceAndInterfaceSettings:
+    """
+    Find a local USB device using the process-wide :class:`~adbts.usb.index.DeviceIndex`, raising when no
+    device matches the filter.
+
+    :param serial: Optional serial number filter
+    :type serial: :class:`~str` or :class:`~NoneType`
+    :param vid: Optional vendor id filter
+    :type vid: :class:`~int` or :class:`~NoneType`
+    :param pid: Optional product id filter
+    :type pid: :class:`~int` or :class:`~NoneType`
+    :param context: Optional USB context to use for querying devices
+    :type context: :class:`~usb1.USBContext` or :class:`~NoneType`
+    :return: Two item tuple with device and interface settings
+    :rtype: :class:`~tuple` containing :class:`~usb1.USBDevice` and :class:`~usb1.USBInterfaceSetting`
+    :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When no device matches the filter
+    """
+    device, interface_settings = find_indexed_device(serial, vid, pid, context)
+    if device is None or interface_settings is None:
+        raise exceptions.TransportEndpointNotFound(
+            'Cannot find USB device for serial={} vid={} pid={}'.format(serial, vid, pid))
+    return device, interface_settings
@@ -6,6 +6,8 @@
 """
 import contextlib
 import functools
+import inspect
+import threading
 import typing
 
 import usb1
@@ -74,6 +76,14 @@ ReleaseInterfaceContextManager = usb1._ReleaseInterface
 # pylint: enable=invalid-name, protected-access
 
 
+#: Type hint alias for libusb :class:`~usb1.USBTransfer`.
+Transfer = usb1.USBTransfer  # pylint: disable=invalid-name
+
+
+#: Type hint for a callback function invoked when a :class:`~usb1.USBTransfer` completes.
+TransferCallback = typing.Callable[[Transfer], None]  # pylint: disable=invalid-name
+
+
 #: Type hint for a USB serial number.
 SerialNumber = typing.Optional[hints.Str]  # pylint: disable=invalid-name
 
@@ -82,6 +92,18 @@ SerialNumber = typing.Optional[hints.Str]  # pylint: disable=invalid-name
 VendorId = typing.Optional[hints.Int]  # pylint: disable=invalid-name
 
 
+#: Type hint for a serial number filter that is a single serial number or a collection of them.
+SerialNumbers = typing.Union[SerialNumber, typing.Iterable[hints.Str]]  # pylint: disable=invalid-name
+
+
+#: Type hint for a vendor id filter that is a single vendor id or a collection of them.
+VendorIds = typing.Union[VendorId, typing.Iterable[hints.Int]]  # pylint: disable=invalid-name
+
+
+#: Type hint for a product id filter that is a single product id or a collection of them.
+ProductIds = typing.Union[ProductId, typing.Iterable[hints.Int]]  # pylint: disable=invalid-name
+
+
 #: Type hint for an two-item tuple of USB device and settings.
 DeviceAndInterfaceSettings = typing.Tuple[Device, InterfaceSettings]  # pylint: disable=invalid-name
 
@@ -98,6 +120,14 @@ OptionalDeviceAndInterfaceSettings = typing.Union[DeviceAndInterfaceSettings, ty
 # pylint: enable=redefined-outer-name
 
 
+#: Type hint for the bus number followed by the port numbers that locate a device on the bus.
+PortPath = typing.Tuple[hints.Int, ...]  # pylint: disable=invalid-name
+
+
+#: Type hint for an optional bus/port path.
+OptionalPortPath = typing.Optional[PortPath]  # pylint: disable=invalid-name
+
+
 #: USB device class supported by ADB (vendor specific).
 USB_DEVICE_CLASS = 0xff
 
@@ -114,11 +144,31 @@ USB_DEVICE_PROTOCOL = 0x1
 USB_ENDPOINT_DIRECTION_IN = 0x80
 
 
+#: Asynchronous transfer status indicating it completed without error.
+USB_TRANSFER_COMPLETED = usb1.TRANSFER_COMPLETED  # pylint: disable=no-member
+
+
 def reraise_libusb_errors(func: hints.DecoratorFunc) -> hints.DecoratorReturnValue:
     """
     Decorator that catches :class:`~usb1.USBError` exceptions and re-raises them as
     specific exception types that derive from :class:`~adbts.exceptions.TransportError`.
+
+    Coroutine functions are wrapped by a coroutine so errors raised while the result is awaited are
+    also re-raised.
     """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_decorator(*args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
+            """
+            Catch and re-raise libusb related exceptions raised while awaiting the decorated coroutine.
+            """
+            try:
+                return await func(*args, **kwargs)
+            except usb1.USBError as ex:
+                raise usb_error_to_transport_error(ex, kwargs.get('timeout', 'inf')) from ex
+
+        return coroutine_decorator
+
     @functools.wraps(func)
     def decorator(*args: hints.Args, **kwargs: hints.Kwargs) -> hints.DecoratorReturnValue:
         """
@@ -127,21 +177,52 @@ def reraise_libusb_errors(func: hints.DecoratorFunc) -> hints.DecoratorReturnVal
         try:
             return func(*args, **kwargs)
         except usb1.USBError as ex:
-            if ex.value == usb1.ERROR_NO_DEVICE:  # pylint: disable=no-member
-                raise exceptions.TransportEndpointNotFound(
-                    'Device not found or has been disconnected') from ex
-            if ex.value == usb1.ERROR_ACCESS:  # pylint: disable=no-member
-                raise exceptions.TransportAccessDenied(
-                    'Insufficient permissions or interface already claimed') from ex
-            if ex.value == usb1.ERROR_TIMEOUT:  # pylint: disable=no-member
-                raise exceptions.TransportTimeoutError(
-                    'Exceeded timeout of {} ms'.format(kwargs.get('timeout', 'inf'))) from ex
-            raise exceptions.TransportError(
-                'Unhandled USB transport error {}'.format(getattr(ex, '__name__', str(ex)))) from ex
+            raise usb_error_to_transport_error(ex, kwargs.get('timeout', 'inf')) from ex
 
     return decorator
 
 
+def usb_error_to_transport_error(ex: usb1.USBError,
+                                 timeout: hints.Timeout = None) -> exceptions.TransportError:
+    """
+    Create the transport exception that represents the given :class:`~usb1.USBError`.
+
+    :param ex: Exception raised by libusb
+    :type ex: :class:`~usb1.USBError`
+    :param timeout: Timeout value of the operation that raised
+    :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~str`
+    :return: Transport exception to raise
+    :rtype: :class:`~adbts.exceptions.TransportError`
+    """
+    if ex.value == usb1.ERROR_NO_DEVICE:  # pylint: disable=no-member
+        return exceptions.TransportEndpointNotFound('Device not found or has been disconnected')
+    if ex.value == usb1.ERROR_ACCESS:  # pylint: disable=no-member
+        return exceptions.TransportAccessDenied('Insufficient permissions or interface already claimed')
+    if ex.value == usb1.ERROR_TIMEOUT:  # pylint: disable=no-member
+        return exceptions.TransportTimeoutError('Exceeded timeout of {} ms'.format(timeout))
+    return exceptions.TransportError(
+        'Unhandled USB transport error {}'.format(getattr(ex, '__name__', str(ex))))
+
+
+def transfer_status_to_transport_error(status: hints.Int,
+                                       timeout: hints.Timeout = None) -> exceptions.TransportError:
+    """
+    Create the transport exception that represents the given unsuccessful asynchronous transfer status.
+
+    :param status: Status of a completed :class:`~usb1.USBTransfer`
+    :type status: :class:`~int`
+    :param timeout: Timeout value of the transfer
+    :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~str`
+    :return: Transport exception to raise
+    :rtype: :class:`~adbts.exceptions.TransportError`
+    """
+    if status == usb1.TRANSFER_NO_DEVICE:  # pylint: disable=no-member
+        return exceptions.TransportEndpointNotFound('Device not found or has been disconnected')
+    if status == usb1.TRANSFER_TIMED_OUT:  # pylint: disable=no-member
+        return exceptions.TransportTimeoutError('Exceeded timeout of {} ms'.format(timeout))
+    return exceptions.TransportError('Unhandled USB transfer status {}'.format(status))
+
+
 def read(handle: Handle,
          endpoint: Endpoint,
          num_bytes: hints.Int,
@@ -167,6 +248,34 @@ def read(handle: Handle,
     return handle.bulkRead(endpoint.getAddress(), num_bytes, timeout)
 
 
+def readinto(handle: Handle,
+             endpoint: Endpoint,
+             buffer: hints.WritableBuffer,
+             timeout: hints.Int) -> hints.Int:
+    """
+    Read bytes from a USB device endpoint directly into a caller owned buffer.
+
+    :param handle: USB device handle
+    :type handle: :class:`~usb1.USBDeviceHandle`
+    :param endpoint: Endpoint to read from
+    :type endpoint: :class:`~usb1.USBEndpoint`
+    :param buffer: Writable buffer to read bytes into, up to its length
+    :type buffer: :class:`~bytearray` or :class:`~memoryview`
+    :param timeout: Maximum number of milliseconds allowed to read bytes from endpoint
+    :type timeout: :class:`~int`
+    :return: Number of bytes read into the buffer
+    :rtype: :class:`~int`
+    :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When device is not found/disconnected
+    :raises :class:`~adbts.exceptions.TransportAccessDenied`: When we lack permissions to read
+    :raises :class:`~adbts.exceptions.TransportTimeoutError`: When read call exceeds timeout
+    :raises :class:`~adbts.exceptions.TransportError`: When USB transport encounters unhandled error
+    """
+    # Wrap the writable buffer with a ctypes array that shares its memory so libusb writes into it directly
+    # instead of into a temporary buffer that `bulkRead` would allocate and copy from.
+    data, _ = usb1.create_binary_buffer(buffer)
+    return handle._bulkTransfer(endpoint.getAddress(), data, len(buffer), timeout)  # pylint: disable=protected-access
+
+
 def write(handle: Handle,  # pylint: disable=useless-return
           endpoint: Endpoint,
           data: hints.Buffer,
@@ -197,6 +306,80 @@ def write(handle: Handle,  # pylint: disable=useless-return
     return None
 
 
+def writev(handle: Handle,  # pylint: disable=useless-return
+           endpoint: Endpoint,
+           buffers: hints.Buffers,
+           timeout: hints.Int) -> None:
+    """
+    Write a sequence of buffers to a USB device endpoint as a single bulk transfer.
+
+    :param handle: USB device handle
+    :type handle: :class:`~usb1.USBDeviceHandle`
+    :param endpoint: Endpoint to write to
+    :type endpoint: :class:`~usb1.USBEndpoint`
+    :param buffers: Sequence of byte collections to write in order
+    :type buffers: :class:`~list` or :class:`~tuple`
+    :param timeout: Maximum number of milliseconds allowed to write bytes to endpoint
+    :type timeout: :class:`~int`
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When device is not found/disconnected
+    :raises :class:`~adbts.exceptions.TransportAccessDenied`: When we lack permissions to write
+    :raises :class:`~adbts.exceptions.TransportTimeoutError`: When write call exceeds timeout
+    :raises :class:`~adbts.exceptions.TransportError`: When USB transport encounters unhandled error
+    :raises :class:`~adbts.exceptions.TransportError`: When not all bytes were written
+    """
+    data = b''.join(buffers)
+    write(handle, endpoint, data, timeout)
+    if requires_zero_length_packet(endpoint, len(data)):
+        handle.bulkWrite(endpoint.getAddress(), b'', timeout)
+    return None
+
+
+def requires_zero_length_packet(endpoint: Endpoint, num_bytes: hints.Int) -> hints.Bool:
+    """
+    Predicate function that determines if a bulk OUT transfer of the given size must be terminated by a
+    zero-length packet for the device to detect its end.
+
+    :param endpoint: Endpoint the transfer is written to
+    :type endpoint: :class:`~usb1.USBEndpoint`
+    :param num_bytes: Number of bytes in the transfer
+    :type num_bytes: :class:`~int`
+    :return: True if the transfer length is a multiple of the endpoint max packet size, False otherwise
+    :rtype: :class:`~bool`
+    """
+    max_packet_size = endpoint.getMaxPacketSize()
+    return num_bytes > 0 and max_packet_size > 0 and num_bytes % max_packet_size == 0
+
+
+def submit_bulk_transfer(handle: Handle,
+                         endpoint: Endpoint,
+                         buffer_or_len: typing.Union[hints.Buffer, hints.WritableBuffer, hints.Int],
+                         callback: TransferCallback,
+                         timeout: hints.Int) -> Transfer:
+    """
+    Submit an asynchronous bulk transfer to a USB device endpoint.
+
+    :param handle: USB device handle
+    :type handle: :class:`~usb1.USBDeviceHandle`
+    :param endpoint: Endpoint to transfer to/from
+    :type endpoint: :class:`~usb1.USBEndpoint`
+    :param buffer_or_len: Collection of bytes to write, writable buffer or number of bytes to read
+    :type buffer_or_len: :class:`~bytes`, :class:`~bytearray`, :class:`~memoryview` or :class:`~int`
+    :param callback: Function called with the transfer once it completes
+    :type callback: :class:`~function`
+    :param timeout: Maximum number of milliseconds allowed for the transfer
+    :type timeout: :class:`~int`
+    :return: Submitted transfer
+    :rtype: :class:`~usb1.USBTransfer`
+    :raises :class:`~usb1.USBError`: When libusb cannot submit the transfer
+    """
+    transfer = handle.getTransfer()
+    transfer.setBulk(endpoint.getAddress(), buffer_or_len, callback=callback, timeout=timeout)
+    transfer.submit()
+    return transfer
+
+
 def close(context: Context,
           handle: Handle,
           interface_settings: InterfaceSettings) -> None:
@@ -214,7 +397,7 @@ def close(context: Context,
     """
     handle.releaseInterface(interface_settings.getNumber())
     handle.close()
-    context.close()
+    release_context(context)
 
 
 def open_context() -> Context:
@@ -227,6 +410,107 @@ def open_context() -> Context:
     return usb1.USBContext().open()
 
 
+class ContextRegistry:
+    """
+    Reference counted USB context shared by all transports of the process.
+
+    Libusb contexts are expensive to create and each one enumerates the bus on its own, so transports
+    acquire the shared context when opened and release it when closed. The context is closed once the
+    last reference is released.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._context = None  # type: OptionalContext
+        self._references = 0
+
+    @property
+    def references(self) -> hints.Int:
+        """
+        Number of outstanding references to the shared context.
+
+        :return: Number of references
+        :rtype: :class:`~int`
+        """
+        return self._references
+
+    def acquire(self) -> Context:
+        """
+        Acquire a reference to the shared USB context, opening it if necessary.
+
+        :return: Shared and opened USB context
+        :rtype: :class:`~usb1.USBContext`
+        """
+        with self._lock:
+            if self._context is None:
+                self._context = open_context()
+            self._references += 1
+            return self._context
+
+    def release(self, context: Context) -> None:
+        """
+        Release a reference to the given USB context, closing it if it was the last one.
+
+        Contexts that were not acquired from this registry are closed immediately.
+
+        :param context: USB context to release
+        :type context: :class:`~usb1.USBContext`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        with self._lock:
+            if context is not self._context:
+                context.close()
+                return
+            self._references -= 1
+            if self._references <= 0:
+                self._context = None
+                self._references = 0
+                context.close()
+
+
+#: Process-wide registry of the USB context shared by transports.
+CONTEXT_REGISTRY = ContextRegistry()
+
+
+def acquire_context() -> Context:
+    """
+    Acquire a reference to the process-wide shared USB context.
+
+    :return: Shared and opened USB context
+    :rtype: :class:`~usb1.USBContext`
+    """
+    return CONTEXT_REGISTRY.acquire()
+
+
+def release_context(context: Context) -> None:
+    """
+    Release a reference to a USB context acquired by :func:`~adbts.usb.libusb.acquire_context`.
+
+    :param context: USB context to release
+    :type context: :class:`~usb1.USBContext`
+    :return: Nothing
+    :rtype: :class:`~NoneType`
+    """
+    CONTEXT_REGISTRY.release(context)
+
+
+@contextlib.contextmanager
+def release_context_on_error(context: Context) -> typing.Generator[Context, None, None]:
+    """
+    Context manager that releases the given USB context if the block raises an exception.
+
+    :param context: USB context to release on error
+    :type context: :class:`~usb1.USBContext`
+    :raises Exception: When block raises an exception.
+    """
+    try:
+        yield context
+    except Exception:
+        release_context(context)
+        raise
+
+
 def open_device_handle(device: Device) -> Handle:
     """
     Open a new handle for the given device.
@@ -263,9 +547,9 @@ def claim_interface(handle: Handle,
     return handle.claimInterface(interface)
 
 
-def find_device(serial: SerialNumber = None,
-                vid: VendorId = None,
-                pid: ProductId = None,
+def find_device(serial: SerialNumbers = None,
+                vid: VendorIds = None,
+                pid: ProductIds = None,
                 context: OptionalContext = None,
                 skip_on_error: hints.Bool = True) -> OptionalDeviceAndInterfaceSettings:
     """
@@ -287,20 +571,23 @@ def find_device(serial: SerialNumber = None,
     return next(find_devices_generator(serial, vid, pid, context, skip_on_error), (None, None))
 
 
-def find_devices_generator(serial: SerialNumber = None,
-                           vid: VendorId = None,
-                           pid: ProductId = None,
+def find_devices_generator(serial: SerialNumbers = None,
+                           vid: VendorIds = None,
+                           pid: ProductIds = None,
                            context: OptionalContext = None,
                            skip_on_error: hints.Bool = True) -> DeviceAndInterfaceSettingsGenerator:
     """
     Generator function that yields local USB devices.
 
-    :param serial: Optional serial number filter
-    :type serial: :class:`~str` or :class:`~NoneType`
-    :param vid: Optional vendor id filter
-    :type vid: :class:`~int` or :class:`~NoneType`
-    :param vid: Optional product id filter
-    :type pid: :class:`~int` or :class:`~NoneType`
+    The bus is enumerated once and each serial number is read at most once, so a collection of serial
+    numbers can be searched for in a single pass.
+
+    :param serial: Optional serial number filter, a single serial number or a collection of them
+    :type serial: :class:`~str`, :class:`~set` or :class:`~NoneType`
+    :param vid: Optional vendor id filter, a single vendor id or a collection of them
+    :type vid: :class:`~int`, :class:`~set` or :class:`~NoneType`
+    :param vid: Optional product id filter, a single product id or a collection of them
+    :type pid: :class:`~int`, :class:`~set` or :class:`~NoneType`
     :param context: Optional USB context to use for querying devices
     :type context: :class:`~usb1.USBContext` or :class:`~NoneType`
     :param skip_on_error: Optional flag indicating if devices that raise errors should be ignored
@@ -308,9 +595,49 @@ def find_devices_generator(serial: SerialNumber = None,
     :return: Generator that yields tuples for matching devices
     :rtype: :class:`~generator`
     """
+    device_filter = DeviceFilter(serial, vid, pid)
     yield from ((device, settings)
                 for device, settings in find_devices_interfaces_generator(context, skip_on_error)
-                if device_matches(device, settings, serial, vid, pid))
+                if device_filter.matches(device, settings))
+
+
+def find_devices_by_serial(serials: typing.Iterable[hints.Str],
+                           vid: VendorIds = None,
+                           pid: ProductIds = None,
+                           context: OptionalContext = None,
+                           skip_on_error: hints.Bool = True) -> typing.Dict[hints.Str, DeviceAndInterfaceSettings]:
+    """
+    Find the first ADB interface of each of the given serial numbers in a single enumeration of the bus.
+
+    :param serials: Serial numbers to find
+    :type serials: :class:`~list`, :class:`~set` or :class:`~tuple`
+    :param vid: Optional vendor id filter, a single vendor id or a collection of them
+    :type vid: :class:`~int`, :class:`~set` or :class:`~NoneType`
+    :param vid: Optional product id filter, a single product id or a collection of them
+    :type pid: :class:`~int`, :class:`~set` or :class:`~NoneType`
+    :param context: Optional USB context to use for querying devices
+    :type context: :class:`~usb1.USBContext` or :class:`~NoneType`
+    :param skip_on_error: Optional flag indicating if devices that raise errors should be ignored
+    :type skip_on_error: :class:`~bool`
+    :return: Dictionary of serial number to two item tuple with device and interface settings
+    :rtype: :class:`~dict`
+    """
+    serials = frozenset(serials)
+    if not serials:
+        return {}
+
+    device_filter = DeviceFilter(serials, vid, pid)
+    found = {}  # type: typing.Dict[hints.Str, DeviceAndInterfaceSettings]
+    for device, settings in find_devices_interfaces_generator(context, skip_on_error):
+        try:
+            if not device_filter.matches(device, settings):
+                continue
+        except usb1.USBError:
+            if not skip_on_error:
+                raise
+            continue
+        found.setdefault(device_filter.serial_number(device), (device, settings))
+    return found
 
 
 def find_devices_interfaces_generator(context: OptionalContext = None,  # pylint: disable=invalid-name
@@ -334,9 +661,9 @@ def find_devices_interfaces_generator(context: OptionalContext = None,  # pylint
 
 def device_matches(device: Device,
                    settings: InterfaceSettings,
-                   serial: SerialNumber = None,
-                   vid: VendorId = None,
-                   pid: ProductId = None) -> hints.Bool:
+                   serial: SerialNumbers = None,
+                   vid: VendorIds = None,
+                   pid: ProductIds = None) -> hints.Bool:
     """
     Check if given device and interface settings matches filter.
 
@@ -344,40 +671,169 @@ def device_matches(device: Device,
     :type device: :class:`~usb1.USBDevice`
     :param settings: Settings for an interface on this USB device
     :type :class:`~usb1.USBInterfaceSetting`
-    :param serial: Optional serial number filter
-    :type serial: :class:`~str` or :class:`~NoneType`
-    :param vid: Optional vendor id filter
-    :type vid: :class:`~int` or :class:`~NoneType`
-    :param vid: Optional product id filter
-    :type pid: :class:`~int` or :class:`~NoneType`
+    :param serial: Optional serial number filter, a single serial number or a collection of them
+    :type serial: :class:`~str`, :class:`~set` or :class:`~NoneType`
+    :param vid: Optional vendor id filter, a single vendor id or a collection of them
+    :type vid: :class:`~int`, :class:`~set` or :class:`~NoneType`
+    :param vid: Optional product id filter, a single product id or a collection of them
+    :type pid: :class:`~int`, :class:`~set` or :class:`~NoneType`
     :return: Boolean indicating match
     :rtype: :class:`~bool`
     """
-    serial_match = not serial or device.getSerialNumber() == serial
-    vid_match = not vid or device.getVendorID() == vid
-    pid_match = not pid or device.getProductID() == pid
-    usb_class_match = settings.getClass() == USB_DEVICE_CLASS
-    usb_subclass_match = settings.getSubClass() == USB_DEVICE_SUBCLASS
-    usb_protocol_match = settings.getProtocol() == USB_DEVICE_PROTOCOL
-    return all((serial_match, vid_match, pid_match, usb_class_match, usb_subclass_match, usb_protocol_match))
+    return DeviceFilter(serial, vid, pid).matches(device, settings)
+
+
+def filter_values(value: typing.Union[hints.Str, hints.Int, typing.Iterable[typing.Any], None]) -> \
+        typing.Optional[typing.FrozenSet[typing.Any]]:
+    """
+    Normalize a serial/vid/pid filter argument into a set of accepted values.
+
+    :param value: Single value, collection of values or None
+    :type value: :class:`~str`, :class:`~int`, :class:`~set` or :class:`~NoneType`
+    :return: Set of accepted values or None if the filter accepts any value
+    :rtype: :class:`~frozenset` or :class:`~NoneType`
+    """
+    if not value:
+        return None
+    if isinstance(value, (str, int)):
+        return frozenset((value,))
+    return frozenset(value)
+
+
+class DeviceFilter:
+    """
+    Filter for devices and interface settings that evaluates predicates in order of cost.
+
+    The interface class/subclass/protocol and vendor/product id checks only inspect descriptors libusb
+    already cached while enumerating. Reading a serial number opens the device and performs a string
+    descriptor control transfer, so it is done last, only for ADB interfaces, and at most once per device
+    for the lifetime of the filter.
+    """
+
+    def __init__(self,
+                 serial: SerialNumbers = None,
+                 vid: VendorIds = None,
+                 pid: ProductIds = None) -> None:
+        self._serials = filter_values(serial)
+        self._vids = filter_values(vid)
+        self._pids = filter_values(pid)
+        self._serial_cache = {}  # type: typing.Dict[typing.Tuple[hints.Int, hints.Int], SerialNumber]
+
+    def matches(self, device: Device, settings: InterfaceSettings) -> hints.Bool:
+        """
+        Check if given device and interface settings matches filter.
+
+        :param device: USB device to check
+        :type device: :class:`~usb1.USBDevice`
+        :param settings: Settings for an interface on this USB device
+        :type :class:`~usb1.USBInterfaceSetting`
+        :return: Boolean indicating match
+        :rtype: :class:`~bool`
+        """
+        if not self.matches_descriptors(device, settings):
+            return False
+        return self._serials is None or self.serial_number(device) in self._serials
+
+    def matches_descriptors(self, device: Device, settings: InterfaceSettings) -> hints.Bool:
+        """
+        Check if given device and interface settings match the interface class/subclass/protocol and
+        vendor/product id filters, without performing any I/O.
+
+        :param device: USB device to check
+        :type device: :class:`~usb1.USBDevice`
+        :param settings: Settings for an interface on this USB device
+        :type :class:`~usb1.USBInterfaceSetting`
+        :return: Boolean indicating match
+        :rtype: :class:`~bool`
+        """
+        if not is_adb_interface(settings):
+            return False
+        if self._vids is not None and device.getVendorID() not in self._vids:
+            return False
+        return self._pids is None or device.getProductID() in self._pids
+
+    def accepts_serial(self, serial: SerialNumber) -> hints.Bool:
+        """
+        Check if given serial number matches the serial number filter.
+
+        :param serial: Serial number to check
+        :type serial: :class:`~str` or :class:`~NoneType`
+        :return: Boolean indicating match
+        :rtype: :class:`~bool`
+        """
+        return self._serials is None or serial in self._serials
+
+    def forget(self, device: Device) -> None:
+        """
+        Drop the cached serial number of the given device, e.g. once it left the bus and its address may be reused.
+
+        :param device: USB device
+        :type device: :class:`~usb1.USBDevice`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._serial_cache.pop((device.getBusNumber(), device.getDeviceAddress()), None)
+
+    def serial_number(self, device: Device) -> SerialNumber:
+        """
+        Get the serial number of the given device, reading its string descriptor only once.
+
+        :param device: USB device
+        :type device: :class:`~usb1.USBDevice`
+        :return: Serial number of the device
+        :rtype: :class:`~str` or :class:`~NoneType`
+        """
+        key = (device.getBusNumber(), device.getDeviceAddress())
+        try:
+            return self._serial_cache[key]
+        except KeyError:
+            serial = self._serial_cache[key] = device.getSerialNumber()
+            return serial
+
+
+def is_adb_interface(settings: InterfaceSettings) -> hints.Bool:
+    """
+    Predicate function that determines if the given interface settings match the USB class/subclass/protocol
+    supported by ADB.
+
+    :param settings: Settings for an interface on a USB device
+    :type settings: :class:`~usb1.USBInterfaceSetting`
+    :return: True if the interface is an ADB interface, False otherwise
+    :rtype: :class:`~bool`
+    """
+    return (settings.getClass() == USB_DEVICE_CLASS and
+            settings.getSubClass() == USB_DEVICE_SUBCLASS and
+            settings.getProtocol() == USB_DEVICE_PROTOCOL)
+
+
+def device_port_path(device: Device) -> PortPath:
+    """
+    Get the bus number and port numbers that locate the given device.
+
+    :param device: USB device
+    :type device: :class:`~usb1.USBDevice`
+    :return: Tuple of bus number followed by port numbers
+    :rtype: :class:`~tuple`
+    """
+    return (device.getBusNumber(),) + tuple(device.getPortNumberList())
 
 
 @contextlib.contextmanager
 def optional_usb_context(context: OptionalContext = None) -> typing.Generator[Context, None, None]:
     """
-    Context manager that uses or creates a USB context for the duration of the block.
+    Context manager that uses the given USB context or acquires the shared one for the duration of the block.
 
     :param context: Optional USB context to use
     :type context: :class:`~usb1.USBContext` or :class:`~NoneType`
-    :return: Function that optionally creates a USB context for the block
+    :return: Function that optionally acquires a USB context for the block
     :rtype: :class:`~function`
     """
-    ctx = context or open_context()
+    ctx = context or acquire_context()
     try:
         yield ctx
     finally:
         if not context:
-            ctx.close()
+            release_context(ctx)
 
 
 def find_read_endpoint(settings: InterfaceSettings) -> OptionalEndpoint:
@@ -0,0 +1,187 @@
+"""
+    adbts.usb.readahead
+    ~~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for keeping bulk IN transfers queued on a USB endpoint.
+"""
+import threading
+import time
+import typing
+
+from .. import exceptions, hints
+from . import libusb
+
+__all__ = ['ReadAheadQueue', 'DEFAULT_NUM_TRANSFERS', 'DEFAULT_TRANSFER_SIZE']
+
+
+#: Default number of bulk IN transfers kept in-flight on the read endpoint.
+DEFAULT_NUM_TRANSFERS = 4
+
+
+#: Default number of bytes requested by each in-flight bulk IN transfer.
+DEFAULT_TRANSFER_SIZE = 16384
+
+
+class ReadAheadQueue:
+    """
+    Keeps a number of bulk IN transfers submitted against a read endpoint so the bus is never idle
+    between read calls. Reads are served from the buffers of completed transfers.
+
+    Events of the shared USB context may be handled by other code while the owner is not reading, e.g. another
+    transport, so completed transfers are held back rather than resubmitted once `num_transfers` transfers
+    worth of bytes are buffered, and resubmitted by the next read.
+
+    .. note:: Reads are not thread-safe and must be performed by a single thread.
+    """
+
+    def __init__(self,
+                 context: libusb.Context,
+                 handle: libusb.Handle,
+                 endpoint: libusb.Endpoint,
+                 num_transfers: hints.Int = DEFAULT_NUM_TRANSFERS,
+                 transfer_size: hints.Int = DEFAULT_TRANSFER_SIZE) -> None:
+        if num_transfers <= 0:
+            raise ValueError('Read-ahead requires at least one transfer')
+        if transfer_size <= 0:
+            raise ValueError('Read-ahead transfer size must be greater than zero')
+        self._context = context
+        self._handle = handle
+        self._endpoint = endpoint
+        self._num_transfers = num_transfers
+        self._transfer_size = transfer_size
+        self._transfers = []  # type: typing.List[libusb.Transfer]
+        self._held = []  # type: typing.List[libusb.Transfer]
+        self._buffer = bytearray()
+        self._buffer_lock = threading.Lock()
+        self._status = None  # type: hints.OptionalInt
+        self._stopped = True
+
+    @property
+    def buffered(self) -> hints.Int:
+        """
+        Number of bytes received by completed transfers that have not been read yet.
+
+        :return: Number of buffered bytes
+        :rtype: :class:`~int`
+        """
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """
+        Submit all bulk IN transfers to the read endpoint.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~usb1.USBError`: When libusb cannot submit a transfer
+        """
+        self._stopped = False
+        for _ in range(self._num_transfers):
+            self._transfers.append(libusb.submit_bulk_transfer(self._handle, self._endpoint, self._transfer_size,
+                                                               self._on_transfer_completed, 0))
+
+    def stop(self) -> None:
+        """
+        Cancel all in-flight transfers and wait for libusb to acknowledge the cancellation.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._stopped = True
+        for transfer in self._transfers:
+            if transfer.isSubmitted():
+                transfer.cancel()
+        while any(transfer.isSubmitted() for transfer in self._transfers):
+            self._context.handleEventsTimeout(0.1)
+        self._transfers.clear()
+        self._held.clear()
+
+    def read(self, num_bytes: hints.Int, timeout: hints.Int) -> hints.Bytes:
+        """
+        Read bytes received by completed transfers, waiting for a transfer to complete when none are buffered.
+
+        :param num_bytes: Maximum number of bytes to read
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to wait for bytes, zero to wait forever
+        :type timeout: :class:`~int`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes`
+        :raises :class:`~adbts.exceptions.TransportTimeoutError`: When no bytes were received within timeout
+        :raises :class:`~adbts.exceptions.TransportError`: When a transfer failed
+        """
+        self._wait(timeout)
+        with self._buffer_lock:
+            data = bytes(self._buffer[:num_bytes])
+            del self._buffer[:num_bytes]
+        return data
+
+    def readinto(self, buffer: hints.WritableBuffer, timeout: hints.Int) -> hints.Int:
+        """
+        Read bytes received by completed transfers into a caller owned buffer, waiting for a transfer
+        to complete when none are buffered.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to wait for bytes, zero to wait forever
+        :type timeout: :class:`~int`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportTimeoutError`: When no bytes were received within timeout
+        :raises :class:`~adbts.exceptions.TransportError`: When a transfer failed
+        """
+        self._wait(timeout)
+        with self._buffer_lock:
+            num_bytes = min(len(buffer), len(self._buffer))
+            with memoryview(self._buffer) as view:
+                memoryview(buffer)[:num_bytes] = view[:num_bytes]
+            del self._buffer[:num_bytes]
+        return num_bytes
+
+    def _wait(self, timeout: hints.Int) -> None:
+        """
+        Handle libusb events until bytes are buffered.
+        """
+        deadline = time.monotonic() + timeout / 1000 if timeout else None
+        self._resume()
+
+        while not self._buffer:
+            if self._status is not None:
+                raise libusb.transfer_status_to_transport_error(self._status, timeout)
+            if deadline is None:
+                self._context.handleEvents()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise exceptions.TransportTimeoutError('Exceeded timeout of {} ms'.format(timeout))
+            self._context.handleEventsTimeout(remaining)
+
+    def _resume(self) -> None:
+        """
+        Resubmit transfers held back while the buffer was full, once reads made room for their bytes.
+        """
+        with self._buffer_lock:
+            if self._stopped or len(self._buffer) >= self._num_transfers * self._transfer_size:
+                return
+            held, self._held = self._held, []
+        for transfer in held:
+            transfer.submit()
+
+    def _on_transfer_completed(self, transfer: libusb.Transfer) -> None:
+        """
+        Buffer received bytes of a completed transfer and resubmit it to keep the endpoint busy.
+        """
+        if self._status is not None:
+            # Bytes of transfers that were still in flight when one failed would follow a gap, so drop them.
+            return
+        status = transfer.getStatus()
+        if status == libusb.USB_TRANSFER_COMPLETED:
+            # Events of the shared USB context may be handled by another thread, so guard the buffer.
+            with self._buffer_lock:
+                self._buffer += transfer.getBuffer()[:transfer.getActualLength()]
+                if len(self._buffer) >= self._num_transfers * self._transfer_size:
+                    self._held.append(transfer)
+                    return
+            if not self._stopped:
+                transfer.submit()
+        elif not self._stopped:
+            # Stop resubmitting once a transfer fails, otherwise bytes could be buffered out of order.
+            self._status = status
@@ -4,10 +4,18 @@
 
     Contains functionality for synchronous Universal Serial Bus (USB) transport.
 """
-from .. import ctxlib, exceptions, hints, transport
-from . import libusb, timeouts
+import concurrent.futures
+import contextlib
+import typing
 
-__all__ = ['Transport']
+from .. import ctxlib, exceptions, files, hints, transport
+from . import index, libusb, readahead, timeouts
+
+__all__ = ['Transport', 'OpenManyResult']
+
+
+#: Default maximum number of threads used by :func:`~adbts.usb.synchronous.open_many` to open devices.
+DEFAULT_OPEN_MANY_WORKERS = 16
 
 
 class Transport(transport.Transport):
@@ -24,7 +32,8 @@ class Transport(transport.Transport):
                  handle: libusb.Handle,
                  interface_settings: libusb.InterfaceSettings,
                  read_endpoint: libusb.Endpoint,
-                 write_endpoint: libusb.Endpoint) -> None:
+                 write_endpoint: libusb.Endpoint,
+                 read_ahead: typing.Optional[readahead.ReadAheadQueue] = None) -> None:
         self._serial = serial
         self._vid = vid
         self._pid = pid
@@ -34,6 +43,7 @@ class Transport(transport.Transport):
         self._interface_settings = interface_settings
         self._read_endpoint = read_endpoint
         self._write_endpoint = write_endpoint
+        self._read_ahead = read_ahead
         self._closed = False
 
     def __repr__(self) -> hints.Str:
@@ -74,8 +84,70 @@ class Transport(transport.Transport):
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
         """
+        if self._read_ahead is not None:
+            return self._read_ahead.read(num_bytes, timeouts.timeout(timeout))
         return libusb.read(self._handle, self._read_endpoint, num_bytes, timeouts.timeout(timeout))
 
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    @libusb.reraise_libusb_errors
+    def readinto(self,
+                 buffer: hints.WritableBuffer,
+                 timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        if self._read_ahead is not None:
+            return self._read_ahead.readinto(buffer, timeouts.timeout(timeout))
+        return libusb.readinto(self._handle, self._read_endpoint, buffer, timeouts.timeout(timeout))
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    @libusb.reraise_libusb_errors
+    def read_exactly(self,
+                     num_bytes: hints.Int,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport into a single preallocated buffer.
+
+        Bulk transfers read directly into the remainder of the buffer until it is full, all within the timeout.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportEndpointNotFound`: When a transfer returned no bytes before all
+            bytes were read
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = timeouts.deadline(timeout)
+        buffer = bytearray(num_bytes)
+        with memoryview(buffer) as view:
+            received = 0
+            while received < num_bytes:
+                remaining = timeouts.remaining(deadline, timeout)
+                if self._read_ahead is not None:
+                    chunk = self._read_ahead.readinto(view[received:], remaining)
+                else:
+                    chunk = libusb.readinto(self._handle, self._read_endpoint, view[received:], remaining)
+                if not chunk:
+                    raise exceptions.TransportEndpointNotFound(
+                        'Transfer returned no bytes after {} of {} bytes'.format(received, num_bytes))
+                received += chunk
+        return buffer
+
     @transport.ensure_opened
     @transport.ensure_data
     @libusb.reraise_libusb_errors
@@ -97,6 +169,66 @@ class Transport(transport.Transport):
         libusb.write(self._handle, self._write_endpoint, data, timeouts.timeout(timeout))
         return None
 
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    @libusb.reraise_libusb_errors
+    def writev(self,  # pylint: disable=useless-return
+               buffers: hints.Buffers,
+               timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        The buffers are sent as one bulk OUT transfer, terminated by a zero-length packet when its length
+        is a multiple of the endpoint max packet size.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        libusb.writev(self._handle, self._write_endpoint, buffers, timeouts.timeout(timeout))
+        return None
+
+    @transport.ensure_opened
+    @libusb.reraise_libusb_errors
+    def write_file(self,
+                   file: hints.FileSource,
+                   offset: hints.Int = 0,
+                   count: hints.OptionalInt = None,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        The file is mapped into memory and bulk OUT transfers are submitted directly from slices of the mapping,
+        all within the timeout.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened or mapped
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        deadline = timeouts.deadline(timeout)
+        with files.open_file(file) as fd:
+            count = files.file_range(fd, offset, count)
+            with files.mapped(fd, offset, count) as view:
+                for start in range(0, count, files.DEFAULT_CHUNK_SIZE):
+                    libusb.write(self._handle, self._write_endpoint, view[start:start + files.DEFAULT_CHUNK_SIZE],
+                                 timeouts.remaining(deadline, timeout))
+        return count
+
     @transport.ensure_opened
     @libusb.reraise_libusb_errors
     def close(self) -> None:
@@ -107,14 +239,25 @@ class Transport(transport.Transport):
         :rtype: `None`
         :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
         """
+        if self._read_ahead is not None:
+            self._read_ahead.stop()
         libusb.close(self._context, self._handle, self._interface_settings)
         self._closed = True
 
 
+#: Transports opened by :func:`~adbts.usb.synchronous.open_many` and errors of serials that failed to open.
+OpenManyResult = typing.NamedTuple('OpenManyResult', [
+    ('transports', typing.Dict[hints.Str, Transport]),
+    ('errors', typing.Dict[hints.Str, exceptions.TransportError])
+])
+
+
 @libusb.reraise_libusb_errors
 def open(serial: libusb.SerialNumber = None,  # pylint: disable=redefined-builtin
          vid: libusb.VendorId = None,
-         pid: libusb.ProductId = None) -> transport.TransportOpenResult:
+         pid: libusb.ProductId = None,
+         read_ahead_transfers: hints.Int = 0,
+         read_ahead_transfer_size: hints.Int = readahead.DEFAULT_TRANSFER_SIZE) -> transport.TransportOpenResult:
     """
     Open a new :class:`~adbts.usb.sync.Transport` transport to a USB device.
 
@@ -124,35 +267,141 @@ def open(serial: libusb.SerialNumber = None,  # pylint: disable=redefined-builti
     :type vid: :class:`~int` or :class:`~NoneType`
     :param vid: Optional product id filter
     :type pid: :class:`~int` or :class:`~NoneType`
+    :param read_ahead_transfers: Number of bulk IN transfers to keep in-flight, zero disables read-ahead
+    :type read_ahead_transfers: :class:`~int`
+    :param read_ahead_transfer_size: Number of bytes requested by each read-ahead transfer
+    :type read_ahead_transfer_size: :class:`~int`
     :return: Synchronous USB transport
     :rtype: :class:`~adbts.usb.sync.Transport`
     """
-    # Create a new context for accessing a USB device. Libusb uses a context structure to represent
-    # individual user sessions and prevent interference between then when using a device concurrently.
-    with ctxlib.close_on_error(libusb.open_context()) as context:
-        # Grab first device that matches the given serial/vid/pid filter provided. If no filter
+    # Acquire the process-wide context for accessing a USB device. Libusb uses a context structure to represent
+    # a user session; sharing one between transports avoids initializing and enumerating the bus per device.
+    with libusb.release_context_on_error(libusb.acquire_context()) as context:
+        # Open the first device that matches the given serial/vid/pid filter provided. If no filter
         # was provided, this will yield back the first device that matches the USB class/subclass/protocol
-        # supported by ADB.
-        device, interface_settings = libusb.find_device(serial, vid, pid, context)
-        if device is None or interface_settings is None:
-            raise exceptions.TransportEndpointNotFound(
-                'Cannot find USB device for serial={} vid={} pid={}'.format(serial, vid, pid))
-
-        # Grab first device interface endpoint that is used for reading.
-        read_endpoint = libusb.find_read_endpoint(interface_settings)
-        if not read_endpoint:
-            raise exceptions.TransportError('Cannot find read endpoint for USB device interface')
-
-        # Grab first device interface endpoint that is used for writing.
-        write_endpoint = libusb.find_write_endpoint(interface_settings)
-        if not write_endpoint:
-            raise exceptions.TransportError('Cannot find write endpoint for USB device interface')
-
-        # Open this USB device and grab a handle required to perform I/O. Grabbing a handle is purely a libusb
-        # construct and this does not sent any data over the bus.
-        with ctxlib.close_on_error(libusb.open_device_handle(device)) as handle:
-            # Claim the device interface. Doing makes this USB device interface unusable to other clients
-            # until it is released.
-            with libusb.claim_interface(handle, interface_settings):
-                return Transport(serial, vid, pid, context, device, handle,
-                                 interface_settings, read_endpoint, write_endpoint)
+        # supported by ADB. A stale device of the index is looked up again once.
+        return index.open_indexed_device(
+            lambda device, interface_settings: _open_device(serial, vid, pid, context, device, interface_settings,
+                                                            read_ahead_transfers, read_ahead_transfer_size),
+            serial, vid, pid, context)
+
+
+@libusb.reraise_libusb_errors
+def open_many(serials: typing.Iterable[hints.Str],
+              vid: libusb.VendorId = None,
+              pid: libusb.ProductId = None,
+              read_ahead_transfers: hints.Int = 0,
+              read_ahead_transfer_size: hints.Int = readahead.DEFAULT_TRANSFER_SIZE,
+              max_workers: hints.Int = DEFAULT_OPEN_MANY_WORKERS) -> OpenManyResult:
+    """
+    Open new :class:`~adbts.usb.sync.Transport` transports to many USB devices.
+
+    The bus is enumerated once for all serial numbers, then device handles are opened and interfaces
+    claimed concurrently by a pool of threads. Failing to open one device does not prevent the others
+    from being opened.
+
+    :param serials: Serial numbers of the devices to open
+    :type serials: :class:`~list`, :class:`~set` or :class:`~tuple`
+    :param vid: Optional vendor id filter
+    :type vid: :class:`~int` or :class:`~NoneType`
+    :param vid: Optional product id filter
+    :type pid: :class:`~int` or :class:`~NoneType`
+    :param read_ahead_transfers: Number of bulk IN transfers to keep in-flight, zero disables read-ahead
+    :type read_ahead_transfers: :class:`~int`
+    :param read_ahead_transfer_size: Number of bytes requested by each read-ahead transfer
+    :type read_ahead_transfer_size: :class:`~int`
+    :param max_workers: Maximum number of threads used to open devices
+    :type max_workers: :class:`~int`
+    :return: Transports and errors, both keyed by serial number
+    :rtype: :class:`~adbts.usb.synchronous.OpenManyResult`
+    """
+    serials = list(dict.fromkeys(serials))
+    transports = {}  # type: typing.Dict[hints.Str, Transport]
+    errors = {}  # type: typing.Dict[hints.Str, exceptions.TransportError]
+
+    # Hold a reference to the shared context for the whole operation so it is not closed and re-opened
+    # between the enumeration and the transports acquiring their own references.
+    with libusb.optional_usb_context() as context:
+        found = libusb.find_devices_by_serial(serials, vid, pid, context)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(found)))) as executor:
+            futures = {serial: executor.submit(_open_found_device, serial, vid, pid, device, interface_settings,
+                                               read_ahead_transfers, read_ahead_transfer_size)
+                       for serial, (device, interface_settings) in found.items()}
+
+    try:
+        for serial in serials:
+            future = futures.get(serial)
+            if future is None:
+                errors[serial] = exceptions.TransportEndpointNotFound(
+                    'Cannot find USB device for serial={} vid={} pid={}'.format(serial, vid, pid))
+                continue
+            try:
+                transports[serial] = future.result()
+            except exceptions.TransportError as ex:
+                errors[serial] = ex
+    except BaseException:
+        # Close every transport that was opened, collected or not, rather than leak them to the caller.
+        for future in futures.values():
+            if future.exception() is None:
+                with contextlib.suppress(exceptions.TransportError):
+                    future.result().close()
+        raise
+
+    return OpenManyResult(transports, errors)
+
+
+@libusb.reraise_libusb_errors
+def _open_found_device(serial: libusb.SerialNumber,
+                       vid: libusb.VendorId,
+                       pid: libusb.ProductId,
+                       device: libusb.Device,
+                       interface_settings: libusb.InterfaceSettings,
+                       read_ahead_transfers: hints.Int,
+                       read_ahead_transfer_size: hints.Int) -> Transport:
+    """
+    Open a transport to a device found by :func:`~adbts.usb.synchronous.open_many` with its own reference
+    to the shared USB context.
+    """
+    with libusb.release_context_on_error(libusb.acquire_context()) as context:
+        return _open_device(serial, vid, pid, context, device, interface_settings,
+                            read_ahead_transfers, read_ahead_transfer_size)
+
+
+def _open_device(serial: libusb.SerialNumber,
+                 vid: libusb.VendorId,
+                 pid: libusb.ProductId,
+                 context: libusb.Context,
+                 device: libusb.Device,
+                 interface_settings: libusb.InterfaceSettings,
+                 read_ahead_transfers: hints.Int,
+                 read_ahead_transfer_size: hints.Int) -> Transport:
+    """
+    Open a handle to the device, claim its interface and create the transport. The caller is responsible
+    for releasing the context on error.
+    """
+    # Grab first device interface endpoint that is used for reading.
+    read_endpoint = libusb.find_read_endpoint(interface_settings)
+    if not read_endpoint:
+        raise exceptions.TransportError('Cannot find read endpoint for USB device interface')
+
+    # Grab first device interface endpoint that is used for writing.
+    write_endpoint = libusb.find_write_endpoint(interface_settings)
+    if not write_endpoint:
+        raise exceptions.TransportError('Cannot find write endpoint for USB device interface')
+
+    # Open this USB device and grab a handle required to perform I/O. Grabbing a handle is purely a libusb
+    # construct and this does not sent any data over the bus.
+    with ctxlib.close_on_error(libusb.open_device_handle(device)) as handle:
+        # Claim the device interface. Doing makes this USB device interface unusable to other clients
+        # until it is released.
+        with libusb.claim_interface(handle, interface_settings):
+            # Optionally keep bulk IN transfers queued on the read endpoint so reads are served
+            # from buffers the device already filled instead of one transfer per call.
+            read_ahead = None
+            if read_ahead_transfers > 0:
+                read_ahead = readahead.ReadAheadQueue(context, handle, read_endpoint,
+                                                      read_ahead_transfers, read_ahead_transfer_size)
+                read_ahead.start()
+            return Transport(serial, vid, pid, context, device, handle,
+                             interface_settings, read_endpoint, write_endpoint, read_ahead)
@@ -0,0 +1,404 @@
+"""
+    adbts.usb.threaded
+    ~~~~~~~~~~~~~~~~~~
+
+    Contains functionality for asynchronous Universal Serial Bus (USB) transport that performs blocking I/O of a
+    :class:`~adbts.usb.synchronous.Transport` on a dedicated thread per device.
+"""
+import collections
+import contextlib
+import queue
+import threading
+import typing
+
+from .. import hints, loops, transport
+from . import libusb, readahead, synchronous, timeouts
+
+__all__ = ['Transport', 'IOWorker']
+
+
+#: Type hint for a blocking call queued on an :class:`~adbts.usb.threaded.IOWorker` and whether its result is
+#: closed when the future was cancelled.
+IORequest = typing.Tuple[hints.Future, typing.Callable[..., typing.Any], typing.Tuple[typing.Any, ...], hints.Bool]
+
+
+#: Unbounded FIFO queue used to hand requests to worker threads; :class:`~queue.SimpleQueue` is
+#: only available on Python 3.7+.
+RequestQueue = getattr(queue, 'SimpleQueue', queue.Queue)
+
+
+#: Type hint for the outcome of a blocking call waiting to be delivered to the event loop and whether its result
+#: is closed when the future was cancelled.
+IOCompletion = typing.Tuple[hints.Future, typing.Any, hints.OptionalException, hints.Bool]
+
+
+class IOWorker:
+    """
+    Dedicated thread that performs blocking calls in submission order and resolves their futures on an
+    `asyncio` event loop.
+
+    Requests are handed to the thread through a :class:`~queue.SimpleQueue` and completions are handed back
+    through a :class:`~collections.deque`, both of which are safe without additional locks. Completions that
+    finish while the loop has not yet run the previous notification are delivered by the same
+    `call_soon_threadsafe` callback, so a burst of small transfers only wakes the loop once.
+    """
+
+    def __init__(self, loop: hints.EventLoop, name: hints.OptionalStr = None) -> None:
+        self._loop = loop
+        self._requests = RequestQueue()
+        self._completions = collections.deque()  # type: typing.Deque[IOCompletion]
+        self._notified = False
+        self._owned = None  # type: typing.Optional[hints.HasClose]
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self,
+               func: typing.Callable[..., typing.Any],
+               *args: hints.Args,
+               close_if_cancelled: hints.Bool = False) -> hints.Future:
+        """
+        Queue a blocking call to be performed by the worker thread.
+
+        .. note:: Cancelling the returned future does not interrupt a call that already started. Its result
+                  is discarded, unless `close_if_cancelled` is set, in which case it is closed.
+
+        :param func: Blocking function to call
+        :type func: :class:`~function`
+        :param args: Positional arguments for the function
+        :param close_if_cancelled: Close the result of the call if nobody is left to receive it, e.g. an opened
+            transport
+        :type close_if_cancelled: :class:`~bool`
+        :return: Future resolved on the event loop with the result or exception of the call
+        :rtype: :class:`~asyncio.Future`
+        """
+        future = self._loop.create_future()
+        self._requests.put((future, func, args, close_if_cancelled))
+        return future
+
+    def close_on_exit(self, obj: hints.HasClose) -> None:
+        """
+        Close the given object on the worker thread if it exits because the event loop was closed, as the
+        calls that would have closed it are no longer performed.
+
+        :param obj: Object owned by the worker, e.g. the transport it performs I/O for
+        :type obj: :class:`~object`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._owned = obj
+
+    def stop(self) -> None:
+        """
+        Stop the worker thread once all previously submitted calls are performed.
+
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._requests.put(None)
+
+    def join(self, timeout: hints.OptionalFloat = None) -> None:
+        """
+        Wait for the worker thread to exit after it was stopped.
+
+        :param timeout: Maximum number of seconds to wait, None to wait forever
+        :type timeout: :class:`~float` or :class:`~NoneType`
+        :return: Nothing
+        :rtype: :class:`~NoneType`
+        """
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """
+        Perform queued calls until stopped.
+        """
+        while True:
+            request = self._requests.get()  # type: typing.Optional[IORequest]
+            if request is None:
+                return
+            future, func, args, close_if_cancelled = request
+            if future.cancelled():
+                continue
+            try:
+                result = func(*args)
+            except Exception as ex:  # pylint: disable=broad-except
+                self._completions.append((future, None, ex, False))
+            else:
+                # Close results cancelled while the call was performed here rather than on the event loop.
+                if close_if_cancelled and future.cancelled():
+                    _close_quietly(result)
+                    continue
+                self._completions.append((future, result, None, close_if_cancelled))
+
+            # The flag is cleared by the loop before it drains, so a completion appended after the drain
+            # started always schedules another one.
+            if not self._notified:
+                self._notified = True
+                try:
+                    self._loop.call_soon_threadsafe(self._deliver)
+                except RuntimeError:
+                    # Event loop was closed; nobody is left to await the result or close what the worker owns.
+                    self._close_owned()
+                    return
+
+    def _close_owned(self) -> None:
+        """
+        Close the object owned by the worker, if any, after the event loop was closed.
+        """
+        if self._owned is not None:
+            _close_quietly(self._owned)
+
+    def _deliver(self) -> None:
+        """
+        Resolve the futures of all completed calls on the event loop.
+        """
+        self._notified = False
+        while self._completions:
+            future, result, ex, close_if_cancelled = self._completions.popleft()
+            if future.done():
+                # The future was cancelled after the call finished; nobody is left to close its result.
+                if close_if_cancelled:
+                    _close_quietly(result)
+                continue
+            if ex is not None:
+                future.set_exception(ex)
+            else:
+                future.set_result(result)
+
+
+def _close_quietly(obj: hints.HasClose) -> None:
+    """
+    Close an object no caller is left to receive, e.g. a transport opened for a cancelled call, or that is
+    closed after the event loop was closed.
+    """
+    # There is nobody to report errors to, e.g. when the object was already closed.
+    with contextlib.suppress(Exception):
+        obj.close()
+
+
+class Transport(transport.Transport):
+    """
+    Defines asynchronous (non-blocking) USB transport using `asyncio` that performs the blocking I/O of a
+    :class:`~adbts.usb.synchronous.Transport` on a dedicated :class:`~adbts.usb.threaded.IOWorker` thread.
+
+    This is a fallback for platforms where the libusb file descriptors cannot be polled by the event loop,
+    see :class:`~adbts.usb.asynchronous.Transport`. Operations are performed in the order they are awaited.
+
+    .. note:: This transport must only be used from the thread running its event loop.
+
+    .. warning:: Cancelling an operation, e.g. by :func:`~asyncio.wait_for`, does not interrupt it once the worker
+                 thread started it. Bytes received by a cancelled `read`, `readinto` or `read_exactly` are
+                 discarded and lost to the stream, so the transport should be closed rather than read from again.
+    """
+
+    def __init__(self,
+                 sync_transport: synchronous.Transport,
+                 worker: IOWorker) -> None:
+        self._transport = sync_transport
+        self._worker = worker
+        self._closed = False
+        worker.close_on_exit(sync_transport)
+
+    def __repr__(self) -> hints.Str:
+        return '<{}({}, state={!r})>'.format(self.__class__.__name__, str(self),
+                                             'closed' if self.closed else 'open')
+
+    def __str__(self) -> hints.Str:
+        return str(self._transport)
+
+    @property
+    def closed(self) -> hints.Bool:
+        """
+        Checks to see if the transport is closed.
+
+        :return: Closed state of the transport
+        :rtype: :class:`~bool`
+        """
+        return self._closed is True
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read(self,
+                   num_bytes: hints.Int,
+                   timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read bytes from the transport.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of bytes read
+        :rtype: :class:`~bytes` or :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._worker.submit(self._transport.read, num_bytes, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    async def readinto(self,
+                       buffer: hints.WritableBuffer,
+                       timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadIntoResult:
+        """
+        Read bytes from the transport into a caller owned buffer.
+
+        The buffer is written by the worker thread and must not be used until the read completes.
+
+        :param buffer: Writable buffer to read bytes into, up to its length
+        :type buffer: :class:`~bytearray` or :class:`~memoryview`
+        :param timeout: Maximum number of milliseconds to read before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes read into the buffer
+        :rtype: :class:`~int`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._worker.submit(self._transport.readinto, buffer, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read_exactly(self,
+                           num_bytes: hints.Int,
+                           timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportReadResult:
+        """
+        Read exactly the given number of bytes from the transport into a single preallocated buffer.
+
+        :param num_bytes: Number of bytes to read.
+        :type num_bytes: :class:`~int`
+        :param timeout: Maximum number of milliseconds to read all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Collection of exactly `num_bytes` bytes
+        :rtype: :class:`~bytearray`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._worker.submit(self._transport.read_exactly, num_bytes, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    async def write(self,
+                    data: hints.Buffer,
+                    timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write bytes to the transport.
+
+        :param data: Collection of bytes to write.
+        :type data: :class:`~bytes` or :class:`~bytearray`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        await self._worker.submit(self._transport.write, data, timeout)
+
+    @transport.ensure_opened
+    @transport.ensure_buffers
+    async def writev(self,
+                     buffers: hints.Buffers,
+                     timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteResult:
+        """
+        Write a sequence of buffers to the transport as a single operation, e.g. a message header and payload.
+
+        :param buffers: Sequence of byte collections to write in order.
+        :type buffers: :class:`~list` or :class:`~tuple`
+        :param timeout: Maximum number of milliseconds to write before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return Nothing
+        :rtype: :class:`~NoneType`
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        await self._worker.submit(self._transport.writev, buffers, timeout)
+
+    @transport.ensure_opened
+    async def write_file(self,
+                         file: hints.FileSource,
+                         offset: hints.Int = 0,
+                         count: hints.OptionalInt = None,
+                         timeout: hints.Timeout = timeouts.UNDEFINED) -> transport.TransportWriteFileResult:
+        """
+        Write a region of a file to the transport without reading it into Python bytes first.
+
+        :param file: Path of the file or open file descriptor, which is left open
+        :type file: :class:`~str`, :class:`~bytes`, :class:`~os.PathLike` or :class:`~int`
+        :param offset: Offset of the first byte to write
+        :type offset: :class:`~int`
+        :param count: Number of bytes to write, None for all bytes up to the end of the file
+        :type count: :class:`~int` or :class:`~NoneType`
+        :param timeout: Maximum number of milliseconds to write all bytes before raising an exception.
+        :type timeout: :class:`~int`, :class:`~NoneType`, or :class:`~object`
+        :return: Number of bytes written
+        :rtype: :class:`~int`
+        :raises :class:`~OSError`: When the file cannot be opened or mapped
+        :raises :class:`~adbts.exceptions.TransportError`: When underlying transport encounters an error
+        :raises :class:`~adbts.exceptions.TimeoutError`: When timeout is exceeded
+        """
+        return await self._worker.submit(self._transport.write_file, file, offset, count, timeout)
+
+    @transport.ensure_opened
+    def close(self) -> None:
+        """
+        Close the transport.
+
+        The synchronous transport is closed by the worker thread after all pending operations, which then exits.
+        Errors raised while closing it are reported to the exception handler of the event loop.
+
+        :return: Nothing
+        :rtype: `None`
+        """
+        self._worker.submit(self._transport.close).add_done_callback(self._report_close_error)
+        self._worker.stop()
+        self._closed = True
+
+    def _report_close_error(self, future: hints.Future) -> None:
+        """
+        Report the error of closing the synchronous transport, as no caller awaits it.
+        """
+        if future.cancelled() or future.exception() is None:
+            return
+        loops.get_running_loop().call_exception_handler({
+            'message': 'Closing transport {} failed'.format(self),
+            'exception': future.exception(),
+            'transport': self
+        })
+
+
+async def open(serial: libusb.SerialNumber = None,  # pylint: disable=redefined-builtin
+               vid: libusb.VendorId = None,
+               pid: libusb.ProductId = None,
+               read_ahead_transfers: hints.Int = 0,
+               read_ahead_transfer_size: hints.Int = readahead.DEFAULT_TRANSFER_SIZE,
+               loop: hints.OptionalEventLoop = None) -> transport.TransportOpenResult:
+    """
+    Open a new :class:`~adbts.usb.threaded.Transport` transport to a USB device.
+
+    The device is opened by the worker thread that will perform all I/O of the transport.
+
+    :param serial: Optional serial number filter
+    :type serial: :class:`~str` or :class:`~NoneType`
+    :param vid: Optional vendor id filter
+    :type vid: :class:`~int` or :class:`~NoneType`
+    :param vid: Optional product id filter
+    :type pid: :class:`~int` or :class:`~NoneType`
+    :param read_ahead_transfers: Number of bulk IN transfers to keep in-flight, zero disables read-ahead
+    :type read_ahead_transfers: :class:`~int`
+    :param read_ahead_transfer_size: Number of bytes requested by each read-ahead transfer
+    :type read_ahead_transfer_size: :class:`~int`
+    :param loop: Deprecated, the running event loop is used
+    :type loop: :class:`~asyncio.events.AbstractEventLoop`
+    :return: Asynchronous USB transport
+    :rtype: :class:`~adbts.usb.threaded.Transport`
+    """
+    loop = loops.running_loop(loop)
+    worker = IOWorker(loop, name='adbts-usb-{}'.format(serial or '*'))
+    try:
+        # A transport opened after this co-routine was cancelled is closed by the worker.
+        sync_transport = await worker.submit(synchronous.open, serial, vid, pid,
+                                             read_ahead_transfers, read_ahead_transfer_size,
+                                             close_if_cancelled=True)
+    except BaseException:
+        worker.stop()
+        raise
+    return Transport(sync_transport, worker)
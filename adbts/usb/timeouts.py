@@ -22,3 +22,31 @@ def timeout(value: hints.Timeout) -> hints.Int:
     if value is None or value == UNDEFINED:
         return 0
     return int(value)
+
+
+def deadline(value: hints.Timeout) -> hints.OptionalFloat:
+    """
+    Determine the :func:`~time.monotonic` time at which a USB transport operation that spans many transfers
+    times out.
+
+    :param value: Timeout value given
+    :type value: :class:`~int`, :class:`~float`, :class:`~NoneType`
+    :return: Monotonic deadline in seconds or None to wait forever
+    :rtype: :class:`~float` or :class:`~NoneType`
+    """
+    return timeouts.deadline(timeout(value) or None)
+
+
+def remaining(value: hints.OptionalFloat, original: hints.Timeout) -> hints.Int:
+    """
+    Determine the timeout value in milliseconds for the next transfer of an operation with the given deadline.
+
+    :param value: Monotonic deadline in seconds or None to wait forever
+    :type value: :class:`~float` or :class:`~NoneType`
+    :param original: Timeout value given to the operation, used in the error message
+    :type original: :class:`~int`, :class:`~float`, :class:`~NoneType`
+    :return: Transfer timeout in milliseconds
+    :rtype: :class:`~int`
+    :raises :class:`~adbts.exceptions.TransportTimeoutError`: When the deadline passed
+    """
+    return timeout(timeouts.call_timeout(value, original))
@@ -36,6 +36,9 @@ setup(
     packages=['adbts'],
     python_requires='>=3.5',
     install_requires=['libusb1>=1.8'],
+    extras_require={
+        'uvloop': ["uvloop>=0.14; sys_platform != 'win32'"]
+    },
     classifiers=(
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
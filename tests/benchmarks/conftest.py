@@ -0,0 +1,172 @@
+"""
+    tests/benchmarks/conftest
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Contains fixtures used by benchmark modules.
+"""
+import time
+
+import pytest
+import usb1
+
+from adbts.usb import index, libusb
+
+#: Simulated cost of initializing a libusb context.
+CONTEXT_INIT_SECONDS = 0.002
+
+
+#: Simulated cost of enumerating a single device on the bus.
+ENUMERATE_SECONDS_PER_DEVICE = 0.00005
+
+
+#: Simulated cost of reading a string descriptor (control transfer), e.g. a serial number.
+STRING_DESCRIPTOR_SECONDS = 0.0005
+
+
+class SimulatedEndpoint:
+    """
+    Bulk endpoint of a simulated device.
+    """
+
+    def __init__(self, address):
+        self._address = address
+
+    def getAddress(self):  # pylint: disable=invalid-name
+        return self._address
+
+    def getMaxPacketSize(self):  # pylint: disable=invalid-name
+        return 512
+
+
+class SimulatedInterfaceSettings:
+    """
+    Interface settings of a simulated device.
+    """
+
+    def __init__(self, usb_class, usb_subclass, usb_protocol):
+        self._values = (usb_class, usb_subclass, usb_protocol)
+        self._endpoints = (SimulatedEndpoint(libusb.USB_ENDPOINT_DIRECTION_IN | 0x01), SimulatedEndpoint(0x01))
+
+    def getClass(self):  # pylint: disable=invalid-name
+        return self._values[0]
+
+    def getSubClass(self):  # pylint: disable=invalid-name
+        return self._values[1]
+
+    def getProtocol(self):  # pylint: disable=invalid-name
+        return self._values[2]
+
+    def getNumber(self):  # pylint: disable=invalid-name
+        return 0
+
+    def iterEndpoints(self):  # pylint: disable=invalid-name
+        return iter(self._endpoints)
+
+
+class SimulatedHandle:
+    """
+    Handle of an opened simulated device.
+    """
+
+    def kernelDriverActive(self, interface):  # pylint: disable=invalid-name
+        return False
+
+    def claimInterface(self, interface):  # pylint: disable=invalid-name
+        return usb1._ReleaseInterface(self, interface)  # pylint: disable=protected-access
+
+    def releaseInterface(self, interface):  # pylint: disable=invalid-name
+        pass
+
+    def close(self):
+        pass
+
+
+class SimulatedDevice:
+    """
+    Device on the simulated bus. Reading its serial number costs a string descriptor control transfer.
+    """
+
+    def __init__(self, serial, bus, port, adb=True, vid=0x18d1, pid=0x4ee7):
+        self._serial = serial
+        self._bus = bus
+        self._port = port
+        self._vid = vid
+        self._pid = pid
+        self._settings = (SimulatedInterfaceSettings(libusb.USB_DEVICE_CLASS, libusb.USB_DEVICE_SUBCLASS,
+                                                     libusb.USB_DEVICE_PROTOCOL) if adb else
+                          SimulatedInterfaceSettings(0x03, 0x01, 0x01),)
+
+    def getSerialNumber(self):  # pylint: disable=invalid-name
+        time.sleep(STRING_DESCRIPTOR_SECONDS)
+        return self._serial
+
+    def getVendorID(self):  # pylint: disable=invalid-name
+        return self._vid
+
+    def getProductID(self):  # pylint: disable=invalid-name
+        return self._pid
+
+    def getBusNumber(self):  # pylint: disable=invalid-name
+        return self._bus
+
+    def getPortNumberList(self):  # pylint: disable=invalid-name
+        return [self._port]
+
+    def getDeviceAddress(self):  # pylint: disable=invalid-name
+        return self._port
+
+    def iterSettings(self):  # pylint: disable=invalid-name
+        return iter(self._settings)
+
+    def open(self):
+        return SimulatedHandle()
+
+
+class SimulatedContext:
+    """
+    Libusb context over a simulated bus. Opening it and listing devices cost the simulated time.
+    """
+
+    def __init__(self, devices):
+        self._devices = devices
+
+    def open(self):
+        time.sleep(CONTEXT_INIT_SECONDS)
+        return self
+
+    def close(self):
+        pass
+
+    def getDeviceList(self, skip_on_access_error=False, skip_on_error=False):  # pylint: disable=invalid-name
+        time.sleep(ENUMERATE_SECONDS_PER_DEVICE * len(self._devices))
+        return list(self._devices)
+
+
+@pytest.fixture(scope='function')
+def simulated_usb_bus(monkeypatch):
+    """
+    Fixture that yields a function used to patch :class:`~usb1.USBContext` to enumerate the given number of
+    simulated ADB devices, with serials 'SERIAL0000'..., plus an equal number of non-ADB devices.
+    """
+    def factory(num_devices):
+        devices = []
+        for number in range(num_devices):
+            devices.append(SimulatedDevice('HID{:04d}'.format(number), 1, number * 2, adb=False))
+            devices.append(SimulatedDevice('SERIAL{:04d}'.format(number), 1, number * 2 + 1))
+        monkeypatch.setattr(usb1, 'USBContext', lambda: SimulatedContext(devices))
+        monkeypatch.setattr(libusb, 'CONTEXT_REGISTRY', libusb.ContextRegistry())
+        monkeypatch.setattr(index, 'DEVICE_INDEX', index.DeviceIndex())
+        return ['SERIAL{:04d}'.format(number) for number in range(num_devices)]
+
+    return factory
+
+
+@pytest.fixture(scope='session', params=[
+    16384,
+    65536,
+])
+def transfer_size(request):
+    """
+    Fixture that yields USB bulk transfer sizes in bytes.
+    """
+    return request.param
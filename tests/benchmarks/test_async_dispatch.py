@@ -0,0 +1,70 @@
+"""
+    test_async_dispatch
+    ~~~~~~~~~~~~~~~~~~~
+
+    Benchmarks for the per-call overhead of asynchronous transport methods, i.e. awaiting a method through the
+    decorators of :class:`~adbts.tcp.asynchronous.Transport` when the awaited work completes immediately.
+
+    Generator-based co-routines (`yield from`) are compared against native co-routines (`async def`) through the
+    same decorator stack.
+"""
+import asyncio
+import types
+
+import pytest
+
+from adbts import exceptions, transport
+
+#: Number of method calls awaited per benchmark round.
+NUM_CALLS = 10000
+
+
+async def ready():
+    """
+    Awaitable that completes immediately, like a read served from an already filled buffer.
+    """
+    return b''
+
+
+class GeneratorTransport:
+    """
+    Transport whose method is a generator-based co-routine behind the decorators of the asynchronous transports.
+    """
+
+    closed = False
+
+    @transport.ensure_opened
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    @types.coroutine
+    def read(self):
+        return (yield from ready().__await__())
+
+
+class NativeTransport:
+    """
+    Transport whose method is a native co-routine behind the decorators of the asynchronous transports.
+    """
+
+    closed = False
+
+    @transport.ensure_opened
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(asyncio.TimeoutError)
+    async def read(self):
+        return await ready()
+
+
+@pytest.mark.parametrize('transport_class', [GeneratorTransport, NativeTransport])
+def test_method_call_overhead(benchmark, event_loop, transport_class):
+    """
+    Benchmark awaiting a decorated transport method whose work completes immediately.
+    """
+    instance = transport_class()
+
+    async def calls():
+        for _ in range(NUM_CALLS):
+            await instance.read()
+
+    benchmark.extra_info['calls'] = NUM_CALLS
+    benchmark.pedantic(lambda: event_loop.run_until_complete(calls()), rounds=20)
@@ -0,0 +1,57 @@
+"""
+    test_async_timeouts
+    ~~~~~~~~~~~~~~~~~~~
+
+    Benchmarks for the per-operation cost of enforcing a timeout on asynchronous transport operations, comparing
+    :func:`~asyncio.wait_for`, which wraps every operation in a new task, against a
+    :class:`~adbts.tcp.deadlines.Deadline` timer handle.
+
+    Reads are served by a :class:`~asyncio.StreamReader` that already buffered enough bytes, so the timeout
+    machinery dominates the cost of each operation.
+"""
+import asyncio
+
+import pytest
+
+from adbts.tcp import deadlines
+
+#: Number of reads per benchmark round.
+NUM_READS = 10000
+
+
+#: Number of bytes per read, e.g. an ADB message header.
+READ_SIZE = 24
+
+
+#: Timeout in milliseconds of every read; long enough never to pass.
+TIMEOUT = 5000
+
+
+async def read_wait_for(reader):
+    """
+    Read from the given reader, bounded by :func:`~asyncio.wait_for`.
+    """
+    return await asyncio.wait_for(reader.read(READ_SIZE), timeout=TIMEOUT / 1000)
+
+
+async def read_deadline(reader):
+    """
+    Read from the given reader, bounded by a :class:`~adbts.tcp.deadlines.Deadline`.
+    """
+    with deadlines.after(TIMEOUT):
+        return await reader.read(READ_SIZE)
+
+
+@pytest.mark.parametrize('read', [read_wait_for, read_deadline], ids=['wait_for', 'deadline'])
+def test_timeout_per_read(benchmark, event_loop, read):
+    """
+    Benchmark buffered reads that each enforce their own timeout.
+    """
+    async def reads():
+        reader = asyncio.StreamReader()
+        reader.feed_data(bytes(NUM_READS * READ_SIZE))
+        for _ in range(NUM_READS):
+            await read(reader)
+
+    benchmark.extra_info['reads'] = NUM_READS
+    benchmark.pedantic(lambda: event_loop.run_until_complete(reads()), rounds=20)
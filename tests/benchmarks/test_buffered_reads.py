@@ -0,0 +1,98 @@
+"""
+    test_buffered_reads
+    ~~~~~~~~~~~~~~~~~~~
+
+    Benchmarks for reading header heavy traffic, e.g. ADB messages with a 24 byte header and a small payload,
+    from a TCP transport over a local socket pair with and without a :class:`~adbts.buffered.BufferedTransport`.
+
+    The number of read calls made on the TCP transport, each of which is at least one syscall, is recorded
+    in the extra info of the benchmark.
+"""
+import socket
+import threading
+
+import pytest
+
+from adbts import buffered
+from adbts.tcp import synchronous
+
+#: Number of bytes in a message header.
+HEADER_SIZE = 24
+
+
+#: Number of bytes in a message payload.
+PAYLOAD_SIZE = 40
+
+
+#: Number of messages read per benchmark round.
+NUM_MESSAGES = 2000
+
+
+class CountingTransport:
+    """
+    Proxy that counts read calls made on the wrapped transport.
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+        self.reads = 0
+
+    @property
+    def closed(self):
+        return self._transport.closed
+
+    @property
+    def default_timeout(self):
+        return self._transport.default_timeout
+
+    def readinto(self, buffer, timeout=None):
+        self.reads += 1
+        return self._transport.readinto(buffer, timeout)
+
+    def read_exactly(self, num_bytes, timeout=None):
+        self.reads += 1
+        return self._transport.read_exactly(num_bytes, timeout)
+
+    def close(self):
+        self._transport.close()
+
+
+def send_messages(sock):
+    """
+    Send all messages of a round from the peer socket.
+    """
+    message = bytes(HEADER_SIZE + PAYLOAD_SIZE)
+    sock.sendall(message * NUM_MESSAGES)
+
+
+def read_messages(transport):
+    """
+    Read all messages of a round, header first and then payload.
+    """
+    for _ in range(NUM_MESSAGES):
+        transport.read_exactly(HEADER_SIZE)
+        transport.read_exactly(PAYLOAD_SIZE)
+
+
+@pytest.mark.parametrize('buffer_size', [0, 4096, 65536], ids=['unbuffered', '4k', '64k'])
+def test_read_headers(benchmark, buffer_size):
+    """
+    Benchmark reading small messages directly from a TCP transport and through read buffers of different sizes.
+    """
+    sock, peer = socket.socketpair()
+    counter = CountingTransport(synchronous.Transport('localhost', 0, sock))
+    transport = buffered.BufferedTransport(counter, buffer_size) if buffer_size else counter
+
+    def run_round():
+        writer = threading.Thread(target=send_messages, args=(peer,))
+        writer.start()
+        read_messages(transport)
+        writer.join()
+
+    try:
+        benchmark.pedantic(run_round, rounds=10)
+        benchmark.extra_info['messages'] = NUM_MESSAGES * 10
+        benchmark.extra_info['reads'] = counter.reads
+    finally:
+        transport.close()
+        peer.close()
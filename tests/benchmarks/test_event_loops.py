@@ -0,0 +1,159 @@
+"""
+    test_event_loops
+    ~~~~~~~~~~~~~~~~
+
+    Benchmark matrix of asynchronous TCP transports against a local echo server, for every installed event loop
+    implementation, see :mod:`~adbts.loops`, and every transport engine.
+
+    Latency benchmarks record the 50th and 99th percentile of a request/response exchange in microseconds and
+    throughput benchmarks record MiB per second in the extra info of the benchmark.
+"""
+import asyncio
+import contextlib
+import socket
+import threading
+import time
+
+import pytest
+
+from adbts.tcp import asynchronous, protocol
+
+#: Number of bytes in a request/response message, e.g. an ADB message header and small payload.
+MESSAGE_SIZE = 88
+
+
+#: Number of request/response exchanges per latency benchmark round.
+NUM_EXCHANGES = 1000
+
+
+#: Number of bytes echoed per throughput benchmark round.
+STREAM_SIZE = 16 * 1024 * 1024
+
+
+#: Number of bytes per write and read in throughput benchmarks.
+CHUNK_SIZE = 64 * 1024
+
+
+ENGINES = [
+    asynchronous.ENGINE_STREAMS,
+    pytest.param(asynchronous.ENGINE_PROTOCOL, marks=pytest.mark.skipif(
+        not protocol.HAS_BUFFERED_PROTOCOL, reason='Buffered protocols require Python 3.7+')),
+]
+
+
+def echo(conn):
+    """
+    Send every byte received on the given connection back until the peer closes it.
+    """
+    buffer = bytearray(CHUNK_SIZE)
+    with conn, contextlib.suppress(ConnectionError):
+        while True:
+            received = conn.recv_into(buffer)
+            if not received:
+                return
+            conn.sendall(memoryview(buffer)[:received])
+
+
+def serve(listener):
+    """
+    Accept connections on the given listening socket and echo each one on its own thread.
+    """
+    with contextlib.suppress(OSError):
+        while True:
+            conn, _ = listener.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=echo, args=(conn,), daemon=True).start()
+
+
+@pytest.fixture(scope='module')
+def echo_server():
+    """
+    Fixture that yields the port of a local TCP echo server.
+    """
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(8)
+    thread = threading.Thread(target=serve, args=(listener,), daemon=True)
+    thread.start()
+    yield listener.getsockname()[1]
+    listener.close()
+    thread.join(5)
+
+
+@pytest.fixture(scope='function')
+def connect(event_loop, echo_server):
+    """
+    Fixture that yields a function that connects a transport of the given engine to the echo server.
+    """
+    transports = []
+
+    def factory(engine):
+        transport = event_loop.run_until_complete(
+            asynchronous.open('127.0.0.1', echo_server, timeout=5000, engine=engine))
+        transports.append(transport)
+        return transport
+
+    yield factory
+    for transport in transports:
+        transport.close()
+    event_loop.run_until_complete(asyncio.sleep(0))
+
+
+def percentile(samples, fraction):
+    """
+    Get the sample below which the given fraction of the sorted samples falls.
+    """
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_echo_latency(benchmark, event_loop, connect, engine):
+    """
+    Benchmark request/response exchanges of small messages, recording the latency percentiles of an exchange.
+    """
+    transport = connect(engine)
+    message = bytes(MESSAGE_SIZE)
+    latencies = []
+
+    async def exchange():
+        for _ in range(NUM_EXCHANGES):
+            started = time.perf_counter()
+            await transport.write(message, timeout=5000)
+            await transport.read_exactly(MESSAGE_SIZE, timeout=5000)
+            latencies.append(time.perf_counter() - started)
+
+    benchmark.pedantic(lambda: event_loop.run_until_complete(exchange()), rounds=10)
+    latencies.sort()
+    benchmark.extra_info['exchanges'] = NUM_EXCHANGES
+    benchmark.extra_info['p50_us'] = round(percentile(latencies, 0.50) * 1e6, 1)
+    benchmark.extra_info['p99_us'] = round(percentile(latencies, 0.99) * 1e6, 1)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_echo_throughput(benchmark, event_loop, connect, engine):
+    """
+    Benchmark writing a stream of bytes while reading its echo concurrently, recording MiB per second.
+    """
+    transport = connect(engine)
+    chunk = bytes(CHUNK_SIZE)
+    buffer = bytearray(CHUNK_SIZE)
+
+    async def write_stream():
+        for _ in range(STREAM_SIZE // CHUNK_SIZE):
+            await transport.write(chunk, timeout=5000)
+
+    async def read_stream():
+        received = 0
+        while received < STREAM_SIZE:
+            received += await transport.readinto(buffer, timeout=5000)
+
+    durations = []
+
+    async def stream():
+        started = time.perf_counter()
+        await asyncio.gather(write_stream(), read_stream())
+        durations.append(time.perf_counter() - started)
+
+    benchmark.pedantic(lambda: event_loop.run_until_complete(stream()), rounds=5)
+    benchmark.extra_info['bytes'] = STREAM_SIZE
+    benchmark.extra_info['mib_per_second'] = round(STREAM_SIZE * len(durations) / (1024 * 1024) / sum(durations), 1)
@@ -0,0 +1,96 @@
+"""
+    test_file_push
+    ~~~~~~~~~~~~~~
+
+    Throughput benchmarks for pushing a large file over a synchronous TCP transport on a local socket pair.
+
+    The file is either read into Python bytes chunk by chunk and written with
+    :meth:`~adbts.tcp.synchronous.Transport.write`, or written with
+    :meth:`~adbts.tcp.synchronous.Transport.write_file` using :func:`~os.sendfile` or a memory mapping.
+
+    The file size defaults to 256 MiB and can be raised to multiple GiB with the `ADBTS_BENCHMARK_FILE_SIZE`
+    environment variable, given in bytes.
+"""
+import os
+import socket
+import threading
+
+import pytest
+
+from adbts.tcp import synchronous
+
+#: Number of bytes in the pushed file.
+FILE_SIZE = int(os.environ.get('ADBTS_BENCHMARK_FILE_SIZE', 256 * 1024 * 1024))
+
+
+#: Number of bytes read from the file per write when pushing it chunk by chunk.
+CHUNK_SIZE = 1024 * 1024
+
+
+@pytest.fixture(scope='module')
+def large_file(tmpdir_factory):
+    """
+    Fixture that yields the path of a large file whose pages are cached after the first read.
+    """
+    path = tmpdir_factory.mktemp('push').join('large.bin')
+    with open(str(path), 'wb') as file:
+        chunk = os.urandom(CHUNK_SIZE)
+        for _ in range(FILE_SIZE // CHUNK_SIZE):
+            file.write(chunk)
+    return str(path)
+
+
+def drain(sock, num_bytes):
+    """
+    Receive and discard the given number of bytes.
+    """
+    buffer = bytearray(CHUNK_SIZE)
+    received = 0
+    while received < num_bytes:
+        chunk = sock.recv_into(buffer)
+        if not chunk:
+            return
+        received += chunk
+
+
+def push_chunked(transport, path):
+    """
+    Push a file by reading it into Python bytes and writing each chunk.
+    """
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            transport.write(chunk, timeout=None)
+
+
+def push_write_file(transport, path):
+    """
+    Push a file with :meth:`~adbts.tcp.synchronous.Transport.write_file`.
+    """
+    transport.write_file(path, timeout=None)
+
+
+@pytest.mark.parametrize('engine', ['chunked', 'sendfile', 'mmap'])
+def test_push_file(benchmark, monkeypatch, large_file, engine):
+    """
+    Benchmark pushing a large file with each engine.
+    """
+    if engine == 'mmap':
+        monkeypatch.delattr(synchronous.os, 'sendfile', raising=False)
+    if engine == 'sendfile' and not hasattr(os, 'sendfile'):
+        pytest.skip('os.sendfile is not available')
+    push = push_chunked if engine == 'chunked' else push_write_file
+    local, remote = socket.socketpair()
+    transport = synchronous.Transport('localhost', 5555, local)
+
+    def run_round():
+        receiver = threading.Thread(target=drain, args=(remote, os.path.getsize(large_file)))
+        receiver.start()
+        push(transport, large_file)
+        receiver.join()
+
+    try:
+        benchmark.extra_info['bytes'] = os.path.getsize(large_file)
+        benchmark.pedantic(run_round, rounds=3, warmup_rounds=1)
+    finally:
+        transport.close()
+        remote.close()
@@ -0,0 +1,128 @@
+"""
+    test_tcp_async_engines
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Throughput and latency benchmarks for asynchronous TCP transports built on streams and on a buffered protocol,
+    see :data:`~adbts.tcp.asynchronous.ENGINE_STREAMS` and :data:`~adbts.tcp.asynchronous.ENGINE_PROTOCOL`.
+"""
+import asyncio
+import contextlib
+import socket
+import threading
+
+import pytest
+
+from adbts.tcp import asynchronous, protocol
+
+#: Number of bytes in a request/response message, e.g. an ADB message header and small payload.
+MESSAGE_SIZE = 88
+
+
+#: Number of request/response exchanges per latency benchmark round.
+NUM_EXCHANGES = 200
+
+
+#: Number of bytes streamed per throughput benchmark round.
+STREAM_SIZE = 32 * 1024 * 1024
+
+
+#: Number of bytes requested per read in throughput benchmarks.
+READ_SIZE = 4096
+
+
+ENGINES = [
+    asynchronous.ENGINE_STREAMS,
+    pytest.param(asynchronous.ENGINE_PROTOCOL, marks=pytest.mark.skipif(
+        not protocol.HAS_BUFFERED_PROTOCOL, reason='Buffered protocols require Python 3.7+')),
+]
+
+
+def echo(conn):
+    """
+    Answer every request on the given connection with a response of the same size.
+    """
+    with conn, contextlib.suppress(ConnectionError):
+        request = bytearray(MESSAGE_SIZE)
+        while True:
+            view = memoryview(request)
+            while view:
+                received = conn.recv_into(view)
+                if not received:
+                    return
+                view = view[received:]
+            conn.sendall(request)
+
+
+def stream(conn):
+    """
+    Send a stream of bytes on the given connection, one round after every request byte.
+    """
+    chunk = bytes(1024 * 1024)
+    with conn, contextlib.suppress(ConnectionError):
+        while conn.recv(1):
+            for _ in range(STREAM_SIZE // len(chunk)):
+                conn.sendall(chunk)
+
+
+@pytest.fixture(scope='function')
+def connect(event_loop):
+    """
+    Fixture that yields a function that connects a transport of the given engine to a local server thread.
+    """
+    threads = []
+    transports = []
+
+    def factory(engine, serve):
+        local, remote = socket.socketpair()
+        thread = threading.Thread(target=serve, args=(remote,), daemon=True)
+        thread.start()
+        threads.append(thread)
+        if engine == asynchronous.ENGINE_PROTOCOL:
+            transport = event_loop.run_until_complete(protocol.open_connection('localhost', 0, local))
+        else:
+            reader, writer = event_loop.run_until_complete(asyncio.open_connection(sock=local))
+            transport = asynchronous.Transport('localhost', 0, reader, writer, event_loop)
+        transports.append(transport)
+        return transport
+
+    yield factory
+    for transport in transports:
+        transport.close()
+    event_loop.run_until_complete(asyncio.sleep(0))
+    for thread in threads:
+        thread.join(5)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_request_response(benchmark, event_loop, connect, engine):
+    """
+    Benchmark request/response exchanges of small messages.
+    """
+    transport = connect(engine, echo)
+    message = bytes(MESSAGE_SIZE)
+
+    async def exchange():
+        for _ in range(NUM_EXCHANGES):
+            await transport.write(message, timeout=5000)
+            await transport.read_exactly(MESSAGE_SIZE, timeout=5000)
+
+    benchmark.extra_info['exchanges'] = NUM_EXCHANGES
+    benchmark.pedantic(lambda: event_loop.run_until_complete(exchange()), rounds=10)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_stream_read(benchmark, event_loop, connect, engine):
+    """
+    Benchmark reading a stream of bytes in small reads.
+    """
+    transport = connect(engine, stream)
+    buffer = bytearray(READ_SIZE)
+
+    async def read_stream():
+        await transport.write(b'\x01', timeout=5000)
+        received = 0
+        while received < STREAM_SIZE:
+            received += await transport.readinto(buffer, timeout=5000)
+
+    benchmark.extra_info['bytes'] = STREAM_SIZE
+    benchmark.pedantic(lambda: event_loop.run_until_complete(read_stream()), rounds=5)
@@ -0,0 +1,103 @@
+"""
+    test_tcp_async_writes
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Benchmarks for pipelined small writes on an asynchronous TCP transport that waits for the stream writer to
+    drain after every write, compared to one that batches writes below a write high-water mark.
+
+    The number of `send` system calls made by the loop transport of the default event loop is recorded in the
+    extra info of the benchmark.
+"""
+import asyncio
+import contextlib
+import socket
+import threading
+
+import pytest
+
+from adbts.tcp import asynchronous
+
+#: Number of bytes in a message, e.g. an ADB message header and small payload.
+MESSAGE_SIZE = 88
+
+
+#: Number of messages written per benchmark round.
+NUM_MESSAGES = 2000
+
+
+#: Write high-water mark of the batching transport.
+HIGH_WATER = 64 * 1024
+
+
+def acknowledge(conn):
+    """
+    Receive rounds of messages on the given connection and acknowledge every round with a single byte.
+    """
+    round_size = NUM_MESSAGES * MESSAGE_SIZE
+    buffer = bytearray(round_size)
+    with conn, contextlib.suppress(ConnectionError):
+        while True:
+            view = memoryview(buffer)
+            while view:
+                received = conn.recv_into(view)
+                if not received:
+                    return
+                view = view[received:]
+            conn.sendall(b'\x01')
+
+
+class CountingSocket:
+    """
+    Proxy that counts `send` calls made on the wrapped non-blocking socket.
+    """
+
+    def __init__(self, sock):
+        self._socket = sock
+        self.sends = 0
+
+    def __getattr__(self, name):
+        return getattr(self._socket, name)
+
+    def send(self, data, *args):
+        self.sends += 1
+        return self._socket.send(data, *args)
+
+
+@pytest.mark.parametrize('write_high_water', [None, HIGH_WATER], ids=['drain', 'batched'])
+def test_pipelined_writes(benchmark, event_loop, write_high_water):
+    """
+    Benchmark writing rounds of small messages back to back, waiting for the peer to acknowledge each round.
+    """
+    local, remote = socket.socketpair()
+    thread = threading.Thread(target=acknowledge, args=(remote,), daemon=True)
+    thread.start()
+
+    async def connect():
+        reader, writer = await asyncio.open_connection(sock=local)
+        return asynchronous.Transport('localhost', 0, reader, writer, event_loop, write_high_water)
+
+    transport = event_loop.run_until_complete(connect())
+    # Only the selector transports of the default loop expose their socket to count sends on.
+    # pylint: disable=protected-access
+    loop_transport = transport._writer.transport
+    counter = CountingSocket(loop_transport._sock) if hasattr(loop_transport, '_sock') else None
+    if counter is not None:
+        loop_transport._sock = counter
+    message = bytes(MESSAGE_SIZE)
+
+    async def write_round():
+        for _ in range(NUM_MESSAGES):
+            await transport.write(message, timeout=5000)
+        await transport.flush(timeout=5000)
+        await transport.read_exactly(1, timeout=5000)
+
+    try:
+        benchmark.pedantic(lambda: event_loop.run_until_complete(write_round()), rounds=10)
+        if counter is not None:
+            benchmark.extra_info['sends_per_round'] = counter.sends / 10
+    finally:
+        if counter is not None:
+            loop_transport._sock = counter._socket
+        transport.close()
+        event_loop.run_until_complete(asyncio.sleep(0))
+        thread.join(5)
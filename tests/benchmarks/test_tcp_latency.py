@@ -0,0 +1,83 @@
+"""
+    test_tcp_latency
+    ~~~~~~~~~~~~~~~~
+
+    Request/response latency benchmarks for synchronous TCP transports opened with and without the low latency
+    socket options of :mod:`~adbts.tcp.options`.
+
+    Each request is written as a 24 byte header followed by a separate small payload, like an ADB message. With
+    Nagle's algorithm enabled the payload is held back until the peer acknowledges the header, which a peer
+    using delayed ACKs only does after a timeout.
+"""
+import socket
+import threading
+
+import pytest
+
+from adbts.tcp import options, synchronous
+
+#: Number of bytes in a message header.
+HEADER_SIZE = 24
+
+
+#: Number of bytes in a message payload.
+PAYLOAD_SIZE = 64
+
+
+#: Number of request/response exchanges per benchmark round.
+NUM_EXCHANGES = 20
+
+
+def serve(listener):
+    """
+    Accept a single connection and answer every request with a response of the same size.
+    """
+    conn, _ = listener.accept()
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    with conn:
+        request = bytearray(HEADER_SIZE + PAYLOAD_SIZE)
+        while True:
+            view = memoryview(request)
+            while view:
+                received = conn.recv_into(view)
+                if not received:
+                    return
+                view = view[received:]
+            conn.sendall(request)
+
+
+@pytest.fixture(scope='function')
+def server():
+    """
+    Fixture that yields the address of a local request/response server.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    thread = threading.Thread(target=serve, args=(listener,), daemon=True)
+    thread.start()
+    yield listener.getsockname()
+    thread.join(5)
+    listener.close()
+
+
+@pytest.mark.parametrize('socket_options', [options.SYSTEM_DEFAULTS, options.LOW_LATENCY],
+                         ids=['system', 'low-latency'])
+def test_request_response(benchmark, server, socket_options):
+    """
+    Benchmark request/response exchanges of small messages.
+    """
+    transport = synchronous.open(*server, timeout=5000, socket_options=socket_options)
+    header, payload = bytes(HEADER_SIZE), bytes(PAYLOAD_SIZE)
+
+    def exchange():
+        for _ in range(NUM_EXCHANGES):
+            transport.write(header)
+            transport.write(payload)
+            transport.read_exactly(HEADER_SIZE + PAYLOAD_SIZE)
+
+    try:
+        benchmark.extra_info['exchanges'] = NUM_EXCHANGES
+        benchmark.pedantic(exchange, rounds=5)
+    finally:
+        transport.close()
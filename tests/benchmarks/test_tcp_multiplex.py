@@ -0,0 +1,96 @@
+"""
+    test_tcp_multiplex
+    ~~~~~~~~~~~~~~~~~~
+
+    Benchmarks for servicing many synchronous TCP transports over local socket pairs, either with a thread
+    blocked in `read_exactly` per transport or with a single thread driven by a
+    :class:`~adbts.tcp.selector.TransportSelector`.
+
+    Each round, every peer sends one message and the round completes once all messages were read.
+"""
+import socket
+import threading
+
+import pytest
+
+from adbts import exceptions
+from adbts.tcp import selector, synchronous
+
+#: Number of bytes in a message.
+MESSAGE_SIZE = 64
+
+
+class ThreadPerTransport:
+    """
+    Services every transport with a dedicated thread.
+    """
+
+    def __init__(self, transports):
+        self._received = threading.Semaphore(0)
+        self._threads = [threading.Thread(target=self._run, args=(transport,), daemon=True)
+                         for transport in transports]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self, transport):
+        while True:
+            try:
+                transport.read_exactly(MESSAGE_SIZE, timeout=None)
+            except exceptions.TransportError:
+                return
+            self._received.release()
+
+    def service(self, num_messages):
+        for _ in range(num_messages):
+            self._received.acquire()
+
+    def close(self):
+        for thread in self._threads:
+            thread.join(5)
+
+
+class SingleThreadSelector:
+    """
+    Services every transport from the calling thread.
+    """
+
+    def __init__(self, transports):
+        self._selector = selector.TransportSelector()
+        for transport in transports:
+            self._selector.register(transport)
+
+    def service(self, num_messages):
+        remaining = num_messages * MESSAGE_SIZE
+        while remaining:
+            for item in self._selector.select(timeout=None):
+                remaining -= len(item.transport.read_available(65536))
+
+    def close(self):
+        self._selector.close()
+
+
+@pytest.mark.parametrize('num_transports', [50, 300])
+@pytest.mark.parametrize('engine', [ThreadPerTransport, SingleThreadSelector], ids=['threads', 'selector'])
+def test_service_transports(benchmark, engine, num_transports):
+    """
+    Benchmark reading one message from each of many transports.
+    """
+    pairs = [socket.socketpair() for _ in range(num_transports)]
+    transports = [synchronous.Transport('localhost', 5555, local) for local, _ in pairs]
+    service = engine(transports)
+    message = bytes(MESSAGE_SIZE)
+
+    def run_round():
+        for _, remote in pairs:
+            remote.sendall(message)
+        service.service(num_transports)
+
+    try:
+        benchmark.extra_info['threads'] = num_transports if engine is ThreadPerTransport else 1
+        benchmark.pedantic(run_round, rounds=20)
+    finally:
+        for _, remote in pairs:
+            remote.close()
+        service.close()
+        for transport in transports:
+            transport.close()
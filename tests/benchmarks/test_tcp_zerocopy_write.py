@@ -0,0 +1,78 @@
+"""
+    test_tcp_zerocopy_write
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Throughput benchmarks for large writes over a synchronous TCP transport with regular and zero-copy sends.
+
+    The kernel copies zero-copy sends over loopback anyway, so against the default local sink these benchmarks
+    show the overhead zero-copy adds when it cannot pay off. To measure where it does, run a sink that discards
+    everything it receives on another machine, e.g. `socat -u TCP-LISTEN:9000,fork,reuseaddr OPEN:/dev/null`,
+    and point the `ADBTS_BENCHMARK_SINK` environment variable at it as `host:port`.
+"""
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+from adbts.tcp import synchronous
+
+#: Remote sink given as 'host:port', or None to use a local one.
+SINK = os.environ.get('ADBTS_BENCHMARK_SINK')
+
+
+#: Number of bytes written per benchmark round.
+BYTES_PER_ROUND = 64 * 1024 * 1024
+
+
+def discard(listener):
+    """
+    Accept connections and read everything sent on them until the listener is closed.
+    """
+    while True:
+        try:
+            conn, _ = listener.accept()
+        except OSError:
+            return
+        with conn:
+            while conn.recv(1024 * 1024):
+                pass
+
+
+@pytest.fixture(scope='module')
+def sink():
+    """
+    Fixture that yields the address of a server that discards everything it receives.
+    """
+    if SINK:
+        host, _, port = SINK.rpartition(':')
+        yield host, int(port)
+        return
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(8)
+    threading.Thread(target=discard, args=(listener,), daemon=True).start()
+    yield listener.getsockname()
+    listener.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Zero-copy sends require Linux')
+@pytest.mark.parametrize('write_size', [16 * 1024, 256 * 1024, 4 * 1024 * 1024])
+@pytest.mark.parametrize('zerocopy_threshold', [None, 0], ids=['copy', 'zerocopy'])
+def test_write(benchmark, sink, write_size, zerocopy_threshold):
+    """
+    Benchmark writing large buffers of bytes.
+    """
+    transport = synchronous.open(*sink, timeout=10000, zerocopy_threshold=zerocopy_threshold)
+    data = os.urandom(write_size)
+
+    def write():
+        for _ in range(BYTES_PER_ROUND // write_size):
+            transport.write(data)
+
+    try:
+        benchmark.extra_info['bytes'] = BYTES_PER_ROUND
+        benchmark.pedantic(write, rounds=5)
+    finally:
+        transport.close()
@@ -0,0 +1,105 @@
+"""
+    test_unix_latency
+    ~~~~~~~~~~~~~~~~~
+
+    Request/response latency benchmarks for synchronous unix domain socket transports compared to loopback
+    TCP ones, e.g. when talking to a local adb server or emulator.
+"""
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from adbts.tcp import synchronous as tcp
+from adbts.unix import synchronous as unix
+
+#: Number of bytes in a message header.
+HEADER_SIZE = 24
+
+
+#: Number of bytes in a message payload.
+PAYLOAD_SIZE = 64
+
+
+#: Number of request/response exchanges per benchmark round.
+NUM_EXCHANGES = 100
+
+
+def serve(listener):
+    """
+    Accept a single connection and answer every request with a response of the same size.
+    """
+    conn, _ = listener.accept()
+    with conn:
+        request = bytearray(HEADER_SIZE + PAYLOAD_SIZE)
+        while True:
+            view = memoryview(request)
+            while view:
+                received = conn.recv_into(view)
+                if not received:
+                    return
+                view = view[received:]
+            conn.sendall(request)
+
+
+def start(listener):
+    """
+    Start serving the given listening socket in a background thread.
+    """
+    listener.listen(1)
+    thread = threading.Thread(target=serve, args=(listener,), daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(scope='function')
+def tcp_transport():
+    """
+    Fixture that yields a synchronous TCP transport connected to a loopback request/response server.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    thread = start(listener)
+    transport = tcp.open(*listener.getsockname(), timeout=5000)
+    yield transport
+    transport.close()
+    thread.join(5)
+    listener.close()
+
+
+@pytest.fixture(scope='function')
+def unix_transport():
+    """
+    Fixture that yields a synchronous unix domain socket transport connected to a local request/response server.
+    """
+    directory = tempfile.mkdtemp(prefix='adbts-')
+    path = os.path.join(directory, 'bench.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    thread = start(listener)
+    transport = unix.open(path, timeout=5000)
+    yield transport
+    transport.close()
+    thread.join(5)
+    listener.close()
+    shutil.rmtree(directory)
+
+
+@pytest.mark.parametrize('family', ['tcp', 'unix'])
+def test_request_response(benchmark, request, family):
+    """
+    Benchmark request/response exchanges of small messages.
+    """
+    transport = request.getfixturevalue('{}_transport'.format(family))
+    header, payload = bytes(HEADER_SIZE), bytes(PAYLOAD_SIZE)
+
+    def exchange():
+        for _ in range(NUM_EXCHANGES):
+            transport.writev([header, payload])
+            transport.read_exactly(HEADER_SIZE + PAYLOAD_SIZE)
+
+    benchmark.extra_info['exchanges'] = NUM_EXCHANGES
+    benchmark.pedantic(exchange, rounds=10)
@@ -0,0 +1,53 @@
+"""
+    test_usb_open
+    ~~~~~~~~~~~~~
+
+    Latency benchmarks for opening synchronous USB transports on a simulated bus.
+"""
+import pytest
+
+from adbts.usb import index, libusb, synchronous
+
+
+def open_and_close_all(serials):
+    """
+    Open a transport to every serial and close them all once opened.
+    """
+    transports = [synchronous.open(serial=serial) for serial in serials]
+    for transport in transports:
+        transport.close()
+
+
+@pytest.mark.parametrize('num_devices', [1, 10, 100])
+@pytest.mark.parametrize('shared_context', [True, False], ids=['shared', 'per-transport'])
+def test_open_latency(benchmark, monkeypatch, simulated_usb_bus, num_devices, shared_context):
+    """
+    Benchmark opening transports to all devices with the shared context registry and with a new
+    context per transport.
+    """
+    serials = simulated_usb_bus(num_devices)
+    if not shared_context:
+        monkeypatch.setattr(libusb, 'acquire_context', libusb.open_context)
+
+    benchmark.extra_info['devices'] = num_devices
+    benchmark.pedantic(open_and_close_all, args=(serials,), rounds=3)
+
+
+@pytest.mark.parametrize('num_devices', [1, 10, 100])
+@pytest.mark.parametrize('indexed', [True, False], ids=['indexed', 'full-scan'])
+def test_open_by_serial_latency(benchmark, monkeypatch, simulated_usb_bus, num_devices, indexed):
+    """
+    Benchmark repeatedly opening transports by serial with the device index and with a full bus scan
+    per open.
+    """
+    serials = simulated_usb_bus(num_devices)
+    if not indexed:
+        monkeypatch.setattr(index, 'find_indexed_device', libusb.find_device)
+
+    # Keep one transport open so every round shares the same context and device index.
+    keep_alive = synchronous.open(serial=serials[0])
+    try:
+        benchmark.extra_info['devices'] = num_devices
+        benchmark.pedantic(open_and_close_all, args=(serials,), rounds=3)
+    finally:
+        keep_alive.close()
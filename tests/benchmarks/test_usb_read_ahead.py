@@ -0,0 +1,143 @@
+"""
+    test_usb_read_ahead
+    ~~~~~~~~~~~~~~~~~~~
+
+    Throughput benchmarks for synchronous USB reads with and without read-ahead.
+
+    The device is simulated: every bulk IN transfer occupies the bus for `size / BUS_BYTES_PER_SECOND`
+    seconds and a transfer submitted while the bus is idle pays an additional `TURNAROUND_SECONDS`
+    of host scheduling latency. Queued transfers start as soon as the previous one completes.
+"""
+import time
+
+import pytest
+import usb1
+
+from adbts.usb import libusb, readahead, synchronous
+
+#: Simulated bulk endpoint throughput (roughly USB 2.0 high-speed).
+BUS_BYTES_PER_SECOND = 40 * 1024 * 1024
+
+
+#: Simulated latency between a transfer being submitted and the device being polled.
+TURNAROUND_SECONDS = 0.0005
+
+
+#: Number of bytes read per benchmark round.
+TOTAL_BYTES = 4 * 1024 * 1024
+
+
+class SimulatedEndpoint:
+    """
+    Bulk IN endpoint of the simulated device.
+    """
+
+    def getAddress(self):  # pylint: disable=invalid-name
+        return libusb.USB_ENDPOINT_DIRECTION_IN | 0x01
+
+
+class SimulatedTransfer:
+    """
+    Bulk IN transfer that completes once the simulated bus has moved its bytes.
+    """
+
+    def __init__(self, bus):
+        self._bus = bus
+        self._buffer = bytearray()
+        self._callback = None
+        self.completes_at = None
+
+    def setBulk(self, endpoint, buffer_or_len, callback=None,  # pylint: disable=invalid-name
+                user_data=None, timeout=0):
+        self._buffer = bytearray(buffer_or_len)
+        self._callback = callback
+
+    def submit(self):
+        self._bus.submit(self)
+
+    def isSubmitted(self):  # pylint: disable=invalid-name
+        return self in self._bus.queue
+
+    def cancel(self):
+        self._bus.queue.remove(self)
+
+    def getStatus(self):  # pylint: disable=invalid-name
+        return usb1.TRANSFER_COMPLETED
+
+    def getActualLength(self):  # pylint: disable=invalid-name
+        return len(self._buffer)
+
+    def getBuffer(self):  # pylint: disable=invalid-name
+        return self._buffer
+
+    def complete(self):
+        self._callback(self)
+
+
+class SimulatedBus:
+    """
+    Bus that services bulk IN transfers one after another, acting as both USB context and handle.
+    """
+
+    def __init__(self):
+        self.queue = []
+        self._free_at = 0.0
+
+    def _schedule(self, size):
+        now = time.monotonic()
+        start = self._free_at if self._free_at > now else now + TURNAROUND_SECONDS
+        self._free_at = start + size / BUS_BYTES_PER_SECOND
+        return self._free_at
+
+    def submit(self, transfer):
+        transfer.completes_at = self._schedule(transfer.getActualLength())
+        self.queue.append(transfer)
+
+    def getTransfer(self):  # pylint: disable=invalid-name
+        return SimulatedTransfer(self)
+
+    def bulkRead(self, endpoint, num_bytes, timeout):  # pylint: disable=invalid-name
+        time.sleep(max(0.0, self._schedule(num_bytes) - time.monotonic()))
+        return bytes(num_bytes)
+
+    def handleEvents(self):  # pylint: disable=invalid-name
+        self.handleEventsTimeout(60)
+
+    def handleEventsTimeout(self, tv=0):  # pylint: disable=invalid-name
+        if self.queue:
+            time.sleep(max(0.0, min(self.queue[0].completes_at - time.monotonic(), tv)))
+        while self.queue and self.queue[0].completes_at <= time.monotonic():
+            self.queue.pop(0).complete()
+
+
+def make_transport(bus, read_ahead_transfers, transfer_size):
+    """
+    Create a synchronous USB transport that reads from the simulated bus.
+    """
+    endpoint = SimulatedEndpoint()
+    read_ahead = None
+    if read_ahead_transfers:
+        read_ahead = readahead.ReadAheadQueue(bus, bus, endpoint, read_ahead_transfers, transfer_size)
+        read_ahead.start()
+    return synchronous.Transport(None, None, None, bus, None, bus, None, endpoint, None, read_ahead)
+
+
+def read_all(transport, transfer_size):
+    """
+    Read :data:`TOTAL_BYTES` from the transport in transfer sized reads.
+    """
+    remaining = TOTAL_BYTES
+    while remaining > 0:
+        remaining -= len(transport.read(transfer_size, timeout=1000))
+
+
+@pytest.mark.parametrize('read_ahead_transfers', [0, 2, 4, 8])
+def test_read_throughput(benchmark, read_ahead_transfers, transfer_size):
+    """
+    Benchmark reading :data:`TOTAL_BYTES` with one bulk transfer per read (zero) and with read-ahead queues.
+    """
+    def setup():
+        return (make_transport(SimulatedBus(), read_ahead_transfers, transfer_size), transfer_size), {}
+
+    benchmark.extra_info['bytes'] = TOTAL_BYTES
+    benchmark.pedantic(read_all, setup=setup, rounds=5)
@@ -0,0 +1,98 @@
+"""
+    test_usb_threaded_io
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Latency and throughput benchmarks for asynchronous reads of a blocking USB transport performed by a dedicated
+    :class:`~adbts.usb.threaded.IOWorker` thread and by the default executor of the event loop.
+
+    The synchronous transport is simulated: every read blocks for `READ_SECONDS` and returns the requested bytes.
+    Like a real device, the transport services one transfer at a time.
+"""
+import asyncio
+import functools
+import threading
+import time
+
+import pytest
+
+from adbts.usb import threaded
+
+#: Simulated time the device takes to complete a bulk IN transfer.
+READ_SECONDS = 0.0001
+
+
+#: Number of bytes requested by each read.
+READ_SIZE = 512
+
+
+class SimulatedTransport:
+    """
+    Synchronous transport whose reads block for a fixed amount of time, one at a time.
+    """
+
+    def __init__(self):
+        self._bus = threading.Lock()
+
+    def read(self, num_bytes, timeout=None):
+        with self._bus:
+            time.sleep(READ_SECONDS)
+            return bytes(num_bytes)
+
+    def close(self):
+        pass
+
+
+class ExecutorTransport:
+    """
+    Asynchronous adapter that performs every read with `run_in_executor` on the default executor.
+    """
+
+    def __init__(self, transport, loop):
+        self._transport = transport
+        self._loop = loop
+
+    async def read(self, num_bytes, timeout=None):
+        return await self._loop.run_in_executor(None, functools.partial(self._transport.read, num_bytes, timeout))
+
+    def close(self):
+        pass
+
+
+def make_transport(engine, loop):
+    """
+    Create an asynchronous adapter around a simulated synchronous transport.
+    """
+    if engine == 'executor':
+        return ExecutorTransport(SimulatedTransport(), loop)
+    return threaded.Transport(SimulatedTransport(), threaded.IOWorker(loop))
+
+
+async def read_sequential(transport, num_reads):
+    """
+    Await reads one after another, measuring the round trip of a single operation.
+    """
+    for _ in range(num_reads):
+        await transport.read(READ_SIZE)
+
+
+async def read_pipelined(transport, num_reads):
+    """
+    Await many reads concurrently, measuring throughput when the worker is never idle.
+    """
+    await asyncio.gather(*(transport.read(READ_SIZE) for _ in range(num_reads)))
+
+
+@pytest.mark.parametrize('engine', ['executor', 'worker'])
+@pytest.mark.parametrize('mode', [read_sequential, read_pipelined], ids=['latency', 'throughput'])
+def test_async_read(benchmark, engine, mode):
+    """
+    Benchmark asynchronous reads using the default executor and a dedicated I/O worker thread.
+    """
+    loop = asyncio.new_event_loop()
+    transport = make_transport(engine, loop)
+    try:
+        benchmark.extra_info['reads'] = 1000
+        benchmark.pedantic(lambda: loop.run_until_complete(mode(transport, 1000)), rounds=5)
+    finally:
+        transport.close()
+        loop.close()
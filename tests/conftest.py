@@ -9,6 +9,8 @@ import random
 
 import pytest
 
+from adbts import loops
+
 
 @pytest.fixture(scope='session', params=[
     500,
@@ -44,3 +46,27 @@ def valid_bytes():
     Fixture that yields valid collections of bytes to write to a transport.
     """
     return os.urandom(random.randint(1, 1024))
+
+
+@pytest.fixture(scope='function', params=[
+    loops.LOOP_ASYNCIO,
+    pytest.param(loops.LOOP_UVLOOP, marks=pytest.mark.skipif(not loops.HAS_UVLOOP, reason='uvloop is not installed'))
+])
+def event_loop(request):
+    """
+    Fixture that yields a new event loop of every installed implementation that is closed after the test.
+    """
+    loop = loops.new_event_loop(request.param)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope='function')
+def valid_file(tmpdir):
+    """
+    Fixture that yields the path and content of a file of random bytes to write to a transport.
+    """
+    data = os.urandom(random.randint(70000, 140000))
+    path = tmpdir.join('file.bin')
+    path.write_binary(data)
+    return str(path), data
@@ -4,11 +4,342 @@
 
     Tests for the :mod:`~adbts.tpc.asynchronous` module.
 """
+import asyncio
+import inspect
+import socket
+
 import pytest
 
+from adbts import exceptions, files
 from adbts.tcp import asynchronous
 
 
-@pytest.mark.xfail(reason='Not implemented')
-def test_stub():
-    assert False
+@pytest.fixture(scope='function')
+def socket_pair():
+    """
+    Fixture that yields a pair of connected sockets that are closed after the test.
+    """
+    local, remote = socket.socketpair()
+    yield local, remote
+    local.close()
+    remote.close()
+
+
+@pytest.fixture(scope='function')
+def stream_transport(event_loop, socket_pair):
+    """
+    Fixture that yields a stream based transport over one end of a socket pair.
+    """
+    async def connect():
+        reader, writer = await asyncio.open_connection(sock=socket_pair[0])
+        return asynchronous.Transport('localhost', 5555, reader, writer, event_loop)
+
+    transport = event_loop.run_until_complete(connect())
+    yield transport
+    if not transport.closed:
+        transport.close()
+
+
+@pytest.fixture(scope='function')
+def batched_transport(event_loop, socket_pair):
+    """
+    Fixture that yields a stream based transport that batches writes below a high-water mark of 1024 bytes.
+    """
+    async def connect():
+        reader, writer = await asyncio.open_connection(sock=socket_pair[0])
+        return asynchronous.Transport('localhost', 5555, reader, writer, event_loop,
+                                      write_high_water=1024, write_low_water=256)
+
+    transport = event_loop.run_until_complete(connect())
+    yield transport
+    if not transport.closed:
+        transport.close()
+
+
+def receive(sock, num_bytes):
+    """
+    Receive exactly the given number of bytes from the given socket.
+    """
+    received = b''
+    while len(received) < num_bytes:
+        received += sock.recv(num_bytes - len(received))
+    return received
+
+
+@pytest.fixture(scope='function')
+def remote(socket_pair):
+    """
+    Fixture that yields the peer socket of the stream based transport.
+    """
+    return socket_pair[1]
+
+
+@pytest.mark.parametrize('name', ['read', 'readinto', 'read_exactly', 'write', 'writev', 'write_file', 'flush'])
+def test_transport_methods_are_coroutine_functions(name):
+    """
+    Assert that the I/O methods of :class:`~adbts.tcp.asynchronous.Transport` remain native coroutine functions
+    through their decorators.
+    """
+    assert inspect.iscoroutinefunction(getattr(asynchronous.Transport, name))
+
+
+def test_read_returns_received_bytes(event_loop, stream_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.read` returns bytes sent by the peer.
+    """
+    remote.sendall(valid_bytes)
+    received = b''
+    while len(received) < len(valid_bytes):
+        received += event_loop.run_until_complete(stream_transport.read(len(valid_bytes), timeout=1000))
+    assert received == valid_bytes
+
+
+def test_read_raises_timeout_error(event_loop, stream_transport):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when no bytes arrive in time.
+    """
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(stream_transport.read(1, timeout=10))
+
+
+def test_readinto_fills_given_buffer(event_loop, stream_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.readinto` receives bytes into the given buffer.
+    """
+    remote.sendall(valid_bytes)
+    buffer = bytearray(len(valid_bytes))
+    view = memoryview(buffer)
+    received = 0
+    while received < len(buffer):
+        received += event_loop.run_until_complete(stream_transport.readinto(view[received:], timeout=1000))
+    assert buffer == valid_bytes
+
+
+def test_read_exactly_raises_on_early_eof(event_loop, stream_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when the peer closes before all bytes arrived.
+    """
+    remote.sendall(b'partial')
+    remote.shutdown(socket.SHUT_WR)
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(stream_transport.read_exactly(100, timeout=1000))
+
+
+def test_writev_sends_buffers_in_order(event_loop, stream_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.writev` sends every buffer in order.
+    """
+    event_loop.run_until_complete(stream_transport.writev([bytes(24), valid_bytes], timeout=1000))
+    expected = bytes(24) + valid_bytes
+    received = b''
+    while len(received) < len(expected):
+        received += remote.recv(len(expected))
+    assert received == expected
+
+
+def test_write_raises_on_closed_connection(event_loop, stream_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write` raises a
+    :class:`~adbts.exceptions.TransportError` converted from the error raised while draining.
+    """
+    remote.close()
+    with pytest.raises(exceptions.TransportError):
+        for _ in range(100):
+            event_loop.run_until_complete(stream_transport.write(bytes(64 * 1024), timeout=1000))
+
+
+def test_close_raises_on_further_reads(event_loop, stream_transport):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportClosedError` once the transport is closed.
+    """
+    stream_transport.close()
+    assert stream_transport.closed
+    with pytest.raises(exceptions.TransportClosedError):
+        event_loop.run_until_complete(stream_transport.read(1))
+
+
+def test_open_connects_to_listener(event_loop):
+    """
+    Assert that :func:`~adbts.tcp.asynchronous.open` connects a stream based transport to a listening socket.
+    """
+    with socket.socket() as listener:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        port = listener.getsockname()[1]
+        transport = event_loop.run_until_complete(asynchronous.open('127.0.0.1', port, timeout=1000))
+        conn, _ = listener.accept()
+        with conn:
+            conn.sendall(b'okay')
+            assert event_loop.run_until_complete(transport.read_exactly(4, timeout=1000)) == b'okay'
+        transport.close()
+
+
+def test_open_raises_transport_error_when_refused(event_loop):
+    """
+    Assert that :func:`~adbts.tcp.asynchronous.open` raises a :class:`~adbts.exceptions.TransportError`
+    when the connection is refused.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        with pytest.raises(exceptions.TransportError):
+            event_loop.run_until_complete(asynchronous.open('127.0.0.1', port, timeout=1000))
+
+
+def test_open_raises_timeout_error_when_connect_hangs(event_loop, monkeypatch):
+    """
+    Assert that :func:`~adbts.tcp.asynchronous.open` raises a :class:`~adbts.exceptions.TransportTimeoutError`
+    when connecting outlasts the timeout.
+    """
+    async def hang(*args):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(asynchronous, '_connect', hang)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(asynchronous.open('127.0.0.1', 5555, timeout=10))
+
+
+def test_batched_transport_sets_write_buffer_limits(batched_transport):
+    """
+    Assert that :class:`~adbts.tcp.asynchronous.Transport` sets the given watermarks on the loop transport.
+    """
+    writer = batched_transport._writer  # pylint: disable=protected-access
+    assert writer.transport.get_write_buffer_limits() == (256, 1024)
+
+
+def test_batched_writes_are_sent_together_after_loop_iteration(event_loop, batched_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write` batches writes below the high-water mark and
+    hands them to the loop transport once the event loop runs.
+    """
+    async def write():
+        await batched_transport.write(b'first', timeout=1000)
+        await batched_transport.writev([b'second', bytearray(b'third')], timeout=1000)
+        with pytest.raises(BlockingIOError):
+            remote.recv(100, socket.MSG_DONTWAIT)
+        await asyncio.sleep(0)
+
+    event_loop.run_until_complete(write())
+    assert receive(remote, 16) == b'firstsecondthird'
+
+
+def test_batched_write_above_high_water_mark_is_sent(event_loop, batched_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write` hands batched bytes to the loop transport as soon
+    as they exceed the high-water mark.
+    """
+    async def write():
+        await batched_transport.write(b'header', timeout=1000)
+        await batched_transport.write(bytes(2048), timeout=1000)
+        return receive(remote, 2054)
+
+    assert event_loop.run_until_complete(write()) == b'header' + bytes(2048)
+
+
+def test_flush_sends_batched_writes(event_loop, batched_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.flush` sends batched writes without waiting for the
+    event loop to run.
+    """
+    async def write():
+        await batched_transport.write(b'request', timeout=1000)
+        await batched_transport.flush(timeout=1000)
+        return receive(remote, 7)
+
+    assert event_loop.run_until_complete(write()) == b'request'
+
+
+def test_close_sends_batched_writes(event_loop, batched_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.close` sends batched writes before closing.
+    """
+    event_loop.run_until_complete(batched_transport.write(b'goodbye', timeout=1000))
+    batched_transport.close()
+    event_loop.run_until_complete(asyncio.sleep(0))
+    assert receive(remote, 7) == b'goodbye'
+
+
+def test_write_file_sends_file(event_loop, stream_transport, remote, valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write_file` sends the contents of the given file, also
+    on event loops that cannot send files themselves.
+    """
+    path, data = valid_file
+
+    async def write():
+        received = event_loop.run_in_executor(None, receive, remote, len(data))
+        count = await stream_transport.write_file(path, timeout=1000)
+        return count, await received
+
+    assert event_loop.run_until_complete(write()) == (len(data), data)
+
+
+@pytest.mark.parametrize('offset,count', [(0, None), (1000, 5000), (4096, None)])
+def test_write_file_sends_file_region(event_loop, stream_transport, remote, valid_file, offset, count):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write_file` sends the given region of a file.
+    """
+    path, data = valid_file
+    expected = data[offset:] if count is None else data[offset:offset + count]
+
+    async def write():
+        received = event_loop.run_in_executor(None, receive, remote, len(expected))
+        written = await stream_transport.write_file(path, offset, count, timeout=1000)
+        return written, await received
+
+    assert event_loop.run_until_complete(write()) == (len(expected), expected)
+
+
+def test_write_file_raises_on_missing_file(event_loop, stream_transport, tmpdir):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write_file` raises the :class:`~OSError` of a file
+    that cannot be opened rather than a transport error.
+    """
+    with pytest.raises(FileNotFoundError):
+        event_loop.run_until_complete(stream_transport.write_file(str(tmpdir.join('missing.bin'))))
+
+
+def test_write_file_raises_on_timeout(event_loop, stream_transport, tmpdir):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write_file` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when the peer does not read the file in time.
+    """
+    path = tmpdir.join('large.bin')
+    path.write_binary(bytes(16 * 1024 * 1024))
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(stream_transport.write_file(str(path), timeout=50))
+
+
+def test_write_file_writes_mapped_slices_without_sendfile(monkeypatch, event_loop, stream_transport, remote,
+                                                          valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.asynchronous.Transport.write_file` writes the memory mapped file in slices of
+    at most :data:`~adbts.files.DEFAULT_CHUNK_SIZE` bytes when the event loop cannot send files.
+    """
+    async def sendfile(*args, **kwargs):
+        raise NotImplementedError
+
+    writer = stream_transport._writer  # pylint: disable=protected-access
+    write = writer.write
+    sizes = []
+
+    def record(data):
+        sizes.append(len(data))
+        write(data)
+
+    monkeypatch.setattr(event_loop, 'sendfile', sendfile)
+    monkeypatch.setattr(files, 'DEFAULT_CHUNK_SIZE', 16 * 1024)
+    monkeypatch.setattr(writer, 'write', record)
+    path, data = valid_file
+
+    async def push():
+        received = event_loop.run_in_executor(None, receive, remote, len(data))
+        written = await stream_transport.write_file(path, timeout=5000)
+        return written, await received
+
+    assert event_loop.run_until_complete(push()) == (len(data), data)
+    assert len(sizes) > 1
+    assert max(sizes) <= 16 * 1024
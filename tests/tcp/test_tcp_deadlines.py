@@ -0,0 +1,110 @@
+"""
+    test_tcp_deadlines
+    ~~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.deadlines` module.
+"""
+import asyncio
+import socket
+
+import pytest
+
+from adbts.tcp import asynchronous, deadlines
+
+
+def test_deadline_raises_timeout_error_when_passed(event_loop):
+    """
+    Assert that :class:`~adbts.tcp.deadlines.Deadline` raises a :class:`~asyncio.TimeoutError` when the awaited
+    work outlasts it.
+    """
+    async def wait():
+        deadline = deadlines.after(10)
+        with pytest.raises(asyncio.TimeoutError):
+            with deadline:
+                await asyncio.sleep(5)
+        return deadline
+
+    deadline = event_loop.run_until_complete(wait())
+    assert deadline.expired
+
+
+def test_deadline_returns_result_in_time(event_loop):
+    """
+    Assert that :class:`~adbts.tcp.deadlines.Deadline` does not interfere with work that completes in time and
+    cancels its timer on exit.
+    """
+    async def wait():
+        deadline = deadlines.after(5000)
+        with deadline:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.05)
+        return deadline
+
+    deadline = event_loop.run_until_complete(wait())
+    assert not deadline.expired
+
+
+def test_deadline_without_timeout_waits_forever(event_loop):
+    """
+    Assert that :func:`~adbts.tcp.deadlines.after` creates a deadline that never passes for a `None` timeout.
+    """
+    async def wait():
+        with deadlines.after(None) as deadline:
+            await asyncio.sleep(0.01)
+        return deadline
+
+    deadline = event_loop.run_until_complete(wait())
+    assert deadline.when is None
+    assert not deadline.expired
+
+
+def test_deadline_propagates_external_cancellation(event_loop):
+    """
+    Assert that :class:`~adbts.tcp.deadlines.Deadline` does not convert cancellation it did not cause.
+    """
+    async def wait():
+        with deadlines.after(5000):
+            await asyncio.sleep(5)
+
+    task = event_loop.create_task(wait())
+    event_loop.call_later(0.01, task.cancel)
+    with pytest.raises(asyncio.CancelledError):
+        event_loop.run_until_complete(task)
+
+
+def test_deadline_cannot_be_entered_twice(event_loop):
+    """
+    Assert that :class:`~adbts.tcp.deadlines.Deadline` raises a :class:`~RuntimeError` when entered again.
+    """
+    async def wait():
+        deadline = deadlines.after(5000)
+        with deadline:
+            pass
+        with pytest.raises(RuntimeError):
+            with deadline:
+                pass
+
+    event_loop.run_until_complete(wait())
+
+
+def test_outer_deadline_spans_several_operations(event_loop):
+    """
+    Assert that a deadline bounds several transport operations together, each of which finishes within its own
+    timeout, and raises a :class:`~asyncio.TimeoutError` once it passed.
+    """
+    local, remote = socket.socketpair()
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(sock=local)
+        transport = asynchronous.Transport('localhost', 5555, reader, writer)
+        try:
+            with deadlines.after(100):
+                while True:
+                    remote.sendall(b'x')
+                    await transport.read_exactly(1, timeout=1000)
+                    await asyncio.sleep(0.01)
+        finally:
+            transport.close()
+
+    with remote, pytest.raises(asyncio.TimeoutError):
+        event_loop.run_until_complete(exchange())
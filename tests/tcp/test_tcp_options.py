@@ -0,0 +1,108 @@
+"""
+    test_tcp_options
+    ~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.options` module.
+"""
+import socket
+
+import pytest
+
+from adbts import exceptions
+from adbts.tcp import options, synchronous
+
+
+@pytest.fixture(scope='function')
+def listener():
+    """
+    Fixture that yields a TCP socket listening on a local port that is closed after the test.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(1)
+    yield sock
+    sock.close()
+
+
+def test_socket_options_default_to_none():
+    """
+    Assert that :class:`~adbts.tcp.options.SocketOptions` fields not given are `None`.
+    """
+    assert options.SocketOptions(nodelay=True) == (True, None, None, None, None)
+    assert all(value is None for value in options.SYSTEM_DEFAULTS)
+
+
+def test_apply_skips_unset_options(mocker):
+    """
+    Assert that :func:`~adbts.tcp.options.apply` does not touch the socket for options that are `None`.
+    """
+    sock = mocker.MagicMock(socket.socket)
+    options.apply(sock, options.SYSTEM_DEFAULTS)
+    assert not sock.setsockopt.called
+
+
+def test_apply_sets_given_options(mocker):
+    """
+    Assert that :func:`~adbts.tcp.options.apply` sets every given option on the socket.
+    """
+    mocker.patch.object(options, 'TCP_QUICKACK', 12)
+    mocker.patch.object(options, 'SO_BUSY_POLL', 46)
+    sock = mocker.MagicMock(socket.socket)
+    options.apply(sock, options.SocketOptions(nodelay=True, quickack=False, recv_buffer_size=4096,
+                                              send_buffer_size=8192, busy_poll=50))
+    sock.setsockopt.assert_has_calls([
+        mocker.call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        mocker.call(socket.IPPROTO_TCP, 12, 0),
+        mocker.call(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096),
+        mocker.call(socket.SOL_SOCKET, socket.SO_SNDBUF, 8192),
+        mocker.call(socket.SOL_SOCKET, 46, 50)
+    ])
+
+
+def test_apply_skips_options_unsupported_by_platform(mocker):
+    """
+    Assert that :func:`~adbts.tcp.options.apply` skips options the platform does not define.
+    """
+    mocker.patch.object(options, 'TCP_QUICKACK', None)
+    mocker.patch.object(options, 'SO_BUSY_POLL', None)
+    sock = mocker.MagicMock(socket.socket)
+    options.apply(sock, options.SocketOptions(quickack=True, busy_poll=50))
+    assert not sock.setsockopt.called
+
+
+def test_synchronous_open_applies_low_latency_defaults(listener):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.open` disables Nagle's algorithm by default.
+    """
+    transport = synchronous.open(*listener.getsockname(), timeout=1000)
+    try:
+        sock = transport._socket  # pylint: disable=protected-access
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    finally:
+        transport.close()
+
+
+def test_synchronous_open_applies_given_options(listener):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.open` sets the given options on the connected socket.
+    """
+    transport = synchronous.open(*listener.getsockname(), timeout=1000,
+                                 socket_options=options.SocketOptions(nodelay=False, send_buffer_size=65536))
+    try:
+        sock = transport._socket  # pylint: disable=protected-access
+        assert not sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= 65536
+    finally:
+        transport.close()
+
+
+def test_synchronous_open_raises_on_rejected_option(mocker, listener):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.open` closes the socket and raises a
+    :class:`~adbts.exceptions.TransportError` when the operating system rejects an option value.
+    """
+    mocker.patch.object(options, 'apply', side_effect=OSError('Invalid argument'))
+    close = mocker.spy(socket.socket, 'close')
+    with pytest.raises(exceptions.TransportError):
+        synchronous.open(*listener.getsockname(), timeout=1000)
+    assert close.called
@@ -0,0 +1,245 @@
+"""
+    test_tcp_pool
+    ~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.pool` module.
+"""
+import queue
+import socket
+import threading
+import time
+
+import pytest
+
+from adbts import exceptions
+from adbts.tcp import pool
+
+
+@pytest.fixture(scope='function')
+def server():
+    """
+    Fixture that yields the address of a local TCP server and a queue of the connections it accepted.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(16)
+    connections = []
+    accepted = queue.Queue()
+
+    def accept():
+        while True:
+            try:
+                conn = listener.accept()[0]
+            except OSError:
+                return
+            connections.append(conn)
+            accepted.put(conn)
+
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    yield listener.getsockname(), accepted
+    listener.close()
+    for conn in connections:
+        conn.close()
+
+
+@pytest.fixture(scope='function')
+def connection_pool():
+    """
+    Fixture that yields a connection pool that is closed after the test.
+    """
+    with pool.ConnectionPool(max_idle=2, max_per_key=2) as connections:
+        yield connections
+
+
+def test_acquire_reuses_released_transport(server, connection_pool):
+    """
+    Assert that :meth:`~adbts.tcp.pool.ConnectionPool.acquire` hands out a transport returned to the pool
+    instead of connecting again.
+    """
+    address, _ = server
+    first = connection_pool.acquire(*address, timeout=1000)
+    inner = first._transport  # pylint: disable=protected-access
+    first.close()
+    assert first.closed
+    assert connection_pool.num_idle(*address) == 1
+
+    second = connection_pool.acquire(*address, timeout=1000)
+    assert second._transport is inner  # pylint: disable=protected-access
+    assert connection_pool.num_idle(*address) == 0
+    assert connection_pool.num_open(*address) == 1
+
+
+def test_closed_pooled_transport_cannot_be_used(server, connection_pool):
+    """
+    Assert that a :class:`~adbts.tcp.pool.PooledTransport` raises a :class:`~adbts.exceptions.TransportClosedError`
+    once returned to the pool.
+    """
+    transport = connection_pool.acquire(*server[0], timeout=1000)
+    transport.close()
+    with pytest.raises(exceptions.TransportClosedError):
+        transport.write(b'data')
+
+
+def test_acquire_evicts_transport_closed_by_peer(server, connection_pool):
+    """
+    Assert that :meth:`~adbts.tcp.pool.ConnectionPool.acquire` closes idle transports whose peer closed the
+    connection and connects again.
+    """
+    address, connections = server
+    first = connection_pool.acquire(*address, timeout=1000)
+    inner = first._transport  # pylint: disable=protected-access
+    first.close()
+    connections.get(timeout=1).close()
+
+    second = connection_pool.acquire(*address, timeout=1000)
+    assert second._transport is not inner  # pylint: disable=protected-access
+    assert inner.closed
+    assert connection_pool.num_open(*address) == 1
+
+
+def test_release_closes_transport_with_unread_bytes(server, connection_pool):
+    """
+    Assert that a transport with unread bytes is closed instead of returned to the pool.
+    """
+    address, connections = server
+    transport = connection_pool.acquire(*address, timeout=1000)
+    inner = transport._transport  # pylint: disable=protected-access
+    connections.get(timeout=1).sendall(b'stray')
+    transport.read_exactly(1, timeout=1000)
+    transport.close()
+    assert inner.closed
+    assert connection_pool.num_open(*address) == 0
+
+
+def test_release_closes_transport_that_raised(server, connection_pool):
+    """
+    Assert that a transport whose operation raised is closed instead of returned to the pool.
+    """
+    transport = connection_pool.acquire(*server[0], timeout=1000)
+    inner = transport._transport  # pylint: disable=protected-access
+    with pytest.raises(exceptions.TransportTimeoutError):
+        transport.read(1, timeout=1)
+    transport.close()
+    assert inner.closed
+    assert connection_pool.num_idle(*server[0]) == 0
+
+
+def test_release_closes_transports_beyond_max_idle(server):
+    """
+    Assert that transports returned while the pool keeps `max_idle` idle transports are closed.
+    """
+    address, _ = server
+    with pool.ConnectionPool(max_idle=1, max_per_key=4) as connections:
+        transports = [connections.acquire(*address, timeout=1000) for _ in range(3)]
+        for transport in transports:
+            transport.close()
+        assert connections.num_idle(*address) == 1
+        assert connections.num_open(*address) == 1
+
+
+def test_acquire_waits_for_release_at_max_per_key(server, connection_pool):
+    """
+    Assert that :meth:`~adbts.tcp.pool.ConnectionPool.acquire` waits for a transport to be returned once
+    `max_per_key` transports are checked out.
+    """
+    address, _ = server
+    transports = [connection_pool.acquire(*address, timeout=1000) for _ in range(2)]
+    timer = threading.Timer(0.05, transports[0].close)
+    timer.start()
+    third = connection_pool.acquire(*address, timeout=5000)
+    timer.join()
+    assert third._transport is transports[0]._transport  # pylint: disable=protected-access
+
+
+def test_acquire_raises_on_timeout_at_max_per_key(server, connection_pool):
+    """
+    Assert that :meth:`~adbts.tcp.pool.ConnectionPool.acquire` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when no transport is returned in time.
+    """
+    address, _ = server
+    for _ in range(2):
+        connection_pool.acquire(*address, timeout=1000)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        connection_pool.acquire(*address, timeout=10)
+
+
+def test_acquire_connects_within_remaining_timeout(mocker, server, connection_pool):
+    """
+    Assert that :meth:`~adbts.tcp.pool.ConnectionPool.acquire` connects within what is left of the timeout
+    after waiting for a free slot.
+    """
+    address, _ = server
+    transports = [connection_pool.acquire(*address, timeout=1000) for _ in range(2)]
+    sync_open = mocker.spy(pool.synchronous, 'open')
+    timer = threading.Timer(0.2, transports[0].discard)
+    timer.start()
+    connection_pool.acquire(*address, timeout=5000)
+    timer.join()
+    connect_timeout = sync_open.call_args[0][2]
+    assert 0 < connect_timeout <= 4800
+
+
+def test_acquire_releases_slot_on_connect_error(connection_pool):
+    """
+    Assert that a failed connection attempt does not count towards `max_per_key`.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    address = listener.getsockname()
+    listener.close()
+    for _ in range(3):
+        with pytest.raises(exceptions.TransportError):
+            connection_pool.acquire(*address, timeout=1000)
+    assert connection_pool.num_open(*address) == 0
+
+
+def test_idle_transports_expire(mocker, server):
+    """
+    Assert that idle transports returned longer than `idle_timeout` ago are closed instead of reused.
+    """
+    address, _ = server
+    with pool.ConnectionPool(idle_timeout=1000) as connections:
+        transport = connections.acquire(*address, timeout=1000)
+        inner = transport._transport  # pylint: disable=protected-access
+        transport.close()
+        clock = mocker.patch.object(pool, 'time')
+        clock.monotonic.return_value = time.monotonic() + 2
+        second = connections.acquire(*address, timeout=1000)
+        assert second._transport is not inner  # pylint: disable=protected-access
+        assert inner.closed
+
+
+def test_close_closes_idle_and_returned_transports(server):
+    """
+    Assert that :meth:`~adbts.tcp.pool.ConnectionPool.close` closes idle transports and those returned later,
+    and rejects new checkouts.
+    """
+    address, _ = server
+    connections = pool.ConnectionPool()
+    idle, checked_out = connections.acquire(*address, timeout=1000), connections.acquire(*address, timeout=1000)
+    idle_inner = idle._transport  # pylint: disable=protected-access
+    checked_out_inner = checked_out._transport  # pylint: disable=protected-access
+    idle.close()
+    connections.close()
+    assert idle_inner.closed
+    checked_out.close()
+    assert checked_out_inner.closed
+    assert connections.num_open(*address) == 0
+    with pytest.raises(exceptions.TransportClosedError):
+        connections.acquire(*address, timeout=1000)
+
+
+def test_pooled_transport_writes_file(server, connection_pool, valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.pool.PooledTransport.write_file` sends the file over the pooled connection.
+    """
+    address, connections = server
+    path, data = valid_file
+    transport = connection_pool.acquire(*address, timeout=1000)
+    peer = connections.get(timeout=1)
+    assert transport.write_file(path, timeout=5000) == len(data)
+    received = bytearray()
+    while len(received) < len(data):
+        received.extend(peer.recv(65536))
+    assert received == data
@@ -0,0 +1,246 @@
+"""
+    test_tcp_protocol
+    ~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.protocol` module.
+"""
+import asyncio
+import os
+import socket
+
+import pytest
+
+from adbts import exceptions, files
+from adbts.tcp import protocol
+
+pytestmark = pytest.mark.skipif(not protocol.HAS_BUFFERED_PROTOCOL, reason='Buffered protocols require Python 3.7+')
+
+
+#: Number of bytes buffered ahead of reads by the transports under test.
+BUFFER_SIZE = 1024
+
+
+@pytest.fixture(scope='function')
+def socket_pair():
+    """
+    Fixture that yields a pair of connected sockets that are closed after the test.
+    """
+    local, remote = socket.socketpair()
+    yield local, remote
+    local.close()
+    remote.close()
+
+
+@pytest.fixture(scope='function')
+def protocol_transport(event_loop, socket_pair):
+    """
+    Fixture that yields a protocol based transport over one end of a socket pair.
+    """
+    transport = event_loop.run_until_complete(
+        protocol.open_connection('localhost', 5555, socket_pair[0], buffer_size=BUFFER_SIZE))
+    yield transport
+    if not transport.closed:
+        transport.close()
+
+
+@pytest.fixture(scope='function')
+def remote(socket_pair):
+    """
+    Fixture that yields the peer socket of the protocol based transport.
+    """
+    return socket_pair[1]
+
+
+def test_read_returns_buffered_bytes(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read` returns bytes received ahead into the ring buffer,
+    up to the given number of bytes.
+    """
+    remote.sendall(b'header+payload')
+    assert event_loop.run_until_complete(protocol_transport.read(6, timeout=1000)) == b'header'
+    assert event_loop.run_until_complete(protocol_transport.read(100, timeout=1000)) == b'+payload'
+
+
+def test_read_returns_large_reads_directly(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read` receives reads larger than the ring buffer directly.
+    """
+    data = os.urandom(BUFFER_SIZE * 2)
+    remote.sendall(data)
+    received = event_loop.run_until_complete(protocol_transport.read(len(data), timeout=1000))
+    assert 0 < len(received) <= len(data)
+    assert data.startswith(received)
+
+
+def test_read_returns_empty_on_eof(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read` returns no bytes once the peer closed the connection.
+    """
+    remote.sendall(b'last')
+    remote.shutdown(socket.SHUT_WR)
+    assert event_loop.run_until_complete(protocol_transport.read(100, timeout=1000)) == b'last'
+    assert event_loop.run_until_complete(protocol_transport.read(100, timeout=1000)) == b''
+
+
+def test_read_raises_timeout_error(event_loop, protocol_transport):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read` raises a :class:`~adbts.exceptions.TransportTimeoutError`
+    when no bytes arrive in time.
+    """
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(protocol_transport.read(1, timeout=10))
+
+
+def test_readinto_receives_into_caller_buffer(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.readinto` receives bytes directly into a large caller buffer.
+    """
+    data = os.urandom(BUFFER_SIZE * 4)
+    remote.sendall(data)
+    buffer = bytearray(len(data))
+    view = memoryview(buffer)
+    received = 0
+    while received < len(buffer):
+        received += event_loop.run_until_complete(protocol_transport.readinto(view[received:], timeout=1000))
+    assert buffer == data
+
+
+def test_read_exactly_assembles_bytes(event_loop, protocol_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read_exactly` reads all bytes across buffer refills.
+    """
+    data = valid_bytes * 8
+    remote.sendall(data)
+    assert event_loop.run_until_complete(protocol_transport.read_exactly(len(data), timeout=1000)) == data
+
+
+def test_read_exactly_raises_on_early_eof(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when the peer closes before all bytes arrived.
+    """
+    remote.sendall(b'short')
+    remote.shutdown(socket.SHUT_WR)
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(protocol_transport.read_exactly(10, timeout=1000))
+
+
+def test_reading_pauses_while_buffer_full(event_loop, protocol_transport, remote):
+    """
+    Assert that :class:`~adbts.tcp.protocol.StreamProtocol` holds at most the ring buffer capacity and resumes
+    reading once bytes are consumed.
+    """
+    data = os.urandom(BUFFER_SIZE * 8)
+    remote.sendall(data)
+    event_loop.run_until_complete(protocol_transport.read(1, timeout=1000))
+    assert protocol_transport._protocol.buffered <= BUFFER_SIZE
+    rest = event_loop.run_until_complete(protocol_transport.read_exactly(len(data) - 1, timeout=1000))
+    assert bytes(rest) == data[1:]
+
+
+def test_write_sends_bytes(event_loop, protocol_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.write` sends the given bytes.
+    """
+    event_loop.run_until_complete(protocol_transport.write(valid_bytes, timeout=1000))
+    assert remote.recv(len(valid_bytes) + 1) == valid_bytes
+
+
+def test_writev_sends_buffers_in_order(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.writev` sends all buffers in order.
+    """
+    event_loop.run_until_complete(protocol_transport.writev([b'head', b'er', b'payload'], timeout=1000))
+    assert remote.recv(100) == b'headerpayload'
+
+
+def test_write_raises_on_closed_connection(event_loop, protocol_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.write` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` once the peer closed the connection.
+    """
+    remote.close()
+    assert event_loop.run_until_complete(protocol_transport.read(1, timeout=1000)) == b''
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(protocol_transport.write(b'data', timeout=1000))
+
+
+def test_write_file_sends_file(event_loop, protocol_transport, remote, valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.write_file` sends the contents of the given file.
+    """
+    path, data = valid_file
+    remote.setblocking(False)
+    received = bytearray()
+
+    async def receive():
+        while len(received) < len(data):
+            received.extend(await event_loop.sock_recv(remote, 65536))
+
+    async def push():
+        num_bytes, _ = await asyncio.gather(protocol_transport.write_file(path, timeout=5000), receive())
+        return num_bytes
+
+    num_bytes = event_loop.run_until_complete(push())
+    assert num_bytes == len(data)
+    assert received == data
+
+
+class RecordingTransport:
+    """
+    Proxy that records the size of every write made on the wrapped event loop transport.
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+        self.sizes = []
+
+    def __getattr__(self, name):
+        return getattr(self._transport, name)
+
+    def write(self, data):
+        self.sizes.append(len(data))
+        self._transport.write(data)
+
+
+def test_write_file_writes_mapped_slices_without_sendfile(monkeypatch, event_loop, protocol_transport, remote,
+                                                          valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.write_file` writes the memory mapped file in slices of at
+    most :data:`~adbts.files.DEFAULT_CHUNK_SIZE` bytes when the event loop cannot send files.
+    """
+    async def sendfile(*args, **kwargs):
+        raise NotImplementedError
+
+    writable = protocol_transport._writable  # pylint: disable=protected-access
+    recorder = RecordingTransport(writable())
+    monkeypatch.setattr(event_loop, 'sendfile', sendfile)
+    monkeypatch.setattr(files, 'DEFAULT_CHUNK_SIZE', 16 * 1024)
+    monkeypatch.setattr(protocol_transport, '_writable', lambda: recorder)
+    path, data = valid_file
+    remote.setblocking(False)
+    received = bytearray()
+
+    async def receive():
+        while len(received) < len(data):
+            received.extend(await event_loop.sock_recv(remote, 65536))
+
+    async def push():
+        num_bytes, _ = await asyncio.gather(protocol_transport.write_file(path, timeout=5000), receive())
+        return num_bytes
+
+    assert event_loop.run_until_complete(push()) == len(data)
+    assert received == data
+    assert len(recorder.sizes) > 1
+    assert max(recorder.sizes) <= 16 * 1024
+
+
+def test_close_raises_on_further_reads(event_loop, protocol_transport):
+    """
+    Assert that :meth:`~adbts.tcp.protocol.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportClosedError` once the transport is closed.
+    """
+    protocol_transport.close()
+    assert protocol_transport.closed
+    with pytest.raises(exceptions.TransportClosedError):
+        event_loop.run_until_complete(protocol_transport.read(1))
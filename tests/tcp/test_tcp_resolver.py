@@ -0,0 +1,143 @@
+"""
+    test_tcp_resolver
+    ~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.resolver` module.
+"""
+import socket
+
+import pytest
+
+from adbts.tcp import resolver
+
+IPV4 = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.{}'.format(i), 5555)) for i in range(3)]
+IPV6 = [(socket.AF_INET6, socket.SOCK_STREAM, 6, '', ('fd00::{}'.format(i), 5555, 0, 0)) for i in range(2)]
+
+
+@pytest.fixture(scope='function')
+def getaddrinfo(mocker):
+    """
+    Fixture that yields a mock of :func:`~socket.getaddrinfo` returning IPv6 addresses before IPv4 ones.
+    """
+    return mocker.patch.object(resolver.socket, 'getaddrinfo', return_value=IPV6 + IPV4)
+
+
+@pytest.fixture(scope='function')
+def clock(mocker):
+    """
+    Fixture that yields a mock of the monotonic clock used by the resolver.
+    """
+    mock = mocker.patch.object(resolver, 'time')
+    mock.monotonic.return_value = 100.0
+    return mock.monotonic
+
+
+def test_interleave_alternates_families():
+    """
+    Assert that :func:`~adbts.tcp.resolver.interleave` alternates address families, starting with the first one.
+    """
+    assert resolver.interleave(IPV6 + IPV4) == [IPV6[0], IPV4[0], IPV6[1], IPV4[1], IPV4[2]]
+    assert resolver.interleave(IPV4 + IPV6) == [IPV4[0], IPV6[0], IPV4[1], IPV6[1], IPV4[2]]
+
+
+def test_interleave_keeps_single_family_order():
+    """
+    Assert that :func:`~adbts.tcp.resolver.interleave` keeps the order of addresses of a single family.
+    """
+    assert resolver.interleave(IPV4) == IPV4
+    assert resolver.interleave([]) == []
+
+
+def test_resolve_caches_addresses(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.resolve` looks up a host once until the addresses expire.
+    """
+    instance = resolver.Resolver(ttl=1000)
+    assert instance.resolve('device', 5555) == resolver.interleave(IPV6 + IPV4)
+    clock.return_value = 100.5
+    assert instance.resolve('device', 5555) == resolver.interleave(IPV6 + IPV4)
+    assert getaddrinfo.call_count == 1
+    assert len(instance) == 1
+
+    clock.return_value = 101.0
+    instance.resolve('device', 5555)
+    assert getaddrinfo.call_count == 2
+
+
+def test_resolve_caches_by_host_and_port(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.resolve` caches addresses of each host/port separately.
+    """
+    instance = resolver.Resolver()
+    instance.resolve('device', 5555)
+    instance.resolve('device', 5556)
+    instance.resolve('other', 5555)
+    assert getaddrinfo.call_count == 3
+    assert len(instance) == 3
+
+
+def test_resolve_does_not_cache_with_zero_ttl(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.resolve` looks up a host every time when the TTL is zero.
+    """
+    instance = resolver.Resolver(ttl=0)
+    instance.resolve('device', 5555)
+    instance.resolve('device', 5555)
+    assert getaddrinfo.call_count == 2
+    assert len(instance) == 0
+
+
+def test_resolve_does_not_cache_failures(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.resolve` raises lookup errors without caching them.
+    """
+    getaddrinfo.side_effect = socket.gaierror('not found')
+    instance = resolver.Resolver()
+    with pytest.raises(socket.gaierror):
+        instance.resolve('device', 5555)
+    assert len(instance) == 0
+
+
+def test_resolve_drops_expired_entries(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.resolve` drops expired addresses of other hosts.
+    """
+    instance = resolver.Resolver(ttl=1000)
+    instance.resolve('device', 5555)
+    clock.return_value = 200.0
+    instance.resolve('other', 5555)
+    assert len(instance) == 1
+
+
+def test_resolve_returns_copy(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.resolve` returns addresses callers can modify safely.
+    """
+    instance = resolver.Resolver()
+    instance.resolve('device', 5555).clear()
+    assert instance.resolve('device', 5555) == resolver.interleave(IPV6 + IPV4)
+
+
+def test_invalidate_drops_host(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.invalidate` drops only the addresses of the given host/port.
+    """
+    instance = resolver.Resolver()
+    instance.resolve('device', 5555)
+    instance.resolve('other', 5555)
+    instance.invalidate('device', 5555)
+    instance.invalidate('missing', 5555)
+    assert len(instance) == 1
+    instance.resolve('device', 5555)
+    assert getaddrinfo.call_count == 3
+
+
+def test_clear_drops_all_hosts(getaddrinfo, clock):
+    """
+    Assert that :meth:`~adbts.tcp.resolver.Resolver.clear` drops all cached addresses.
+    """
+    instance = resolver.Resolver()
+    instance.resolve('device', 5555)
+    instance.resolve('other', 5555)
+    instance.clear()
+    assert len(instance) == 0
@@ -0,0 +1,119 @@
+"""
+    test_tcp_selector
+    ~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.selector` module.
+"""
+import socket
+
+import pytest
+
+from adbts import exceptions
+from adbts.tcp import selector, synchronous
+
+
+@pytest.fixture(scope='function')
+def connections():
+    """
+    Fixture that yields a factory for synchronous TCP transports over socket pairs, returned along with the peer
+    socket. All sockets are closed after the test.
+    """
+    sockets = []
+
+    def factory():
+        local, remote = socket.socketpair()
+        sockets.extend((local, remote))
+        return synchronous.Transport('localhost', 5555, local), remote
+
+    yield factory
+    for sock in sockets:
+        sock.close()
+
+
+@pytest.fixture(scope='function')
+def transport_selector():
+    """
+    Fixture that yields a transport selector that is closed after the test.
+    """
+    with selector.TransportSelector() as selected:
+        yield selected
+
+
+def test_select_reports_readable_transports(connections, transport_selector):
+    """
+    Assert that :meth:`~adbts.tcp.selector.TransportSelector.select` reports only the transports that have
+    bytes to read, along with their data.
+    """
+    pairs = [connections() for _ in range(8)]
+    for index, (transport, _) in enumerate(pairs):
+        transport_selector.register(transport, data=index)
+    assert len(transport_selector) == 8
+
+    for index in (1, 5):
+        pairs[index][1].sendall(b'data')
+    ready = transport_selector.select(timeout=1000)
+    assert sorted(item.data for item in ready) == [1, 5]
+    assert all(item.events == selector.EVENT_READ for item in ready)
+    assert all(item.transport.read_available(1024) == b'data' for item in ready)
+
+
+def test_select_returns_empty_on_timeout(connections, transport_selector):
+    """
+    Assert that :meth:`~adbts.tcp.selector.TransportSelector.select` returns no transports when none become
+    ready in time.
+    """
+    transport_selector.register(connections()[0])
+    assert transport_selector.select(timeout=0) == []
+
+
+def test_select_reports_writable_after_modify(connections, transport_selector):
+    """
+    Assert that :meth:`~adbts.tcp.selector.TransportSelector.modify` changes the events a transport is
+    reported for.
+    """
+    transport, _ = connections()
+    transport_selector.register(transport)
+    transport_selector.modify(transport, selector.EVENT_WRITE, 'write')
+    ready = transport_selector.select(timeout=1000)
+    assert ready == [selector.SelectedTransport(transport, selector.EVENT_WRITE, 'write')]
+
+
+def test_unregister_stops_reporting(connections, transport_selector):
+    """
+    Assert that :meth:`~adbts.tcp.selector.TransportSelector.unregister` stops reporting a transport.
+    """
+    transport, remote = connections()
+    transport_selector.register(transport)
+    transport_selector.unregister(transport)
+    remote.sendall(b'data')
+    assert transport_selector.select(timeout=0) == []
+    assert not transport_selector
+
+
+def test_register_rejects_closed_transport(connections, transport_selector):
+    """
+    Assert that :meth:`~adbts.tcp.selector.TransportSelector.register` raises a
+    :class:`~adbts.exceptions.TransportClosedError` for a closed transport.
+    """
+    transport, _ = connections()
+    transport.close()
+    with pytest.raises(exceptions.TransportClosedError):
+        transport_selector.register(transport)
+
+
+def test_register_replaces_transport_closed_while_registered(connections, transport_selector):
+    """
+    Assert that :meth:`~adbts.tcp.selector.TransportSelector.register` drops a transport that was closed
+    without being unregistered when its file descriptor is reused.
+    """
+    closed, _ = connections()
+    transport_selector.register(closed)
+    fileno = closed.fileno()
+    closed.close()
+
+    transport, remote = connections()
+    if transport.fileno() != fileno:
+        pytest.skip('File descriptor was not reused')
+    transport_selector.register(transport, data='new')
+    remote.sendall(b'data')
+    assert [item.data for item in transport_selector.select(timeout=1000)] == ['new']
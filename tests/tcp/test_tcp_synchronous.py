@@ -4,11 +4,487 @@
 
     Tests for the :mod:`~adbts.tpc.synchronous` module.
 """
+import socket
+import threading
+import time
+
 import pytest
 
-from adbts.tcp import synchronous
+from adbts import exceptions
+from adbts.tcp import resolver, synchronous
+
+
+@pytest.fixture(scope='function')
+def socket_pair():
+    """
+    Fixture that yields a pair of connected sockets that are closed after the test.
+    """
+    local, remote = socket.socketpair()
+    yield local, remote
+    local.close()
+    remote.close()
+
+
+@pytest.fixture(scope='function')
+def tcp_transport(socket_pair):
+    """
+    Fixture that yields a synchronous TCP transport over one end of a socket pair.
+    """
+    return synchronous.Transport('localhost', 5555, socket_pair[0])
+
+
+@pytest.fixture(scope='function')
+def remote(socket_pair):
+    """
+    Fixture that yields the peer socket of the synchronous TCP transport.
+    """
+    return socket_pair[1]
+
+
+def test_readinto_fills_given_buffer(tcp_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.readinto` receives bytes directly into the given buffer.
+    """
+    remote.sendall(valid_bytes)
+    buffer = bytearray(len(valid_bytes))
+    view = memoryview(buffer)
+    received = 0
+    while received < len(buffer):
+        received += tcp_transport.readinto(view[received:], timeout=1000)
+    assert buffer == valid_bytes
+
+
+def test_readinto_returns_zero_for_empty_buffer(tcp_transport):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.readinto` does not block when given an empty buffer.
+    """
+    assert tcp_transport.readinto(bytearray()) == 0
+
+
+def test_writev_sends_all_buffers_in_order(tcp_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.writev` sends every buffer in order.
+    """
+    tcp_transport.writev([bytes(24), valid_bytes, bytearray(b'tail')], timeout=1000)
+    expected = bytes(24) + valid_bytes + b'tail'
+    received = b''
+    while len(received) < len(expected):
+        received += remote.recv(len(expected))
+    assert received == expected
+
+
+def test_sendmsg_all_resumes_after_partial_send(mocker, valid_bytes):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.sendmsg_all` continues sending the remaining bytes when
+    `sendmsg` only sends part of the buffers.
+    """
+    sent = bytearray()
+
+    def sendmsg(buffers):
+        chunk = b''.join(buffers)[:7]
+        sent.extend(chunk)
+        return len(chunk)
+
+    sock = mocker.Mock(spec=socket.socket)
+    sock.sendmsg.side_effect = sendmsg
+    synchronous.sendmsg_all(sock, [b'header', valid_bytes])
+    assert sent == b'header' + valid_bytes
+
+
+def test_transport_keeps_socket_non_blocking(tcp_transport, socket_pair, remote):
+    """
+    Assert that :class:`~adbts.tcp.synchronous.Transport` puts its socket in non-blocking mode and does not
+    change it around operations.
+    """
+    remote.sendall(b'x')
+    tcp_transport.read(1, timeout=1000)
+    assert socket_pair[0].gettimeout() == 0.0
+
+
+def test_read_raises_on_timeout(tcp_transport):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when no bytes arrive before the timeout.
+    """
+    with pytest.raises(exceptions.TransportTimeoutError):
+        tcp_transport.read(1, timeout=10)
+
+
+def test_read_waits_for_bytes(tcp_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read` waits for bytes that arrive before the timeout.
+    """
+    timer = threading.Timer(0.05, remote.sendall, args=(b'late',))
+    timer.start()
+    try:
+        assert tcp_transport.read(4, timeout=5000) == b'late'
+    finally:
+        timer.join()
+
+
+def test_write_waits_while_peer_is_not_reading(tcp_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write` sends all bytes when the socket buffer fills up.
+    """
+    data = bytes(4 * 1024 * 1024)
+    received = bytearray()
+
+    def receive():
+        while len(received) < len(data):
+            received.extend(remote.recv(65536))
+
+    reader = threading.Thread(target=receive)
+    reader.start()
+    tcp_transport.write(data, timeout=5000)
+    reader.join()
+    assert len(received) == len(data)
+
+
+def test_deadline_scope_bounds_multiple_operations(tcp_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.deadline_scope` applies a single deadline to all
+    operations within the scope.
+    """
+    remote.sendall(b'x')
+    start = time.monotonic()
+    with pytest.raises(exceptions.TransportTimeoutError):
+        with tcp_transport.deadline_scope(100):
+            tcp_transport.read(1)
+            tcp_transport.read(1, timeout=10000)
+    assert time.monotonic() - start < 5
+
+
+def test_read_exactly_assembles_chunks(tcp_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read_exactly` returns all requested bytes when they
+    arrive in several chunks.
+    """
+    def send_chunks():
+        for offset in range(0, len(valid_bytes), 7):
+            remote.sendall(valid_bytes[offset:offset + 7])
+            time.sleep(0.001)
+
+    sender = threading.Thread(target=send_chunks)
+    sender.start()
+    try:
+        assert tcp_transport.read_exactly(len(valid_bytes), timeout=5000) == valid_bytes
+    finally:
+        sender.join()
+
+
+def test_read_exactly_raises_when_peer_closes(tcp_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when the peer closes before all bytes arrive.
+    """
+    remote.sendall(b'abc')
+    remote.shutdown(socket.SHUT_WR)
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        tcp_transport.read_exactly(24, timeout=1000)
+
+
+def test_read_exactly_raises_on_timeout(tcp_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when not all bytes arrive within the timeout.
+    """
+    remote.sendall(b'abc')
+    with pytest.raises(exceptions.TransportTimeoutError):
+        tcp_transport.read_exactly(24, timeout=20)
+
+
+def test_reusable_when_connection_is_idle(tcp_transport):
+    """
+    Assert that :attr:`~adbts.tcp.synchronous.Transport.reusable` is `True` for an open connection with
+    nothing to read.
+    """
+    assert tcp_transport.reusable
+
+
+def test_not_reusable_with_unread_bytes(tcp_transport, remote, valid_bytes):
+    """
+    Assert that :attr:`~adbts.tcp.synchronous.Transport.reusable` is `False` when bytes are left unread.
+    """
+    remote.sendall(valid_bytes)
+    assert not tcp_transport.reusable
+
+
+def test_not_reusable_when_peer_closed(tcp_transport, remote):
+    """
+    Assert that :attr:`~adbts.tcp.synchronous.Transport.reusable` is `False` once the peer closed the connection.
+    """
+    remote.close()
+    assert not tcp_transport.reusable
+
+
+def test_not_reusable_when_closed(tcp_transport):
+    """
+    Assert that :attr:`~adbts.tcp.synchronous.Transport.reusable` is `False` once the transport is closed.
+    """
+    tcp_transport.close()
+    assert not tcp_transport.reusable
+
+
+def test_read_available_returns_empty_when_nothing_received(tcp_transport):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read_available` returns empty bytes instead of blocking.
+    """
+    assert tcp_transport.read_available(1024) == b''
+
+
+def test_read_available_returns_received_bytes(tcp_transport, remote, valid_bytes):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read_available` returns bytes already received.
+    """
+    remote.sendall(valid_bytes)
+    received = b''
+    while len(received) < len(valid_bytes):
+        received += tcp_transport.read_available(len(valid_bytes))
+    assert received == valid_bytes
+
+
+def test_read_available_raises_when_peer_closed(tcp_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.read_available` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` once the peer closed the connection.
+    """
+    remote.close()
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        tcp_transport.read_available(1024)
+
+
+def test_write_some_returns_zero_when_send_buffer_full(tcp_transport):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_some` returns zero instead of blocking once the
+    socket send buffer is full.
+    """
+    chunk = bytes(65536)
+    sent = [tcp_transport.write_some(chunk) for _ in range(1024)]
+    assert sent[0] > 0
+    assert sent[-1] == 0
+
+
+def test_fileno_is_invalid_once_closed(tcp_transport, socket_pair):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.fileno` returns the socket file descriptor, and -1 once
+    the transport is closed.
+    """
+    assert tcp_transport.fileno() == socket_pair[0].fileno()
+    tcp_transport.close()
+    assert tcp_transport.fileno() == -1
+
+
+def receive_all(sock, num_bytes):
+    """
+    Receive the given number of bytes from a socket on a separate thread, returning a function that joins it.
+    """
+    received = bytearray()
+
+    def run():
+        while len(received) < num_bytes:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            received.extend(chunk)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    def join():
+        thread.join(5)
+        return bytes(received)
+    return join
+
+
+@pytest.mark.parametrize('offset,count', [(0, None), (1000, 5000), (4096, None)])
+def test_write_file_sends_file_region(tcp_transport, remote, valid_file, offset, count):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_file` sends the given region of a file.
+    """
+    path, data = valid_file
+    expected = data[offset:] if count is None else data[offset:offset + count]
+    join = receive_all(remote, len(expected))
+    assert tcp_transport.write_file(path, offset, count, timeout=5000) == len(expected)
+    assert join() == expected
+
+
+def test_write_file_maps_file_without_sendfile(monkeypatch, tcp_transport, remote, valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_file` sends the file from a memory mapping when
+    :func:`~os.sendfile` is not available.
+    """
+    monkeypatch.delattr(synchronous.os, 'sendfile')
+    path, data = valid_file
+    join = receive_all(remote, len(data))
+    assert tcp_transport.write_file(path, timeout=5000) == len(data)
+    assert join() == data
+
+
+def test_write_file_raises_on_missing_file(tcp_transport, tmpdir):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_file` raises the :class:`~OSError` of a file
+    that cannot be opened rather than a transport error.
+    """
+    with pytest.raises(FileNotFoundError):
+        tcp_transport.write_file(str(tmpdir.join('missing.bin')))
+
+
+def test_write_file_raises_on_timeout(tcp_transport, tmpdir):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_file` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when the peer does not read the file in time.
+    """
+    path = tmpdir.join('large.bin')
+    path.write_binary(bytes(16 * 1024 * 1024))
+    with pytest.raises(exceptions.TransportTimeoutError):
+        tcp_transport.write_file(str(path), timeout=50)
+
+
+def test_write_file_without_sendfile_raises_on_timeout(monkeypatch, tcp_transport, tmpdir):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_file` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when the peer does not read the mapped file in time.
+    """
+    monkeypatch.delattr(synchronous.os, 'sendfile')
+    path = tmpdir.join('large.bin')
+    path.write_binary(bytes(16 * 1024 * 1024))
+    with pytest.raises(exceptions.TransportTimeoutError):
+        tcp_transport.write_file(str(path), timeout=50)
+
+
+def test_write_file_without_sendfile_raises_when_peer_closed(monkeypatch, tcp_transport, remote, valid_file):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write_file` raises a
+    :class:`~adbts.exceptions.TransportError` rather than an :class:`~OSError` when sending the mapped file
+    fails.
+    """
+    monkeypatch.delattr(synchronous.os, 'sendfile')
+    remote.close()
+    path, _ = valid_file
+    with pytest.raises(exceptions.TransportError):
+        tcp_transport.write_file(path, timeout=1000)
+
+
+def address_info(address):
+    """
+    Build the :func:`~socket.getaddrinfo` entry of the given IPv4 address.
+    """
+    return socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', address
+
+
+@pytest.fixture(scope='function')
+def listener():
+    """
+    Fixture that yields a listening TCP socket that is closed after the test.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(8)
+    yield sock
+    sock.close()
+
+
+@pytest.fixture(scope='function')
+def refused_address():
+    """
+    Fixture that yields a local address that refuses connections.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    yield sock.getsockname()
+    sock.close()
+
+
+@pytest.fixture(scope='function')
+def stalled_address():
+    """
+    Fixture that yields a local address whose connections do not complete, as its accept queue is full.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(0)
+    filler = socket.create_connection(sock.getsockname())
+    yield sock.getsockname()
+    filler.close()
+    sock.close()
+
+
+def test_connect_skips_stalled_address(listener, stalled_address):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.connect` connects to the next address once an attempt did not
+    complete within the connect delay, rather than waiting for the timeout.
+    """
+    addresses = [address_info(stalled_address), address_info(listener.getsockname())]
+    start = time.monotonic()
+    sock = synchronous.connect(addresses, time.monotonic() + 5, delay=50)
+    try:
+        assert time.monotonic() - start < 2
+        assert sock.getpeername() == listener.getsockname()
+    finally:
+        sock.close()
+
+
+def test_connect_tries_next_address_after_refusal(listener, refused_address):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.connect` connects to the next address right away once an attempt
+    was refused.
+    """
+    addresses = [address_info(refused_address), address_info(listener.getsockname())]
+    start = time.monotonic()
+    sock = synchronous.connect(addresses, time.monotonic() + 5, delay=5000)
+    try:
+        assert time.monotonic() - start < 2
+        assert sock.getpeername() == listener.getsockname()
+    finally:
+        sock.close()
+
+
+def test_connect_raises_last_error(refused_address):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.connect` raises the error of the last attempt when all failed.
+    """
+    with pytest.raises(ConnectionRefusedError):
+        synchronous.connect([address_info(refused_address)] * 2, time.monotonic() + 5)
+
+
+def test_connect_raises_on_timeout(stalled_address):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.connect` raises a :class:`~socket.timeout` when no attempt
+    completed before the deadline.
+    """
+    with pytest.raises(socket.timeout):
+        synchronous.connect([address_info(stalled_address)], time.monotonic() + 0.05)
+
+
+def test_open_caches_resolved_addresses(mocker, listener):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.open` resolves a host through the given resolver once.
+    """
+    getaddrinfo = mocker.patch.object(resolver.socket, 'getaddrinfo',
+                                      return_value=[address_info(listener.getsockname())])
+    address_resolver = resolver.Resolver()
+    for _ in range(2):
+        synchronous.open('device', 5555, timeout=1000, address_resolver=address_resolver).close()
+    assert getaddrinfo.call_count == 1
+
+
+def test_open_invalidates_addresses_on_failure(mocker, refused_address):
+    """
+    Assert that :func:`~adbts.tcp.synchronous.open` drops cached addresses of a host it could not connect to.
+    """
+    mocker.patch.object(resolver.socket, 'getaddrinfo', return_value=[address_info(refused_address)])
+    address_resolver = resolver.Resolver()
+    with pytest.raises(exceptions.TransportError):
+        synchronous.open('device', 5555, timeout=1000, address_resolver=address_resolver)
+    assert len(address_resolver) == 0
 
 
-@pytest.mark.xfail(reason='Not implemented')
-def test_stub():
-    assert False
+def test_default_timeout_follows_socket_default(monkeypatch, tcp_transport):
+    """
+    Assert that :attr:`~adbts.tcp.synchronous.Transport.default_timeout` is the default socket timeout in
+    milliseconds.
+    """
+    monkeypatch.setattr(socket, 'getdefaulttimeout', lambda: 1.5)
+    assert tcp_transport.default_timeout == 1500
+    monkeypatch.setattr(socket, 'getdefaulttimeout', lambda: None)
+    assert tcp_transport.default_timeout is None
@@ -0,0 +1,182 @@
+"""
+    test_tcp_zerocopy
+    ~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.tcp.zerocopy` module.
+"""
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from adbts.tcp import synchronous, zerocopy
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Zero-copy sends require Linux')
+
+
+@pytest.fixture(scope='function')
+def tcp_pair():
+    """
+    Fixture that yields a pair of connected loopback TCP sockets that are closed after the test.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    local = socket.create_connection(listener.getsockname())
+    remote, _ = listener.accept()
+    listener.close()
+    yield local, remote
+    local.close()
+    remote.close()
+
+
+@pytest.fixture(scope='function')
+def zerocopy_transport(tcp_pair):
+    """
+    Fixture that yields a synchronous TCP transport that sends writes of 1 KiB and more with zero-copy.
+    """
+    transport = synchronous.Transport('localhost', 5555, tcp_pair[0], zerocopy_threshold=1024)
+    if transport._zerocopy is None:
+        pytest.skip('Zero-copy sends are not supported by the kernel')
+    yield transport
+    if not transport.closed:
+        transport.close()
+
+
+@pytest.fixture(scope='function')
+def remote(tcp_pair):
+    """
+    Fixture that yields the peer socket of the transport.
+    """
+    return tcp_pair[1]
+
+
+def receive_all(sock, num_bytes):
+    """
+    Receive the given number of bytes on a background thread and return a function that joins it.
+    """
+    received = bytearray()
+
+    def receive():
+        while len(received) < num_bytes:
+            chunk = sock.recv(num_bytes - len(received))
+            if not chunk:
+                break
+            received.extend(chunk)
+
+    thread = threading.Thread(target=receive)
+    thread.start()
+
+    def join():
+        thread.join(5)
+        return bytes(received)
+    return join
+
+
+def completion(first, last, code=0, err=0, origin=zerocopy.SO_EE_ORIGIN_ZEROCOPY):
+    """
+    Build a `sock_extended_err` that reports the given range of sends.
+    """
+    return zerocopy.SOCK_EXTENDED_ERR.pack(err, origin, 0, code, 0, first, last)
+
+
+def test_sender_returns_none_for_unsupported_socket():
+    """
+    Assert that :func:`~adbts.tcp.zerocopy.sender` returns None for sockets without zero-copy support.
+    """
+    local, remote = socket.socketpair()
+    try:
+        assert zerocopy.sender(local) is None
+    finally:
+        local.close()
+        remote.close()
+
+
+def test_write_sends_large_bytes(zerocopy_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write` sends writes above the threshold with zero-copy
+    and the peer receives them unchanged.
+    """
+    data = os.urandom(512 * 1024)
+    join = receive_all(remote, len(data))
+    zerocopy_transport.write(data, timeout=5000)
+    assert join() == data
+    zerocopy_transport._zerocopy.flush(time.monotonic() + 5)
+    assert zerocopy_transport._zerocopy.pending == 0
+    assert zerocopy_transport._zerocopy.copied > 0
+
+
+def test_write_waits_for_writable_buffer(zerocopy_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write` only returns once the kernel released a writable
+    buffer, so the caller can reuse it right away.
+    """
+    data = bytearray(os.urandom(256 * 1024))
+    join = receive_all(remote, len(data))
+    zerocopy_transport.write(data, timeout=5000)
+    assert zerocopy_transport._zerocopy.pending == 0
+    expected = bytes(data)
+    data[:] = bytes(len(data))
+    assert join() == expected
+
+
+def test_writev_sends_large_buffers(zerocopy_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.writev` sends buffers that add up to the threshold with
+    zero-copy.
+    """
+    buffers = [os.urandom(24), os.urandom(64 * 1024)]
+    join = receive_all(remote, sum(len(buffer) for buffer in buffers))
+    zerocopy_transport.writev(buffers, timeout=5000)
+    assert join() == b''.join(buffers)
+    zerocopy_transport._zerocopy.flush(time.monotonic() + 5)
+    assert zerocopy_transport._zerocopy.copied == 1
+
+
+def test_write_sends_small_bytes_with_copy(mocker, zerocopy_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.write` sends writes below the threshold with regular sends.
+    """
+    spy = mocker.spy(zerocopy_transport._zerocopy, 'sendmsg_all')
+    zerocopy_transport.write(b'x' * 1023, timeout=1000)
+    assert remote.recv(2048) == b'x' * 1023
+    assert not spy.called
+
+
+def test_close_waits_for_completions(zerocopy_transport, remote):
+    """
+    Assert that :meth:`~adbts.tcp.synchronous.Transport.close` waits for outstanding sends.
+    """
+    data = os.urandom(256 * 1024)
+    join = receive_all(remote, len(data))
+    sender = zerocopy_transport._zerocopy
+    zerocopy_transport.write(data, timeout=5000)
+    zerocopy_transport.close()
+    assert sender.pending == 0
+    assert join() == data
+
+
+def test_complete_releases_wrapped_range(tcp_pair):
+    """
+    Assert that :meth:`~adbts.tcp.zerocopy.Sender._complete` releases ranges of sends that wrap the counter.
+    """
+    sender = zerocopy.Sender(tcp_pair[0])
+    for send_id in (zerocopy.COUNTER_MASK - 1, zerocopy.COUNTER_MASK, 0, 1):
+        sender._pending[send_id] = []
+    assert sender._complete(completion(zerocopy.COUNTER_MASK - 1, 0, code=zerocopy.SO_EE_CODE_ZEROCOPY_COPIED)) == 3
+    assert list(sender._pending) == [1]
+    assert sender.copied == 3
+
+
+def test_complete_raises_on_socket_error(tcp_pair):
+    """
+    Assert that :meth:`~adbts.tcp.zerocopy.Sender._complete` raises a :class:`~OSError` for error queue messages
+    that report socket errors rather than completions.
+    """
+    sender = zerocopy.Sender(tcp_pair[0])
+    with pytest.raises(OSError):
+        sender._complete(completion(0, 0, err=113, origin=2))
+    assert sender._complete(completion(0, 0, origin=2)) == 0
@@ -0,0 +1,290 @@
+"""
+    test_buffered
+    ~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.buffered` module.
+"""
+import os
+
+import pytest
+
+from adbts import buffered, exceptions
+
+
+class StreamTransport:
+    """
+    Transport stand-in that serves bytes of a stream in chunks of at most `chunk_size` per read call.
+    """
+
+    default_timeout = None
+
+    def __init__(self, data, chunk_size=4096):
+        self.data = bytearray(data)
+        self.chunk_size = chunk_size
+        self.reads = 0
+        self.closed = False
+
+    def readinto(self, buffer, timeout=None):
+        self.reads += 1
+        num_bytes = min(len(buffer), len(self.data), self.chunk_size)
+        buffer[:num_bytes] = self.data[:num_bytes]
+        del self.data[:num_bytes]
+        return num_bytes
+
+    def read(self, num_bytes, timeout=None):
+        buffer = bytearray(num_bytes)
+        return bytes(buffer[:self.readinto(buffer, timeout)])
+
+    def read_exactly(self, num_bytes, timeout=None):
+        if num_bytes > len(self.data):
+            raise exceptions.TransportEndpointNotFound('Stream ended')
+        self.reads += 1
+        data = bytes(self.data[:num_bytes])
+        del self.data[:num_bytes]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncStreamTransport(StreamTransport):
+    """
+    Asynchronous variant of :class:`~tests.test_buffered.StreamTransport`.
+    """
+
+    async def readinto(self, buffer, timeout=None):  # pylint: disable=invalid-overridden-method
+        return StreamTransport.readinto(self, buffer, timeout)
+
+    async def read(self, num_bytes, timeout=None):  # pylint: disable=invalid-overridden-method
+        buffer = bytearray(num_bytes)
+        return bytes(buffer[:StreamTransport.readinto(self, buffer, timeout)])
+
+    async def read_exactly(self, num_bytes, timeout=None):  # pylint: disable=invalid-overridden-method
+        return StreamTransport.read_exactly(self, num_bytes, timeout)
+
+
+@pytest.fixture(scope='function')
+def stream():
+    """
+    Fixture that yields random bytes served by a wrapped transport.
+    """
+    return os.urandom(65536)
+
+
+def test_ring_buffer_rejects_non_positive_capacity():
+    """
+    Assert that :class:`~adbts.buffered.RingBuffer` raises a :class:`~ValueError` for a capacity below one.
+    """
+    with pytest.raises(ValueError):
+        buffered.RingBuffer(0)
+
+
+def test_ring_buffer_peek_is_contiguous_across_wrap():
+    """
+    Assert that :meth:`~adbts.buffered.RingBuffer.peek` returns bytes in order when they wrap around the end
+    of the buffer.
+    """
+    ring = buffered.RingBuffer(8)
+    ring.writable()[:6] = b'abcdef'
+    ring.commit(6)
+    ring.consume(4)
+    region = ring.writable()
+    assert len(region) == 2
+    region[:] = b'gh'
+    ring.commit(2)
+    region = ring.writable()
+    assert len(region) == 4
+    region[:] = b'ijkl'
+    ring.commit(4)
+    assert len(ring) == 8
+    assert ring.peek(8) == b'efghijkl'
+
+
+def test_ring_buffer_rewinds_when_empty():
+    """
+    Assert that :class:`~adbts.buffered.RingBuffer` offers its whole capacity again once emptied.
+    """
+    ring = buffered.RingBuffer(8)
+    ring.commit(5)
+    ring.consume(5)
+    assert len(ring.writable()) == 8
+
+
+def test_read_serves_small_reads_from_one_fill(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read` reads the wrapped transport once for many
+    small reads.
+    """
+    inner = StreamTransport(stream)
+    transport = buffered.BufferedTransport(inner, buffer_size=4096)
+    data = b''.join(transport.read(24) for _ in range(100))
+    assert data == stream[:2400]
+    assert inner.reads == 1
+
+
+def test_read_bypasses_buffer_for_large_reads(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read` does not copy reads at least the buffer size
+    through an empty buffer.
+    """
+    inner = StreamTransport(stream, chunk_size=len(stream))
+    transport = buffered.BufferedTransport(inner, buffer_size=1024)
+    assert transport.read(8192) == stream[:8192]
+    assert transport.buffered == 0
+
+
+def test_readinto_copies_buffered_bytes(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.readinto` copies buffered bytes into the caller buffer.
+    """
+    transport = buffered.BufferedTransport(StreamTransport(stream), buffer_size=4096)
+    buffer = bytearray(100)
+    assert transport.readinto(buffer) == 100
+    assert buffer == stream[:100]
+    assert transport.buffered == 4096 - 100
+
+
+def test_peek_does_not_consume(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.peek` leaves the bytes to be read.
+    """
+    transport = buffered.BufferedTransport(StreamTransport(stream), buffer_size=4096)
+    assert transport.peek(24) == stream[:24]
+    assert transport.read(24) == stream[:24]
+
+
+def test_read_exactly_fills_until_satisfied(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read_exactly` reads the wrapped transport until enough
+    bytes are buffered.
+    """
+    inner = StreamTransport(stream, chunk_size=7)
+    transport = buffered.BufferedTransport(inner, buffer_size=4096)
+    assert transport.read_exactly(24) == stream[:24]
+    assert transport.read_exactly(24) == stream[24:48]
+    assert inner.reads == 7
+
+
+def test_read_exactly_reads_past_buffer_capacity(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read_exactly` returns buffered bytes followed by the
+    rest read from the wrapped transport when more bytes than the buffer holds are requested.
+    """
+    transport = buffered.BufferedTransport(StreamTransport(stream), buffer_size=1024)
+    assert transport.read(24) == stream[:24]
+    assert transport.read_exactly(4096) == stream[24:4120]
+    assert transport.read(24) == stream[4120:4144]
+
+
+def test_read_exactly_wraps_around_buffer(stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read_exactly` returns bytes in order when buffered
+    bytes wrap around the end of the ring buffer.
+    """
+    transport = buffered.BufferedTransport(StreamTransport(stream, chunk_size=100), buffer_size=256)
+    offset = 0
+    for num_bytes in (24, 200, 24, 150, 24, 256, 1):
+        assert transport.read_exactly(num_bytes) == stream[offset:offset + num_bytes]
+        offset += num_bytes
+
+
+def test_read_raises_when_wrapped_transport_returns_nothing():
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when the wrapped transport has no more bytes.
+    """
+    transport = buffered.BufferedTransport(StreamTransport(b''))
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        transport.read(24)
+
+
+def test_read_exactly_raises_on_exceeded_timeout(mocker, stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when all reads together exceed the timeout.
+    """
+    clock = mocker.patch('adbts.timeouts.time')
+    clock.monotonic.side_effect = [0.0, 0.0, 1.0]
+    transport = buffered.BufferedTransport(StreamTransport(stream, chunk_size=8), buffer_size=4096)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        transport.read_exactly(24, timeout=500)
+
+
+def test_read_exactly_bounds_whole_call_by_default_timeout(mocker, stream):
+    """
+    Assert that :meth:`~adbts.buffered.BufferedTransport.read_exactly` without a timeout raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when all reads together exceed the default timeout of the
+    wrapped transport.
+    """
+    clock = mocker.patch('adbts.timeouts.time')
+    clock.monotonic.side_effect = [0.0, 0.0, 1.0]
+    wrapped = StreamTransport(stream, chunk_size=8)
+    wrapped.default_timeout = 500
+    transport = buffered.BufferedTransport(wrapped, buffer_size=4096)
+    assert transport.default_timeout == 500
+    with pytest.raises(exceptions.TransportTimeoutError):
+        transport.read_exactly(24)
+
+
+def test_write_and_close_pass_through(mocker, valid_bytes):
+    """
+    Assert that :class:`~adbts.buffered.BufferedTransport` writes to and closes the wrapped transport.
+    """
+    inner = mocker.MagicMock(closed=False)
+    transport = buffered.BufferedTransport(inner)
+    transport.write(valid_bytes, 1000)
+    transport.writev([valid_bytes, valid_bytes], 1000)
+    transport.close()
+    inner.write.assert_called_once_with(valid_bytes, 1000)
+    inner.writev.assert_called_once_with([valid_bytes, valid_bytes], 1000)
+    inner.close.assert_called_once_with()
+
+
+def test_async_read_serves_small_reads_from_one_fill(event_loop, stream):
+    """
+    Assert that :meth:`~adbts.buffered.AsyncBufferedTransport.read` awaits the wrapped transport once for many
+    small reads.
+    """
+    inner = AsyncStreamTransport(stream)
+    transport = buffered.AsyncBufferedTransport(inner, buffer_size=4096)
+
+    async def read_all():
+        return b''.join([await transport.read(24) for _ in range(100)])
+
+    assert event_loop.run_until_complete(read_all()) == stream[:2400]
+    assert inner.reads == 1
+
+
+def test_async_read_exactly_fills_until_satisfied(event_loop, stream):
+    """
+    Assert that :meth:`~adbts.buffered.AsyncBufferedTransport.read_exactly` awaits the wrapped transport until
+    enough bytes are buffered, reads past the buffer capacity and peeks with a single read.
+    """
+    transport = buffered.AsyncBufferedTransport(AsyncStreamTransport(stream, chunk_size=7), buffer_size=1024)
+
+    async def read_all():
+        return [await transport.read_exactly(24), await transport.read_exactly(4096),
+                await transport.peek(24)]
+
+    header, payload, peeked = event_loop.run_until_complete(read_all())
+    assert header == stream[:24]
+    assert payload == stream[24:4120]
+    assert peeked == stream[4120:4127]
+
+
+def test_write_file_passes_through(mocker, event_loop):
+    """
+    Assert that :class:`~adbts.buffered.BufferedTransport` and :class:`~adbts.buffered.AsyncBufferedTransport`
+    write files with the wrapped transport.
+    """
+    inner = mocker.MagicMock(closed=False)
+    inner.write_file.return_value = 42
+    assert buffered.BufferedTransport(inner).write_file('file.bin', 8, 42, 1000) == 42
+    inner.write_file.assert_called_once_with('file.bin', 8, 42, 1000)
+
+    async def write_file(*args):
+        return 24
+
+    inner.write_file.side_effect = write_file
+    transport = buffered.AsyncBufferedTransport(inner)
+    assert event_loop.run_until_complete(transport.write_file('file.bin', timeout=1000)) == 24
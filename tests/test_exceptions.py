@@ -4,6 +4,9 @@
 
     Tests for the :mod:`~adbts.exceptions` module.
 """
+import asyncio
+import inspect
+
 import pytest
 
 from adbts import exceptions
@@ -49,3 +52,44 @@ def test_reraise_timeout_errors_converts_exception_to_transport_timeout_error(ex
 
     with pytest.raises(exceptions.TransportTimeoutError):
         func()
+
+
+def test_reraise_converts_exception_raised_by_awaited_coroutine(event_loop, exc_to_catch):
+    """
+    Assert that :func:`~adbts.exceptions.reraise` wraps coroutine functions so stdlib exceptions raised while
+    they are awaited are reraised as :class:`~adbts.exceptions.TransportError`.
+    """
+    @exceptions.reraise(exc_to_catch)
+    async def func():
+        await asyncio.sleep(0)
+        raise exc_to_catch()
+
+    with pytest.raises(exceptions.TransportError):
+        event_loop.run_until_complete(func())
+
+
+def test_reraise_timeout_errors_converts_exception_raised_by_awaited_coroutine(event_loop, exc_to_catch):
+    """
+    Assert that :func:`~adbts.exceptions.reraise_timeout_errors` wraps coroutine functions so stdlib exceptions
+    raised while they are awaited are reraised as :class:`~adbts.exceptions.TransportTimeoutError`.
+    """
+    @exceptions.reraise_timeout_errors(exc_to_catch)
+    async def func(timeout=None):
+        await asyncio.sleep(0)
+        raise exc_to_catch()
+
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(func(timeout=100))
+
+
+def test_reraise_keeps_coroutine_function():
+    """
+    Assert that :func:`~adbts.exceptions.reraise` and :func:`~adbts.exceptions.reraise_timeout_errors` return
+    coroutine functions for coroutine functions, so decorators applied on top also cover the awaited work.
+    """
+    @exceptions.reraise(OSError)
+    @exceptions.reraise_timeout_errors(TimeoutError)
+    async def func():
+        pass
+
+    assert inspect.iscoroutinefunction(func)
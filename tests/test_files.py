@@ -0,0 +1,86 @@
+"""
+    test_files
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.files` module.
+"""
+import os
+
+import pytest
+
+from adbts import files
+
+
+def test_open_file_opens_and_closes_path(valid_file):
+    """
+    Assert that :func:`~adbts.files.open_file` opens a file given by path and closes it afterwards.
+    """
+    path, data = valid_file
+    with files.open_file(path) as fd:
+        assert os.read(fd, len(data)) == data
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def test_open_file_leaves_file_descriptor_open(valid_file):
+    """
+    Assert that :func:`~adbts.files.open_file` yields a given file descriptor as is and leaves it open.
+    """
+    fd = os.open(valid_file[0], os.O_RDONLY)
+    try:
+        with files.open_file(fd) as opened:
+            assert opened == fd
+        assert os.fstat(fd)
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.parametrize('offset,count,expected', [
+    (0, None, 100),
+    (10, None, 90),
+    (10, 20, 20),
+    (90, 20, 10),
+    (200, None, 0),
+])
+def test_file_range_is_clamped_to_end_of_file(tmpdir, offset, count, expected):
+    """
+    Assert that :func:`~adbts.files.file_range` clamps the region to the end of the file.
+    """
+    path = tmpdir.join('file.bin')
+    path.write_binary(bytes(100))
+    with files.open_file(str(path)) as fd:
+        assert files.file_range(fd, offset, count) == expected
+
+
+@pytest.mark.parametrize('offset,count', [(-1, None), (0, -1)])
+def test_file_range_rejects_negative_values(valid_file, offset, count):
+    """
+    Assert that :func:`~adbts.files.file_range` raises a :class:`~ValueError` for a negative offset or count.
+    """
+    with files.open_file(valid_file[0]) as fd, pytest.raises(ValueError):
+        files.file_range(fd, offset, count)
+
+
+@pytest.mark.parametrize('offset', [0, 1, 4096, 65537])
+def test_mapped_yields_writable_view_of_region(valid_file, offset):
+    """
+    Assert that :func:`~adbts.files.mapped` yields a writable view of the file region at any offset, and
+    writing to it does not modify the file.
+    """
+    path, data = valid_file
+    with files.open_file(path) as fd:
+        count = files.file_range(fd, offset, 1000)
+        with files.mapped(fd, offset, count) as view:
+            assert view == data[offset:offset + 1000]
+            assert not view.readonly
+            view[:4] = b'\x00' * 4
+    with open(path, 'rb') as file:
+        assert file.read() == data
+
+
+def test_mapped_yields_empty_view_for_empty_region(valid_file):
+    """
+    Assert that :func:`~adbts.files.mapped` yields an empty view instead of mapping an empty region.
+    """
+    with files.open_file(valid_file[0]) as fd, files.mapped(fd, 0, 0) as view:
+        assert len(view) == 0
@@ -0,0 +1,139 @@
+"""
+    test_loops
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.loops` module.
+"""
+import asyncio
+import socket
+
+import pytest
+
+from adbts import loops
+from adbts.tcp import asynchronous
+
+
+@pytest.fixture(scope='function')
+def event_loop_policy():
+    """
+    Fixture that restores the event loop policy after the test.
+    """
+    policy = asyncio.get_event_loop_policy()
+    yield
+    asyncio.set_event_loop_policy(policy)
+
+
+def test_new_event_loop_creates_asyncio_loop():
+    """
+    Assert that :func:`~adbts.loops.new_event_loop` creates a default `asyncio` event loop.
+    """
+    loop = loops.new_event_loop(loops.LOOP_ASYNCIO)
+    try:
+        assert isinstance(loop, asyncio.AbstractEventLoop)
+    finally:
+        loop.close()
+
+
+@pytest.mark.skipif(not loops.HAS_UVLOOP, reason='uvloop is not installed')
+def test_new_event_loop_creates_uvloop_loop():
+    """
+    Assert that :func:`~adbts.loops.new_event_loop` creates a `uvloop` event loop.
+    """
+    loop = loops.new_event_loop(loops.LOOP_UVLOOP)
+    try:
+        assert type(loop).__module__.startswith('uvloop')
+    finally:
+        loop.close()
+
+
+def test_new_event_loop_raises_on_unknown_implementation():
+    """
+    Assert that :func:`~adbts.loops.new_event_loop` raises a :class:`~ValueError` for unknown implementations.
+    """
+    with pytest.raises(ValueError):
+        loops.new_event_loop('tokio')
+
+
+def test_new_event_loop_raises_when_uvloop_missing(monkeypatch):
+    """
+    Assert that :func:`~adbts.loops.new_event_loop` raises a :class:`~RuntimeError` when `uvloop` is requested
+    but not installed.
+    """
+    monkeypatch.setattr(loops, 'HAS_UVLOOP', False)
+    with pytest.raises(RuntimeError):
+        loops.new_event_loop(loops.LOOP_UVLOOP)
+
+
+def test_install_returns_false_when_uvloop_missing(monkeypatch, event_loop_policy):
+    """
+    Assert that :func:`~adbts.loops.install` keeps the event loop policy when `uvloop` is not installed.
+    """
+    monkeypatch.setattr(loops, 'HAS_UVLOOP', False)
+    policy = asyncio.get_event_loop_policy()
+    assert not loops.install()
+    assert asyncio.get_event_loop_policy() is policy
+
+
+@pytest.mark.skipif(not loops.HAS_UVLOOP, reason='uvloop is not installed')
+def test_install_sets_uvloop_policy(event_loop_policy):
+    """
+    Assert that :func:`~adbts.loops.install` makes `uvloop` the implementation of new event loops.
+    """
+    assert loops.install()
+    loop = asyncio.new_event_loop()
+    try:
+        assert type(loop).__module__.startswith('uvloop')
+    finally:
+        loop.close()
+
+
+def test_running_loop_returns_loop_of_coroutine(event_loop):
+    """
+    Assert that :func:`~adbts.loops.running_loop` returns the loop running the calling co-routine.
+    """
+    async def running():
+        return loops.running_loop()
+
+    assert event_loop.run_until_complete(running()) is event_loop
+
+
+def test_current_loop_returns_loop_of_coroutine(event_loop):
+    """
+    Assert that :func:`~adbts.loops.current_loop` returns the loop running the calling co-routine.
+    """
+    async def current():
+        return loops.current_loop()
+
+    assert event_loop.run_until_complete(current()) is event_loop
+
+
+def test_current_loop_returns_none_outside_of_loop():
+    """
+    Assert that :func:`~adbts.loops.current_loop` returns None rather than raising when no loop is running.
+    """
+    assert loops.current_loop() is None
+
+
+def test_running_loop_warns_about_explicit_loop(event_loop):
+    """
+    Assert that :func:`~adbts.loops.running_loop` raises a :class:`~DeprecationWarning` when given a loop.
+    """
+    async def running():
+        return loops.running_loop(event_loop)
+
+    with pytest.warns(DeprecationWarning):
+        assert event_loop.run_until_complete(running()) is event_loop
+
+
+def test_open_warns_about_explicit_loop(event_loop):
+    """
+    Assert that :func:`~adbts.tcp.asynchronous.open` raises a :class:`~DeprecationWarning` when given a loop.
+    """
+    with socket.socket() as listener:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        port = listener.getsockname()[1]
+        with pytest.warns(DeprecationWarning):
+            transport = event_loop.run_until_complete(
+                asynchronous.open('127.0.0.1', port, timeout=1000, loop=event_loop))
+        transport.close()
@@ -4,9 +4,11 @@
 
     Tests for the :mod:`~adbts.timeouts` module.
 """
+import time
+
 import pytest
 
-from adbts import timeouts
+from adbts import exceptions, timeouts
 
 
 @pytest.fixture(scope='session', params=[
@@ -57,3 +59,75 @@ def test_transport_timeout_returns_none_when_none_and_seconds_set():
     value and the seconds flag set.
     """
     assert timeouts.timeout(None, seconds=True) is None
+
+
+def test_deadline_returns_none_without_timeout():
+    """
+    Assert that :func:`~adbts.timeouts.deadline` returns `None` when no timeout was given and there is no
+    default timeout.
+    """
+    assert timeouts.deadline(None) is None
+    assert timeouts.deadline(timeouts.UNDEFINED) is None
+
+
+def test_deadline_is_timeout_after_now(valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.timeouts.deadline` returns a monotonic time the given number of milliseconds
+    from now.
+    """
+    before = time.monotonic()
+    deadline = timeouts.deadline(valid_timeout_ms)
+    assert before + valid_timeout_ms / 1000 <= deadline <= time.monotonic() + valid_timeout_ms / 1000
+
+
+def test_deadline_uses_default_when_timeout_undefined(valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.timeouts.deadline` uses the default timeout when no timeout was given, but not
+    when waiting forever was asked for.
+    """
+    before = time.monotonic()
+    deadline = timeouts.deadline(timeouts.UNDEFINED, valid_timeout_ms)
+    assert before + valid_timeout_ms / 1000 <= deadline <= time.monotonic() + valid_timeout_ms / 1000
+    assert timeouts.deadline(None, valid_timeout_ms) is None
+
+
+def test_earliest_ignores_deadlines_waiting_forever():
+    """
+    Assert that :func:`~adbts.timeouts.earliest` returns the earliest deadline, ignoring `None`.
+    """
+    assert timeouts.earliest(None, 2.0, 1.0) == 1.0
+    assert timeouts.earliest(None, None) is None
+
+
+def test_remaining_returns_seconds_left(valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.timeouts.remaining` returns no more than the original number of seconds and
+    zero once the deadline passed.
+    """
+    assert 0 < timeouts.remaining(timeouts.deadline(valid_timeout_ms)) <= valid_timeout_ms / 1000
+    assert timeouts.remaining(time.monotonic() - 1) == 0
+    assert timeouts.remaining(None) is None
+
+
+def test_call_timeout_returns_none_without_deadline(sentinel):
+    """
+    Assert that :func:`~adbts.timeouts.call_timeout` returns `None` to wait forever when there is no deadline.
+    """
+    assert timeouts.call_timeout(None, sentinel) is None
+
+
+def test_call_timeout_returns_milliseconds_left(valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.timeouts.call_timeout` returns no more than the original number of milliseconds.
+    """
+    remaining = timeouts.call_timeout(timeouts.deadline(valid_timeout_ms), valid_timeout_ms)
+    assert 0 < remaining <= valid_timeout_ms
+
+
+def test_call_timeout_raises_when_deadline_passed(valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.timeouts.call_timeout` raises a :class:`~adbts.exceptions.TransportTimeoutError`
+    once the deadline passed.
+    """
+    with pytest.raises(exceptions.TransportTimeoutError):
+        timeouts.call_timeout(time.monotonic() - 1, valid_timeout_ms)
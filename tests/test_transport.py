@@ -6,7 +6,7 @@
 """
 import pytest
 
-from adbts import transport
+from adbts import exceptions, transport
 
 
 def test_transport_is_abstract():
@@ -15,3 +15,72 @@ def test_transport_is_abstract():
     """
     with pytest.raises(TypeError):
         transport.Transport()
+
+
+class CoroutineTransport:
+    """
+    Minimal object with a 'closed' attribute used to exercise the coroutine decorators.
+    """
+    closed = False
+
+    @transport.ensure_opened
+    @transport.ensure_num_bytes
+    async def read(self, num_bytes):
+        return b'\x00' * num_bytes
+
+    @transport.ensure_opened
+    @transport.ensure_buffer
+    async def readinto(self, buffer):
+        return len(buffer)
+
+    @transport.ensure_opened
+    @transport.ensure_data
+    async def write(self, data):
+        return len(data)
+
+
+def test_ensure_num_bytes_coroutine_returns_empty_bytes(event_loop):
+    """
+    Assert that :func:`~adbts.transport.ensure_num_bytes` keeps coroutine functions awaitable when
+    no bytes would be read.
+    """
+    assert event_loop.run_until_complete(CoroutineTransport().read(0)) == b''
+
+
+def test_ensure_buffer_coroutine_returns_zero(event_loop):
+    """
+    Assert that :func:`~adbts.transport.ensure_buffer` keeps coroutine functions awaitable when
+    the buffer cannot hold any bytes.
+    """
+    assert event_loop.run_until_complete(CoroutineTransport().readinto(bytearray())) == 0
+
+
+def test_ensure_buffers_returns_none_without_data():
+    """
+    Assert that :func:`~adbts.transport.ensure_buffers` does not call the wrapped function when no buffer
+    has data.
+    """
+    @transport.ensure_buffers
+    def writev(self, buffers):
+        raise AssertionError('Should not be called')
+
+    assert writev(None, [b'', bytearray()]) is None
+
+
+def test_ensure_data_coroutine_returns_none(event_loop):
+    """
+    Assert that :func:`~adbts.transport.ensure_data` keeps coroutine functions awaitable when
+    no data would be written.
+    """
+    assert event_loop.run_until_complete(CoroutineTransport().write(b'')) is None
+
+
+def test_ensure_opened_coroutine_raises_when_closed(event_loop):
+    """
+    Assert that :func:`~adbts.transport.ensure_opened` raises a :class:`~adbts.exceptions.TransportClosedError`
+    when a coroutine function is awaited on a closed transport.
+    """
+    obj = CoroutineTransport()
+    obj.closed = True
+    with pytest.raises(exceptions.TransportClosedError):
+        event_loop.run_until_complete(obj.read(1))
@@ -0,0 +1,62 @@
+"""
+    test_unix_addresses
+    ~~~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.unix.addresses` module.
+"""
+import pytest
+
+from adbts.unix import addresses
+
+
+@pytest.mark.parametrize('path', ['/tmp/adb.sock', b'/tmp/adb.sock', 'relative.sock'])
+def test_address_returns_filesystem_path_as_is(path):
+    """
+    Assert that :func:`~adbts.unix.addresses.address` returns filesystem paths unchanged.
+    """
+    assert addresses.address(path) == path
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('@jdwp-control', '\0jdwp-control'),
+    ('\0jdwp-control', '\0jdwp-control'),
+    (b'@jdwp-control', b'\0jdwp-control'),
+])
+def test_address_maps_abstract_names_to_leading_nul(monkeypatch, path, expected):
+    """
+    Assert that :func:`~adbts.unix.addresses.address` maps abstract names to addresses with a leading NUL byte.
+    """
+    monkeypatch.setattr(addresses, 'HAS_ABSTRACT_NAMESPACE', True)
+    assert addresses.address(path) == expected
+
+
+def test_address_raises_on_abstract_name_without_namespace(monkeypatch):
+    """
+    Assert that :func:`~adbts.unix.addresses.address` raises a :class:`~ValueError` for abstract names on
+    platforms without the abstract namespace.
+    """
+    monkeypatch.setattr(addresses, 'HAS_ABSTRACT_NAMESPACE', False)
+    with pytest.raises(ValueError):
+        addresses.address('@jdwp-control')
+
+
+@pytest.mark.parametrize('path', ['', b''])
+def test_address_raises_on_empty_path(path):
+    """
+    Assert that :func:`~adbts.unix.addresses.address` raises a :class:`~ValueError` for empty paths.
+    """
+    with pytest.raises(ValueError):
+        addresses.address(path)
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('/tmp/adb.sock', '/tmp/adb.sock'),
+    (b'/tmp/adb.sock', '/tmp/adb.sock'),
+    ('@jdwp-control', '@jdwp-control'),
+    ('\0jdwp-control', '@jdwp-control'),
+])
+def test_display_prints_abstract_names_with_prefix(path, expected):
+    """
+    Assert that :func:`~adbts.unix.addresses.display` prints abstract names with the '@' prefix.
+    """
+    assert addresses.display(path) == expected
@@ -0,0 +1,81 @@
+"""
+    test_unix_asynchronous
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.unix.asynchronous` module.
+"""
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+
+import pytest
+
+from adbts import exceptions
+from adbts.unix import asynchronous
+
+
+@pytest.fixture(scope='function')
+def socket_dir():
+    """
+    Fixture that yields a short temporary directory, as socket paths are limited to about a hundred bytes.
+    """
+    path = tempfile.mkdtemp(prefix='adbts-')
+    yield path
+    shutil.rmtree(path)
+
+
+@pytest.fixture(scope='function')
+def listener(socket_dir):
+    """
+    Fixture that yields the path of a listening unix domain socket and the socket itself.
+    """
+    path = os.path.join(socket_dir, 'adb.sock')
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(1)
+    yield path, sock
+    sock.close()
+
+
+def test_open_connects_to_filesystem_socket(event_loop, listener, valid_bytes):
+    """
+    Assert that :func:`~adbts.unix.asynchronous.open` connects to a socket given by filesystem path.
+    """
+    path, sock = listener
+    transport = event_loop.run_until_complete(asynchronous.open(path, timeout=1000))
+    conn, _ = sock.accept()
+    try:
+        with conn:
+            event_loop.run_until_complete(transport.write(valid_bytes, timeout=1000))
+            received = b''
+            while len(received) < len(valid_bytes):
+                received += conn.recv(len(valid_bytes))
+            conn.sendall(received)
+            assert event_loop.run_until_complete(transport.read_exactly(len(valid_bytes), timeout=1000)) == valid_bytes
+    finally:
+        transport.close()
+    assert str(transport) == path
+
+
+def test_open_raises_on_missing_socket(event_loop, socket_dir):
+    """
+    Assert that :func:`~adbts.unix.asynchronous.open` raises a :class:`~adbts.exceptions.TransportError` when
+    nothing listens on the given path.
+    """
+    with pytest.raises(exceptions.TransportError):
+        event_loop.run_until_complete(asynchronous.open(os.path.join(socket_dir, 'missing.sock'), timeout=1000))
+
+
+def test_open_raises_timeout_error_when_connect_hangs(event_loop, monkeypatch, socket_dir):
+    """
+    Assert that :func:`~adbts.unix.asynchronous.open` raises a :class:`~adbts.exceptions.TransportTimeoutError`
+    when connecting outlasts the timeout.
+    """
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(asyncio, 'open_unix_connection', hang)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(asynchronous.open(os.path.join(socket_dir, 'adb.sock'), timeout=10))
@@ -0,0 +1,168 @@
+"""
+    test_unix_synchronous
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.unix.synchronous` module.
+"""
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from adbts import exceptions
+from adbts.unix import synchronous
+
+
+@pytest.fixture(scope='function')
+def socket_dir():
+    """
+    Fixture that yields a short temporary directory, as socket paths are limited to about a hundred bytes.
+    """
+    path = tempfile.mkdtemp(prefix='adbts-')
+    yield path
+    shutil.rmtree(path)
+
+
+def listen(address):
+    """
+    Create a unix domain socket listening on the given address.
+    """
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(address)
+    listener.listen(1)
+    return listener
+
+
+@pytest.fixture(scope='function')
+def listener(socket_dir):
+    """
+    Fixture that yields the path of a listening unix domain socket and the socket itself.
+    """
+    path = os.path.join(socket_dir, 'adb.sock')
+    sock = listen(path)
+    yield path, sock
+    sock.close()
+
+
+@pytest.fixture(scope='function')
+def abstract_listener():
+    """
+    Fixture that yields the abstract name of a listening unix domain socket and the socket itself.
+    """
+    if not sys.platform.startswith('linux'):
+        pytest.skip('Abstract socket namespace is only supported on Linux')
+    name = 'adbts-test-{}'.format(os.urandom(8).hex())
+    sock = listen('\0' + name)
+    yield '@' + name, sock
+    sock.close()
+
+
+def echo(sock, num_bytes):
+    """
+    Accept a single connection on the given socket and echo the given number of bytes back.
+    """
+    conn, _ = sock.accept()
+    with conn:
+        data = b''
+        while len(data) < num_bytes:
+            chunk = conn.recv(num_bytes - len(data))
+            if not chunk:
+                break
+            data += chunk
+        conn.sendall(data)
+
+
+def test_open_connects_to_filesystem_socket(listener, valid_bytes):
+    """
+    Assert that :func:`~adbts.unix.synchronous.open` connects to a socket given by filesystem path.
+    """
+    path, sock = listener
+    thread = threading.Thread(target=echo, args=(sock, len(valid_bytes)))
+    thread.start()
+    transport = synchronous.open(path, timeout=1000)
+    try:
+        transport.write(valid_bytes, timeout=1000)
+        assert transport.read_exactly(len(valid_bytes), timeout=1000) == valid_bytes
+    finally:
+        transport.close()
+        thread.join(1)
+    assert str(transport) == path
+
+
+def test_open_connects_to_abstract_socket(abstract_listener, valid_bytes):
+    """
+    Assert that :func:`~adbts.unix.synchronous.open` connects to a socket given by its abstract name.
+    """
+    name, sock = abstract_listener
+    thread = threading.Thread(target=echo, args=(sock, len(valid_bytes)))
+    thread.start()
+    transport = synchronous.open(name, timeout=1000)
+    try:
+        transport.write(valid_bytes, timeout=1000)
+        assert transport.read_exactly(len(valid_bytes), timeout=1000) == valid_bytes
+    finally:
+        transport.close()
+        thread.join(1)
+    assert str(transport) == name
+
+
+def test_open_raises_on_missing_socket(socket_dir):
+    """
+    Assert that :func:`~adbts.unix.synchronous.open` raises a :class:`~adbts.exceptions.TransportError` when
+    nothing listens on the given path.
+    """
+    with pytest.raises(exceptions.TransportError):
+        synchronous.open(os.path.join(socket_dir, 'missing.sock'), timeout=1000)
+
+
+def test_open_raises_on_empty_path():
+    """
+    Assert that :func:`~adbts.unix.synchronous.open` raises a :class:`~ValueError` for an empty path.
+    """
+    with pytest.raises(ValueError):
+        synchronous.open('')
+
+
+def test_read_raises_on_closed_transport(listener):
+    """
+    Assert that :meth:`~adbts.unix.synchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportClosedError` once the transport is closed.
+    """
+    transport = synchronous.open(listener[0], timeout=1000)
+    transport.close()
+    assert transport.closed
+    with pytest.raises(exceptions.TransportClosedError):
+        transport.read(1)
+
+
+def test_read_raises_timeout_error(listener):
+    """
+    Assert that :meth:`~adbts.unix.synchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when the peer does not write in time.
+    """
+    transport = synchronous.open(listener[0], timeout=1000)
+    try:
+        with pytest.raises(exceptions.TransportTimeoutError):
+            transport.read(1, timeout=10)
+    finally:
+        transport.close()
+
+
+def test_write_file_sends_file(listener, valid_file):
+    """
+    Assert that :meth:`~adbts.unix.synchronous.Transport.write_file` sends the contents of the given file.
+    """
+    path, data = valid_file
+    thread = threading.Thread(target=echo, args=(listener[1], len(data)))
+    thread.start()
+    transport = synchronous.open(listener[0], timeout=1000)
+    try:
+        assert transport.write_file(path, timeout=1000) == len(data)
+        assert transport.read_exactly(len(data), timeout=1000) == data
+    finally:
+        transport.close()
+        thread.join(1)
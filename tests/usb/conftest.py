@@ -8,7 +8,20 @@ import pytest
 import usb1
 
 from adbts import exceptions
-from adbts.usb import libusb
+from adbts.usb import asynchronous, index, libusb
+
+
+@pytest.fixture(scope='function', autouse=True)
+def context_registry(mocker):
+    """
+    Fixture that yields an empty shared USB context registry so contexts, their pollers and the device
+    index never leak between tests.
+    """
+    registry = libusb.ContextRegistry()
+    mocker.patch.object(libusb, 'CONTEXT_REGISTRY', registry)
+    mocker.patch.object(index, 'DEVICE_INDEX', index.DeviceIndex())
+    mocker.patch.object(asynchronous, '_POLLERS', {})
+    return registry
 
 
 @pytest.fixture(scope='session', params=[
@@ -544,3 +557,90 @@ def mock_interface_settings_endpoint_factory(mocker, mock_interface_settings_mat
         return mock_interface_settings_match
 
     return factory
+
+
+@pytest.fixture(scope='function')
+def mock_pollable_context(mock_context):
+    """
+    Fixture that yields a mock USB context that can be driven by an event loop.
+    """
+    mock_context.getPollFDList.return_value = []
+    mock_context.getNextTimeout.return_value = None
+    return mock_context
+
+
+@pytest.fixture(scope='function')
+def mock_transfer_factory(mocker, event_loop, mock_handle):
+    """
+    Fixture that yields a function used to make the mock USB device handle create transfers that
+    complete on the event loop with the given status, buffer and actual length.
+    """
+    def factory(status=usb1.TRANSFER_COMPLETED, buffer=b'', actual_length=None):
+        transfer = mocker.MagicMock(usb1.USBTransfer, autospec=True)
+        transfer.getStatus.return_value = status
+        transfer.getBuffer.return_value = bytearray(buffer)
+        transfer.getActualLength.return_value = len(buffer) if actual_length is None else actual_length
+        transfer.isSubmitted.return_value = False
+
+        def set_bulk(endpoint, buffer_or_len, callback=None, user_data=None, timeout=0):
+            transfer.callback = callback
+
+        transfer.setBulk.side_effect = set_bulk
+        transfer.submit.side_effect = lambda: event_loop.call_soon(transfer.callback, transfer)
+        mock_handle.getTransfer.return_value = transfer
+        return transfer
+
+    return factory
+
+
+@pytest.fixture(scope='function')
+def mock_async_transport(mocker, event_loop, mock_pollable_context, mock_device, mock_handle):
+    """
+    Fixture that yields an asynchronous USB transport backed by mock libusb objects.
+    """
+    interface_settings = mocker.MagicMock(usb1.USBInterfaceSetting, autospec=True)
+    read_endpoint = mocker.MagicMock(usb1.USBEndpoint, autospec=True)
+    read_endpoint.getAddress.return_value = libusb.USB_ENDPOINT_DIRECTION_IN | 0x01
+    write_endpoint = mocker.MagicMock(usb1.USBEndpoint, autospec=True)
+    write_endpoint.getAddress.return_value = 0x01
+    poller = asynchronous.acquire_poller(mock_pollable_context, event_loop)
+    return asynchronous.Transport(None, None, None, mock_pollable_context, mock_device, mock_handle,
+                                  interface_settings, read_endpoint, write_endpoint, poller, event_loop)
+
+
+@pytest.fixture(scope='function')
+def mock_adb_device_factory(mocker):
+    """
+    Fixture that yields a factory function used to create mock USB devices with a single ADB interface.
+    """
+    def factory(serial, vid=0x18d1, pid=0x4ee7, bus=1, ports=(1,), adb=True):
+        settings = mocker.MagicMock(usb1.USBInterfaceSetting, autospec=True)
+        settings.getClass.return_value = libusb.USB_DEVICE_CLASS if adb else 0x03
+        settings.getSubClass.return_value = libusb.USB_DEVICE_SUBCLASS
+        settings.getProtocol.return_value = libusb.USB_DEVICE_PROTOCOL
+        device = mocker.MagicMock(usb1.USBDevice, autospec=True)
+        device.getSerialNumber.return_value = serial
+        device.getVendorID.return_value = vid
+        device.getProductID.return_value = pid
+        device.getBusNumber.return_value = bus
+        device.getPortNumberList.return_value = list(ports)
+        device.iterSettings.return_value = [settings]
+        return device
+
+    return factory
+
+
+@pytest.fixture(scope='function')
+def mock_hotplug_context(mocker, mock_pollable_context):
+    """
+    Fixture that yields a mock USB context that supports hotplug and exposes the registered callback
+    as its `hotplug` attribute.
+    """
+    mocker.patch.object(usb1, 'hasCapability', return_value=True)
+
+    def register(callback, **kwargs):
+        mock_pollable_context.hotplug = callback
+        return 1
+
+    mock_pollable_context.hotplugRegisterCallback.side_effect = register
+    return mock_pollable_context
@@ -0,0 +1,357 @@
+"""
+    test_usb_asynchronous
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.usb.asynchronous` module.
+"""
+import asyncio
+import select
+import socket
+import threading
+
+import pytest
+import usb1
+
+from adbts import exceptions, usb
+from adbts.usb import hotplug, index
+
+
+def test_open_raises_when_no_device_found(event_loop, mock_context_no_devices):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.open` raises a :class:`~adbts.exceptions.TransportEndpointNotFound`
+    exception when no matching device is found.
+    """
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(usb.asynchronous.open())
+
+
+def test_open_closes_context_when_no_device_found(event_loop, mock_context_no_devices):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.open` will close the USB context it creates when it cannot
+    find a suitable device to use.
+    """
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(usb.asynchronous.open())
+    mock_context_no_devices.close.assert_called_with()
+
+
+def test_open_registers_context_poll_fds(event_loop, mock_device_with_handle,
+                                         mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.open` registers for poll file descriptor notifications
+    of the USB context it creates.
+    """
+    mock_context_one_device_valid_endpoints.getPollFDList.return_value = []
+    event_loop.run_until_complete(usb.asynchronous.open())
+    assert mock_context_one_device_valid_endpoints.setPollFDNotifiers.called
+
+
+def test_open_warns_about_explicit_loop(event_loop, mock_device_with_handle,
+                                        mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.open` raises a :class:`~DeprecationWarning` when given a loop.
+    """
+    mock_context_one_device_valid_endpoints.getPollFDList.return_value = []
+    with pytest.warns(DeprecationWarning):
+        assert event_loop.run_until_complete(usb.asynchronous.open(loop=event_loop)) is not None
+
+
+def test_open_retries_when_indexed_device_is_stale(event_loop, mock_device, mock_handle,
+                                                   mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.open` enumerates the bus again and retries once when the device
+    found in the index cannot be opened, e.g. because it re-enumerated.
+    """
+    mock_context_one_device_valid_endpoints.getPollFDList.return_value = []
+    mock_device.open.side_effect = [usb1.USBError(usb1.ERROR_NO_DEVICE), mock_handle]
+    assert event_loop.run_until_complete(usb.asynchronous.open()) is not None
+    assert mock_device.open.call_count == 2
+    assert mock_context_one_device_valid_endpoints.getDeviceList.call_count == 2
+
+
+def test_open_finds_device_in_executor(mocker, event_loop, mock_device_with_handle,
+                                       mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.open` looks up the device in the executor of the loop so
+    enumerating the bus does not block it.
+    """
+    mock_context_one_device_valid_endpoints.getPollFDList.return_value = []
+    threads = []
+    find = index.find_indexed_device_or_raise
+
+    def find_in_thread(*args):
+        threads.append(threading.current_thread())
+        return find(*args)
+
+    mocker.patch.object(index, 'find_indexed_device_or_raise', side_effect=find_in_thread)
+    assert event_loop.run_until_complete(usb.asynchronous.open()) is not None
+    assert threads and threading.current_thread() not in threads
+
+
+def test_read_returns_transfer_buffer(event_loop, mock_async_transport, mock_transfer_factory, valid_bytes):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read` returns the bytes received by the
+    completed bulk transfer.
+    """
+    mock_transfer_factory(buffer=valid_bytes + b'\x00', actual_length=len(valid_bytes))
+    data = event_loop.run_until_complete(mock_async_transport.read(len(valid_bytes) + 1))
+    assert data == valid_bytes
+
+
+def test_readinto_submits_transfer_with_given_buffer(event_loop, mock_async_transport, mock_transfer_factory):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.readinto` submits the caller buffer with the bulk
+    transfer and returns the number of bytes received.
+    """
+    transfer = mock_transfer_factory(actual_length=3)
+    buffer = bytearray(8)
+    assert event_loop.run_until_complete(mock_async_transport.readinto(buffer)) == 3
+    assert transfer.setBulk.call_args[0][1] is buffer
+
+
+def test_read_raises_timeout_error_on_timed_out_transfer(event_loop, mock_async_transport, mock_transfer_factory,
+                                                         valid_num_bytes, valid_timeout_ms):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when the transfer times out.
+    """
+    mock_transfer_factory(status=usb1.TRANSFER_TIMED_OUT)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(mock_async_transport.read(valid_num_bytes, timeout=valid_timeout_ms))
+
+
+def test_read_raises_endpoint_not_found_on_disconnected_device(event_loop, mock_async_transport,
+                                                               mock_transfer_factory, valid_num_bytes):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when the device is disconnected.
+    """
+    mock_transfer_factory(status=usb1.TRANSFER_NO_DEVICE)
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(mock_async_transport.read(valid_num_bytes))
+
+
+def test_read_reraises_submit_errors(event_loop, mock_async_transport, mock_transfer_factory,
+                                     error_code_to_exception, valid_num_bytes):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read` maps libusb errors raised when submitting
+    the transfer the same way as :func:`~adbts.usb.libusb.reraise_libusb_errors`.
+    """
+    value, exc_type = error_code_to_exception
+    transfer = mock_transfer_factory()
+    transfer.submit.side_effect = usb1.USBError(value)
+    with pytest.raises(exc_type):
+        event_loop.run_until_complete(mock_async_transport.read(valid_num_bytes))
+
+
+def test_read_returns_empty_bytes_without_transfer(event_loop, mock_async_transport, mock_handle):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read` does not submit a transfer when asked
+    to read zero bytes.
+    """
+    assert event_loop.run_until_complete(mock_async_transport.read(0)) == b''
+    assert not mock_handle.getTransfer.called
+
+
+def test_read_raises_when_closed(event_loop, mock_async_transport, valid_num_bytes):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read` raises a
+    :class:`~adbts.exceptions.TransportClosedError` when the transport is closed.
+    """
+    mock_async_transport.close()
+    with pytest.raises(exceptions.TransportClosedError):
+        event_loop.run_until_complete(mock_async_transport.read(valid_num_bytes))
+
+
+def test_write_raises_when_not_all_bytes_written(event_loop, mock_async_transport, mock_transfer_factory,
+                                                 valid_bytes):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.write` raises a
+    :class:`~adbts.exceptions.TransportError` when the transfer did not write all bytes.
+    """
+    mock_transfer_factory(actual_length=len(valid_bytes) - 1)
+    with pytest.raises(exceptions.TransportError):
+        event_loop.run_until_complete(mock_async_transport.write(valid_bytes))
+
+
+def test_close_stops_poll_fd_notifications(mock_async_transport, mock_pollable_context):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.close` removes the poll file descriptor notifiers
+    from the USB context before closing it.
+    """
+    mock_async_transport.close()
+    mock_pollable_context.setPollFDNotifiers.assert_called_with()
+    mock_pollable_context.close.assert_called_with()
+
+
+def test_writev_submits_single_transfer(event_loop, mock_async_transport, mock_transfer_factory, valid_bytes):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.writev` submits all buffers as a single bulk transfer.
+    """
+    transfer = mock_transfer_factory(actual_length=len(valid_bytes) + 24)
+    mock_async_transport._write_endpoint.getMaxPacketSize.return_value = 512
+    event_loop.run_until_complete(mock_async_transport.writev([bytes(24), valid_bytes]))
+    transfer.setBulk.assert_called_once()
+    assert transfer.setBulk.call_args[0][1] == bytes(24) + valid_bytes
+
+
+def test_acquire_poller_shares_poller_per_context(event_loop, mock_pollable_context):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.acquire_poller` registers a single poller per USB context
+    and only unregisters it once the last reference is released.
+    """
+    poller = usb.asynchronous.acquire_poller(mock_pollable_context, event_loop)
+    assert usb.asynchronous.acquire_poller(mock_pollable_context, event_loop) is poller
+    assert mock_pollable_context.setPollFDNotifiers.call_count == 1
+    usb.asynchronous.release_poller(poller)
+    assert mock_pollable_context.setPollFDNotifiers.call_count == 1
+    usb.asynchronous.release_poller(poller)
+    mock_pollable_context.setPollFDNotifiers.assert_called_with()
+
+
+@pytest.fixture(scope='function')
+def other_event_loop():
+    """
+    Fixture that yields a second event loop that is closed after the test.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_acquire_poller_uses_poller_per_event_loop(event_loop, other_event_loop, mock_pollable_context):
+    """
+    Assert that :func:`~adbts.usb.asynchronous.acquire_poller` registers a poller per event loop that uses
+    the USB context and only removes the poll file descriptor notifiers once the last one is released.
+    """
+    poller = usb.asynchronous.acquire_poller(mock_pollable_context, event_loop)
+    other_poller = usb.asynchronous.acquire_poller(mock_pollable_context, other_event_loop)
+    assert poller is not other_poller
+    assert poller.loop is event_loop
+    assert other_poller.loop is other_event_loop
+    assert mock_pollable_context.setPollFDNotifiers.call_count == 1
+    usb.asynchronous.release_poller(poller)
+    assert mock_pollable_context.setPollFDNotifiers.call_count == 1
+    usb.asynchronous.release_poller(other_poller)
+    mock_pollable_context.setPollFDNotifiers.assert_called_with()
+
+
+def test_poll_fd_notifiers_update_pollers_on_their_event_loops(event_loop, other_event_loop,
+                                                                 mock_pollable_context):
+    """
+    Assert that poll file descriptors libusb adds or removes on another thread are registered with the pollers
+    of every event loop using the USB context, on the thread running that loop.
+    """
+    pollers = [usb.asynchronous.acquire_poller(mock_pollable_context, loop)
+               for loop in (event_loop, other_event_loop)]
+    on_fd_added, on_fd_removed = mock_pollable_context.setPollFDNotifiers.call_args[0]
+    local, remote = socket.socketpair()
+    try:
+        for notify, args in ((on_fd_added, (local.fileno(), select.POLLIN, None)),
+                             (on_fd_removed, (local.fileno(), None))):
+            thread = threading.Thread(target=notify, args=args)
+            thread.start()
+            thread.join()
+            for poller in pollers:
+                poller.loop.run_until_complete(asyncio.sleep(0))
+                assert (local.fileno() in poller._fds) is (notify is on_fd_added)
+    finally:
+        for poller in pollers:
+            usb.asynchronous.release_poller(poller)
+        local.close()
+        remote.close()
+
+
+def test_hotplug_monitor_awaits_arrival(event_loop, mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.asynchronous.HotplugMonitor` wakes when a hotplug callback queues an arrival
+    on the event loop.
+    """
+    device = mock_adb_device_factory('a')
+
+    async def first_event():
+        async with usb.asynchronous.HotplugMonitor(context=mock_hotplug_context) as monitor:
+            event_loop.call_soon(mock_hotplug_context.hotplug, mock_hotplug_context, device,
+                                 hotplug.HOTPLUG_EVENT_ARRIVED)
+            async for event in monitor:
+                return event
+
+    event = event_loop.run_until_complete(first_event())
+    assert event.device is device
+    assert event.serial == 'a'
+
+
+def test_hotplug_monitor_uses_running_loop(event_loop, mock_hotplug_context):
+    """
+    Assert that :class:`~adbts.usb.asynchronous.HotplugMonitor` is driven by the loop running the co-routine
+    that creates it and raises a :class:`~DeprecationWarning` when given a loop.
+    """
+    async def create(**kwargs):
+        with usb.asynchronous.HotplugMonitor(context=mock_hotplug_context, **kwargs) as monitor:
+            return monitor._poller.loop
+
+    assert event_loop.run_until_complete(create()) is event_loop
+    with pytest.warns(DeprecationWarning):
+        assert event_loop.run_until_complete(create(loop=event_loop)) is event_loop
+
+
+def test_hotplug_monitor_stops_iteration_when_closed(event_loop, mock_hotplug_context):
+    """
+    Assert that :class:`~adbts.usb.asynchronous.HotplugMonitor` stops iterating once closed.
+    """
+    async def collect():
+        monitor = usb.asynchronous.HotplugMonitor(context=mock_hotplug_context)
+        monitor.open()
+        event_loop.call_soon(monitor.close)
+        return [event async for event in monitor]
+
+    assert event_loop.run_until_complete(collect()) == []
+    assert mock_hotplug_context.setPollFDNotifiers.called
+
+
+def test_read_exactly_submits_transfers_until_buffer_is_full(event_loop, mock_async_transport,
+                                                             mock_transfer_factory):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read_exactly` keeps submitting transfers with the
+    remainder of one buffer until it received all bytes.
+    """
+    transfer = mock_transfer_factory(actual_length=4)
+    data = event_loop.run_until_complete(mock_async_transport.read_exactly(8, timeout=1000))
+    assert len(data) == 8
+    assert transfer.setBulk.call_count == 2
+    assert len(transfer.setBulk.call_args[0][1]) == 4
+
+
+def test_read_exactly_raises_when_transfer_returns_no_bytes(event_loop, mock_async_transport,
+                                                            mock_transfer_factory):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when a transfer returns no bytes rather than
+    submitting transfers until the timeout.
+    """
+    transfer = mock_transfer_factory(actual_length=0)
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(mock_async_transport.read_exactly(8, timeout=1000))
+    assert transfer.setBulk.call_count == 1
+
+
+def test_write_file_submits_transfer_per_chunk(mocker, event_loop, mock_async_transport, mock_transfer_factory,
+                                               valid_file):
+    """
+    Assert that :meth:`~adbts.usb.asynchronous.Transport.write_file` submits a bulk OUT transfer for each chunk
+    of the mapped file.
+    """
+    mocker.patch.object(usb.asynchronous.files, 'DEFAULT_CHUNK_SIZE', 16384)
+    path, data = valid_file
+    transfer = mock_transfer_factory()
+    lengths = []
+
+    def set_bulk(endpoint, buffer_or_len, callback=None, user_data=None, timeout=0):
+        transfer.callback = callback
+        lengths.append(len(buffer_or_len))
+        transfer.getActualLength.return_value = len(buffer_or_len)
+
+    transfer.setBulk.side_effect = set_bulk
+    assert event_loop.run_until_complete(mock_async_transport.write_file(path, timeout=1000)) == len(data)
+    assert sum(lengths) == len(data)
+    assert len(lengths) == -(-len(data) // 16384)
@@ -0,0 +1,157 @@
+"""
+    test_usb_hotplug
+    ~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.usb.hotplug` module.
+"""
+import pytest
+import usb1
+
+from adbts import exceptions
+from adbts.usb import hotplug, index
+
+
+def test_hotplug_monitor_raises_when_unsupported(mocker, mock_context):
+    """
+    Assert that :meth:`~adbts.usb.hotplug.HotplugMonitor.open` raises a :class:`~adbts.exceptions.TransportError`
+    when libusb does not support hotplug.
+    """
+    mocker.patch.object(usb1, 'hasCapability', return_value=False)
+    with pytest.raises(exceptions.TransportError):
+        hotplug.HotplugMonitor(context=mock_context).open()
+
+
+def test_hotplug_monitor_yields_adb_arrivals(mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` yields arrivals of ADB devices with their serial
+    number and ignores other devices.
+    """
+    device = mock_adb_device_factory('a', bus=2, ports=(1, 3))
+    with hotplug.HotplugMonitor(context=mock_hotplug_context) as monitor:
+        mock_hotplug_context.hotplug(mock_hotplug_context, mock_adb_device_factory('hid', adb=False),
+                                     hotplug.HOTPLUG_EVENT_ARRIVED)
+        mock_hotplug_context.hotplug(mock_hotplug_context, device, hotplug.HOTPLUG_EVENT_ARRIVED)
+        event = next(monitor)
+    assert event.event == hotplug.HOTPLUG_EVENT_ARRIVED
+    assert event.device is device
+    assert event.serial == 'a'
+    assert event.port_path == (2, 1, 3)
+
+
+def test_hotplug_monitor_pairs_departure_with_arrival(mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` yields departures of previously arrived devices
+    and ignores departures of other devices.
+    """
+    device = mock_adb_device_factory('a')
+    with hotplug.HotplugMonitor(context=mock_hotplug_context) as monitor:
+        mock_hotplug_context.hotplug(mock_hotplug_context, device, hotplug.HOTPLUG_EVENT_ARRIVED)
+        mock_hotplug_context.hotplug(mock_hotplug_context, mock_adb_device_factory('b'), hotplug.HOTPLUG_EVENT_LEFT)
+        mock_hotplug_context.hotplug(mock_hotplug_context, device, hotplug.HOTPLUG_EVENT_LEFT)
+        events = [monitor.pop_event(), monitor.pop_event(), monitor.pop_event()]
+    assert [event.event for event in events[:2]] == [hotplug.HOTPLUG_EVENT_ARRIVED, hotplug.HOTPLUG_EVENT_LEFT]
+    assert events[1].serial == 'a'
+    assert events[2] is None
+
+
+def test_hotplug_monitor_filters_serial(mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` only yields devices that match its serial filter.
+    """
+    with hotplug.HotplugMonitor(serial='b', context=mock_hotplug_context) as monitor:
+        for serial in ('a', 'b'):
+            mock_hotplug_context.hotplug(mock_hotplug_context, mock_adb_device_factory(serial),
+                                         hotplug.HOTPLUG_EVENT_ARRIVED)
+        assert monitor.pop_event().serial == 'b'
+        assert monitor.pop_event() is None
+
+
+def test_hotplug_monitor_registers_vid_pid_with_libusb(mock_hotplug_context):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` lets libusb filter by vendor and product id.
+    """
+    with hotplug.HotplugMonitor(vid=0x18d1, pid=0x4ee7, context=mock_hotplug_context):
+        _, kwargs = mock_hotplug_context.hotplugRegisterCallback.call_args
+    assert kwargs['vendor_id'] == 0x18d1
+    assert kwargs['product_id'] == 0x4ee7
+
+
+def test_hotplug_monitor_next_event_returns_none_on_timeout(mock_hotplug_context):
+    """
+    Assert that :meth:`~adbts.usb.hotplug.HotplugMonitor.next_event` handles libusb events until the timeout
+    and returns None when no device arrived or left.
+    """
+    with hotplug.HotplugMonitor(context=mock_hotplug_context) as monitor:
+        assert monitor.next_event(timeout=1) is None
+    assert mock_hotplug_context.handleEventsTimeout.called
+
+
+def test_hotplug_monitor_invalidates_device_index(mocker, mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` invalidates the process-wide device index
+    on every event.
+    """
+    invalidate = mocker.patch.object(index.DEVICE_INDEX, 'invalidate')
+    with hotplug.HotplugMonitor(context=mock_hotplug_context):
+        mock_hotplug_context.hotplug(mock_hotplug_context, mock_adb_device_factory('a'),
+                                     hotplug.HOTPLUG_EVENT_ARRIVED)
+    invalidate.assert_called_with()
+
+
+def test_hotplug_monitor_close_releases_owned_context(mock_context_class, mock_hotplug_context):
+    """
+    Assert that :meth:`~adbts.usb.hotplug.HotplugMonitor.close` deregisters its callback and releases the
+    USB context it acquired.
+    """
+    monitor = hotplug.HotplugMonitor()
+    monitor.open()
+    monitor.close()
+    assert monitor.closed
+    mock_hotplug_context.hotplugDeregisterCallback.assert_called_with(1)
+    mock_hotplug_context.close.assert_called_with()
+
+
+def test_hotplug_monitor_filters_serial_collection(mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` accepts a collection of serial numbers like
+    :class:`~adbts.usb.libusb.DeviceFilter`.
+    """
+    with hotplug.HotplugMonitor(serial={'a', 'c'}, context=mock_hotplug_context) as monitor:
+        for serial in ('a', 'b', 'c'):
+            mock_hotplug_context.hotplug(mock_hotplug_context, mock_adb_device_factory(serial),
+                                         hotplug.HOTPLUG_EVENT_ARRIVED)
+        assert [monitor.pop_event().serial, monitor.pop_event().serial] == ['a', 'c']
+        assert monitor.pop_event() is None
+
+
+def test_hotplug_monitor_filters_vid_pid_collection(mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` lets libusb match any vendor id when given several
+    and filters them itself.
+    """
+    with hotplug.HotplugMonitor(vid={0x18d1, 0x04e8}, context=mock_hotplug_context) as monitor:
+        _, kwargs = mock_hotplug_context.hotplugRegisterCallback.call_args
+        for serial, vid in (('a', 0x18d1), ('b', 0x2717), ('c', 0x04e8)):
+            mock_hotplug_context.hotplug(mock_hotplug_context, mock_adb_device_factory(serial, vid=vid),
+                                         hotplug.HOTPLUG_EVENT_ARRIVED)
+        assert [monitor.pop_event().serial, monitor.pop_event().serial] == ['a', 'c']
+        assert monitor.pop_event() is None
+    assert kwargs['vendor_id'] == usb1.HOTPLUG_MATCH_ANY
+
+
+def test_hotplug_monitor_reads_serial_again_after_departure(mock_hotplug_context, mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.hotplug.HotplugMonitor` caches serial numbers per attached device and reads
+    it again for a device attached at the address of one that left.
+    """
+    device = mock_adb_device_factory('a')
+    events = []
+    with hotplug.HotplugMonitor(context=mock_hotplug_context) as monitor:
+        for event in (hotplug.HOTPLUG_EVENT_ARRIVED, hotplug.HOTPLUG_EVENT_LEFT):
+            mock_hotplug_context.hotplug(mock_hotplug_context, device, event)
+            events.append(monitor.pop_event())
+        device.getSerialNumber.return_value = 'b'
+        mock_hotplug_context.hotplug(mock_hotplug_context, device, hotplug.HOTPLUG_EVENT_ARRIVED)
+        events.append(monitor.pop_event())
+    assert [event.serial for event in events] == ['a', 'a', 'b']
+    assert device.getSerialNumber.call_count == 2
@@ -0,0 +1,176 @@
+"""
+    test_usb_index
+    ~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.usb.index` module.
+"""
+import pytest
+import usb1
+
+from adbts import exceptions
+from adbts.usb import index
+
+
+def test_device_index_finds_device_by_serial(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.find` finds the device with the requested serial number.
+    """
+    devices = [mock_adb_device_factory('a', ports=(1,)), mock_adb_device_factory('b', ports=(2,))]
+    mock_context.getDeviceList.return_value = devices
+    device, _ = index.DeviceIndex().find(mock_context, serial='b')
+    assert device is devices[1]
+
+
+def test_device_index_finds_device_by_vid_pid_and_port_path(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.find` finds devices by vendor/product id and bus/port path.
+    """
+    devices = [mock_adb_device_factory('a', pid=0x1, bus=1, ports=(1,)),
+               mock_adb_device_factory('b', pid=0x2, bus=2, ports=(3, 4))]
+    mock_context.getDeviceList.return_value = devices
+    device_index = index.DeviceIndex()
+    assert device_index.find(mock_context, vid=0x18d1, pid=0x2)[0] is devices[1]
+    assert device_index.find(mock_context, port_path=(1, 1))[0] is devices[0]
+    assert device_index.find(mock_context, port_path=[2, 3, 4])[0] is devices[1]
+
+
+def test_device_index_ignores_non_adb_interfaces(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.refresh` only indexes ADB interfaces and does not
+    read serial numbers of other devices.
+    """
+    hid = mock_adb_device_factory('hid', adb=False)
+    mock_context.getDeviceList.return_value = [hid]
+    device_index = index.DeviceIndex()
+    assert device_index.find(mock_context, serial='hid') == (None, None)
+    assert not device_index.entries
+    assert not hid.getSerialNumber.called
+
+
+def test_device_index_reuses_enumeration_within_ttl(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.find` does not enumerate the bus again for hits
+    before the index expires.
+    """
+    mock_context.getDeviceList.return_value = [mock_adb_device_factory('a')]
+    device_index = index.DeviceIndex()
+    for _ in range(3):
+        assert device_index.find(mock_context, serial='a') != (None, None)
+    assert mock_context.getDeviceList.call_count == 1
+
+
+def test_device_index_enumerates_again_after_ttl(mocker, mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.find` enumerates the bus again once the index expires.
+    """
+    monotonic = mocker.patch.object(index.time, 'monotonic', return_value=100.0)
+    mock_context.getDeviceList.return_value = [mock_adb_device_factory('a')]
+    device_index = index.DeviceIndex(ttl=5.0)
+    device_index.find(mock_context, serial='a')
+    monotonic.return_value = 105.0
+    device_index.find(mock_context, serial='a')
+    assert mock_context.getDeviceList.call_count == 2
+
+
+def test_device_index_enumerates_again_after_invalidate(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.find` enumerates the bus again after
+    :meth:`~adbts.usb.index.DeviceIndex.invalidate`.
+    """
+    mock_context.getDeviceList.return_value = [mock_adb_device_factory('a')]
+    device_index = index.DeviceIndex()
+    device_index.find(mock_context, serial='a')
+    device_index.invalidate()
+    device_index.find(mock_context, serial='a')
+    assert mock_context.getDeviceList.call_count == 2
+
+
+def test_device_index_enumerates_again_on_miss(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.find` enumerates the bus again when a lookup misses
+    so newly attached devices are found.
+    """
+    late = mock_adb_device_factory('late')
+    mock_context.getDeviceList.side_effect = [[mock_adb_device_factory('a')], [late]]
+    device_index = index.DeviceIndex()
+    device_index.find(mock_context, serial='a')
+    assert device_index.find(mock_context, serial='late')[0] is late
+
+
+def test_device_index_indexes_devices_without_serial_on_error(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.refresh` indexes devices whose serial number cannot be
+    read when errors are skipped.
+    """
+    device = mock_adb_device_factory('a')
+    device.getSerialNumber.side_effect = usb1.USBError(usb1.ERROR_ACCESS)
+    mock_context.getDeviceList.return_value = [device]
+    device_index = index.DeviceIndex()
+    device_index.refresh(mock_context)
+    assert device_index.entries[0].serial is None
+    assert device_index.find(mock_context, vid=0x18d1)[0] is device
+
+
+def test_find_indexed_device_uses_process_wide_index(mock_context_class, mock_adb_device_factory):
+    """
+    Assert that :func:`~adbts.usb.index.find_indexed_device` finds devices through
+    :data:`~adbts.usb.index.DEVICE_INDEX` until it is invalidated.
+    """
+    mock_context_class.getDeviceList.return_value = [mock_adb_device_factory('a')]
+    assert index.find_indexed_device(serial='a', context=mock_context_class) != (None, None)
+    assert index.find_indexed_device(serial='a', context=mock_context_class) != (None, None)
+    assert mock_context_class.getDeviceList.call_count == 1
+    index.invalidate_device_index()
+    index.find_indexed_device(serial='a', context=mock_context_class)
+    assert mock_context_class.getDeviceList.call_count == 2
+
+
+def test_open_indexed_device_looks_up_stale_device_again(mocker, mock_context_class, mock_adb_device_factory):
+    """
+    Assert that :func:`~adbts.usb.index.open_indexed_device` enumerates the bus again and retries once when
+    opening the indexed device fails.
+    """
+    mock_context_class.getDeviceList.return_value = [mock_adb_device_factory('a')]
+    opener = mocker.Mock(side_effect=[usb1.USBError(usb1.ERROR_NO_DEVICE), 'transport'])
+    assert index.open_indexed_device(opener, serial='a', context=mock_context_class) == 'transport'
+    assert opener.call_count == 2
+    assert mock_context_class.getDeviceList.call_count == 2
+
+
+def test_open_indexed_device_raises_when_retry_fails(mocker, mock_context_class, mock_adb_device_factory):
+    """
+    Assert that :func:`~adbts.usb.index.open_indexed_device` raises the :class:`~usb1.USBError` of opening
+    the device found again.
+    """
+    mock_context_class.getDeviceList.return_value = [mock_adb_device_factory('a')]
+    opener = mocker.Mock(side_effect=usb1.USBError(usb1.ERROR_NO_DEVICE))
+    with pytest.raises(usb1.USBError):
+        index.open_indexed_device(opener, serial='a', context=mock_context_class)
+    assert opener.call_count == 2
+
+
+def test_open_indexed_device_raises_when_no_device_found(mocker, mock_context_class):
+    """
+    Assert that :func:`~adbts.usb.index.open_indexed_device` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` without opening anything when no device matches.
+    """
+    mock_context_class.getDeviceList.return_value = []
+    opener = mocker.Mock()
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        index.open_indexed_device(opener, serial='a', context=mock_context_class)
+    assert not opener.called
+
+
+def test_device_index_stays_expired_when_invalidated_during_refresh(mock_context, mock_adb_device_factory):
+    """
+    Assert that :meth:`~adbts.usb.index.DeviceIndex.invalidate` called while enumerating, e.g. by a hotplug
+    callback, keeps the index expired.
+    """
+    device_index = index.DeviceIndex()
+    device = mock_adb_device_factory('a')
+    device.getSerialNumber.side_effect = lambda: device_index.invalidate() or 'a'
+    mock_context.getDeviceList.return_value = [device]
+    device_index.find(mock_context, serial='a')
+    device.getSerialNumber.side_effect = None
+    device_index.find(mock_context, serial='a')
+    assert mock_context.getDeviceList.call_count == 2
@@ -26,6 +26,22 @@ def test_reraise_libusb_errors_handles_no_device(error_code_to_exception):
         func()
 
 
+@pytest.mark.parametrize('status, exc_type', [
+    (usb1.TRANSFER_NO_DEVICE, exceptions.TransportEndpointNotFound),
+    (usb1.TRANSFER_TIMED_OUT, exceptions.TransportTimeoutError),
+    (usb1.TRANSFER_ERROR, exceptions.TransportError),
+    (usb1.TRANSFER_CANCELLED, exceptions.TransportError),
+    (usb1.TRANSFER_STALL, exceptions.TransportError),
+    (usb1.TRANSFER_OVERFLOW, exceptions.TransportError),
+])
+def test_transfer_status_to_transport_error(status, exc_type):
+    """
+    Assert that :func:`~adbts.usb.libusb.transfer_status_to_transport_error` maps unsuccessful
+    transfer statuses to the expected exception type.
+    """
+    assert type(libusb.transfer_status_to_transport_error(status)) is exc_type
+
+
 def test_read_performs_bulk_read_on_handle(mock_read_handle, mock_endpoint, valid_endpoint_address,
                                            valid_num_bytes, valid_timeout_ms):
     """
@@ -46,6 +62,24 @@ def test_read_performs_bulk_read_against_endpoint_address(mock_read_handle, mock
     mock_endpoint.getAddress.assert_called_with()
 
 
+def test_readinto_performs_bulk_transfer_into_buffer(mock_handle, mock_endpoint, valid_endpoint_address,
+                                                     valid_num_bytes, valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.usb.libusb.readinto` performs a bulk transfer against the endpoint address that
+    writes into memory shared with the given buffer.
+    """
+    buffer = bytearray(valid_num_bytes)
+
+    def bulk_transfer(endpoint, data, length, timeout):
+        data[0] = b'\x01'
+        return 1
+
+    mock_handle._bulkTransfer.side_effect = bulk_transfer
+    assert libusb.readinto(mock_handle, mock_endpoint, buffer, valid_timeout_ms) == 1
+    assert buffer[0] == 1
+    assert mock_handle._bulkTransfer.call_args[0][0] == valid_endpoint_address
+
+
 def test_write_performs_bulk_write_on_handle(mock_write_handle, mock_endpoint, valid_endpoint_address,
                                              valid_bytes, valid_timeout_ms):
     """
@@ -76,6 +110,30 @@ def test_write_throws_error_when_not_all_bytes_written(mock_write_handle_incorre
         libusb.write(mock_write_handle_incorrect_return_value, mock_endpoint, valid_bytes, valid_timeout_ms)
 
 
+def test_writev_performs_single_bulk_write(mock_write_handle, mock_endpoint, valid_endpoint_address, valid_bytes,
+                                           valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.usb.libusb.writev` joins the buffers into a single bulk write.
+    """
+    mock_endpoint.getMaxPacketSize.return_value = 512
+    libusb.writev(mock_write_handle, mock_endpoint, [b'header', valid_bytes], valid_timeout_ms)
+    mock_write_handle.bulkWrite.assert_called_once_with(valid_endpoint_address, b'header' + valid_bytes,
+                                                        valid_timeout_ms)
+
+
+def test_writev_terminates_max_packet_size_multiple_with_zero_length_packet(mock_write_handle, mock_endpoint,
+                                                                           valid_endpoint_address,
+                                                                           valid_timeout_ms):
+    """
+    Assert that :func:`~adbts.usb.libusb.writev` sends a zero-length packet when the combined transfer
+    length is a multiple of the endpoint max packet size.
+    """
+    mock_endpoint.getMaxPacketSize.return_value = 512
+    libusb.writev(mock_write_handle, mock_endpoint, [bytes(24), bytes(1000)], valid_timeout_ms)
+    mock_write_handle.bulkWrite.assert_called_with(valid_endpoint_address, b'', valid_timeout_ms)
+    assert mock_write_handle.bulkWrite.call_count == 2
+
+
 def test_close_releases_handle_interface(mock_context, mock_handle, mock_interface_settings, valid_interface_number):
     """
     Assert that :func:`~adbts.usb.libusb.close` calls :meth:`~usb1.USBDeviceHandle.releaseInterface`
@@ -112,6 +170,40 @@ def test_open_context_returns_new_context(mock_context_class):
     mock_context_class.open.assert_called_with()
 
 
+def test_acquire_context_shares_single_context(mock_context_class):
+    """
+    Assert that :func:`~adbts.usb.libusb.acquire_context` opens a single context and returns it to every caller.
+    """
+    assert libusb.acquire_context() is libusb.acquire_context() is mock_context_class
+    mock_context_class.open.assert_called_once_with()
+
+
+def test_release_context_closes_after_last_reference(mock_context_class, context_registry):
+    """
+    Assert that :func:`~adbts.usb.libusb.release_context` only closes the shared context once the last
+    reference is released.
+    """
+    context = libusb.acquire_context()
+    libusb.acquire_context()
+    libusb.release_context(context)
+    assert not context.close.called
+    libusb.release_context(context)
+    context.close.assert_called_once_with()
+    assert context_registry.references == 0
+
+
+def test_release_context_closes_unshared_context(mocker, mock_context_class):
+    """
+    Assert that :func:`~adbts.usb.libusb.release_context` closes contexts that were not acquired from
+    the registry without affecting the shared one.
+    """
+    shared = libusb.acquire_context()
+    unshared = mocker.MagicMock()
+    libusb.release_context(unshared)
+    unshared.close.assert_called_once_with()
+    assert not shared.close.called
+
+
 def test_open_device_handle_calls_open_on_device(mock_device):
     """
     Assert that :func:`~adbts.usb.libusb.open_device_handle` creates a new :class:`~usb1.USBDeviceHandle`
@@ -338,3 +430,77 @@ def test_find_write_endpoint_returns_none_on_mismatch(mock_interface_settings_en
     settings = mock_interface_settings_endpoint_factory(valid_read_endpoint_address)
     endpoint = libusb.find_write_endpoint(settings)
     assert not endpoint
+
+
+def test_device_filter_skips_serial_read_for_non_adb_interfaces(mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.libusb.DeviceFilter` does not read the serial number of devices whose
+    interface settings do not match the ADB class/subclass/protocol.
+    """
+    device = mock_adb_device_factory('a', adb=False)
+    device_filter = libusb.DeviceFilter(serial='a')
+    assert not device_filter.matches(device, device.iterSettings()[0])
+    assert not device.getSerialNumber.called
+
+
+def test_device_filter_skips_serial_read_on_vid_pid_mismatch(mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.libusb.DeviceFilter` checks vendor and product ids before reading the
+    serial number.
+    """
+    device = mock_adb_device_factory('a', vid=0x04e8)
+    device_filter = libusb.DeviceFilter(serial='a', vid=0x18d1)
+    assert not device_filter.matches(device, device.iterSettings()[0])
+    assert not device.getSerialNumber.called
+
+
+def test_device_filter_reads_serial_once_per_device(mock_adb_device_factory):
+    """
+    Assert that :class:`~adbts.usb.libusb.DeviceFilter` caches the serial number of each device.
+    """
+    device = mock_adb_device_factory('a')
+    device_filter = libusb.DeviceFilter(serial={'a', 'b'})
+    assert device_filter.matches(device, device.iterSettings()[0])
+    assert device_filter.matches(device, device.iterSettings()[0])
+    assert device.getSerialNumber.call_count == 1
+
+
+def test_find_devices_generator_matches_serial_set(mock_context, mock_adb_device_factory):
+    """
+    Assert that :func:`~adbts.usb.libusb.find_devices_generator` yields all devices whose serial number is in
+    the given collection in a single enumeration.
+    """
+    devices = [mock_adb_device_factory(serial, ports=(port,)) for port, serial in enumerate('abc', 1)]
+    mock_context.getDeviceList.return_value = devices
+    found = [device for device, _ in libusb.find_devices_generator(serial=['a', 'c'], context=mock_context)]
+    assert found == [devices[0], devices[2]]
+    assert mock_context.getDeviceList.call_count == 1
+
+
+def test_device_matches_vendor_id_set(mock_adb_device_factory):
+    """
+    Assert that :func:`~adbts.usb.libusb.device_matches` accepts a collection of vendor ids.
+    """
+    device = mock_adb_device_factory('a', vid=0x04e8)
+    assert libusb.device_matches(device, device.iterSettings()[0], vid={0x18d1, 0x04e8})
+    assert not libusb.device_matches(device, device.iterSettings()[0], vid={0x18d1})
+
+
+def test_find_devices_by_serial_returns_first_interface_per_serial(mock_context, mock_adb_device_factory):
+    """
+    Assert that :func:`~adbts.usb.libusb.find_devices_by_serial` maps each found serial number to its device
+    and skips devices that are not requested.
+    """
+    devices = [mock_adb_device_factory(serial, ports=(port,)) for port, serial in enumerate('abc', 1)]
+    mock_context.getDeviceList.return_value = devices
+    found = libusb.find_devices_by_serial(['a', 'c', 'z'], context=mock_context)
+    assert {serial: device for serial, (device, _) in found.items()} == {'a': devices[0], 'c': devices[2]}
+
+
+def test_find_devices_by_serial_returns_empty_without_serials(mock_context):
+    """
+    Assert that :func:`~adbts.usb.libusb.find_devices_by_serial` does not enumerate the bus when no serial
+    numbers are given.
+    """
+    assert libusb.find_devices_by_serial([], context=mock_context) == {}
+    assert not mock_context.getDeviceList.called
@@ -0,0 +1,188 @@
+"""
+    test_usb_readahead
+    ~~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.usb.readahead` module.
+"""
+import collections
+
+import pytest
+import usb1
+
+from adbts import exceptions
+from adbts.usb import readahead
+
+
+@pytest.fixture(scope='function')
+def mock_read_ahead_handle(mocker, mock_handle):
+    """
+    Fixture that yields a mock USB device handle that creates mock transfers which are queued
+    in submission order until completed by the test.
+    """
+    submitted = collections.deque()
+
+    def get_transfer():
+        transfer = mocker.MagicMock(usb1.USBTransfer, autospec=True)
+
+        def set_bulk(endpoint, buffer_or_len, callback=None, user_data=None, timeout=0):
+            transfer.callback = callback
+            transfer.size = buffer_or_len
+
+        transfer.setBulk.side_effect = set_bulk
+        transfer.submit.side_effect = lambda: submitted.append(transfer)
+        transfer.isSubmitted.side_effect = lambda: transfer in submitted
+        return transfer
+
+    mock_handle.getTransfer.side_effect = get_transfer
+    mock_handle.submitted = submitted
+    return mock_handle
+
+
+@pytest.fixture(scope='function')
+def complete_transfer(mock_read_ahead_handle):
+    """
+    Fixture that yields a function which completes the oldest submitted transfer.
+    """
+    def complete(data=b'', status=usb1.TRANSFER_COMPLETED):
+        transfer = mock_read_ahead_handle.submitted.popleft()
+        transfer.getStatus.return_value = status
+        transfer.getBuffer.return_value = bytearray(data.ljust(transfer.size, b'\x00'))
+        transfer.getActualLength.return_value = len(data)
+        transfer.callback(transfer)
+
+    return complete
+
+
+@pytest.fixture(scope='function')
+def read_ahead_queue(mock_context, mock_read_ahead_handle, mock_endpoint):
+    """
+    Fixture that yields a started read-ahead queue over mock libusb objects.
+    """
+    queue = readahead.ReadAheadQueue(mock_context, mock_read_ahead_handle, mock_endpoint, 2, 64)
+    queue.start()
+    return queue
+
+
+def test_start_submits_all_transfers(read_ahead_queue, mock_read_ahead_handle):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.start` submits the configured number of transfers.
+    """
+    assert len(mock_read_ahead_handle.submitted) == 2
+
+
+def test_read_serves_completed_transfers_in_order(read_ahead_queue, complete_transfer):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.read` returns bytes of completed transfers in order
+    and no more than requested.
+    """
+    complete_transfer(b'abc')
+    complete_transfer(b'def')
+    assert read_ahead_queue.read(4, 1000) == b'abcd'
+    assert read_ahead_queue.read(4, 1000) == b'ef'
+
+
+def test_readinto_copies_completed_transfers_into_buffer(read_ahead_queue, complete_transfer):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.readinto` fills the given buffer with bytes of
+    completed transfers, up to its length.
+    """
+    complete_transfer(b'abcdef')
+    buffer = bytearray(4)
+    assert read_ahead_queue.readinto(memoryview(buffer)[1:], 1000) == 3
+    assert buffer == b'\x00abc'
+    assert read_ahead_queue.buffered == 3
+
+
+def test_read_resubmits_completed_transfers(read_ahead_queue, complete_transfer, mock_read_ahead_handle):
+    """
+    Assert that completed transfers are submitted again to keep the read endpoint busy.
+    """
+    complete_transfer(b'abc')
+    assert len(mock_read_ahead_handle.submitted) == 2
+
+
+def test_read_holds_back_transfers_while_buffer_is_full(read_ahead_queue, complete_transfer,
+                                                        mock_read_ahead_handle):
+    """
+    Assert that completed transfers are not submitted again once all transfers worth of bytes are buffered,
+    and are submitted again by the next read once it made room.
+    """
+    for _ in range(3):
+        complete_transfer(bytes(64))
+    assert read_ahead_queue.buffered == 192
+    assert not mock_read_ahead_handle.submitted
+    assert read_ahead_queue.read(128, 1000) == bytes(128)
+    assert not mock_read_ahead_handle.submitted
+    assert read_ahead_queue.read(64, 1000) == bytes(64)
+    assert len(mock_read_ahead_handle.submitted) == 2
+
+
+def test_read_handles_events_until_data_arrives(read_ahead_queue, complete_transfer, mock_context):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.read` lets libusb handle events when no
+    bytes are buffered.
+    """
+    mock_context.handleEventsTimeout.side_effect = lambda tv: complete_transfer(b'abc')
+    assert read_ahead_queue.read(3, 1000) == b'abc'
+
+
+def test_read_raises_timeout_error_when_no_data_arrives(read_ahead_queue):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.read` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` when no transfer completes within the timeout.
+    """
+    with pytest.raises(exceptions.TransportTimeoutError):
+        read_ahead_queue.read(3, 1)
+
+
+def test_read_raises_on_failed_transfer(read_ahead_queue, complete_transfer):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.read` raises the mapped transport error once
+    all bytes buffered before a failed transfer are read.
+    """
+    complete_transfer(b'abc')
+    complete_transfer(status=usb1.TRANSFER_NO_DEVICE)
+    assert read_ahead_queue.read(3, 1000) == b'abc'
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        read_ahead_queue.read(3, 1000)
+
+
+def test_read_drops_transfers_completed_after_failed_transfer(read_ahead_queue, complete_transfer,
+                                                              mock_read_ahead_handle):
+    """
+    Assert that :class:`~adbts.usb.readahead.ReadAheadQueue` drops bytes of transfers that were in flight
+    when an earlier transfer failed, rather than serve bytes that follow a gap.
+    """
+    complete_transfer(b'abc')
+    complete_transfer(status=usb1.TRANSFER_NO_DEVICE)
+    complete_transfer(b'def')
+    assert read_ahead_queue.read(6, 1000) == b'abc'
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        read_ahead_queue.read(3, 1000)
+    assert not mock_read_ahead_handle.submitted
+
+
+def test_stop_cancels_in_flight_transfers(read_ahead_queue, complete_transfer, mock_read_ahead_handle,
+                                          mock_context):
+    """
+    Assert that :meth:`~adbts.usb.readahead.ReadAheadQueue.stop` cancels submitted transfers and waits
+    for them to complete.
+    """
+    transfers = list(mock_read_ahead_handle.submitted)
+    mock_context.handleEventsTimeout.side_effect = lambda tv: complete_transfer(status=usb1.TRANSFER_CANCELLED)
+    read_ahead_queue.stop()
+    assert all(transfer.cancel.called for transfer in transfers)
+    assert not mock_read_ahead_handle.submitted
+
+
+@pytest.mark.parametrize('num_transfers, transfer_size', [
+    (0, 64),
+    (2, 0),
+])
+def test_init_raises_on_invalid_configuration(mock_context, mock_handle, mock_endpoint, num_transfers,
+                                               transfer_size):
+    """
+    Assert that :class:`~adbts.usb.readahead.ReadAheadQueue` rejects configurations that cannot read.
+    """
+    with pytest.raises(ValueError):
+        readahead.ReadAheadQueue(mock_context, mock_handle, mock_endpoint, num_transfers, transfer_size)
@@ -4,7 +4,10 @@
 
     Tests for the :mod:`~adbts.usb.synchronous` module.
 """
+import time
+
 import pytest
+import usb1
 
 from adbts import exceptions, usb
 
@@ -74,6 +77,17 @@ def test_open_opens_device_handle(mock_context_one_device_valid_endpoints, mock_
     mock_device.open.assert_called_with()
 
 
+def test_open_retries_when_indexed_device_is_stale(mock_device, mock_handle, mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open` enumerates the bus again and retries once when the device
+    found in the index cannot be opened, e.g. because it re-enumerated.
+    """
+    mock_device.open.side_effect = [usb1.USBError(usb1.ERROR_NO_DEVICE), mock_handle]
+    assert usb.synchronous.open() is not None
+    assert mock_device.open.call_count == 2
+    assert mock_context_one_device_valid_endpoints.getDeviceList.call_count == 2
+
+
 def test_open_claims_device_handle(mock_device_with_handle, mock_context_one_device_valid_endpoints, mock_handle):
     """
     Assert that :func:`~adbts.usb.synchronous.open` will claim the interface of the open device handle for
@@ -81,3 +95,161 @@ def test_open_claims_device_handle(mock_device_with_handle, mock_context_one_dev
     """
     usb.synchronous.open()
     assert mock_handle.claimInterface.called
+
+
+def test_open_starts_read_ahead_when_enabled(mock_device_with_handle, mock_context_one_device_valid_endpoints,
+                                             mock_handle):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open` submits the requested number of read-ahead transfers
+    to the read endpoint.
+    """
+    usb.synchronous.open(read_ahead_transfers=3)
+    assert mock_handle.getTransfer.call_count == 3
+
+
+def test_open_does_not_read_ahead_by_default(mock_device_with_handle, mock_context_one_device_valid_endpoints,
+                                             mock_handle):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open` does not submit any transfers unless read-ahead is enabled.
+    """
+    usb.synchronous.open()
+    assert not mock_handle.getTransfer.called
+
+
+def test_open_many_opens_found_devices(mock_device_with_handle, mock_context_one_device_valid_endpoints,
+                                       mock_handle):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open_many` opens a transport for each found serial number.
+    """
+    mock_device_with_handle.getSerialNumber.return_value = 'a'
+    result = usb.synchronous.open_many(['a'])
+    assert list(result.transports) == ['a']
+    assert not result.errors
+    assert mock_handle.claimInterface.called
+
+
+def test_open_many_reports_missing_serials(mock_device_with_handle, mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open_many` reports a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` for serial numbers that are not on the bus.
+    """
+    mock_device_with_handle.getSerialNumber.return_value = 'a'
+    result = usb.synchronous.open_many(['a', 'b'])
+    assert list(result.transports) == ['a']
+    assert isinstance(result.errors['b'], exceptions.TransportEndpointNotFound)
+
+
+def test_open_many_reports_open_errors(mock_context_one_device_match, mock_device):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open_many` reports errors raised while opening a device instead
+    of raising them.
+    """
+    mock_device.getSerialNumber.return_value = 'a'
+    result = usb.synchronous.open_many(['a'])
+    assert not result.transports
+    assert isinstance(result.errors['a'], exceptions.TransportError)
+
+
+def test_open_many_enumerates_once(mock_device_with_handle, mock_context_one_device_valid_endpoints):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open_many` enumerates the bus once for all serial numbers.
+    """
+    mock_device_with_handle.getSerialNumber.return_value = 'a'
+    usb.synchronous.open_many(['a', 'b', 'c'])
+    assert mock_context_one_device_valid_endpoints.getDeviceList.call_count == 1
+
+
+@pytest.mark.parametrize('serials', [['a', 'b'], ['b', 'a']])
+def test_open_many_closes_opened_transports_on_unexpected_error(mocker, mock_context_class, serials):
+    """
+    Assert that :func:`~adbts.usb.synchronous.open_many` closes the transports it opened when opening another
+    device raises an error that is not a :class:`~adbts.exceptions.TransportError`.
+    """
+    opened = mocker.Mock()
+
+    def open_found_device(serial, *args):
+        if serial == 'b':
+            raise RuntimeError('unexpected')
+        return opened
+
+    mocker.patch.object(usb.synchronous.libusb, 'find_devices_by_serial',
+                        return_value={serial: (mocker.Mock(), mocker.Mock()) for serial in serials})
+    mocker.patch.object(usb.synchronous, '_open_found_device', side_effect=open_found_device)
+    with pytest.raises(RuntimeError):
+        usb.synchronous.open_many(serials)
+    opened.close.assert_called_once_with()
+
+
+def test_read_exactly_reads_into_one_buffer(mocker, mock_handle):
+    """
+    Assert that :meth:`~adbts.usb.synchronous.Transport.read_exactly` reads into the remainder of a single
+    buffer until it is full.
+    """
+    def readinto(handle, endpoint, view, timeout):
+        view[:3] = b'abc'[:len(view)]
+        return min(3, len(view))
+
+    patched = mocker.patch.object(usb.synchronous.libusb, 'readinto', side_effect=readinto)
+    transport = usb.synchronous.Transport(None, None, None, None, None, mock_handle, None, None, None)
+    assert transport.read_exactly(7, timeout=1000) == bytearray(b'abcabca')
+    assert patched.call_count == 3
+
+
+def test_read_exactly_raises_when_transfer_returns_no_bytes(mocker, mock_handle):
+    """
+    Assert that :meth:`~adbts.usb.synchronous.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportEndpointNotFound` when a transfer returns no bytes rather than
+    retrying until the timeout.
+    """
+    patched = mocker.patch.object(usb.synchronous.libusb, 'readinto', side_effect=[3, 0])
+    transport = usb.synchronous.Transport(None, None, None, None, None, mock_handle, None, None, None)
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        transport.read_exactly(7, timeout=1000)
+    assert patched.call_count == 2
+
+
+def test_read_exactly_raises_when_deadline_passed(mocker, mock_handle):
+    """
+    Assert that :meth:`~adbts.usb.synchronous.Transport.read_exactly` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` once its overall timeout passed.
+    """
+    def readinto(handle, endpoint, view, timeout):
+        time.sleep(0.02)
+        return 1
+
+    mocker.patch.object(usb.synchronous.libusb, 'readinto', side_effect=readinto)
+    transport = usb.synchronous.Transport(None, None, None, None, None, mock_handle, None, None, None)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        transport.read_exactly(100, timeout=50)
+
+
+def test_write_file_writes_mapped_chunks(mocker, mock_write_handle, mock_endpoint, valid_file):
+    """
+    Assert that :meth:`~adbts.usb.synchronous.Transport.write_file` writes the file in chunks of writable views
+    of its memory mapping.
+    """
+    mocker.patch.object(usb.synchronous.files, 'DEFAULT_CHUNK_SIZE', 16384)
+    written = []
+    mock_write_handle.bulkWrite.side_effect = lambda address, data, timeout: written.append(
+        (bytes(data), isinstance(data, memoryview) and not data.readonly)) or len(data)
+    path, data = valid_file
+    transport = usb.synchronous.Transport(None, None, None, None, None, mock_write_handle, None, None, mock_endpoint)
+    assert transport.write_file(path, 100, timeout=1000) == len(data) - 100
+    assert b''.join(chunk for chunk, _ in written) == data[100:]
+    assert all(len(chunk) <= 16384 and writable for chunk, writable in written)
+
+
+def test_write_file_raises_when_deadline_passed(mocker, mock_write_handle, mock_endpoint, valid_file):
+    """
+    Assert that :meth:`~adbts.usb.synchronous.Transport.write_file` raises a
+    :class:`~adbts.exceptions.TransportTimeoutError` once its overall timeout passed.
+    """
+    def bulk_write(address, data, timeout):
+        time.sleep(0.02)
+        return len(data)
+
+    mocker.patch.object(usb.synchronous.files, 'DEFAULT_CHUNK_SIZE', 1024)
+    mock_write_handle.bulkWrite.side_effect = bulk_write
+    transport = usb.synchronous.Transport(None, None, None, None, None, mock_write_handle, None, None, mock_endpoint)
+    with pytest.raises(exceptions.TransportTimeoutError):
+        transport.write_file(valid_file[0], timeout=50)
@@ -0,0 +1,243 @@
+"""
+    test_usb_threaded
+    ~~~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~adbts.usb.threaded` module.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from adbts import exceptions, usb
+
+
+@pytest.fixture(scope='function')
+def mock_sync_transport(mocker):
+    """
+    Fixture that yields a mock synchronous USB transport.
+    """
+    return mocker.MagicMock(usb.synchronous.Transport, autospec=True)
+
+
+@pytest.fixture(scope='function')
+def threaded_transport(event_loop, mock_sync_transport):
+    """
+    Fixture that yields a threaded USB transport wrapping a mock synchronous transport.
+    """
+    worker = usb.threaded.IOWorker(event_loop)
+    yield usb.threaded.Transport(mock_sync_transport, worker)
+    worker.stop()
+    worker.join()
+
+
+def test_read_is_performed_by_worker_thread(event_loop, threaded_transport, mock_sync_transport):
+    """
+    Assert that :meth:`~adbts.usb.threaded.Transport.read` performs the blocking read on the worker thread.
+    """
+    threads = []
+
+    def read(num_bytes, timeout):
+        threads.append(threading.current_thread())
+        return b'x' * num_bytes
+
+    mock_sync_transport.read.side_effect = read
+    assert event_loop.run_until_complete(threaded_transport.read(4)) == b'xxxx'
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_read_raises_worker_exception(event_loop, threaded_transport, mock_sync_transport):
+    """
+    Assert that :meth:`~adbts.usb.threaded.Transport.read` raises exceptions of the synchronous transport.
+    """
+    mock_sync_transport.read.side_effect = exceptions.TransportTimeoutError('timeout')
+    with pytest.raises(exceptions.TransportTimeoutError):
+        event_loop.run_until_complete(threaded_transport.read(4, timeout=10))
+
+
+def test_operations_complete_in_submission_order(event_loop, threaded_transport, mock_sync_transport):
+    """
+    Assert that concurrently awaited operations are performed in the order they were submitted.
+    """
+    mock_sync_transport.read.side_effect = lambda num_bytes, timeout: bytes([num_bytes])
+
+    async def read_many():
+        return await asyncio.gather(*(threaded_transport.read(n) for n in range(1, 33)))
+
+    assert event_loop.run_until_complete(read_many()) == [bytes([n]) for n in range(1, 33)]
+    assert [c[0][0] for c in mock_sync_transport.read.call_args_list] == list(range(1, 33))
+
+
+def test_completions_are_delivered_in_batches(mocker, event_loop, threaded_transport, mock_sync_transport):
+    """
+    Assert that completions that finish before the event loop runs are delivered by a single callback.
+    """
+    mock_sync_transport.write.return_value = None
+    call_soon_threadsafe = mocker.spy(event_loop, 'call_soon_threadsafe')
+
+    async def write_many():
+        gate = threading.Event()
+        mock_sync_transport.write.side_effect = lambda data, timeout: gate.wait()
+        tasks = [event_loop.create_task(threaded_transport.write(b'x')) for _ in range(8)]
+        await asyncio.sleep(0)
+        gate.set()
+        # Block the loop so every write completes before the first notification runs.
+        time.sleep(0.1)
+        await asyncio.gather(*tasks)
+
+    event_loop.run_until_complete(write_many())
+    assert mock_sync_transport.write.call_count == 8
+    assert call_soon_threadsafe.call_count == 1
+
+
+def test_close_closes_sync_transport_on_worker(event_loop, mock_sync_transport):
+    """
+    Assert that :meth:`~adbts.usb.threaded.Transport.close` closes the synchronous transport on the worker
+    thread and stops it.
+    """
+    worker = usb.threaded.IOWorker(event_loop)
+    transport = usb.threaded.Transport(mock_sync_transport, worker)
+    transport.close()
+    worker.join(timeout=5)
+    assert transport.closed
+    mock_sync_transport.close.assert_called_with()
+
+
+def test_close_reports_sync_transport_error(event_loop, mock_sync_transport):
+    """
+    Assert that :meth:`~adbts.usb.threaded.Transport.close` reports an error raised while closing the
+    synchronous transport to the exception handler of the event loop.
+    """
+    error = exceptions.TransportError('close')
+    mock_sync_transport.close.side_effect = error
+    contexts = []
+    event_loop.set_exception_handler(lambda loop, context: contexts.append(context))
+    worker = usb.threaded.IOWorker(event_loop)
+    transport = usb.threaded.Transport(mock_sync_transport, worker)
+    transport.close()
+    worker.join(timeout=5)
+    event_loop.run_until_complete(asyncio.sleep(0.01))
+    assert [context['exception'] for context in contexts] == [error]
+
+
+def test_worker_closes_sync_transport_when_loop_closed(mock_sync_transport):
+    """
+    Assert that :class:`~adbts.usb.threaded.IOWorker` closes the synchronous transport it performs I/O for
+    when it exits because the event loop was closed.
+    """
+    loop = asyncio.new_event_loop()
+    worker = usb.threaded.IOWorker(loop)
+    usb.threaded.Transport(mock_sync_transport, worker)
+    gate = threading.Event()
+    future = worker.submit(gate.wait)
+    loop.close()
+    gate.set()
+    worker.join(timeout=5)
+    assert not future.done()
+    mock_sync_transport.close.assert_called_with()
+
+
+def test_open_wraps_synchronous_transport(mocker, event_loop, mock_sync_transport):
+    """
+    Assert that :func:`~adbts.usb.threaded.open` opens the synchronous transport with the given filter.
+    """
+    sync_open = mocker.patch.object(usb.synchronous, 'open', return_value=mock_sync_transport)
+    transport = event_loop.run_until_complete(usb.threaded.open(serial='a'))
+    sync_open.assert_called_with('a', None, None, 0, usb.readahead.DEFAULT_TRANSFER_SIZE)
+    transport.close()
+
+
+def test_open_warns_about_explicit_loop(mocker, event_loop, mock_sync_transport):
+    """
+    Assert that :func:`~adbts.usb.threaded.open` raises a :class:`~DeprecationWarning` when given a loop.
+    """
+    mocker.patch.object(usb.synchronous, 'open', return_value=mock_sync_transport)
+    with pytest.warns(DeprecationWarning):
+        transport = event_loop.run_until_complete(usb.threaded.open(loop=event_loop))
+    transport.close()
+
+
+def test_open_raises_when_no_device_found(mocker, event_loop):
+    """
+    Assert that :func:`~adbts.usb.threaded.open` raises errors of the synchronous open.
+    """
+    mocker.patch.object(usb.synchronous, 'open', side_effect=exceptions.TransportEndpointNotFound('none'))
+    with pytest.raises(exceptions.TransportEndpointNotFound):
+        event_loop.run_until_complete(usb.threaded.open())
+
+
+def test_open_closes_transport_opened_after_cancellation(mocker, event_loop, mock_sync_transport):
+    """
+    Assert that :func:`~adbts.usb.threaded.open` closes the synchronous transport when it is cancelled while
+    the worker is opening it.
+    """
+    opening, gate, closed = threading.Event(), threading.Event(), threading.Event()
+
+    def sync_open(*args):
+        opening.set()
+        gate.wait()
+        return mock_sync_transport
+
+    mocker.patch.object(usb.synchronous, 'open', side_effect=sync_open)
+    mock_sync_transport.close.side_effect = closed.set
+
+    async def cancel_open():
+        task = event_loop.create_task(usb.threaded.open(serial='a'))
+        while not opening.is_set():
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        gate.set()
+
+    event_loop.run_until_complete(cancel_open())
+    assert closed.wait(timeout=5)
+    mock_sync_transport.close.assert_called_once_with()
+
+
+def test_worker_closes_result_delivered_to_cancelled_future(event_loop, mock_sync_transport):
+    """
+    Assert that :class:`~adbts.usb.threaded.IOWorker` closes the result of a call submitted with
+    `close_if_cancelled` when its future is cancelled after the call finished but before it was delivered.
+    """
+    worker = usb.threaded.IOWorker(event_loop)
+    future = worker.submit(lambda: mock_sync_transport, close_if_cancelled=True)
+    worker.stop()
+    worker.join(timeout=5)
+    future.cancel()
+    event_loop.run_until_complete(asyncio.sleep(0.01))
+    mock_sync_transport.close.assert_called_once_with()
+
+
+def test_worker_discards_result_of_cancelled_future(event_loop, mock_sync_transport):
+    """
+    Assert that :class:`~adbts.usb.threaded.IOWorker` does not close the result of a cancelled call that was
+    not submitted with `close_if_cancelled`.
+    """
+    worker = usb.threaded.IOWorker(event_loop)
+    future = worker.submit(lambda: mock_sync_transport)
+    worker.stop()
+    worker.join(timeout=5)
+    future.cancel()
+    event_loop.run_until_complete(asyncio.sleep(0.01))
+    assert not mock_sync_transport.close.called
+
+
+def test_read_exactly_is_performed_by_worker(event_loop, threaded_transport, mock_sync_transport):
+    """
+    Assert that :meth:`~adbts.usb.threaded.Transport.read_exactly` delegates to the synchronous transport.
+    """
+    mock_sync_transport.read_exactly.return_value = bytearray(24)
+    assert event_loop.run_until_complete(threaded_transport.read_exactly(24, timeout=1000)) == bytearray(24)
+    mock_sync_transport.read_exactly.assert_called_with(24, 1000)
+
+
+def test_write_file_is_performed_by_worker(event_loop, threaded_transport, mock_sync_transport):
+    """
+    Assert that :meth:`~adbts.usb.threaded.Transport.write_file` delegates to the synchronous transport on the
+    worker thread.
+    """
+    mock_sync_transport.write_file.return_value = 42
+    assert event_loop.run_until_complete(threaded_transport.write_file('file.bin', 8, 42, 1000)) == 42
+    mock_sync_transport.write_file.assert_called_once_with('file.bin', 8, 42, 1000)